@@ -0,0 +1,628 @@
+"""Execution Layer - Bounded pools that keep blocking work off the event loop.
+
+Crew runs take minutes, tool calls block on I/O and AVM batches on CPU;
+run on the event loop, any of them stalls every other request on the
+worker, ``/health`` included. Routes hand such work to the pool of its
+class instead. Each class has its own thread pool, a concurrency limit and
+a bounded queue: when the queue is full the request is rejected at once
+with 429 (and a Retry-After estimate), and work that waited longer than
+the queue timeout without starting is rejected with 503. An event loop
+monitor measures how late the loop wakes up, which is the latency every
+request on the worker pays.
+
+Async jobs are not run here while job worker processes (``run_workers.py``)
+are up: ``start_job`` records them in the job store and the workers run
+them; ``stream_job`` follows their progress from the store. Without a live
+worker for the job type, the job runs on the crew pool of this process.
+"""
+
+import asyncio
+import contextvars
+import json
+import threading
+import time
+from collections import deque
+from collections.abc import AsyncIterator, Callable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from functools import lru_cache, partial
+from typing import Any, TypeVar
+
+from fastapi import HTTPException
+
+from config import get_settings
+from jobs import (
+    PRIORITIES,
+    InvalidTransitionError,
+    Job,
+    JobEvent,
+    JobStore,
+    execute_job,
+    get_job_store,
+)
+
+T = TypeVar("T")
+
+# Work classes with their own pool and limits
+WORK_CLASSES = ("crew", "tool", "avm")
+
+# Weight of the latest run in the average run time
+_DURATION_SMOOTHING = 0.2
+
+# Longest silence on a job progress stream before a keepalive
+_STREAM_KEEPALIVE_SECONDS = 15.0
+
+# Threads reading the job store for all progress streams of the process
+_STREAM_READERS = 2
+
+
+class ExecutionRejected(HTTPException):
+    """Work refused because its pool is saturated (429) or overloaded (503)."""
+
+    def __init__(self, status_code: int, work_class: str, reason: str, retry_after: float):
+        super().__init__(
+            status_code=status_code,
+            detail=f"{work_class} capacity exhausted: {reason}",
+            headers={"Retry-After": str(max(1, round(retry_after)))},
+        )
+        self.work_class = work_class
+
+
+class _QueueTimeoutError(Exception):
+    """Work did not start within the queue timeout."""
+
+
+class WorkPool:
+    """
+    Thread pool of one work class with admission control.
+
+    At most ``max_workers`` items run and ``max_queue`` wait; anything
+    beyond is rejected rather than queued without bound.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_workers: int,
+        max_queue: int,
+        queue_timeout_seconds: float,
+    ):
+        """
+        Initialize the pool; threads start on first use.
+
+        Args:
+            name: Work class name
+            max_workers: Items running concurrently
+            max_queue: Items waiting for a worker before new work is rejected
+            queue_timeout_seconds: Longest wait for a worker before the item is dropped
+        """
+        self.name = name
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.queue_timeout_seconds = queue_timeout_seconds
+
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix=f"pricewaze-{name}"
+        )
+        self._lock = threading.Lock()
+        self._closed = False
+        self._running = 0
+        self._queued = 0
+        self._counters = {
+            "completed": 0,
+            "failed": 0,
+            "rejected": 0,
+            "timed_out": 0,
+        }
+        self._avg_seconds = 0.0
+
+    def _retry_after(self) -> float:
+        """Seconds until a slot is likely free. Call with the lock held."""
+        waves = (self._queued + self.max_workers) / self.max_workers
+        return waves * (self._avg_seconds or 1.0)
+
+    def _admit(self) -> None:
+        """Reserve a queue slot or reject the work."""
+        with self._lock:
+            if self._closed:
+                raise ExecutionRejected(503, self.name, "shutting down", 5)
+            if self._running + self._queued >= self.max_workers + self.max_queue:
+                self._counters["rejected"] += 1
+                raise ExecutionRejected(429, self.name, "queue full", self._retry_after())
+            self._queued += 1
+
+    def _start(self, enqueued_at: float) -> None:
+        """Move admitted work from queued to running, unless it waited too long."""
+        with self._lock:
+            self._queued -= 1
+            if time.monotonic() - enqueued_at > self.queue_timeout_seconds:
+                self._counters["timed_out"] += 1
+                raise _QueueTimeoutError()
+            self._running += 1
+
+    def _finish(self, started_at: float, failed: bool) -> None:
+        with self._lock:
+            self._running -= 1
+            self._counters["failed" if failed else "completed"] += 1
+            elapsed = time.monotonic() - started_at
+            self._avg_seconds = (
+                elapsed if not self._avg_seconds
+                else self._avg_seconds + _DURATION_SMOOTHING * (elapsed - self._avg_seconds)
+            )
+
+    def _cancelled(self, future: Future) -> None:
+        """Release the queue slot of work cancelled before it started."""
+        if future.cancelled():
+            with self._lock:
+                self._queued -= 1
+
+    def _dispatch(self, call: Callable[[], T]) -> Future:
+        """Submit admitted work to the executor, in the caller's context."""
+        enqueued_at = time.monotonic()
+        context = contextvars.copy_context()
+
+        def run() -> T:
+            self._start(enqueued_at)
+            started_at = time.monotonic()
+            failed = True
+            try:
+                result = context.run(call)
+                failed = False
+                return result
+            finally:
+                self._finish(started_at, failed)
+
+        future = self._executor.submit(run)
+        future.add_done_callback(self._cancelled)
+        return future
+
+    def _rejected_timeout(self) -> ExecutionRejected:
+        with self._lock:
+            retry_after = self._retry_after()
+        return ExecutionRejected(503, self.name, "queue timeout", retry_after)
+
+    async def run(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """
+        Run a blocking call on the pool and await its result.
+
+        Raises:
+            ExecutionRejected: If the pool is saturated or the call timed out in the queue
+        """
+        self._admit()
+        future = self._dispatch(partial(fn, *args, **kwargs))
+        wrapped = asyncio.wrap_future(future)
+        try:
+            # Reject at the timeout rather than when a worker finally picks the item up
+            done, _ = await asyncio.wait({wrapped}, timeout=self.queue_timeout_seconds)
+            if not done and future.cancel():
+                with self._lock:
+                    self._counters["timed_out"] += 1
+                raise self._rejected_timeout()
+            return await wrapped
+        except _QueueTimeoutError:
+            raise self._rejected_timeout() from None
+        except asyncio.CancelledError:
+            wrapped.cancel()
+            raise
+
+    def submit(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Future:
+        """
+        Start a blocking call in the background (e.g. an async job).
+
+        Admission happens immediately, so a saturated pool rejects the
+        request that submits the work rather than failing it later.
+
+        Raises:
+            ExecutionRejected: If the pool is saturated
+        """
+        self._admit()
+        return self._dispatch(partial(fn, *args, **kwargs))
+
+    def iterate(self, iterator: Iterator[T]) -> AsyncIterator[T]:
+        """
+        Consume a blocking iterator on the pool (e.g. a streamed response).
+
+        The iteration holds one slot of the class from this call until it is
+        exhausted, fails, or is stopped or dropped and closed; each item is
+        produced, and an unfinished iterator closed, on a pool thread.
+        Admission happens here, before any response is started.
+
+        Raises:
+            ExecutionRejected: If the pool is saturated
+        """
+        self._admit()
+        self._start(time.monotonic())
+        return _PoolIterator(self, iterator)
+
+    def stats(self) -> dict[str, Any]:
+        """Current load and counters."""
+        with self._lock:
+            return {
+                "running": self._running,
+                "queued": self._queued,
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                **self._counters,
+                "avg_seconds": round(self._avg_seconds, 3),
+            }
+
+    def shutdown(self, wait: bool = False) -> None:
+        """Reject new work and drop work that has not started."""
+        with self._lock:
+            self._closed = True
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+
+def _close_iterator(
+    pool: WorkPool,
+    iterator: Iterator[Any],
+    pending: Future | None,
+    context: contextvars.Context,
+    started_at: float,
+) -> None:
+    """Close a pool iterator once its last item is produced, then free its slot."""
+    try:
+        if pending is not None:
+            wait([pending])  # A generator cannot be closed while it is producing
+        close = getattr(iterator, "close", None)
+        if close is not None:
+            context.run(close)
+    finally:
+        pool._finish(started_at, failed=False)
+
+
+class _PoolIterator:
+    """
+    Async view of a blocking iterator whose items are produced on a pool.
+
+    An iterator stopped early (the client left) is closed on the pool too,
+    so its cleanup never blocks the event loop; its slot is held until that
+    cleanup finished.
+    """
+
+    _DONE = object()
+
+    def __init__(self, pool: WorkPool, iterator: Iterator[Any]):
+        self._pool = pool
+        self._iterator = iterator
+        self._context = contextvars.copy_context()
+        self._started_at = time.monotonic()
+        self._pending: Future | None = None
+        self._closed = False
+        self._closing: Future | None = None
+
+    def _release(self, failed: bool) -> None:
+        """Free the slot of an iterator that ended by itself."""
+        if not self._closed:
+            self._closed = True
+            self._pool._finish(self._started_at, failed)
+
+    def _close(self) -> Future | None:
+        """Close the iterator on the pool (at most once); None if it already ended."""
+        if self._closed:
+            return self._closing
+        self._closed = True
+        args = (self._pool, self._iterator, self._pending, self._context, self._started_at)
+        try:
+            self._closing = self._pool._executor.submit(_close_iterator, *args)
+        except RuntimeError:
+            # Pool shut down: the process is exiting, nothing else waits on the loop
+            _close_iterator(*args)
+        return self._closing
+
+    def __aiter__(self) -> "_PoolIterator":
+        return self
+
+    async def __anext__(self) -> Any:
+        if self._closed:
+            raise StopAsyncIteration
+        self._pending = self._pool._executor.submit(
+            self._context.run, next, self._iterator, self._DONE
+        )
+        try:
+            item = await asyncio.wrap_future(self._pending)
+        except asyncio.CancelledError:
+            # The client left mid-item; the item is still produced, then the iterator closed
+            self._close()
+            raise
+        except BaseException:
+            self._release(failed=True)
+            raise
+        if item is self._DONE:
+            self._release(failed=False)
+            raise StopAsyncIteration
+        return item
+
+    async def aclose(self) -> None:
+        """Stop early: close the iterator on the pool, then free the slot."""
+        closing = self._close()
+        if closing is not None:
+            await asyncio.wrap_future(closing)
+
+    def __del__(self) -> None:
+        # Dropped unfinished (e.g. the client left before streaming started)
+        self._close()
+
+
+class EventLoopMonitor:
+    """
+    Measures event loop lag: how much later than scheduled a sleep wakes up.
+
+    Lag is time during which the loop ran something else without yielding,
+    i.e. the delay added to every request served by this worker.
+    """
+
+    def __init__(self, interval_seconds: float = 0.5, window: int = 120):
+        """
+        Initialize the monitor.
+
+        Args:
+            interval_seconds: Sampling interval
+            window: Samples kept for the percentiles
+        """
+        self.interval_seconds = interval_seconds
+        self._samples: deque[float] = deque(maxlen=window)
+        self._max_lag = 0.0
+        self._task: asyncio.Task | None = None
+
+    async def _sample(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            scheduled = loop.time() + self.interval_seconds
+            await asyncio.sleep(self.interval_seconds)
+            lag = max(0.0, loop.time() - scheduled)
+            self._samples.append(lag)
+            self._max_lag = max(self._max_lag, lag)
+
+    def start(self) -> None:
+        """Start sampling on the running loop."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._sample())
+
+    def stop(self) -> None:
+        """Stop sampling."""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def stats(self) -> dict[str, Any]:
+        """Latest, 99th percentile and maximum lag in milliseconds."""
+        samples = sorted(self._samples)
+        if not samples:
+            return {"lag_ms": 0.0, "p99_lag_ms": 0.0, "max_lag_ms": 0.0, "samples": 0}
+        return {
+            "lag_ms": round(self._samples[-1] * 1000, 2),
+            "p99_lag_ms": round(samples[min(len(samples) - 1, int(len(samples) * 0.99))] * 1000, 2),
+            "max_lag_ms": round(self._max_lag * 1000, 2),
+            "samples": len(samples),
+        }
+
+
+class ExecutionLayer:
+    """The work pools of the API process and its event loop monitor."""
+
+    def __init__(self, pools: dict[str, WorkPool], monitor: EventLoopMonitor):
+        self.pools = pools
+        self.monitor = monitor
+
+    def pool(self, work_class: str) -> WorkPool:
+        """Pool of a work class (one of ``WORK_CLASSES``)."""
+        return self.pools[work_class]
+
+    async def run(self, work_class: str, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Run a blocking call in a class pool (see ``WorkPool.run``)."""
+        return await self.pools[work_class].run(fn, *args, **kwargs)
+
+    def submit(self, work_class: str, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Future:
+        """Start a blocking call in the background (see ``WorkPool.submit``)."""
+        return self.pools[work_class].submit(fn, *args, **kwargs)
+
+    def iterate(self, work_class: str, iterator: Iterator[T]) -> AsyncIterator[T]:
+        """Consume a blocking iterator in a class pool (see ``WorkPool.iterate``)."""
+        return self.pools[work_class].iterate(iterator)
+
+    def stats(self) -> dict[str, Any]:
+        """Load of every pool and event loop lag, for health checks."""
+        return {
+            "pools": {name: pool.stats() for name, pool in self.pools.items()},
+            "event_loop": self.monitor.stats(),
+        }
+
+    def start(self) -> None:
+        """Start the event loop monitor (application startup)."""
+        self.monitor.start()
+
+    def shutdown(self) -> None:
+        """Stop the monitor and the pools (application shutdown)."""
+        self.monitor.stop()
+        for pool in self.pools.values():
+            pool.shutdown()
+
+
+@lru_cache
+def get_execution_layer() -> ExecutionLayer:
+    """Get the process-wide execution layer configured from settings."""
+    settings = get_settings()
+    limits = {
+        "crew": (settings.exec_crew_workers, settings.exec_crew_queue),
+        "tool": (settings.exec_tool_workers, settings.exec_tool_queue),
+        "avm": (settings.exec_avm_workers, settings.exec_avm_queue),
+    }
+    return ExecutionLayer(
+        pools={
+            name: WorkPool(name, workers, queue, settings.exec_queue_timeout_seconds)
+            for name, (workers, queue) in limits.items()
+        },
+        monitor=EventLoopMonitor(settings.event_loop_lag_interval_seconds),
+    )
+
+
+def _fail_dropped(store: JobStore, job_id: str, future: Future) -> None:
+    """Fail an inline job its pool dropped before it started, so it does not stay queued."""
+    if future.cancelled():
+        error = "Dropped before start: shutting down"
+    elif isinstance(future.exception(), _QueueTimeoutError):
+        error = "Dropped before start: queue timeout"
+    else:
+        return
+    try:
+        store.transition(job_id, "failed", error=error)
+    except (KeyError, InvalidTransitionError):
+        pass
+
+
+async def start_job(kind: str, params: dict[str, Any], priority: str = "interactive") -> Job:
+    """
+    Record an async job and hand it to the job workers.
+
+    With ``job_inline`` set, or when no live job worker runs jobs of the
+    type (none started, or no durable job store they could share), the job
+    runs on this process's crew pool instead rather than waiting in a
+    queue nobody serves. An inline job that waits out the queue timeout
+    fails instead.
+
+    Args:
+        kind: Job type (a key of ``JOB_HANDLERS``)
+        params: JSON-serializable handler parameters
+        priority: ``"interactive"`` or ``"batch"``
+
+    Raises:
+        ExecutionRejected: If an inline job finds the crew pool saturated
+    """
+    settings = get_settings()
+    store = get_job_store()
+    layer = get_execution_layer()
+    inline = settings.job_inline or not await layer.run("tool", store.has_worker, kind)
+
+    job = await layer.run(
+        "tool",
+        store.create,
+        kind,
+        params,
+        priority=PRIORITIES[priority],
+        # Inline jobs have no worker to pick up a retry
+        max_attempts=1 if inline else settings.job_max_attempts,
+        timeout_seconds=settings.job_timeout_seconds,
+    )
+    if inline:
+        try:
+            future = layer.submit(
+                "crew", store.run, job.id, execute_job, kind, params, partial(store.add_event, job.id)
+            )
+        except HTTPException:
+            store.delete(job.id)
+            raise
+        future.add_done_callback(partial(_fail_dropped, store, job.id))
+    return job
+
+
+async def get_job(kind: str, job_id: str) -> Job:
+    """
+    Look up an async job of a type, whichever process runs it.
+
+    Raises:
+        HTTPException: 404 if unknown, expired or of another type
+    """
+    job = await get_execution_layer().run("tool", get_job_store().get, job_id)
+    if job is None or job.kind != kind:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+async def cancel_job(kind: str, job_id: str) -> Job:
+    """
+    Cancel a queued or running async job; its job worker stops the run.
+
+    Raises:
+        HTTPException: 404 if unknown, 409 if it already finished
+    """
+    await get_job(kind, job_id)
+    try:
+        return await get_execution_layer().run("tool", get_job_store().cancel, job_id)
+    except KeyError:
+        raise HTTPException(status_code=404, detail="Job not found") from None
+    except InvalidTransitionError:
+        job = await get_job(kind, job_id)
+        raise HTTPException(status_code=409, detail=f"Job already {job.status}") from None
+
+
+@lru_cache
+def _stream_readers() -> ThreadPoolExecutor:
+    """
+    Threads for the job store reads of progress streams.
+
+    Every open stream polls the store; on the tool pool, enough watchers
+    would crowd out tool routes. Each poll is one short indexed read, so a
+    couple of threads serve all streams of the process.
+    """
+    return ThreadPoolExecutor(max_workers=_STREAM_READERS, thread_name_prefix="pricewaze-stream")
+
+
+def _poll_job(store: JobStore, job_id: str, after: int) -> tuple[Job | None, list[JobEvent]]:
+    """A job and its progress events after ``after``."""
+    # Job before events: events recorded before it finished are still sent
+    job = store.get(job_id)
+    return job, store.events(job_id, after) if job else []
+
+
+def _frame(event: str, data: dict[str, Any], ndjson: bool, event_id: int | None = None) -> str:
+    """One stream frame: a Server-Sent Event, or an NDJSON line."""
+    if ndjson:
+        return json.dumps({"event": event, "id": event_id, "data": data}, default=str) + "\n"
+    head = f"id: {event_id}\n" if event_id is not None else ""
+    return f"{head}event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+async def stream_job(job_id: str, after: int = 0, ndjson: bool = False) -> AsyncIterator[str]:
+    """
+    Stream an async job as it runs, whichever process runs it.
+
+    Emits ``status`` on every state change (including retries), ``task``
+    for each progress event after sequence number ``after`` (the SSE event
+    id, so a reconnecting client resumes with ``Last-Event-ID``), and a
+    final ``job`` with the finished job, or ``error`` if it expired.
+
+    Args:
+        job_id: Job to follow
+        after: Last progress event already seen
+        ndjson: NDJSON lines instead of Server-Sent Events
+
+    Yields:
+        Encoded frames
+    """
+    store = get_job_store()
+    loop = asyncio.get_running_loop()
+    interval = get_settings().job_poll_interval_seconds
+    status = None
+    attempts = None
+    last_frame_at = time.monotonic()
+
+    while True:
+        job, events = await loop.run_in_executor(
+            _stream_readers(), _poll_job, store, job_id, after
+        )
+        if job is None:
+            yield _frame("error", {"detail": "Job not found or expired"}, ndjson)
+            return
+        frames = [_frame("task", event.to_dict(), ndjson, event.seq) for event in events]
+        if (job.status, job.attempts) != (status, attempts):
+            status, attempts = job.status, job.attempts
+            change = _frame("status", {"status": status, "attempts": attempts}, ndjson)
+            # A final state follows the last task, a new attempt precedes its tasks
+            frames = [*frames, change] if job.terminal else [change, *frames]
+        if job.terminal:
+            frames.append(_frame("job", job.to_dict(), ndjson))
+
+        for frame in frames:
+            yield frame
+        if job.terminal:
+            return
+        if events:
+            after = events[-1].seq
+        if frames:
+            last_frame_at = time.monotonic()
+
+        if not ndjson and time.monotonic() - last_frame_at > _STREAM_KEEPALIVE_SECONDS:
+            # Comment line keeping proxies from closing an idle stream
+            yield ": keepalive\n\n"
+            last_frame_at = time.monotonic()
+        await asyncio.sleep(interval)
@@ -11,7 +11,9 @@ from fastapi.middleware.cors import CORSMiddleware
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from api.execution import get_execution_layer
 from api.routes import pricing, negotiation, contracts, analysis
+from avm import get_model_registry, get_parallel_valuator, get_valuation_cache
 from config import get_settings
 
 
@@ -22,7 +24,16 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     print(f"🚀 PriceWaze CrewAI starting on {settings.api_host}:{settings.api_port}")
     print(f"📊 Using model: {settings.deepseek_model}")
     print(f"🔗 Supabase: {settings.effective_supabase_url[:50]}...")
+    registry = get_model_registry()
+    print(f"🧮 AVM model: {registry.current_version or 'none (zone statistics fallback)'}")
+    execution = get_execution_layer()
+    execution.start()
     yield
+    execution.shutdown()
+    get_parallel_valuator().close()
+    from tools.database_tools import aclose_supabase_clients
+
+    await aclose_supabase_clients()
     print("👋 PriceWaze CrewAI shutting down")
 
 
@@ -76,10 +87,26 @@ def create_app() -> FastAPI:
     @app.get("/health", tags=["Health"])
     async def health_check():
         """Detailed health check."""
+        from crews.llm_cache import get_llm_cache
+        from jobs import get_job_store
+        from tools.database_tools import get_connection_metrics
+        from tools.fetch_cache import get_fetch_cache
+
+        cache = get_valuation_cache()
+        fetch_cache = get_fetch_cache()
+        llm_cache = get_llm_cache()
         return {
             "status": "healthy",
             "model": settings.deepseek_model,
+            "data_backend": settings.data_backend,
             "supabase_connected": bool(settings.effective_supabase_url),
+            "supabase_pool": get_connection_metrics().snapshot(),
+            "fetch_cache": fetch_cache.stats() if fetch_cache else None,
+            "llm_cache": llm_cache.stats() if llm_cache else None,
+            "avm_model": get_model_registry().status(),
+            "valuation_cache": cache.stats() if cache else None,
+            "execution": get_execution_layer().stats(),
+            "jobs": get_job_store().stats(),
             "crews_available": [
                 "pricing_analysis",
                 "negotiation_advisory",
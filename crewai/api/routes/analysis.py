@@ -1,24 +1,22 @@
 """Full property analysis API routes."""
 
-from typing import Any
+from typing import Any, Literal
 
-from fastapi import APIRouter, HTTPException, BackgroundTasks
+from fastapi import APIRouter, Header, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 
 import sys
 from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
+from api.execution import cancel_job, get_execution_layer, get_job, start_job, stream_job
 from crews import FullPropertyAnalysisCrew
 
 
 router = APIRouter()
 
 
-# Store for async results
-_analysis_store: dict[str, dict[str, Any]] = {}
-
-
 class FullAnalysisRequest(BaseModel):
     """Request schema for comprehensive property analysis."""
 
@@ -47,6 +45,9 @@ class FullAnalysisResponse(BaseModel):
     executive_summary: str
     specialist_reports: list[dict[str, Any]]
     agents_used: list[str]
+    fetch_cache: dict[str, Any] | None = None  # Database fetch cache stats of this run
+    llm_cache: dict[str, Any] | None = None  # LLM response cache stats of this run
+    token_usage: dict[str, int] | None = None  # LLM tokens used by this run
 
 
 @router.post("/full", response_model=FullAnalysisResponse)
@@ -71,16 +72,20 @@ async def run_full_analysis(request: FullAnalysisRequest) -> dict[str, Any]:
                 detail="buyer_name and seller_name required when generate_contract=True",
             )
 
-    try:
+    def run_analysis() -> dict[str, Any]:
         crew = FullPropertyAnalysisCrew(verbose=True)
-        result = crew.run(
+        return crew.run(
             property_id=request.property_id,
             buyer_budget=request.buyer_budget,
             generate_contract=request.generate_contract,
             buyer_name=request.buyer_name,
             seller_name=request.seller_name,
         )
-        return result
+
+    try:
+        return await get_execution_layer().run("crew", run_analysis)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Full analysis failed: {str(e)}")
 
@@ -88,16 +93,17 @@ async def run_full_analysis(request: FullAnalysisRequest) -> dict[str, Any]:
 @router.post("/full/async")
 async def run_full_analysis_async(
     request: FullAnalysisRequest,
-    background_tasks: BackgroundTasks,
+    priority: Literal["interactive", "batch"] = Query(
+        default="interactive", description="Batch jobs run after waiting interactive ones"
+    ),
 ) -> dict[str, str]:
     """
     Start comprehensive analysis asynchronously.
 
-    Full analysis can take several minutes. This endpoint returns
-    immediately with a job ID to check results later.
+    Full analysis can take several minutes. It runs in a job worker
+    process, not in the API; this endpoint returns immediately with a job
+    ID to check results later. DELETE on the result URL cancels the job.
     """
-    import uuid
-
     # Validate
     if request.generate_contract:
         if not request.buyer_name or not request.seller_name:
@@ -106,46 +112,13 @@ async def run_full_analysis_async(
                 detail="buyer_name and seller_name required when generate_contract=True",
             )
 
-    job_id = str(uuid.uuid4())
-    _analysis_store[job_id] = {
-        "status": "processing",
-        "property_id": request.property_id,
-        "started_at": None,
-        "result": None,
-    }
-
-    def run_analysis():
-        from datetime import datetime
-
-        _analysis_store[job_id]["started_at"] = datetime.now().isoformat()
-        try:
-            crew = FullPropertyAnalysisCrew(verbose=True)
-            result = crew.run(
-                property_id=request.property_id,
-                buyer_budget=request.buyer_budget,
-                generate_contract=request.generate_contract,
-                buyer_name=request.buyer_name,
-                seller_name=request.seller_name,
-            )
-            _analysis_store[job_id] = {
-                "status": "completed",
-                "property_id": request.property_id,
-                "completed_at": datetime.now().isoformat(),
-                "result": result,
-            }
-        except Exception as e:
-            _analysis_store[job_id] = {
-                "status": "failed",
-                "property_id": request.property_id,
-                "error": str(e),
-            }
-
-    background_tasks.add_task(run_analysis)
+    job = await start_job("full_analysis", request.model_dump(), priority=priority)
 
     return {
-        "job_id": job_id,
-        "status": "processing",
-        "check_url": f"/api/v1/analysis/full/result/{job_id}",
+        "job_id": job.id,
+        "status": job.status,
+        "check_url": f"/api/v1/analysis/full/result/{job.id}",
+        "stream_url": f"/api/v1/analysis/full/stream/{job.id}",
         "estimated_time": "2-5 minutes",
     }
 
@@ -153,12 +126,46 @@ async def run_full_analysis_async(
 @router.get("/full/result/{job_id}")
 async def get_full_analysis_result(job_id: str) -> dict[str, Any]:
     """
-    Get the result of an async full analysis.
+    Get the state and result of an async full analysis.
+
+    Served by any API worker, whichever one started the job.
+    """
+    job = await get_job("full_analysis", job_id)
+    return {"property_id": job.params.get("property_id"), **job.to_dict()}
+
+
+@router.get("/full/stream/{job_id}")
+async def stream_full_analysis(
+    job_id: str,
+    format: Literal["sse", "ndjson"] = Query(default="sse", description="Stream encoding"),
+    last_event_id: int = Header(default=0, description="Resume after this task event"),
+) -> StreamingResponse:
+    """
+    Stream the progress of an async full analysis.
+
+    Sends each specialist report as its task completes, with elapsed time
+    and token usage, instead of polling /full/result for the end of a
+    2-5 minute run. Server-Sent Events by default: ``status`` on state
+    changes, ``task`` per finished task, then ``job`` with the final
+    result. ``format=ndjson`` sends the same events as JSON lines.
     """
-    if job_id not in _analysis_store:
-        raise HTTPException(status_code=404, detail="Job not found")
+    await get_job("full_analysis", job_id)
 
-    return _analysis_store[job_id]
+    ndjson = format == "ndjson"
+    return StreamingResponse(
+        stream_job(job_id, after=last_event_id, ndjson=ndjson),
+        media_type="application/x-ndjson" if ndjson else "text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.delete("/full/result/{job_id}")
+async def cancel_full_analysis(job_id: str) -> dict[str, Any]:
+    """
+    Cancel an async full analysis that has not finished.
+    """
+    job = await cancel_job("full_analysis", job_id)
+    return {"property_id": job.params.get("property_id"), **job.to_dict()}
 
 
 @router.get("/capabilities")
@@ -9,6 +9,7 @@ import sys
 from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
+from api.execution import get_execution_layer
 from crews import ContractGenerationCrew
 from tools import GenerateContractTemplateTool, ValidateContractTermsTool
 
@@ -72,9 +73,9 @@ async def generate_contract(request: ContractGenerationRequest) -> dict[str, Any
 
     The contract is NON-BINDING and requires attorney review.
     """
-    try:
+    def run_generation() -> dict[str, Any]:
         crew = ContractGenerationCrew(verbose=True)
-        result = crew.run(
+        return crew.run(
             property_id=request.property_id,
             buyer_name=request.buyer.name,
             seller_name=request.seller.name,
@@ -84,7 +85,11 @@ async def generate_contract(request: ContractGenerationRequest) -> dict[str, Any
             closing_days=request.closing_days,
             special_conditions=request.special_conditions,
         )
-        return result
+
+    try:
+        return await get_execution_layer().run("crew", run_generation)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Contract generation failed: {str(e)}")
 
@@ -101,7 +106,9 @@ async def generate_quick_draft(request: QuickContractRequest) -> dict[str, Any]:
         from tools.contract_tools import ContractParty as ToolParty, PropertyDetails
 
         tool = GenerateContractTemplateTool()
-        result = tool._run(
+        return await get_execution_layer().run(
+            "tool",
+            tool._run,
             buyer=ToolParty(name=request.buyer_name),
             seller=ToolParty(name=request.seller_name),
             property_details=PropertyDetails(
@@ -112,7 +119,8 @@ async def generate_quick_draft(request: QuickContractRequest) -> dict[str, Any]:
             deposit_percent=request.deposit_percent,
             closing_days=request.closing_days,
         )
-        return result
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Quick draft failed: {str(e)}")
 
@@ -130,13 +138,16 @@ async def validate_contract_terms(request: ValidateTermsRequest) -> dict[str, An
     """
     try:
         tool = ValidateContractTermsTool()
-        result = tool._run(
+        return await get_execution_layer().run(
+            "tool",
+            tool._run,
             agreed_price=request.agreed_price,
             property_price=request.property_price,
             deposit_percent=request.deposit_percent,
             closing_days=request.closing_days,
         )
-        return result
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Validation failed: {str(e)}")
 
@@ -9,6 +9,7 @@ import sys
 from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
+from api.execution import get_execution_layer
 from crews import NegotiationAdvisoryCrew
 
 
@@ -51,13 +52,17 @@ async def get_buyer_advice(request: BuyerAdviceRequest) -> dict[str, Any]:
     - Counter-offer response guidelines
     - Key talking points for negotiation
     """
-    try:
+    def run_advice() -> dict[str, Any]:
         crew = NegotiationAdvisoryCrew(verbose=True)
-        result = crew.run_buyer_advice(
+        return crew.run_buyer_advice(
             property_id=request.property_id,
             buyer_budget=request.buyer_budget,
         )
-        return result
+
+    try:
+        return await get_execution_layer().run("crew", run_advice)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Buyer advice failed: {str(e)}")
 
@@ -73,14 +78,18 @@ async def get_seller_advice(request: SellerAdviceRequest) -> dict[str, Any]:
     - Confidence level in recommendation
     - Detailed reasoning
     """
-    try:
+    def run_advice() -> dict[str, Any]:
         crew = NegotiationAdvisoryCrew(verbose=True)
-        result = crew.run_seller_advice(
+        return crew.run_seller_advice(
             property_id=request.property_id,
             offer_amount=request.offer_amount,
             offer_message=request.offer_message,
         )
-        return result
+
+    try:
+        return await get_execution_layer().run("crew", run_advice)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Seller advice failed: {str(e)}")
 
@@ -97,7 +106,9 @@ async def calculate_negotiation_power(request: NegotiationPowerRequest) -> dict[
 
     try:
         tool = CalculateNegotiationPowerTool()
-        result = tool._run(
+        result = await get_execution_layer().run(
+            "tool",
+            tool._run,
             days_on_market=request.days_on_market,
             price_changes=request.price_changes,
             offer_count=request.offer_count,
@@ -108,6 +119,8 @@ async def calculate_negotiation_power(request: NegotiationPowerRequest) -> dict[
             "property_id": request.property_id,
             **result,
         }
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Power calculation failed: {str(e)}")
 
@@ -129,7 +142,7 @@ async def get_offer_suggestions(
 
     try:
         tool = FetchPropertyTool()
-        result = tool._run(property_id=property_id)
+        result = await tool._arun(property_id=property_id)
 
         if not result.get("success"):
             raise HTTPException(status_code=404, detail="Property not found")
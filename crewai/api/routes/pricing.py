@@ -1,14 +1,17 @@
 """Pricing analysis API routes."""
 
-from typing import Any
+import json
+from typing import Any, Literal
 
-from fastapi import APIRouter, HTTPException, BackgroundTasks
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 
 import sys
 from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
+from api.execution import cancel_job, get_execution_layer, get_job, start_job
 from crews import PricingAnalysisCrew
 
 
@@ -30,10 +33,29 @@ class PricingAnalysisResponse(BaseModel):
     analysis_type: str
     result: str
     tasks_output: list[dict[str, Any]]
+    fetch_cache: dict[str, Any] | None = None  # Database fetch cache stats of this run
+    llm_cache: dict[str, Any] | None = None  # LLM response cache stats of this run
 
 
-# Store for async results
-_results_store: dict[str, dict[str, Any]] = {}
+class BatchValuationRequest(BaseModel):
+    """Request schema for batch (portfolio or zone-wide) valuation."""
+
+    property_ids: list[str] | None = Field(
+        default=None,
+        max_length=5000,
+        description="UUIDs of the properties to value",
+    )
+    zone_id: str | None = Field(
+        default=None,
+        description="Zone UUID; values every property in the zone when no ids are given",
+    )
+
+
+class CacheInvalidationRequest(BaseModel):
+    """Request schema for valuation cache invalidation (e.g. from a database webhook)."""
+
+    property_id: str | None = Field(default=None, description="Property whose listing changed")
+    zone_id: str | None = Field(default=None, description="Zone whose statistics changed")
 
 
 @router.post("/analyze", response_model=PricingAnalysisResponse)
@@ -51,13 +73,18 @@ async def analyze_property_pricing(request: PricingAnalysisRequest) -> dict[str,
     - Pricing fairness score
     - Three tiered offer suggestions
     """
-    try:
+
+    def run_analysis() -> dict[str, Any]:
         crew = PricingAnalysisCrew(verbose=True)
-        result = crew.run(
+        return crew.run(
             property_id=request.property_id,
             zone_id=request.zone_id,
         )
-        return result
+
+    try:
+        return await get_execution_layer().run("crew", run_analysis)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
 
@@ -65,48 +92,48 @@ async def analyze_property_pricing(request: PricingAnalysisRequest) -> dict[str,
 @router.post("/analyze/async")
 async def analyze_property_pricing_async(
     request: PricingAnalysisRequest,
-    background_tasks: BackgroundTasks,
+    priority: Literal["interactive", "batch"] = Query(
+        default="interactive", description="Batch jobs run after waiting interactive ones"
+    ),
 ) -> dict[str, str]:
     """
     Start pricing analysis asynchronously.
 
-    Returns a job ID to check results later via /analyze/result/{job_id}.
-    Useful for long-running analyses.
+    The analysis runs in a job worker process, not in the API. Returns a job
+    ID to check results later via /analyze/result/{job_id}; DELETE on that
+    URL cancels it. Useful for long-running analyses.
     """
-    import uuid
-
-    job_id = str(uuid.uuid4())
-    _results_store[job_id] = {"status": "processing", "result": None}
-
-    def run_analysis():
-        try:
-            crew = PricingAnalysisCrew(verbose=True)
-            result = crew.run(
-                property_id=request.property_id,
-                zone_id=request.zone_id,
-            )
-            _results_store[job_id] = {"status": "completed", "result": result}
-        except Exception as e:
-            _results_store[job_id] = {"status": "failed", "error": str(e)}
-
-    background_tasks.add_task(run_analysis)
+    job = await start_job(
+        "pricing_analysis",
+        {"property_id": request.property_id, "zone_id": request.zone_id},
+        priority=priority,
+    )
 
     return {
-        "job_id": job_id,
-        "status": "processing",
-        "check_url": f"/api/v1/pricing/analyze/result/{job_id}",
+        "job_id": job.id,
+        "status": job.status,
+        "check_url": f"/api/v1/pricing/analyze/result/{job.id}",
     }
 
 
 @router.get("/analyze/result/{job_id}")
 async def get_analysis_result(job_id: str) -> dict[str, Any]:
     """
-    Get the result of an async pricing analysis.
+    Get the state and result of an async pricing analysis.
+
+    Served by any API worker, whichever one started the job.
     """
-    if job_id not in _results_store:
-        raise HTTPException(status_code=404, detail="Job not found")
+    job = await get_job("pricing_analysis", job_id)
+    return job.to_dict()
+
 
-    return _results_store[job_id]
+@router.delete("/analyze/result/{job_id}")
+async def cancel_analysis(job_id: str) -> dict[str, Any]:
+    """
+    Cancel an async pricing analysis that has not finished.
+    """
+    job = await cancel_job("pricing_analysis", job_id)
+    return job.to_dict()
 
 
 @router.get("/quick/{property_id}")
@@ -122,7 +149,7 @@ async def quick_pricing_check(property_id: str) -> dict[str, Any]:
     try:
         # Fetch property
         property_tool = FetchPropertyTool()
-        property_result = property_tool._run(property_id=property_id)
+        property_result = await property_tool._arun(property_id=property_id)
 
         if not property_result.get("success"):
             raise HTTPException(status_code=404, detail="Property not found")
@@ -131,7 +158,9 @@ async def quick_pricing_check(property_id: str) -> dict[str, Any]:
 
         # Fetch zone properties for comparison
         zone_tool = FetchZonePropertiesTool()
-        zone_result = zone_tool._run(zone_id=prop.get("zone_id"), status="active", limit=30)
+        zone_result = await zone_tool._arun(
+            zone_id=prop.get("zone_id"), status="active", limit=30
+        )
 
         comparables = zone_result.get("properties", [])
 
@@ -144,7 +173,9 @@ async def quick_pricing_check(property_id: str) -> dict[str, Any]:
 
         # Compare prices
         compare_tool = ComparePropertyPricesTool()
-        comparison = compare_tool._run(
+        comparison = await get_execution_layer().run(
+            "tool",
+            compare_tool._run,
             target_price=float(prop["price"]),
             target_area=float(prop["area_m2"]),
             comparable_prices=[float(c["price"]) for c in comparables if c["price"]],
@@ -163,3 +194,101 @@ async def quick_pricing_check(property_id: str) -> dict[str, Any]:
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Quick check failed: {str(e)}")
+
+
+@router.post("/valuate/batch")
+async def valuate_batch(request: BatchValuationRequest) -> StreamingResponse:
+    """
+    Value many properties in one request.
+
+    Accepts a portfolio of property ids or a zone id. Candidates are fetched
+    once for all subject zones, and the spatial index and AVM model are
+    shared across subjects, which are spread over the parallel valuation
+    worker pool. Results stream back as NDJSON, one
+    ValuationResult per line, in the order the subjects were fetched.
+    """
+    from avm import CandidateFrame, get_parallel_valuator
+    from tools.database_tools import fetch_valuation_batch
+
+    if not request.property_ids and not request.zone_id:
+        raise HTTPException(status_code=400, detail="Provide property_ids or zone_id")
+
+    execution = get_execution_layer()
+    try:
+        data = await execution.run(
+            "tool",
+            fetch_valuation_batch,
+            property_ids=request.property_ids,
+            zone_id=request.zone_id,
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Batch valuation failed: {str(e)}")
+
+    if not data["subjects"]:
+        raise HTTPException(status_code=404, detail="No properties found")
+
+    valuator = get_parallel_valuator()
+
+    def stream_results():
+        # Normalize database rows (DECIMAL strings, year_built -> age) via the frame
+        subject_frame = CandidateFrame.from_supabase_rows(data["subjects"])
+        subjects = [subject_frame.record(row) for row in range(len(subject_frame))]
+        candidates = CandidateFrame.from_supabase_rows(data["candidates"])
+
+        zone_stats_map = candidates.zone_statistics()
+        for zone_id, stats in zone_stats_map.items():
+            stats["zone_name"] = data["zone_names"].get(zone_id, "")
+
+        for result in valuator.valuate_many(subjects, candidates, zone_stats_map):
+            yield json.dumps(result.to_dict(), default=str) + "\n"
+
+    # Frame building and valuation run on the AVM pool, off the event loop
+    return StreamingResponse(
+        execution.iterate("avm", stream_results()),
+        media_type="application/x-ndjson",
+    )
+
+
+@router.post("/cache/invalidate")
+async def invalidate_valuation_cache(request: CacheInvalidationRequest) -> dict[str, Any]:
+    """
+    Drop cached valuations and tool fetches after a listing or zone changed.
+
+    Intended as the target of a database webhook on listing price updates
+    and zone statistics recomputation.
+    """
+    from avm import get_valuation_cache
+    from tools.fetch_cache import get_fetch_cache
+
+    if not request.property_id and not request.zone_id:
+        raise HTTPException(status_code=400, detail="Provide property_id or zone_id")
+
+    fetch_cache = get_fetch_cache()
+    fetches_invalidated = 0
+    if fetch_cache is not None:
+        if request.property_id:
+            fetches_invalidated += fetch_cache.invalidate_property(request.property_id)
+        if request.zone_id:
+            fetches_invalidated += fetch_cache.invalidate_zone(request.zone_id)
+
+    cache = get_valuation_cache()
+    if cache is None:
+        return {
+            "invalidated": 0,
+            "cache_enabled": False,
+            "fetches_invalidated": fetches_invalidated,
+        }
+
+    invalidated = 0
+    if request.property_id:
+        invalidated += cache.invalidate_property(request.property_id)
+    if request.zone_id:
+        invalidated += cache.invalidate_zone(request.zone_id)
+
+    return {
+        "invalidated": invalidated,
+        "cache_enabled": True,
+        "fetches_invalidated": fetches_invalidated,
+    }
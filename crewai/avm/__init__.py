@@ -1,12 +1,31 @@
 """AVM (Automated Valuation Model) Module - OpenAVMKit-style property valuation."""
 
+from .cache import ValuationCache, get_valuation_cache
 from .comparables import ComparablesFinder
+from .frame import CandidateFrame
+from .incremental import IncrementalRevaluator, ListingEvent
 from .model import AVMModel
+from .parallel import ParallelValuator, get_parallel_valuator
+from .registry import ModelRegistry, get_model_registry
+from .streaming import ValuationRecord, iter_valuations, write_ndjson, write_parquet
 from .valuation import PropertyValuator, ValuationResult
 
 __all__ = [
     "AVMModel",
+    "CandidateFrame",
     "ComparablesFinder",
+    "IncrementalRevaluator",
+    "ListingEvent",
+    "ModelRegistry",
+    "get_model_registry",
+    "ParallelValuator",
+    "get_parallel_valuator",
     "PropertyValuator",
+    "ValuationCache",
+    "get_valuation_cache",
     "ValuationResult",
+    "ValuationRecord",
+    "iter_valuations",
+    "write_ndjson",
+    "write_parquet",
 ]
@@ -0,0 +1,191 @@
+"""Model Artifacts - Versioned, memory-mappable AVM model storage.
+
+An artifact is a directory holding a small ``manifest.json`` plus one raw
+``.npy`` file per model array:
+
+    avm-20260115T020000/
+        manifest.json
+        model_threshold.npy
+        model_children_left.npy
+        ...
+
+Arrays are opened with ``np.load(mmap_mode="r")``, so every worker process
+that loads the same artifact shares one page-cached copy instead of
+deserializing a private one. The manifest records the format and model
+version, feature list, training data hash and metrics, which is what a
+model registry needs to pick and hot-reload artifacts.
+"""
+
+import json
+import os
+import shutil
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+ARTIFACT_FORMAT = "pricewaze-avm"
+ARTIFACT_FORMAT_VERSION = 1
+MANIFEST_FILE = "manifest.json"
+
+
+@dataclass
+class ModelArtifact:
+    """A loaded model artifact: manifest fields plus (memory-mapped) arrays."""
+
+    path: Path
+    version: str
+    created_at: str
+    feature_names: list[str]
+    training_data_hash: str
+    metrics: dict[str, float]
+    arrays: dict[str, np.ndarray]
+    extra: dict[str, Any] = field(default_factory=dict)
+
+
+def new_version() -> str:
+    """Generate a sortable artifact version string from the current UTC time."""
+    return datetime.now(UTC).strftime("%Y%m%dT%H%M%S")
+
+
+def is_artifact(path: Path | str) -> bool:
+    """Check whether a path is an artifact directory."""
+    return (Path(path) / MANIFEST_FILE).is_file()
+
+
+def write_artifact(
+    path: Path | str,
+    arrays: dict[str, np.ndarray],
+    feature_names: list[str],
+    version: str | None = None,
+    training_data_hash: str = "",
+    metrics: dict[str, float] | None = None,
+    extra: dict[str, Any] | None = None,
+) -> Path:
+    """
+    Write a model artifact directory.
+
+    The artifact is assembled in a temporary sibling directory and renamed
+    into place, so readers never observe a partially written artifact.
+
+    Args:
+        path: Target artifact directory (must not already exist)
+        arrays: Named model arrays, each saved as ``<name>.npy``
+        feature_names: Ordered model feature names
+        version: Artifact version (defaults to a UTC timestamp)
+        training_data_hash: Hash of the training features and targets
+        metrics: Model quality metrics
+        extra: Additional manifest fields
+
+    Returns:
+        Path of the written artifact
+    """
+    path = Path(path)
+    if path.exists():
+        raise FileExistsError(f"Artifact already exists: {path}")
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    staging = path.with_name(f".{path.name}.tmp-{os.getpid()}")
+    if staging.exists():
+        shutil.rmtree(staging)
+    staging.mkdir()
+
+    try:
+        array_entries = {}
+        for name, array in arrays.items():
+            array = np.ascontiguousarray(array)
+            file_name = f"{name}.npy"
+            np.save(staging / file_name, array, allow_pickle=False)
+            array_entries[name] = {
+                "file": file_name,
+                "dtype": array.dtype.str,
+                "shape": list(array.shape),
+            }
+
+        manifest = {
+            "format": ARTIFACT_FORMAT,
+            "format_version": ARTIFACT_FORMAT_VERSION,
+            "version": version or new_version(),
+            "created_at": datetime.now(UTC).isoformat(),
+            "feature_names": list(feature_names),
+            "training_data_hash": training_data_hash,
+            "metrics": metrics or {},
+            "arrays": array_entries,
+            **(extra or {}),
+        }
+        # Manifest is written last; its presence marks the artifact complete
+        with open(staging / MANIFEST_FILE, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+
+        os.rename(staging, path)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+
+    return path
+
+
+def read_manifest(path: Path | str) -> dict[str, Any]:
+    """Read and validate an artifact manifest without loading any arrays."""
+    path = Path(path)
+    with open(path / MANIFEST_FILE, encoding="utf-8") as f:
+        manifest = json.load(f)
+
+    if manifest.get("format") != ARTIFACT_FORMAT:
+        raise ValueError(f"Not a {ARTIFACT_FORMAT} artifact: {path}")
+    if manifest.get("format_version", 0) > ARTIFACT_FORMAT_VERSION:
+        raise ValueError(
+            f"Artifact format version {manifest['format_version']} is newer than "
+            f"supported version {ARTIFACT_FORMAT_VERSION}: {path}"
+        )
+
+    return manifest
+
+
+def read_artifact(path: Path | str, mmap: bool = True) -> ModelArtifact:
+    """
+    Load a model artifact.
+
+    Args:
+        path: Artifact directory
+        mmap: Memory-map the arrays read-only instead of reading them into memory
+
+    Returns:
+        ModelArtifact with manifest fields and arrays
+    """
+    path = Path(path)
+    manifest = read_manifest(path)
+
+    arrays = {}
+    for name, entry in manifest["arrays"].items():
+        array = np.load(
+            path / entry["file"],
+            mmap_mode="r" if mmap else None,
+            allow_pickle=False,
+        )
+        if array.dtype.str != entry["dtype"] or list(array.shape) != entry["shape"]:
+            raise ValueError(f"Array {name!r} does not match manifest in {path}")
+        arrays[name] = array
+
+    known = {
+        "format",
+        "format_version",
+        "version",
+        "created_at",
+        "feature_names",
+        "training_data_hash",
+        "metrics",
+        "arrays",
+    }
+    return ModelArtifact(
+        path=path,
+        version=manifest["version"],
+        created_at=manifest["created_at"],
+        feature_names=manifest["feature_names"],
+        training_data_hash=manifest["training_data_hash"],
+        metrics=manifest["metrics"],
+        arrays=arrays,
+        extra={k: v for k, v in manifest.items() if k not in known},
+    )
@@ -0,0 +1,387 @@
+"""Valuation Cache - Content-addressed cache of ValuationResults.
+
+Entries are keyed by a hash of everything a valuation depends on: the
+subject's valuation fields, the zone statistics, the candidate-set version
+and the model version. A changed input therefore simply misses; explicit
+invalidation by property or zone covers callers that want stale entries
+gone immediately (e.g. a database webhook on a price change).
+
+The in-process tier is an LRU with TTL. An optional SQLite file adds a
+tier shared by every process that opens it (API workers, batch workers),
+including invalidations.
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from config import get_settings
+
+from .frame import CandidateFrame
+
+if TYPE_CHECKING:
+    from .valuation import ValuationResult
+
+# Subject fields that influence a valuation
+SUBJECT_KEY_FIELDS = (
+    "id",
+    "zone_id",
+    "price",
+    "area_m2",
+    "bedrooms",
+    "bathrooms",
+    "parking_spaces",
+    "floor",
+    "age",
+    "age_years",
+    "condition",
+    "property_type",
+    "latitude",
+    "longitude",
+    "distance_to_center_km",
+)
+
+# Candidate fields that influence comparables
+CANDIDATE_KEY_FIELDS = (
+    "id",
+    "latitude",
+    "longitude",
+    "price",
+    "price_per_m2",
+    "area_m2",
+    "bedrooms",
+    "bathrooms",
+    "property_type",
+    "condition",
+    "age",
+)
+
+
+def _digest(payload: Any) -> str:
+    """Stable short hash of a JSON-serializable payload."""
+    encoded = json.dumps(payload, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+def candidate_set_version(candidates: list[dict[str, Any]] | CandidateFrame) -> str:
+    """
+    Version of a candidate set: changes whenever any candidate that could
+    affect comparables changes.
+
+    Args:
+        candidates: Candidate dictionaries or a CandidateFrame
+
+    Returns:
+        Short content hash
+    """
+    if isinstance(candidates, CandidateFrame):
+        return candidates.fingerprint()
+    return _digest(
+        [[cand.get(name) for name in CANDIDATE_KEY_FIELDS] for cand in candidates]
+    )[:16]
+
+
+def valuation_key(
+    subject: dict[str, Any],
+    zone_stats: dict[str, Any],
+    candidate_version: str,
+    model_version: str | None,
+) -> str:
+    """
+    Content address of a valuation.
+
+    Args:
+        subject: Subject property data
+        zone_stats: Zone statistics used for the valuation
+        candidate_version: Version of the candidate set (``candidate_set_version``)
+        model_version: Version of the model serving the valuation
+
+    Returns:
+        Hex digest key
+    """
+    return _digest(
+        {
+            "subject": {name: subject.get(name) for name in SUBJECT_KEY_FIELDS},
+            "zone_stats": zone_stats,
+            "candidates": candidate_version,
+            "model": model_version,
+        }
+    )
+
+
+@dataclass
+class _Entry:
+    """A cached valuation and the metadata needed for eviction and invalidation."""
+
+    result: "ValuationResult"
+    property_id: str
+    zone_id: str
+    created_at: float
+    expires_at: float
+
+
+class ValuationCache:
+    """
+    Two-tier valuation cache: in-process LRU with TTL, optional shared SQLite.
+
+    Thread-safe. Hit, miss, eviction and invalidation counters are exposed
+    through ``stats``.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 4096,
+        ttl_seconds: float = 900.0,
+        sqlite_path: Path | str | None = None,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum entries in the in-process tier
+            ttl_seconds: Time to live of an entry in both tiers
+            sqlite_path: Optional SQLite file shared between processes
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.sqlite_path = Path(sqlite_path) if sqlite_path else None
+
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._lock = threading.Lock()
+        self._db: sqlite3.Connection | None = None
+        self._counters = {
+            "hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "evictions": 0,
+            "expirations": 0,
+            "invalidations": 0,
+        }
+
+    def _connection(self) -> sqlite3.Connection | None:
+        """Open the shared tier lazily (after any fork). Call with the lock held."""
+        if self.sqlite_path is None:
+            return None
+        if self._db is None:
+            self.sqlite_path.parent.mkdir(parents=True, exist_ok=True)
+            db = sqlite3.connect(self.sqlite_path, timeout=5.0, check_same_thread=False)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            db.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS valuation_cache (
+                    key TEXT PRIMARY KEY,
+                    property_id TEXT,
+                    zone_id TEXT,
+                    created_at REAL NOT NULL,
+                    expires_at REAL NOT NULL,
+                    result TEXT NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_valuation_cache_property
+                    ON valuation_cache(property_id);
+                CREATE INDEX IF NOT EXISTS idx_valuation_cache_zone
+                    ON valuation_cache(zone_id);
+                CREATE TABLE IF NOT EXISTS valuation_cache_invalidations (
+                    scope TEXT NOT NULL,
+                    scope_id TEXT NOT NULL,
+                    invalidated_at REAL NOT NULL,
+                    PRIMARY KEY (scope, scope_id)
+                );
+                """
+            )
+            self._db = db
+        return self._db
+
+    def _invalidated_since(self, db: sqlite3.Connection, entry: _Entry) -> bool:
+        """Whether another process invalidated the entry's property or zone after it was cached."""
+        row = db.execute(
+            "SELECT MAX(invalidated_at) FROM valuation_cache_invalidations "
+            "WHERE (scope = 'property' AND scope_id = ?) OR (scope = 'zone' AND scope_id = ?)",
+            (entry.property_id, entry.zone_id),
+        ).fetchone()
+        return row[0] is not None and row[0] >= entry.created_at
+
+    def get(self, key: str) -> "ValuationResult | None":
+        """
+        Look up a valuation.
+
+        Args:
+            key: Key from ``valuation_key``
+
+        Returns:
+            Cached ValuationResult, or None on a miss
+        """
+        now = time.time()
+        with self._lock:
+            db = self._connection()
+
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry.expires_at <= now:
+                    del self._entries[key]
+                    self._counters["expirations"] += 1
+                elif db is not None and self._invalidated_since(db, entry):
+                    del self._entries[key]
+                else:
+                    self._entries.move_to_end(key)
+                    self._counters["hits"] += 1
+                    return entry.result
+
+            if db is not None:
+                row = db.execute(
+                    "SELECT property_id, zone_id, created_at, expires_at, result "
+                    "FROM valuation_cache WHERE key = ? AND expires_at > ?",
+                    (key, now),
+                ).fetchone()
+                if row is not None:
+                    from .valuation import ValuationResult
+
+                    entry = _Entry(
+                        result=ValuationResult.from_dict(json.loads(row[4])),
+                        property_id=row[0],
+                        zone_id=row[1],
+                        created_at=row[2],
+                        expires_at=row[3],
+                    )
+                    self._remember(key, entry)
+                    self._counters["disk_hits"] += 1
+                    return entry.result
+
+            self._counters["misses"] += 1
+            return None
+
+    def put(self, key: str, result: "ValuationResult") -> None:
+        """
+        Store a valuation in every tier.
+
+        Args:
+            key: Key from ``valuation_key``
+            result: Valuation to cache
+        """
+        now = time.time()
+        entry = _Entry(
+            result=result,
+            property_id=str(result.property_id),
+            zone_id=str(result.zone_id),
+            created_at=now,
+            expires_at=now + self.ttl_seconds,
+        )
+        with self._lock:
+            self._remember(key, entry)
+
+            db = self._connection()
+            if db is not None:
+                with db:
+                    db.execute(
+                        "INSERT OR REPLACE INTO valuation_cache VALUES (?, ?, ?, ?, ?, ?)",
+                        (
+                            key,
+                            entry.property_id,
+                            entry.zone_id,
+                            entry.created_at,
+                            entry.expires_at,
+                            json.dumps(result.to_dict(), default=str),
+                        ),
+                    )
+
+    def _remember(self, key: str, entry: _Entry) -> None:
+        """Insert into the in-process LRU, evicting the oldest entries. Call with the lock held."""
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._counters["evictions"] += 1
+
+    def _invalidate(self, scope: str, scope_id: str) -> int:
+        """Drop every entry of a property or zone from both tiers."""
+        attribute = "property_id" if scope == "property" else "zone_id"
+        with self._lock:
+            keys = [
+                key for key, entry in self._entries.items()
+                if getattr(entry, attribute) == scope_id
+            ]
+            for key in keys:
+                del self._entries[key]
+            removed = len(keys)
+
+            db = self._connection()
+            if db is not None:
+                with db:
+                    cursor = db.execute(
+                        f"DELETE FROM valuation_cache WHERE {attribute} = ?", (scope_id,)
+                    )
+                    removed = max(removed, cursor.rowcount)
+                    # Recorded so other processes drop their in-memory copies too
+                    db.execute(
+                        "INSERT OR REPLACE INTO valuation_cache_invalidations VALUES (?, ?, ?)",
+                        (scope, scope_id, time.time()),
+                    )
+
+            self._counters["invalidations"] += removed
+            return removed
+
+    def invalidate_property(self, property_id: str) -> int:
+        """
+        Drop cached valuations of a property, e.g. after its listing changed.
+
+        Valuations of other properties that used it as a comparable miss on
+        their own once the candidate-set version changes.
+
+        Returns:
+            Number of entries removed
+        """
+        return self._invalidate("property", str(property_id))
+
+    def invalidate_zone(self, zone_id: str) -> int:
+        """
+        Drop cached valuations in a zone, e.g. after its statistics were recomputed.
+
+        Returns:
+            Number of entries removed
+        """
+        return self._invalidate("zone", str(zone_id))
+
+    def clear(self) -> None:
+        """Drop every entry from both tiers."""
+        with self._lock:
+            self._entries.clear()
+            db = self._connection()
+            if db is not None:
+                with db:
+                    db.execute("DELETE FROM valuation_cache")
+
+    def stats(self) -> dict[str, Any]:
+        """Hit/miss counters and tier sizes for health checks."""
+        with self._lock:
+            lookups = (
+                self._counters["hits"] + self._counters["disk_hits"] + self._counters["misses"]
+            )
+            hits = self._counters["hits"] + self._counters["disk_hits"]
+            return {
+                **self._counters,
+                "hit_rate": round(hits / lookups, 3) if lookups else 0.0,
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "shared_tier": str(self.sqlite_path) if self.sqlite_path else None,
+            }
+
+
+@lru_cache
+def get_valuation_cache() -> ValuationCache | None:
+    """Get the process-wide valuation cache (None when disabled in settings)."""
+    settings = get_settings()
+    if settings.avm_cache_max_entries <= 0:
+        return None
+    return ValuationCache(
+        max_entries=settings.avm_cache_max_entries,
+        ttl_seconds=settings.avm_cache_ttl_seconds,
+        sqlite_path=settings.avm_cache_path or None,
+    )
@@ -1,13 +1,68 @@
 """Comparable Property Search - Spatial + Feature Similarity."""
 
 import math
-from dataclasses import dataclass, field
+from dataclasses import dataclass, fields
 from typing import Any
 
 import numpy as np
 
+from .frame import CandidateFrame
+from .kernels import (
+    AdjustmentArrays,
+    feature_similarity,
+    haversine_km,
+    overall_similarity,
+    price_adjustments,
+    top_k,
+)
+from .spatial import SpatialIndex
+
+# Adjustment components, in the order ``calculate_adjustments`` applies them
+ADJUSTMENT_NAMES = ("bedrooms", "bathrooms", "area", "condition")
+
+
+@dataclass(frozen=True, slots=True)
+class Adjustments:
+    """Price adjustments of one comparable (None where an adjustment does not apply)."""
+
+    bedrooms: float | None = None
+    bathrooms: float | None = None
+    area: float | None = None
+    condition: float | None = None
+
+    def as_dict(self) -> dict[str, float]:
+        """Applied adjustments, shaped like ``calculate_adjustments``."""
+        return {
+            name: value
+            for name in ADJUSTMENT_NAMES
+            if (value := getattr(self, name)) is not None
+        }
+
+    @classmethod
+    def from_dict(cls, adjustments: dict[str, float]) -> "Adjustments":
+        """Build from an adjustments dict."""
+        return cls(**adjustments) if adjustments else NO_ADJUSTMENTS
+
+    @classmethod
+    def from_arrays(cls, arrays: AdjustmentArrays, i: int) -> "Adjustments":
+        """Adjustments of one candidate from the vectorized kernel output."""
+        values = [float(getattr(arrays, name)[i]) for name in ADJUSTMENT_NAMES]
+        bedrooms, bathrooms, area, condition = (
+            None if math.isnan(value) else value for value in values
+        )
+        return cls(
+            bedrooms=bedrooms,
+            bathrooms=bathrooms,
+            # The scalar version reports the area adjustment rounded
+            area=round(area, 4) if area is not None else None,
+            condition=condition,
+        )
+
+
+NO_ADJUSTMENTS = Adjustments()
 
-@dataclass
+
+@dataclass(frozen=True, slots=True)
 class ComparableProperty:
     """A comparable property with similarity scores."""
 
@@ -22,9 +77,23 @@ class ComparableProperty:
     distance_km: float
     feature_similarity: float
     overall_similarity: float
-    adjustments: dict[str, float] = field(default_factory=dict)
+    adjustments: Adjustments = NO_ADJUSTMENTS
     adjusted_price_per_m2: float = 0.0
 
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to a JSON-serializable dictionary."""
+        data = {name: getattr(self, name) for name in COMPARABLE_FIELDS}
+        data["adjustments"] = self.adjustments.as_dict()
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "ComparableProperty":
+        """Rebuild a comparable from ``to_dict`` output."""
+        return cls(**{**data, "adjustments": Adjustments.from_dict(data.get("adjustments", {}))})
+
+
+COMPARABLE_FIELDS = tuple(f.name for f in fields(ComparableProperty))
+
 
 class ComparablesFinder:
     """
@@ -55,6 +124,9 @@ class ComparablesFinder:
         "condition_grade": 0.05,  # 5% per condition grade
     }
 
+    # Radius expansion stops once the search radius exceeds this
+    MAX_SEARCH_RADIUS_KM = 10
+
     def __init__(
         self,
         max_distance_km: float = 2.0,
@@ -218,91 +290,269 @@ class ComparablesFinder:
         adjusted_price = comp_price_per_m2 * total_adjustment
         return adjustments, adjusted_price
 
+    @staticmethod
+    def build_index(
+        candidates: list[dict[str, Any]] | CandidateFrame,
+        cell_size_km: float = 1.0,
+    ) -> SpatialIndex:
+        """
+        Build a reusable spatial index over candidate properties.
+
+        Build it once per candidate set and pass it to ``find_comparables``
+        for every subject; new listings can be added with ``index.insert``.
+
+        Args:
+            candidates: List of candidate properties, or a CandidateFrame
+            cell_size_km: Grid cell size of the index
+
+        Returns:
+            SpatialIndex keyed by candidate id, with the candidate (or its
+            frame row number) as payload
+        """
+        if isinstance(candidates, CandidateFrame):
+            return SpatialIndex.from_points(
+                (
+                    (item_id if item_id is not None else row, lat, lon, row)
+                    for row, (item_id, lat, lon) in enumerate(
+                        zip(
+                            candidates.ids,
+                            candidates.latitude.tolist(),
+                            candidates.longitude.tolist(),
+                        )
+                    )
+                ),
+                cell_size_km=cell_size_km,
+            )
+
+        return SpatialIndex.from_points(
+            (
+                (cand.get("id", row), cand.get("latitude", 0), cand.get("longitude", 0), cand)
+                for row, cand in enumerate(candidates)
+            ),
+            cell_size_km=cell_size_km,
+        )
+
     def find_comparables(
         self,
         subject: dict[str, Any],
-        candidates: list[dict[str, Any]],
+        candidates: list[dict[str, Any]] | CandidateFrame,
         expand_radius: bool = True,
+        index: SpatialIndex | None = None,
     ) -> list[ComparableProperty]:
         """
         Find comparable properties for the subject property.
 
         Args:
             subject: Subject property with features and location
-            candidates: List of candidate properties from database
+            candidates: List of candidate properties from database, or a
+                CandidateFrame to score all candidates with vectorized kernels
             expand_radius: Whether to expand search radius if not enough found
+            index: Spatial index from ``build_index``; when given, candidates
+                are taken from the index instead of scanning ``candidates``
 
         Returns:
             List of comparable properties sorted by overall similarity
         """
+        if isinstance(candidates, CandidateFrame):
+            return self._find_comparables_frame(subject, candidates, expand_radius, index)
+
         subj_lat = subject.get("latitude", 0)
         subj_lon = subject.get("longitude", 0)
 
-        comparables: list[ComparableProperty] = []
-        search_radius = self.max_distance_km
+        if index is not None:
+            candidates, _ = index.query_radius(
+                subj_lat, subj_lon, self.reach_km(expand_radius)
+            )
+
+        # Distances are computed once; the radius expansion only needs counts
+        subject_id = subject.get("id")
+        in_play = []
+        distances = []
+        for cand in candidates:
+            # Skip if same property
+            if cand.get("id") == subject_id:
+                continue
+
+            in_play.append(cand)
+            distances.append(
+                self.haversine_distance(
+                    subj_lat, subj_lon, cand.get("latitude", 0), cand.get("longitude", 0)
+                )
+            )
+
+        search_radius = self.select_search_radius(np.sort(distances), expand_radius)
+        if search_radius is None:
+            return []
 
-        while len(comparables) < self.min_comparables and search_radius <= 10:
-            comparables = []
+        # Similarity and adjustments only for candidates inside the final radius
+        comparables = [
+            self._score_candidate(subject, cand, distance, search_radius)
+            for cand, distance in zip(in_play, distances)
+            if distance <= search_radius
+        ]
 
-            for cand in candidates:
-                # Skip if same property
-                if cand.get("id") == subject.get("id"):
-                    continue
+        # Sort by overall similarity (descending)
+        comparables.sort(key=lambda x: x.overall_similarity, reverse=True)
 
-                cand_lat = cand.get("latitude", 0)
-                cand_lon = cand.get("longitude", 0)
+        return comparables[: self.max_comparables]
+
+    def reach_km(self, expand_radius: bool = True) -> float:
+        """
+        Widest radius the search can reach, used to prefilter via the index.
 
-                # Calculate distance
-                distance = self.haversine_distance(
-                    subj_lat, subj_lon, cand_lat, cand_lon
+        Candidates beyond it never affect a subject's comparables.
+        """
+        if expand_radius:
+            return max(self.MAX_SEARCH_RADIUS_KM, self.max_distance_km)
+        return self.max_distance_km
+
+    def _find_comparables_frame(
+        self,
+        subject: dict[str, Any],
+        frame: CandidateFrame,
+        expand_radius: bool,
+        index: SpatialIndex | None,
+    ) -> list[ComparableProperty]:
+        """Vectorized ``find_comparables`` over a columnar candidate frame."""
+        subj_lat = subject.get("latitude", 0)
+        subj_lon = subject.get("longitude", 0)
+        subject_id = subject.get("id")
+
+        if index is not None:
+            rows_found, _ = index.query_radius(
+                subj_lat, subj_lon, self.reach_km(expand_radius)
+            )
+            rows = np.sort(np.asarray(rows_found, dtype=np.int64))
+        else:
+            rows = np.arange(len(frame))
+
+        # Skip if same property
+        ids = frame.ids
+        rows = rows[
+            np.fromiter(
+                (ids[row] != subject_id for row in rows.tolist()), dtype=bool, count=len(rows)
+            )
+        ]
+
+        distances = haversine_km(
+            subj_lat, subj_lon, frame.latitude[rows], frame.longitude[rows]
+        )
+        search_radius = self.select_search_radius(np.sort(distances), expand_radius)
+        if search_radius is None:
+            return []
+
+        inside = distances <= search_radius
+        rows, distances = rows[inside], distances[inside]
+
+        feature_sim = feature_similarity(subject, frame, self.weights, rows)
+        overall_sim = overall_similarity(distances, feature_sim, search_radius)
+        adjustments = price_adjustments(subject, frame, self.ADJUSTMENT_FACTORS, rows)
+
+        # Rank on the rounded score, as the scalar path sorts rounded values
+        chosen = top_k(np.round(overall_sim, 3), self.max_comparables)
+
+        def value(column: np.ndarray, row: int) -> float:
+            return float(np.nan_to_num(column[row], nan=0.0))
+
+        comparables = []
+        for i in chosen.tolist():
+            row = int(rows[i])
+            item_id = ids[row]
+            comparables.append(
+                ComparableProperty(
+                    property_id=item_id if item_id is not None else "",
+                    price=value(frame.price, row),
+                    price_per_m2=value(frame.price_per_m2, row),
+                    area_m2=value(frame.area_m2, row),
+                    bedrooms=int(value(frame.bedrooms, row)),
+                    bathrooms=int(value(frame.bathrooms, row)),
+                    latitude=value(frame.latitude, row),
+                    longitude=value(frame.longitude, row),
+                    distance_km=round(float(distances[i]), 2),
+                    feature_similarity=round(float(feature_sim[i]), 3),
+                    overall_similarity=round(float(overall_sim[i]), 3),
+                    adjustments=Adjustments.from_arrays(adjustments, i),
+                    adjusted_price_per_m2=round(
+                        float(adjustments.adjusted_price_per_m2[i]), 2
+                    ),
                 )
+            )
 
-                if distance > search_radius:
-                    continue
+        return comparables
 
-                # Calculate feature similarity
-                feature_sim = self.calculate_feature_similarity(subject, cand)
+    def select_search_radius(
+        self,
+        sorted_distances: np.ndarray,
+        expand_radius: bool = True,
+    ) -> float | None:
+        """
+        Pick the smallest search radius that yields enough comparables.
 
-                # Calculate overall similarity (weighted combination)
-                # Distance weight: closer is better (inverse distance)
-                distance_sim = max(0, 1 - (distance / search_radius))
+        Starts at ``max_distance_km`` and grows by 1km up to
+        ``MAX_SEARCH_RADIUS_KM``, counting candidates within each radius from
+        the sorted distances instead of rescanning them.
 
-                # Overall: 40% distance, 60% features
-                overall_sim = 0.4 * distance_sim + 0.6 * feature_sim
+        Args:
+            sorted_distances: Candidate distances in ascending order
+            expand_radius: Whether to expand search radius if not enough found
 
-                # Calculate adjustments
-                comp_price_per_m2 = cand.get("price_per_m2", 0)
-                adjustments, adjusted_price = self.calculate_adjustments(
-                    subject, cand, comp_price_per_m2
-                )
+        Returns:
+            Final search radius, or None if no radius is searched
+        """
+        selected = None
+        found = 0
+        search_radius = self.max_distance_km
 
-                comparables.append(
-                    ComparableProperty(
-                        property_id=cand.get("id", ""),
-                        price=cand.get("price", 0),
-                        price_per_m2=comp_price_per_m2,
-                        area_m2=cand.get("area_m2", 0),
-                        bedrooms=cand.get("bedrooms", 0),
-                        bathrooms=cand.get("bathrooms", 0),
-                        latitude=cand_lat,
-                        longitude=cand_lon,
-                        distance_km=round(distance, 2),
-                        feature_similarity=round(feature_sim, 3),
-                        overall_similarity=round(overall_sim, 3),
-                        adjustments=adjustments,
-                        adjusted_price_per_m2=round(adjusted_price, 2),
-                    )
-                )
+        while found < self.min_comparables and search_radius <= self.MAX_SEARCH_RADIUS_KM:
+            selected = search_radius
+            found = int(np.searchsorted(sorted_distances, search_radius, side="right"))
 
             if not expand_radius:
                 break
 
             search_radius += 1  # Expand by 1km if needed
 
-        # Sort by overall similarity (descending)
-        comparables.sort(key=lambda x: x.overall_similarity, reverse=True)
+        return selected
 
-        return comparables[: self.max_comparables]
+    def _score_candidate(
+        self,
+        subject: dict[str, Any],
+        cand: dict[str, Any],
+        distance: float,
+        search_radius: float,
+    ) -> ComparableProperty:
+        """Score one candidate inside the final search radius."""
+        # Calculate feature similarity
+        feature_sim = self.calculate_feature_similarity(subject, cand)
+
+        # Calculate overall similarity (weighted combination)
+        # Distance weight: closer is better (inverse distance)
+        distance_sim = max(0, 1 - (distance / search_radius))
+
+        # Overall: 40% distance, 60% features
+        overall_sim = 0.4 * distance_sim + 0.6 * feature_sim
+
+        # Calculate adjustments
+        comp_price_per_m2 = cand.get("price_per_m2", 0)
+        adjustments, adjusted_price = self.calculate_adjustments(
+            subject, cand, comp_price_per_m2
+        )
+
+        return ComparableProperty(
+            property_id=cand.get("id", ""),
+            price=cand.get("price", 0),
+            price_per_m2=comp_price_per_m2,
+            area_m2=cand.get("area_m2", 0),
+            bedrooms=cand.get("bedrooms", 0),
+            bathrooms=cand.get("bathrooms", 0),
+            latitude=cand.get("latitude", 0),
+            longitude=cand.get("longitude", 0),
+            distance_km=round(distance, 2),
+            feature_similarity=round(feature_sim, 3),
+            overall_similarity=round(overall_sim, 3),
+            adjustments=Adjustments.from_dict(adjustments),
+            adjusted_price_per_m2=round(adjusted_price, 2),
+        )
 
     def get_adjusted_value_estimate(
         self,
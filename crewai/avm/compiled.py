@@ -0,0 +1,192 @@
+"""Compiled AVM - Pure-NumPy evaluator for fitted gradient boosting models.
+
+Flattens a fitted ``GradientBoostingRegressor`` and ``StandardScaler`` into
+packed arrays so inference needs only NumPy. The compiled objects mirror the
+small part of the scikit-learn API that ``AVMModel`` uses (``transform``,
+``predict`` and ``feature_importances_``), so they can be dropped in place of
+the fitted estimators.
+"""
+
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+
+# Rows evaluated per step; bounds the (rows x trees) node-index matrix
+EVAL_CHUNK_ROWS = 4096
+
+
+@dataclass
+class CompiledScaler:
+    """Packed parameters of a fitted StandardScaler."""
+
+    mean: np.ndarray
+    scale: np.ndarray
+
+    @classmethod
+    def from_sklearn(cls, scaler: Any) -> "CompiledScaler":
+        """Extract the packed parameters from a fitted StandardScaler."""
+        n_features = scaler.n_features_in_
+        mean = scaler.mean_ if scaler.with_mean else np.zeros(n_features)
+        scale = scaler.scale_ if scaler.with_std else np.ones(n_features)
+        return cls(
+            mean=np.asarray(mean, dtype=np.float64),
+            scale=np.asarray(scale, dtype=np.float64),
+        )
+
+    def transform(self, features: np.ndarray) -> np.ndarray:
+        """Standardize a feature matrix exactly like StandardScaler.transform."""
+        return (np.asarray(features, dtype=np.float64) - self.mean) / self.scale
+
+    def to_arrays(self, prefix: str = "scaler_") -> dict[str, np.ndarray]:
+        """Return the parameters as named arrays for persistence."""
+        return {f"{prefix}mean": self.mean, f"{prefix}scale": self.scale}
+
+    @classmethod
+    def from_arrays(cls, arrays: Any, prefix: str = "scaler_") -> "CompiledScaler":
+        """Rebuild the scaler from named arrays."""
+        return cls(mean=arrays[f"{prefix}mean"], scale=arrays[f"{prefix}scale"])
+
+
+@dataclass
+class CompiledEnsemble:
+    """
+    Packed representation of a fitted gradient boosting regressor.
+
+    All trees are concatenated into flat per-node arrays. Child indices are
+    global positions in those arrays, and leaves point to themselves, so a
+    fixed number of ``max_depth`` vectorized steps lands every (row, tree)
+    pair on its leaf.
+    """
+
+    feature: np.ndarray  # int32, split feature per node (0 at leaves)
+    threshold: np.ndarray  # float64, split threshold per node
+    children_left: np.ndarray  # int32, global index of left child (self at leaves)
+    children_right: np.ndarray  # int32, global index of right child (self at leaves)
+    value: np.ndarray  # float64, node output (used at leaves)
+    roots: np.ndarray  # int32, global index of each tree's root node
+    baseline: float
+    learning_rate: float
+    max_depth: int
+    feature_importances_: np.ndarray
+
+    @classmethod
+    def from_sklearn(cls, regressor: Any) -> "CompiledEnsemble":
+        """Flatten a fitted GradientBoostingRegressor into packed arrays."""
+        features, thresholds, lefts, rights, values, roots = [], [], [], [], [], []
+        offset = 0
+        max_depth = 0
+
+        for estimator in regressor.estimators_[:, 0]:
+            tree = estimator.tree_
+            n_nodes = tree.node_count
+            local = np.arange(n_nodes)
+            is_leaf = tree.children_left == -1
+
+            roots.append(offset)
+            features.append(np.where(is_leaf, 0, tree.feature))
+            thresholds.append(np.where(is_leaf, 0.0, tree.threshold))
+            lefts.append(np.where(is_leaf, local, tree.children_left) + offset)
+            rights.append(np.where(is_leaf, local, tree.children_right) + offset)
+            values.append(tree.value[:, 0, 0])
+
+            max_depth = max(max_depth, tree.max_depth)
+            offset += n_nodes
+
+        init = regressor.init_
+        if init == "zero":
+            baseline = 0.0
+        else:
+            n_features = regressor.n_features_in_
+            baseline = float(np.ravel(init.predict(np.zeros((1, n_features))))[0])
+
+        return cls(
+            feature=np.concatenate(features).astype(np.int32),
+            threshold=np.concatenate(thresholds).astype(np.float64),
+            children_left=np.concatenate(lefts).astype(np.int32),
+            children_right=np.concatenate(rights).astype(np.int32),
+            value=np.concatenate(values).astype(np.float64),
+            roots=np.asarray(roots, dtype=np.int32),
+            baseline=baseline,
+            learning_rate=float(regressor.learning_rate),
+            max_depth=int(max_depth),
+            feature_importances_=np.asarray(
+                regressor.feature_importances_, dtype=np.float64
+            ),
+        )
+
+    @property
+    def n_trees(self) -> int:
+        """Number of trees in the ensemble."""
+        return len(self.roots)
+
+    def tree_outputs(self, features: np.ndarray) -> np.ndarray:
+        """
+        Evaluate every tree for every row.
+
+        Args:
+            features: Scaled feature matrix of shape (n_rows, n_features)
+
+        Returns:
+            Leaf values of shape (n_rows, n_trees)
+        """
+        # sklearn trees validate input to float32 before comparing with thresholds
+        features = np.asarray(features, dtype=np.float32)
+        n_rows = features.shape[0]
+        outputs = np.empty((n_rows, self.n_trees), dtype=np.float64)
+
+        for start in range(0, n_rows, EVAL_CHUNK_ROWS):
+            chunk = features[start : start + EVAL_CHUNK_ROWS]
+            flat_chunk = chunk.ravel()
+            # Offset of each row in the flattened chunk, so one take() gathers
+            # the split feature value for every (row, tree) pair
+            row_offsets = (np.arange(chunk.shape[0]) * chunk.shape[1])[:, np.newaxis]
+            nodes = np.broadcast_to(self.roots, (chunk.shape[0], self.n_trees))
+
+            for _ in range(self.max_depth):
+                split_values = flat_chunk.take(row_offsets + self.feature.take(nodes))
+                nodes = np.where(
+                    split_values <= self.threshold.take(nodes),
+                    self.children_left.take(nodes),
+                    self.children_right.take(nodes),
+                )
+
+            outputs[start : start + chunk.shape[0]] = self.value.take(nodes)
+
+        return outputs
+
+    def predict(self, features: np.ndarray) -> np.ndarray:
+        """Predict like GradientBoostingRegressor.predict on scaled features."""
+        return self.baseline + self.learning_rate * self.tree_outputs(features).sum(axis=1)
+
+    def to_arrays(self, prefix: str) -> dict[str, np.ndarray]:
+        """Return the packed ensemble as named arrays for persistence."""
+        return {
+            f"{prefix}feature": self.feature,
+            f"{prefix}threshold": self.threshold,
+            f"{prefix}children_left": self.children_left,
+            f"{prefix}children_right": self.children_right,
+            f"{prefix}value": self.value,
+            f"{prefix}roots": self.roots,
+            f"{prefix}feature_importances": self.feature_importances_,
+            f"{prefix}params": np.array(
+                [self.baseline, self.learning_rate, self.max_depth], dtype=np.float64
+            ),
+        }
+
+    @classmethod
+    def from_arrays(cls, arrays: Any, prefix: str) -> "CompiledEnsemble":
+        """Rebuild the ensemble from named arrays."""
+        baseline, learning_rate, max_depth = arrays[f"{prefix}params"].tolist()
+        return cls(
+            feature=arrays[f"{prefix}feature"],
+            threshold=arrays[f"{prefix}threshold"],
+            children_left=arrays[f"{prefix}children_left"],
+            children_right=arrays[f"{prefix}children_right"],
+            value=arrays[f"{prefix}value"],
+            roots=arrays[f"{prefix}roots"],
+            baseline=baseline,
+            learning_rate=learning_rate,
+            max_depth=int(max_depth),
+            feature_importances_=arrays[f"{prefix}feature_importances"],
+        )
@@ -0,0 +1,428 @@
+"""Candidate Frame - Columnar (struct-of-arrays) store of candidate properties."""
+
+import hashlib
+import json
+from dataclasses import dataclass, field
+from datetime import date
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+# Code for a missing property type or zone; never equal to an interned value
+MISSING_CODE = -1
+
+# Scraper listing types (scrapers/shared/schema.js) -> pricewaze_property_type
+SCRAPER_PROPERTY_TYPES = {
+    "apartamento": "apartment",
+    "casa": "house",
+    "terreno": "land",
+    "local": "commercial",
+    "oficina": "office",
+    "industrial": "commercial",
+}
+
+# Manifest of a saved frame; column arrays sit next to it as <column>.npy
+FRAME_MANIFEST_FILE = "frame.json"
+
+# Column name -> dtype. Coordinates and money stay float64; small counts fit
+# float32 exactly and keep NaN for missing values.
+COLUMN_DTYPES: dict[str, Any] = {
+    "latitude": np.float64,
+    "longitude": np.float64,
+    "price": np.float64,
+    "price_per_m2": np.float64,
+    "area_m2": np.float64,
+    "bedrooms": np.float32,
+    "bathrooms": np.float32,
+    "parking_spaces": np.float32,
+    "floor": np.float32,
+    "condition": np.float32,
+    "age": np.float32,
+    "age_years": np.float32,
+    "distance_to_center_km": np.float32,
+}
+
+
+class _Interner:
+    """Assigns dense integer codes to values in first-seen order."""
+
+    def __init__(self) -> None:
+        self.codes: dict[Any, int] = {}
+
+    def __call__(self, value: Any) -> int:
+        if value is None:
+            return MISSING_CODE
+        return self.codes.setdefault(value, len(self.codes))
+
+
+@dataclass
+class CandidateFrame:
+    """
+    Candidate properties stored as typed NumPy columns.
+
+    Numeric columns hold NaN where a candidate lacks the field. Property
+    types and zone ids are interned to integer codes (``type_codes``,
+    ``zone_codes``), and ``row_by_id`` maps property ids to rows. Compared
+    with a list of dicts this needs a fraction of the memory and lets the
+    comparables kernels and the AVM model scan columns directly.
+    """
+
+    ids: list[Any]
+    latitude: np.ndarray
+    longitude: np.ndarray
+    price: np.ndarray
+    price_per_m2: np.ndarray
+    area_m2: np.ndarray
+    bedrooms: np.ndarray
+    bathrooms: np.ndarray
+    parking_spaces: np.ndarray
+    floor: np.ndarray
+    condition: np.ndarray
+    age: np.ndarray
+    age_years: np.ndarray
+    distance_to_center_km: np.ndarray
+    property_type: np.ndarray  # int16 codes into type_codes
+    zone: np.ndarray  # int32 codes into zone_codes
+    type_codes: dict[Any, int] = field(default_factory=dict)
+    zone_codes: dict[Any, int] = field(default_factory=dict)
+    row_by_id: dict[Any, int] = field(init=False, repr=False)
+    _fingerprint: str | None = field(default=None, init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        self.row_by_id = {
+            item_id: row for row, item_id in enumerate(self.ids) if item_id is not None
+        }
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @classmethod
+    def _from_rows(
+        cls,
+        rows: list[dict[str, Any]],
+        extractors: dict[str, Any],
+    ) -> "CandidateFrame":
+        """Build a frame by applying one extractor per column to every row."""
+        types = _Interner()
+        zones = _Interner()
+
+        columns = {
+            name: np.array(
+                [_missing_to_nan(extractors[name](row)) for row in rows], dtype=dtype
+            )
+            for name, dtype in COLUMN_DTYPES.items()
+        }
+
+        return cls(
+            ids=[extractors["id"](row) for row in rows],
+            property_type=np.array(
+                [types(extractors["property_type"](row)) for row in rows], dtype=np.int16
+            ),
+            zone=np.array([zones(extractors["zone"](row)) for row in rows], dtype=np.int32),
+            type_codes=types.codes,
+            zone_codes=zones.codes,
+            **columns,
+        )
+
+    @classmethod
+    def concat(cls, frames: list["CandidateFrame"]) -> "CandidateFrame":
+        """
+        Concatenate frames (e.g. one per fetched page), merging their vocabularies.
+
+        Args:
+            frames: Frames to append in order
+
+        Returns:
+            Single CandidateFrame with re-interned type and zone codes
+        """
+        types = _Interner()
+        zones = _Interner()
+
+        def remap(codes: np.ndarray, vocabulary: dict[Any, int], interner: _Interner) -> np.ndarray:
+            # Last entry serves MISSING_CODE (-1)
+            lookup = np.array(
+                [interner(value) for value in vocabulary] + [MISSING_CODE], dtype=codes.dtype
+            )
+            return lookup[codes]
+
+        property_types = [remap(f.property_type, f.type_codes, types) for f in frames]
+        zone_codes = [remap(f.zone, f.zone_codes, zones) for f in frames]
+
+        return cls(
+            ids=[item_id for f in frames for item_id in f.ids],
+            property_type=np.concatenate(property_types or [np.empty(0, np.int16)]),
+            zone=np.concatenate(zone_codes or [np.empty(0, np.int32)]),
+            type_codes=types.codes,
+            zone_codes=zones.codes,
+            **{
+                name: np.concatenate(
+                    [getattr(f, name) for f in frames] or [np.empty(0, dtype)]
+                )
+                for name, dtype in COLUMN_DTYPES.items()
+            },
+        )
+
+    @classmethod
+    def from_records(cls, candidates: list[dict[str, Any]]) -> "CandidateFrame":
+        """
+        Build a frame from candidate dictionaries as used by ``find_comparables``.
+
+        Missing latitude/longitude default to 0 like the dict-based search.
+        """
+        extractors: dict[str, Any] = {
+            name: (lambda key: lambda row: row.get(key))(name) for name in COLUMN_DTYPES
+        }
+        extractors["latitude"] = lambda row: row.get("latitude", 0)
+        extractors["longitude"] = lambda row: row.get("longitude", 0)
+        extractors["id"] = lambda row: row.get("id")
+        extractors["property_type"] = lambda row: row.get("property_type")
+        extractors["zone"] = lambda row: row.get("zone_id")
+        return cls._from_rows(candidates, extractors)
+
+    @classmethod
+    def from_supabase_rows(
+        cls,
+        rows: list[dict[str, Any]],
+        as_of_year: int | None = None,
+    ) -> "CandidateFrame":
+        """
+        Build a frame from ``pricewaze_properties`` rows.
+
+        Args:
+            rows: Rows as returned by PostgREST (DECIMAL columns may be strings)
+            as_of_year: Year used to turn ``year_built`` into an age
+                (defaults to the current year)
+
+        Returns:
+            CandidateFrame with zones keyed by ``zone_id``
+        """
+        as_of_year = as_of_year or date.today().year
+
+        def age_from_year_built(row: dict[str, Any]) -> float | None:
+            year_built = _to_float(row.get("year_built"))
+            return None if year_built is None else as_of_year - year_built
+
+        extractors: dict[str, Any] = {
+            name: (lambda key: lambda row: _to_float(row.get(key)))(name)
+            for name in COLUMN_DTYPES
+        }
+        extractors["age"] = age_from_year_built
+        extractors["age_years"] = age_from_year_built
+        extractors["id"] = lambda row: row.get("id")
+        extractors["property_type"] = lambda row: row.get("property_type")
+        extractors["zone"] = lambda row: row.get("zone_id")
+        return cls._from_rows(rows, extractors)
+
+    @classmethod
+    def from_scraper_listings(
+        cls,
+        listings: list[dict[str, Any]],
+        currency: str | None = "USD",
+        transaction_type: str | None = "venta",
+    ) -> "CandidateFrame":
+        """
+        Build a frame from normalized scraper listings (scrapers/shared/schema.js).
+
+        Scraped listings carry no coordinates, so latitude/longitude are NaN
+        and zones are keyed by the normalized zone name.
+
+        Args:
+            listings: Listings that passed ``ListingSchema``
+            currency: Keep only listings priced in this currency (None keeps all)
+            transaction_type: Keep only this transaction type (None keeps all)
+
+        Returns:
+            CandidateFrame of the selected listings
+        """
+        listings = [
+            listing
+            for listing in listings
+            if (currency is None or listing.get("currency") == currency)
+            and (transaction_type is None or listing.get("transactionType") == transaction_type)
+        ]
+
+        def price_per_m2(listing: dict[str, Any]) -> float | None:
+            price = _to_float(listing.get("priceNumeric"))
+            area = _to_float(listing.get("areaM2"))
+            return price / area if price is not None and area else None
+
+        extractors: dict[str, Any] = {name: lambda listing: None for name in COLUMN_DTYPES}
+        extractors.update(
+            {
+                "id": lambda listing: listing.get("id"),
+                "price": lambda listing: _to_float(listing.get("priceNumeric")),
+                "price_per_m2": price_per_m2,
+                "area_m2": lambda listing: _to_float(listing.get("areaM2")),
+                "bedrooms": lambda listing: listing.get("bedrooms"),
+                "bathrooms": lambda listing: listing.get("bathrooms"),
+                "parking_spaces": lambda listing: listing.get("parking"),
+                "property_type": lambda listing: SCRAPER_PROPERTY_TYPES.get(
+                    listing.get("propertyType")
+                ),
+                "zone": lambda listing: listing.get("zone"),
+            }
+        )
+        return cls._from_rows(listings, extractors)
+
+    def fingerprint(self) -> str:
+        """
+        Content hash of the frame, used as the candidate-set version.
+
+        Computed once per frame; frames are treated as immutable after
+        construction.
+        """
+        if self._fingerprint is None:
+            digest = hashlib.sha256()
+            for name in (*COLUMN_DTYPES, "property_type", "zone"):
+                digest.update(np.ascontiguousarray(getattr(self, name)).tobytes())
+            vocab = [self.ids, list(self.type_codes), list(self.zone_codes)]
+            digest.update(json.dumps(vocab, default=str).encode())
+            self._fingerprint = digest.hexdigest()[:16]
+        return self._fingerprint
+
+    def save(self, path: Path | str) -> Path:
+        """
+        Save the frame as one ``.npy`` file per column plus a JSON manifest.
+
+        Saved frames can be memory-mapped by other processes (see ``load``),
+        so workers share one page-cached copy of the columns. Ids, types
+        and zone ids must be JSON-serializable.
+
+        Args:
+            path: Target directory (must not already exist)
+
+        Returns:
+            Path of the saved frame
+        """
+        path = Path(path)
+        path.mkdir(parents=True)
+
+        for name in (*COLUMN_DTYPES, "property_type", "zone"):
+            np.save(path / f"{name}.npy", getattr(self, name), allow_pickle=False)
+
+        # Codes are dense, so the vocabularies are stored as lists in code order
+        manifest = {
+            "ids": self.ids,
+            "type_codes": list(self.type_codes),
+            "zone_codes": list(self.zone_codes),
+        }
+        with open(path / FRAME_MANIFEST_FILE, "w", encoding="utf-8") as f:
+            json.dump(manifest, f)
+
+        return path
+
+    @classmethod
+    def load(cls, path: Path | str, mmap: bool = True) -> "CandidateFrame":
+        """
+        Load a frame written by ``save``.
+
+        Args:
+            path: Frame directory
+            mmap: Memory-map the columns read-only instead of reading them
+
+        Returns:
+            CandidateFrame backed by the saved columns
+        """
+        path = Path(path)
+        with open(path / FRAME_MANIFEST_FILE, encoding="utf-8") as f:
+            manifest = json.load(f)
+
+        columns = {
+            name: np.load(
+                path / f"{name}.npy", mmap_mode="r" if mmap else None, allow_pickle=False
+            )
+            for name in (*COLUMN_DTYPES, "property_type", "zone")
+        }
+        return cls(
+            ids=manifest["ids"],
+            type_codes={value: code for code, value in enumerate(manifest["type_codes"])},
+            zone_codes={value: code for code, value in enumerate(manifest["zone_codes"])},
+            **columns,
+        )
+
+    def encode_type(self, property_type: Any) -> int:
+        """Code of a property type in this frame (a non-matching code if unseen)."""
+        if property_type is None:
+            return MISSING_CODE
+        return self.type_codes.get(property_type, MISSING_CODE - 1)
+
+    @property
+    def zone_ids(self) -> list[Any]:
+        """Zone id for each code, indexed by code."""
+        return list(self.zone_codes)
+
+    def zone_lookup(self, per_zone: dict[Any, Any], default: Any = None) -> list[Any]:
+        """
+        Map a per-zone value onto rows.
+
+        Args:
+            per_zone: Value by zone id (e.g. zone statistics)
+            default: Value for rows without a zone or a missing zone entry
+
+        Returns:
+            One value per row
+        """
+        by_code = [per_zone.get(zone_id, default) for zone_id in self.zone_codes]
+        by_code.append(default)  # MISSING_CODE (-1) indexes the last entry
+        return [by_code[code] for code in self.zone.tolist()]
+
+    def zone_statistics(self) -> dict[Any, dict[str, Any]]:
+        """
+        Price statistics per zone, shaped like the ``zone_stats`` valuation input.
+
+        Returns:
+            Mapping of zone id to avg/median price per m² and property count
+        """
+        stats = {}
+        valid = ~np.isnan(self.price_per_m2)
+        for zone_id, code in self.zone_codes.items():
+            in_zone = self.zone == code
+            prices = self.price_per_m2[in_zone & valid]
+            stats[zone_id] = {
+                "zone_id": zone_id,
+                "avg_price_m2": round(float(prices.mean()), 2) if len(prices) else 0,
+                "median_price_m2": round(float(np.median(prices)), 2) if len(prices) else 0,
+                "property_count": int(in_zone.sum()),
+            }
+        return stats
+
+    def row(self, item_id: Any) -> int | None:
+        """Row of a property id (None if absent)."""
+        return self.row_by_id.get(item_id)
+
+    def record(self, row: int) -> dict[str, Any]:
+        """Materialize one row as a candidate dictionary (missing fields omitted)."""
+        record: dict[str, Any] = {"id": self.ids[row]}
+        for name in COLUMN_DTYPES:
+            value = getattr(self, name)[row]
+            if not np.isnan(value):
+                record[name] = value.item()
+
+        type_names = list(self.type_codes)
+        type_code = int(self.property_type[row])
+        if type_code != MISSING_CODE:
+            record["property_type"] = type_names[type_code]
+
+        zone_code = int(self.zone[row])
+        if zone_code != MISSING_CODE:
+            record["zone_id"] = self.zone_ids[zone_code]
+
+        return record
+
+    def nbytes(self) -> int:
+        """Approximate memory used by the columns (excluding id strings)."""
+        arrays = [getattr(self, name) for name in COLUMN_DTYPES]
+        arrays += [self.property_type, self.zone]
+        return sum(array.nbytes for array in arrays)
+
+
+def _to_float(value: Any) -> float | None:
+    """Parse a numeric field that may arrive as a string (PostgREST DECIMAL)."""
+    if value is None or value == "":
+        return None
+    return float(value)
+
+
+def _missing_to_nan(value: Any) -> Any:
+    return np.nan if value is None else value
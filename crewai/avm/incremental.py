@@ -0,0 +1,251 @@
+"""Incremental Revaluation - Refresh only the valuations a listing change can affect.
+
+A subject's comparables depend only on the candidates inside its final
+search radius: the radius is the first step whose count reaches
+``min_comparables``, so listings farther out change neither the radius nor
+the scores. When a listing is inserted, updated or deleted, the pipeline
+looks up subjects near the listing's old and new positions in a spatial
+index and revalues just those whose current radius covers either position.
+"""
+
+import time
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
+from typing import Any
+
+import numpy as np
+
+from .spatial import RADIUS_EPSILON_KM, SpatialIndex
+from .valuation import PropertyValuator, ValuationResult
+
+EVENT_KINDS = ("insert", "update", "delete")
+
+
+@dataclass
+class ListingEvent:
+    """A listing insert, update or delete."""
+
+    kind: str  # insert, update, delete
+    listing: dict[str, Any]  # New listing row (for delete, at least its id)
+
+    def __post_init__(self) -> None:
+        if self.kind not in EVENT_KINDS:
+            raise ValueError(f"Unknown listing event kind: {self.kind!r}")
+
+    @property
+    def property_id(self) -> Any:
+        return self.listing.get("id")
+
+    @classmethod
+    def from_webhook(cls, payload: dict[str, Any]) -> "ListingEvent":
+        """
+        Build an event from a Supabase database webhook payload.
+
+        Args:
+            payload: Webhook body with ``type`` (INSERT/UPDATE/DELETE),
+                ``record`` and ``old_record``
+
+        Returns:
+            ListingEvent
+        """
+        kind = str(payload.get("type", "")).lower()
+        listing = payload.get("old_record") if kind == "delete" else payload.get("record")
+        return cls(kind=kind, listing=listing or {})
+
+
+@dataclass
+class EventReport:
+    """What one listing event cost: how many subjects it touched and their new results."""
+
+    kind: str
+    property_id: Any
+    touched: int
+    results: list[ValuationResult] = field(default_factory=list)
+    elapsed_ms: float = 0.0
+
+
+class IncrementalRevaluator:
+    """
+    Keeps valuations of a set of subjects current as listings change.
+
+    Candidates live in an incremental spatial index, so events never
+    rebuild or rescan the candidate set. Each subject's last search radius
+    is tracked to decide which subjects an event can affect.
+    """
+
+    def __init__(
+        self,
+        valuator: PropertyValuator,
+        candidates: list[dict[str, Any]],
+        zone_stats_map: dict[str, dict[str, Any]],
+        subjects: list[dict[str, Any]] | None = None,
+        value_new_listings: bool = True,
+        cell_size_km: float = 1.0,
+    ):
+        """
+        Initialize the pipeline.
+
+        Args:
+            valuator: Valuator used for every revaluation
+            candidates: Current candidate listings
+            zone_stats_map: Zone statistics by zone_id
+            subjects: Properties whose valuations are maintained (defaults
+                to the candidates themselves)
+            value_new_listings: Also start valuing listings that get inserted
+            cell_size_km: Grid cell size of the spatial indexes
+        """
+        self.valuator = valuator
+        self.finder = valuator.comparables_finder
+        self.zone_stats_map = zone_stats_map
+        self.value_new_listings = value_new_listings
+        self.reach_km = self.finder.reach_km(expand_radius=True)
+
+        self.candidate_index = self.finder.build_index(candidates, cell_size_km=cell_size_km)
+        self.subject_index = SpatialIndex(cell_size_km=cell_size_km)
+        self.subjects: dict[Any, dict[str, Any]] = {}
+        self.radii: dict[Any, float] = {}
+        self.results: dict[Any, ValuationResult] = {}
+
+        for subject in candidates if subjects is None else subjects:
+            self._track_subject(subject)
+
+    def _track_subject(self, subject: dict[str, Any]) -> None:
+        subject_id = subject.get("id")
+        self.subjects[subject_id] = subject
+        self.subject_index.insert(
+            subject_id, subject.get("latitude", 0), subject.get("longitude", 0), subject_id
+        )
+
+    def _untrack_subject(self, subject_id: Any) -> None:
+        self.subjects.pop(subject_id, None)
+        self.radii.pop(subject_id, None)
+        self.results.pop(subject_id, None)
+        self.subject_index.remove(subject_id)
+
+    def _search_radius(self, distances: np.ndarray) -> float:
+        """The radius ``find_comparables`` settles on given a subject's candidate distances."""
+        radius = self.finder.select_search_radius(np.sort(distances), expand_radius=True)
+        return self.reach_km if radius is None else radius
+
+    def _candidates_near(self, subject: dict[str, Any]) -> tuple[list[dict], np.ndarray]:
+        """Candidates within reach of a subject, excluding the subject itself."""
+        items, distances = self.candidate_index.query_radius(
+            subject.get("latitude", 0), subject.get("longitude", 0), self.reach_km
+        )
+        keep = [i for i, item in enumerate(items) if item.get("id") != subject.get("id")]
+        return [items[i] for i in keep], distances[keep]
+
+    def revalue(self, subject_ids: Iterable[Any]) -> list[ValuationResult]:
+        """
+        Value the given subjects against the current candidates.
+
+        ML estimates are computed with one batch prediction, and cached
+        valuations of the subjects are invalidated so other readers do not
+        serve stale results.
+
+        Args:
+            subject_ids: Ids of tracked subjects
+
+        Returns:
+            New ValuationResults in the given order
+        """
+        subjects = [self.subjects[sid] for sid in subject_ids if sid in self.subjects]
+        if not subjects:
+            return []
+
+        ml_model = self.valuator.served_model()
+        prediction_model = self.valuator.prediction_model(ml_model)
+        ml_results = (
+            prediction_model.predict_batch(subjects, self.zone_stats_map, as_results=True)
+            if prediction_model is not None
+            else [None] * len(subjects)
+        )
+
+        results = []
+        for subject, ml_result in zip(subjects, ml_results):
+            subject_id = subject.get("id")
+            candidates, distances = self._candidates_near(subject)
+            result = self.valuator.valuate_with_model(
+                subject,
+                candidates,
+                self.zone_stats_map.get(subject.get("zone_id", ""), {}),
+                index=None,
+                ml_model=ml_model,
+                ml_result=ml_result,
+            )
+            self.results[subject_id] = result
+            self.radii[subject_id] = self._search_radius(distances)
+            if self.valuator.cache is not None:
+                self.valuator.cache.invalidate_property(str(subject_id))
+            results.append(result)
+
+        return results
+
+    def value_all(self) -> list[ValuationResult]:
+        """Value every tracked subject (initial load)."""
+        return self.revalue(list(self.subjects))
+
+    def affected_subjects(self, lat: float, lon: float) -> list[Any]:
+        """Subjects whose current search radius covers a position."""
+        subject_ids, distances = self.subject_index.query_radius(lat, lon, self.reach_km)
+        return [
+            sid
+            for sid, distance in zip(subject_ids, distances.tolist())
+            if distance <= self.radii.get(sid, self.reach_km) + RADIUS_EPSILON_KM
+        ]
+
+    def apply(self, event: ListingEvent) -> EventReport:
+        """
+        Apply one listing event and revalue the subjects it affects.
+
+        Args:
+            event: Listing insert, update or delete
+
+        Returns:
+            EventReport with the number of subjects touched and their results
+        """
+        started = time.perf_counter()
+        listing_id = event.property_id
+        affected: dict[Any, None] = {}
+
+        # Subjects around the listing's old position (update/delete) ...
+        previous = self.candidate_index.get(listing_id)
+        if previous is not None:
+            for sid in self.affected_subjects(
+                previous.get("latitude", 0), previous.get("longitude", 0)
+            ):
+                affected[sid] = None
+
+        # ... and around its new position (insert/update)
+        if event.kind == "delete":
+            self.candidate_index.remove(listing_id)
+            self._untrack_subject(listing_id)
+        else:
+            listing = {**(previous or {}), **event.listing}
+            lat, lon = listing.get("latitude", 0), listing.get("longitude", 0)
+            for sid in self.affected_subjects(lat, lon):
+                affected[sid] = None
+            self.candidate_index.insert(listing_id, lat, lon, listing)
+
+            # The listing's own valuation changes with its own fields
+            if listing_id in self.subjects:
+                self._track_subject({**self.subjects[listing_id], **event.listing})
+                affected[listing_id] = None
+            elif event.kind == "insert" and self.value_new_listings:
+                self._track_subject(listing)
+                affected[listing_id] = None
+
+        results = self.revalue(list(affected))
+
+        return EventReport(
+            kind=event.kind,
+            property_id=listing_id,
+            touched=len(results),
+            results=results,
+            elapsed_ms=round((time.perf_counter() - started) * 1000, 2),
+        )
+
+    def process(self, events: Iterable[ListingEvent]) -> Iterator[EventReport]:
+        """Apply a stream of events, yielding one report per event."""
+        for event in events:
+            yield self.apply(event)
@@ -0,0 +1,203 @@
+"""Comparables Kernels - Vectorized distance, similarity and adjustment scoring.
+
+NumPy counterparts of the scalar ``ComparablesFinder`` methods. They work on a
+columnar ``CandidateFrame`` and score every candidate in one shot; the scalar
+methods remain the reference implementation.
+"""
+
+import math
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+
+from .frame import MISSING_CODE, CandidateFrame
+from .spatial import haversine_km
+
+# Numeric similarity features and the difference that maps to "fully different"
+SIMILARITY_SCALES = {
+    "area_m2": 200,
+    "bedrooms": 4,
+    "bathrooms": 4,
+    "age": 30,
+    "condition": 4,
+}
+
+
+def feature_similarity(
+    subject: dict[str, Any],
+    block: CandidateFrame,
+    weights: dict[str, float],
+    rows: np.ndarray | None = None,
+) -> np.ndarray:
+    """
+    Weighted feature similarity of every candidate to the subject.
+
+    Vectorized ``ComparablesFinder.calculate_feature_similarity``: a feature
+    only counts when both subject and candidate have it.
+
+    Args:
+        subject: Subject property features
+        block: Candidate frame
+        weights: Feature weights
+        rows: Optional subset of frame rows to score
+
+    Returns:
+        Similarity scores 0-1 (1 = identical)
+    """
+    rows = np.arange(len(block)) if rows is None else rows
+    weighted_diff = np.zeros(len(rows))
+    total_weight = np.zeros(len(rows))
+
+    for feature, weight in weights.items():
+        subj_val = subject.get(feature)
+        if feature not in subject or subj_val is None:
+            continue
+
+        if feature == "property_type":
+            codes = block.property_type[rows]
+            present = codes != MISSING_CODE
+            diff = (codes != block.encode_type(subj_val)).astype(np.float64)
+        else:
+            column = getattr(block, feature, None)
+            if column is None:
+                continue
+            values = column[rows].astype(np.float64)
+            present = ~np.isnan(values)
+            scale = SIMILARITY_SCALES.get(feature)
+            if scale is None:
+                diff = np.zeros(len(rows))
+            else:
+                diff = np.minimum(np.abs(subj_val - values) / scale, 1)
+
+        weighted_diff += np.where(present, weight * diff, 0)
+        total_weight += np.where(present, weight, 0)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        similarity = 1 - (weighted_diff / total_weight)
+    return np.where(total_weight == 0, 0.5, similarity)
+
+
+@dataclass
+class AdjustmentArrays:
+    """Per-candidate price adjustments (NaN where an adjustment does not apply)."""
+
+    bedrooms: np.ndarray
+    bathrooms: np.ndarray
+    area: np.ndarray
+    condition: np.ndarray
+    adjusted_price_per_m2: np.ndarray
+
+    def as_dict(self, i: int) -> dict[str, float]:
+        """Adjustments of one candidate, shaped like ``calculate_adjustments``."""
+        adjustments = {}
+        for name in ("bedrooms", "bathrooms", "area", "condition"):
+            value = float(getattr(self, name)[i])
+            if not math.isnan(value):
+                # The scalar version reports the area adjustment rounded
+                adjustments[name] = round(value, 4) if name == "area" else value
+        return adjustments
+
+
+def price_adjustments(
+    subject: dict[str, Any],
+    block: CandidateFrame,
+    factors: dict[str, float],
+    rows: np.ndarray | None = None,
+) -> AdjustmentArrays:
+    """
+    Price adjustments for every candidate.
+
+    Vectorized ``ComparablesFinder.calculate_adjustments``; adjustments are
+    summed in the same order so adjusted prices match the scalar version.
+
+    Args:
+        subject: Subject property features
+        block: Candidate frame
+        factors: Adjustment factors per unit difference
+        rows: Optional subset of frame rows to adjust
+
+    Returns:
+        AdjustmentArrays with components and adjusted price per m²
+    """
+    rows = np.arange(len(block)) if rows is None else rows
+    total_adjustment = np.ones(len(rows))
+
+    def room_adjustment(key: str, factor: float) -> np.ndarray:
+        subj = subject.get(key, 0) or 0
+        comp = np.nan_to_num(getattr(block, key)[rows].astype(np.float64), nan=0.0)
+        adj = (subj - comp) * factor
+        applies = bool(subj) & (comp != 0) & (adj != 0)
+        return np.where(applies, adj, np.nan)
+
+    bedrooms = room_adjustment("bedrooms", factors["bedroom"])
+    bathrooms = room_adjustment("bathrooms", factors["bathroom"])
+
+    subj_area = subject.get("area_m2", 0) or 0
+    comp_area = np.nan_to_num(block.area_m2[rows], nan=0.0)
+    area_adj = (subj_area - comp_area) / 10 * factors["area_per_10m2"]
+    area_applies = bool(subj_area) & (comp_area != 0) & (np.abs(area_adj) > 0.001)
+    area = np.where(area_applies, area_adj, np.nan)
+
+    subj_cond = subject.get("condition", 3)
+    subj_cond = 3 if subj_cond is None else subj_cond
+    comp_cond = block.condition[rows].astype(np.float64)
+    comp_cond = np.where(np.isnan(comp_cond), 3, comp_cond)
+    cond_adj = (subj_cond - comp_cond) * factors["condition_grade"]
+    condition = np.where(cond_adj != 0, cond_adj, np.nan)
+
+    # Same summation order as the scalar version so totals match exactly
+    for adj in (bedrooms, bathrooms, area, condition):
+        total_adjustment += np.nan_to_num(adj, nan=0.0)
+
+    price_per_m2 = np.nan_to_num(block.price_per_m2[rows], nan=0.0)
+    return AdjustmentArrays(
+        bedrooms=bedrooms,
+        bathrooms=bathrooms,
+        area=area,
+        condition=condition,
+        adjusted_price_per_m2=price_per_m2 * total_adjustment,
+    )
+
+
+def overall_similarity(
+    distances: np.ndarray,
+    feature_sim: np.ndarray,
+    search_radius: float,
+) -> np.ndarray:
+    """Overall similarity: 40% inverse distance within the radius, 60% features."""
+    distance_sim = np.maximum(0, 1 - (distances / search_radius))
+    return 0.4 * distance_sim + 0.6 * feature_sim
+
+
+def top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """
+    Indices of the k highest scores, best first.
+
+    Uses ``argpartition`` to find the cut-off, then orders the selection
+    with ties broken by position, matching a stable descending sort.
+    """
+    n = len(scores)
+    if k <= 0 or n == 0:
+        return np.empty(0, dtype=np.int64)
+
+    if n > k:
+        cutoff = scores[np.argpartition(-scores, k - 1)[k - 1]]
+        above = np.flatnonzero(scores > cutoff)
+        tied = np.flatnonzero(scores == cutoff)[: k - len(above)]
+        chosen = np.concatenate([above, tied])
+    else:
+        chosen = np.arange(n)
+
+    return chosen[np.lexsort((chosen, -scores[chosen]))]
+
+
+__all__ = [
+    "AdjustmentArrays",
+    "CandidateFrame",
+    "feature_similarity",
+    "haversine_km",
+    "overall_similarity",
+    "price_adjustments",
+    "top_k",
+]
@@ -1,19 +1,73 @@
 """AVM Model - Machine Learning Property Valuation Model."""
 
+import hashlib
+import importlib.util
 import pickle
+from collections.abc import Iterator, Mapping
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 import numpy as np
 
-# Try to import sklearn, fallback to basic stats if not available
-try:
+from .artifact import is_artifact, new_version, read_artifact, write_artifact
+from .compiled import CompiledEnsemble, CompiledScaler
+from .frame import CandidateFrame
+
+# sklearn is only imported when a model is built or trained, so loading a
+# compiled model keeps worker cold start free of the sklearn import cost.
+# Fallback to basic stats if it is not installed.
+SKLEARN_AVAILABLE = importlib.util.find_spec("sklearn") is not None
+
+if TYPE_CHECKING:
     from sklearn.ensemble import GradientBoostingRegressor
-    from sklearn.preprocessing import StandardScaler
-    SKLEARN_AVAILABLE = True
-except ImportError:
-    SKLEARN_AVAILABLE = False
+
+
+class FeatureImportances(Mapping[str, float]):
+    """Read-only feature importances; unpickles to the shared instance."""
+
+    __slots__ = ("_importances",)
+
+    def __init__(self, importances: dict[str, float]):
+        self._importances = importances
+
+    def __getitem__(self, name: str) -> float:
+        return self._importances[name]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._importances)
+
+    def __len__(self) -> int:
+        return len(self._importances)
+
+    def __repr__(self) -> str:
+        return f"FeatureImportances({self._importances!r})"
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return shared_feature_importances, (self._importances,)
+
+
+@lru_cache(maxsize=64)
+def _intern_importances(items: tuple[tuple[str, float], ...]) -> FeatureImportances:
+    return FeatureImportances(dict(items))
+
+
+def shared_feature_importances(importances: Mapping[str, float]) -> FeatureImportances:
+    """
+    Read-only importances mapping shared by every result with the same values.
+
+    A model version always reports the same importances, so all of its
+    predictions (and the valuations built on them) hold one mapping instead
+    of a copy each.
+
+    Args:
+        importances: Feature importances by feature name
+
+    Returns:
+        Shared FeatureImportances
+    """
+    return _intern_importances(tuple(importances.items()))
 
 
 @dataclass
@@ -26,7 +80,44 @@ class PredictionResult:
     confidence_interval_high: float
     confidence_score: float
     features_used: list[str]
-    feature_importances: dict[str, float]
+    feature_importances: Mapping[str, float]
+
+
+@dataclass
+class BatchPredictionResult:
+    """Columnar result of a batched AVM prediction (one array entry per property)."""
+
+    predicted_values: np.ndarray
+    predicted_price_per_m2: np.ndarray
+    confidence_interval_low: np.ndarray
+    confidence_interval_high: np.ndarray
+    confidence_scores: np.ndarray
+    features_used: list[str]
+    feature_importances: Mapping[str, float]
+
+    def __len__(self) -> int:
+        return len(self.predicted_values)
+
+    def to_results(self) -> list[PredictionResult]:
+        """Expand the columnar arrays into per-property PredictionResults."""
+        return [
+            PredictionResult(
+                predicted_value=value,
+                predicted_price_per_m2=price_m2,
+                confidence_interval_low=ci_low,
+                confidence_interval_high=ci_high,
+                confidence_score=confidence,
+                features_used=self.features_used,
+                feature_importances=self.feature_importances,
+            )
+            for value, price_m2, ci_low, ci_high, confidence in zip(
+                self.predicted_values.tolist(),
+                self.predicted_price_per_m2.tolist(),
+                self.confidence_interval_low.tolist(),
+                self.confidence_interval_high.tolist(),
+                self.confidence_scores.tolist(),
+            )
+        ]
 
 
 class AVMModel:
@@ -35,7 +126,7 @@ class AVMModel:
 
     Features:
     - Feature engineering for real estate properties
-    - Confidence interval estimation
+    - Confidence intervals from quantile gradient-boosting heads
     - Feature importance analysis
     - Model persistence
 
@@ -57,6 +148,11 @@ class AVMModel:
         "condition_encoded",
     ]
 
+    # Quantiles fitted by the interval heads (90% prediction interval)
+    INTERVAL_QUANTILES = (0.05, 0.95)
+    # z-score of the upper quantile, used to turn interval width into a std estimate
+    INTERVAL_Z_SCORE = 1.645
+
     def __init__(self, model_path: Path | str | None = None):
         """
         Initialize the AVM model.
@@ -66,20 +162,40 @@ class AVMModel:
         """
         self.model = None
         self.scaler = None
+        self.quantile_models: tuple[Any, Any] | None = None
         self.feature_names = self.FEATURE_NAMES.copy()
         self.is_fitted = False
 
+        # Provenance recorded at training time and persisted in the artifact manifest
+        self.version: str | None = None
+        self.training_data_hash = ""
+        self.metrics: dict[str, float] = {}
+
+        # Estimators are built by ``fit``: an untrained model (e.g. the
+        # fallback of a valuator without a registry model) never needs sklearn
         if model_path:
             self.load(model_path)
-        elif SKLEARN_AVAILABLE:
-            self._initialize_model()
 
     def _initialize_model(self) -> None:
-        """Initialize the gradient boosting model."""
+        """Initialize the gradient boosting model and its quantile interval heads."""
         if not SKLEARN_AVAILABLE:
             return
 
-        self.model = GradientBoostingRegressor(
+        from sklearn.preprocessing import StandardScaler
+
+        self.model = self._build_regressor()
+        self.quantile_models = tuple(
+            self._build_regressor(loss="quantile", alpha=alpha)
+            for alpha in self.INTERVAL_QUANTILES
+        )
+        self.scaler = StandardScaler()
+
+    @staticmethod
+    def _build_regressor(**loss_params: Any) -> "GradientBoostingRegressor":
+        """Build a gradient boosting regressor with the shared hyperparameters."""
+        from sklearn.ensemble import GradientBoostingRegressor
+
+        return GradientBoostingRegressor(
             n_estimators=100,
             learning_rate=0.1,
             max_depth=5,
@@ -87,8 +203,8 @@ class AVMModel:
             min_samples_leaf=2,
             subsample=0.8,
             random_state=42,
+            **loss_params,
         )
-        self.scaler = StandardScaler()
 
     def _encode_property_type(self, property_type: str | None) -> int:
         """Encode property type to numeric value."""
@@ -134,27 +250,114 @@ class AVMModel:
         Returns:
             Feature array for model input
         """
-        zone_stats = zone_stats or {}
-
-        features = [
-            property_data.get("area_m2", 100),
-            property_data.get("bedrooms", 2),
-            property_data.get("bathrooms", 1),
-            property_data.get("parking_spaces", 1),
-            property_data.get("floor", 1),
-            property_data.get("age_years", 10),
-            zone_stats.get("avg_price_m2", 2000),
-            zone_stats.get("median_price_m2", 1800),
-            property_data.get("distance_to_center_km", 5),
-            self._encode_property_type(property_data.get("property_type")),
-            self._encode_condition(property_data.get("condition")),
+        return self._build_feature_matrix([property_data], [zone_stats or {}])
+
+    def extract_feature_matrix(
+        self,
+        properties: list[dict[str, Any]] | CandidateFrame,
+        zone_stats_map: dict[str, dict[str, Any]] | None = None,
+    ) -> np.ndarray:
+        """
+        Extract the feature matrix for many properties in one pass.
+
+        Args:
+            properties: List of property data dictionaries, or a CandidateFrame
+            zone_stats_map: Zone statistics by zone_id
+
+        Returns:
+            Feature matrix of shape (len(properties), len(FEATURE_NAMES))
+        """
+        features, _ = self._features_and_zone_stats(properties, zone_stats_map)
+        return features
+
+    def _features_and_zone_stats(
+        self,
+        properties: list[dict[str, Any]] | CandidateFrame,
+        zone_stats_map: dict[str, dict[str, Any]] | None,
+    ) -> tuple[np.ndarray, list[dict[str, Any]]]:
+        """Feature matrix plus the row-aligned zone statistics it was built from."""
+        if isinstance(properties, CandidateFrame):
+            zone_stats_list = properties.zone_lookup(zone_stats_map or {}, {})
+            return self._frame_feature_matrix(properties, zone_stats_list), zone_stats_list
+
+        zone_stats_list = self._resolve_zone_stats(properties, zone_stats_map)
+        return self._build_feature_matrix(properties, zone_stats_list), zone_stats_list
+
+    @staticmethod
+    def _resolve_zone_stats(
+        properties: list[dict[str, Any]],
+        zone_stats_map: dict[str, dict[str, Any]] | None,
+    ) -> list[dict[str, Any]]:
+        """Look up the zone statistics row for each property by zone_id."""
+        zone_stats_map = zone_stats_map or {}
+        return [zone_stats_map.get(prop.get("zone_id", ""), {}) for prop in properties]
+
+    def _build_feature_matrix(
+        self,
+        properties: list[dict[str, Any]],
+        zone_stats_list: list[dict[str, Any]],
+    ) -> np.ndarray:
+        """Build the feature matrix column by column from row-aligned inputs."""
+        columns = [
+            [prop.get("area_m2", 100) for prop in properties],
+            [prop.get("bedrooms", 2) for prop in properties],
+            [prop.get("bathrooms", 1) for prop in properties],
+            [prop.get("parking_spaces", 1) for prop in properties],
+            [prop.get("floor", 1) for prop in properties],
+            [prop.get("age_years", 10) for prop in properties],
+            [zs.get("avg_price_m2", 2000) for zs in zone_stats_list],
+            [zs.get("median_price_m2", 1800) for zs in zone_stats_list],
+            [prop.get("distance_to_center_km", 5) for prop in properties],
+            [self._encode_property_type(prop.get("property_type")) for prop in properties],
+            [self._encode_condition(prop.get("condition")) for prop in properties],
+        ]
+
+        matrix = np.empty((len(properties), len(columns)), dtype=np.float64)
+        for col, values in enumerate(columns):
+            matrix[:, col] = values
+
+        return matrix
+
+    def _frame_feature_matrix(
+        self,
+        frame: CandidateFrame,
+        zone_stats_list: list[dict[str, Any]],
+    ) -> np.ndarray:
+        """Build the feature matrix straight from a frame's columns."""
+
+        def column(values: np.ndarray, default: float) -> np.ndarray:
+            return np.where(np.isnan(values), default, values)
+
+        # Encode each interned type once; the last entry serves MISSING_CODE (-1)
+        type_lookup = np.array(
+            [self._encode_property_type(t) for t in frame.type_codes]
+            + [self._encode_property_type(None)],
+            dtype=np.float64,
+        )
+
+        columns = [
+            column(frame.area_m2, 100),
+            column(frame.bedrooms, 2),
+            column(frame.bathrooms, 1),
+            column(frame.parking_spaces, 1),
+            column(frame.floor, 1),
+            column(frame.age_years, 10),
+            [zs.get("avg_price_m2", 2000) for zs in zone_stats_list],
+            [zs.get("median_price_m2", 1800) for zs in zone_stats_list],
+            column(frame.distance_to_center_km, 5),
+            type_lookup[frame.property_type],
+            np.clip(column(frame.condition, 3), 1, 5),
         ]
 
-        return np.array(features).reshape(1, -1)
+        matrix = np.empty((len(frame), len(columns)), dtype=np.float64)
+        for col, values in enumerate(columns):
+            matrix[:, col] = values
+
+        return matrix
 
     def fit(
         self,
-        properties: list[dict[str, Any]],
+        properties: list[dict[str, Any]] | CandidateFrame,
         prices: list[float],
         zone_stats_map: dict[str, dict[str, Any]] | None = None,
     ) -> "AVMModel":
@@ -162,7 +365,7 @@ class AVMModel:
         Train the AVM model on historical data.
 
         Args:
-            properties: List of property data dictionaries
+            properties: List of property data dictionaries, or a CandidateFrame
             prices: Corresponding sale prices
             zone_stats_map: Zone statistics by zone_id
 
@@ -172,28 +375,59 @@ class AVMModel:
         if not SKLEARN_AVAILABLE:
             raise RuntimeError("scikit-learn required for model training")
 
-        zone_stats_map = zone_stats_map or {}
-
-        # Extract features for all properties
-        feature_matrix = []
-        for prop in properties:
-            zone_id = prop.get("zone_id", "")
-            zone_stats = zone_stats_map.get(zone_id, {})
-            features = self.extract_features(prop, zone_stats)
-            feature_matrix.append(features.flatten())
+        if self.model is None or isinstance(self.model, CompiledEnsemble):
+            # First fit, or a compiled model (inference-only): train fresh estimators
+            self._initialize_model()
 
-        feature_array = np.array(feature_matrix)
+        feature_array = self.extract_feature_matrix(properties, zone_stats_map)
         target_prices = np.array(prices)
 
         # Scale features
         scaled_features = self.scaler.fit_transform(feature_array)
 
-        # Train model
+        # Train model and the quantile heads used for confidence intervals
         self.model.fit(scaled_features, target_prices)
+        if self.quantile_models is not None:
+            for quantile_model in self.quantile_models:
+                quantile_model.fit(scaled_features, target_prices)
         self.is_fitted = True
 
+        self.version = None
+        self.training_data_hash = self._hash_training_data(feature_array, target_prices)
+        self.metrics = self._training_metrics(
+            target_prices, self.model.predict(scaled_features)
+        )
+
         return self
 
+    @staticmethod
+    def _hash_training_data(features: np.ndarray, targets: np.ndarray) -> str:
+        """Hash the training feature matrix and targets for artifact provenance."""
+        digest = hashlib.sha256()
+        digest.update(np.ascontiguousarray(features, dtype=np.float64).tobytes())
+        digest.update(np.ascontiguousarray(targets, dtype=np.float64).tobytes())
+        return digest.hexdigest()
+
+    @staticmethod
+    def _training_metrics(targets: np.ndarray, fitted: np.ndarray) -> dict[str, float]:
+        """In-sample fit metrics recorded alongside the trained model."""
+        errors = fitted - targets
+        total_var = float(np.sum((targets - targets.mean()) ** 2))
+        nonzero = targets != 0
+        mape = (
+            float(np.mean(np.abs(errors[nonzero] / targets[nonzero])))
+            if nonzero.any()
+            else 0.0
+        )
+        return {
+            "n_samples": float(len(targets)),
+            "train_mae": round(float(np.mean(np.abs(errors))), 2),
+            "train_mape": round(mape, 4),
+            "train_r2": round(
+                1 - float(np.sum(errors**2)) / total_var if total_var > 0 else 0.0, 4
+            ),
+        }
+
     def predict(
         self,
         property_data: dict[str, Any],
@@ -209,23 +443,53 @@ class AVMModel:
         Returns:
             PredictionResult with value and confidence
         """
-        features = self.extract_features(property_data, zone_stats)
-        area_m2 = property_data.get("area_m2", 100)
+        zone_stats_list = [zone_stats or {}]
+        features = self._build_feature_matrix([property_data], zone_stats_list)
+        return self._predict_rows(features, zone_stats_list).to_results()[0]
+
+    def predict_batch(
+        self,
+        properties: list[dict[str, Any]] | CandidateFrame,
+        zone_stats_map: dict[str, dict[str, Any]] | None = None,
+        as_results: bool = False,
+    ) -> "BatchPredictionResult | list[PredictionResult]":
+        """
+        Predict values for many properties with a single model call.
+
+        The feature matrix is built in one pass and scaled/predicted with
+        one ``scaler.transform`` and one ``model.predict`` call, so the
+        per-property Python overhead of :meth:`predict` is avoided.
 
-        if self.is_fitted and SKLEARN_AVAILABLE:
+        Args:
+            properties: List of property data dictionaries, or a CandidateFrame
+                whose columns are used directly
+            zone_stats_map: Zone statistics by zone_id
+            as_results: Return a list of PredictionResult instead of arrays
+
+        Returns:
+            BatchPredictionResult with one array entry per property, or a
+            list of PredictionResult when ``as_results`` is True
+        """
+        features, zone_stats_list = self._features_and_zone_stats(properties, zone_stats_map)
+        batch = self._predict_rows(features, zone_stats_list)
+        return batch.to_results() if as_results else batch
+
+    def _predict_rows(
+        self,
+        features: np.ndarray,
+        zone_stats_list: list[dict[str, Any]],
+    ) -> "BatchPredictionResult":
+        """Run the vectorized prediction for a feature matrix and row-aligned zone stats."""
+        area_m2 = features[:, 0]
+
+        if self.is_fitted and self.model is not None and len(features) > 0:
             # Use trained model
             scaled_features = self.scaler.transform(features)
-            predicted_value = self.model.predict(scaled_features)[0]
+            predicted_values = self.model.predict(scaled_features)
 
-            # Estimate confidence interval using tree variance
-            predictions = []
-            for tree in self.model.estimators_:
-                pred = tree[0].predict(scaled_features)[0]
-                predictions.append(pred)
-
-            std_dev = np.std(predictions)
-            ci_low = predicted_value - 1.96 * std_dev
-            ci_high = predicted_value + 1.96 * std_dev
+            ci_low, ci_high, std_dev = self._prediction_interval(
+                scaled_features, predicted_values
+            )
 
             # Get feature importances
             importances = dict(
@@ -233,65 +497,231 @@ class AVMModel:
             )
 
             # Confidence based on prediction variance
-            cv = std_dev / predicted_value if predicted_value > 0 else 1
-            confidence = max(0, min(1, 1 - cv))
+            with np.errstate(divide="ignore", invalid="ignore"):
+                cv = np.where(predicted_values > 0, std_dev / predicted_values, 1.0)
+            confidence = np.clip(1 - cv, 0, 1)
 
         else:
             # Fallback: Use zone stats for estimation
-            zone_avg = zone_stats.get("avg_price_m2", 2000) if zone_stats else 2000
-            zone_median = zone_stats.get("median_price_m2", zone_avg) if zone_stats else zone_avg
+            zone_avg = np.array(
+                [zs.get("avg_price_m2", 2000) if zs else 2000 for zs in zone_stats_list],
+                dtype=np.float64,
+            )
+            zone_median = np.array(
+                [
+                    zs.get("median_price_m2", avg) if zs else avg
+                    for zs, avg in zip(zone_stats_list, zone_avg.tolist())
+                ],
+                dtype=np.float64,
+            )
 
             # Simple weighted estimate
             predicted_price_m2 = 0.4 * zone_avg + 0.6 * zone_median
-            predicted_value = predicted_price_m2 * area_m2
+            predicted_values = predicted_price_m2 * area_m2
 
             # Simple confidence interval (±15%)
-            ci_low = predicted_value * 0.85
-            ci_high = predicted_value * 1.15
+            ci_low = predicted_values * 0.85
+            ci_high = predicted_values * 1.15
 
             # Default importances
             importances = {name: 0.1 for name in self.feature_names}
             importances["zone_avg_price_m2"] = 0.3
             importances["area_m2"] = 0.2
 
-            confidence = 0.6  # Lower confidence for fallback
+            confidence = np.full(len(features), 0.6)  # Lower confidence for fallback
 
-        predicted_price_m2 = predicted_value / area_m2 if area_m2 > 0 else 0
+        with np.errstate(divide="ignore", invalid="ignore"):
+            predicted_price_m2 = np.where(area_m2 > 0, predicted_values / area_m2, 0.0)
 
-        return PredictionResult(
-            predicted_value=round(predicted_value, 2),
-            predicted_price_per_m2=round(predicted_price_m2, 2),
-            confidence_interval_low=round(max(0, ci_low), 2),
-            confidence_interval_high=round(ci_high, 2),
-            confidence_score=round(confidence, 3),
+        return BatchPredictionResult(
+            predicted_values=np.round(predicted_values, 2),
+            predicted_price_per_m2=np.round(predicted_price_m2, 2),
+            confidence_interval_low=np.round(np.maximum(0, ci_low), 2),
+            confidence_interval_high=np.round(ci_high, 2),
+            confidence_scores=np.round(confidence, 3),
             features_used=self.feature_names,
-            feature_importances={k: round(v, 4) for k, v in importances.items()},
+            feature_importances=shared_feature_importances(
+                {k: round(float(v), 4) for k, v in importances.items()}
+            ),
         )
 
-    def save(self, path: Path | str) -> None:
-        """Save model to disk."""
-        path = Path(path)
-        path.parent.mkdir(parents=True, exist_ok=True)
+    def _prediction_interval(
+        self,
+        scaled_features: np.ndarray,
+        predicted_values: np.ndarray,
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Estimate the prediction interval for a batch of scaled feature rows.
+
+        Uses the quantile gradient-boosting heads, one predict call per bound
+        for the whole batch. Models saved before the heads existed fall back
+        to the spread of the stacked per-tree outputs.
+
+        Args:
+            scaled_features: Scaled feature matrix
+            predicted_values: Point predictions for the same rows
 
-        state = {
-            "model": self.model,
-            "scaler": self.scaler,
-            "feature_names": self.feature_names,
-            "is_fitted": self.is_fitted,
+        Returns:
+            Tuple of (interval low, interval high, implied standard deviation)
+        """
+        if self.quantile_models is not None:
+            lower_model, upper_model = self.quantile_models
+            ci_low = np.minimum(lower_model.predict(scaled_features), predicted_values)
+            ci_high = np.maximum(upper_model.predict(scaled_features), predicted_values)
+            std_dev = (ci_high - ci_low) / (2 * self.INTERVAL_Z_SCORE)
+            return ci_low, ci_high, std_dev
+
+        if isinstance(self.model, CompiledEnsemble):
+            tree_predictions = self.model.tree_outputs(scaled_features).T
+        else:
+            tree_predictions = np.stack(
+                [tree[0].predict(scaled_features) for tree in self.model.estimators_]
+            )
+        std_dev = np.std(tree_predictions, axis=0)
+        return predicted_values - 1.96 * std_dev, predicted_values + 1.96 * std_dev, std_dev
+
+    def compile(self) -> "AVMModel":
+        """
+        Return an inference-only copy backed by the pure-NumPy evaluator.
+
+        The fitted regressor, quantile heads and scaler are flattened into
+        packed arrays (see ``avm.compiled``); predictions match sklearn to
+        floating-point tolerance.
+        """
+        if not self.is_fitted:
+            raise RuntimeError("Model must be fitted before compiling")
+
+        compiled = AVMModel.__new__(AVMModel)
+        compiled.feature_names = list(self.feature_names)
+        compiled.is_fitted = True
+        compiled.version = self.version
+        compiled.training_data_hash = self.training_data_hash
+        compiled.metrics = dict(self.metrics)
+        if isinstance(self.model, CompiledEnsemble):
+            compiled.model = self.model
+            compiled.scaler = self.scaler
+            compiled.quantile_models = self.quantile_models
+            return compiled
+
+        compiled.model = CompiledEnsemble.from_sklearn(self.model)
+        compiled.scaler = CompiledScaler.from_sklearn(self.scaler)
+        compiled.quantile_models = (
+            tuple(CompiledEnsemble.from_sklearn(m) for m in self.quantile_models)
+            if self.quantile_models is not None
+            else None
+        )
+        return compiled
+
+    def _compiled_arrays(self) -> dict[str, np.ndarray]:
+        """Packed arrays of the compiled model, keyed by persisted array name."""
+        compiled = self.compile()
+        arrays = {
+            **compiled.scaler.to_arrays(),
+            **compiled.model.to_arrays("model_"),
         }
+        if compiled.quantile_models is not None:
+            lower_model, upper_model = compiled.quantile_models
+            arrays.update(lower_model.to_arrays("lower_"))
+            arrays.update(upper_model.to_arrays("upper_"))
+        return arrays
+
+    def _set_compiled_arrays(self, arrays: dict[str, np.ndarray]) -> None:
+        """Install compiled estimators rebuilt from persisted arrays."""
+        self.model = CompiledEnsemble.from_arrays(arrays, "model_")
+        self.scaler = CompiledScaler.from_arrays(arrays)
+        self.quantile_models = (
+            (
+                CompiledEnsemble.from_arrays(arrays, "lower_"),
+                CompiledEnsemble.from_arrays(arrays, "upper_"),
+            )
+            if "lower_params" in arrays
+            else None
+        )
+        self.is_fitted = True
+
+    def save(
+        self,
+        path: Path | str,
+        version: str | None = None,
+        metrics: dict[str, float] | None = None,
+    ) -> Path:
+        """
+        Save model to disk as a versioned artifact directory.
+
+        The artifact is a ``manifest.json`` plus raw ``.npy`` arrays of the
+        compiled model (see ``avm.artifact``); it is loaded memory-mapped and
+        without sklearn.
+
+        Args:
+            path: Artifact directory to create
+            version: Artifact version (defaults to a UTC timestamp)
+            metrics: Extra metrics (e.g. holdout scores) to record with the
+                training metrics
+
+        Returns:
+            Path of the written artifact
+        """
+        version = version or new_version()
+        artifact_path = write_artifact(
+            path,
+            arrays=self._compiled_arrays(),
+            feature_names=self.feature_names,
+            version=version,
+            training_data_hash=self.training_data_hash,
+            metrics={**self.metrics, **(metrics or {})},
+            extra={"model_type": "gradient_boosting"},
+        )
+        self.version = version
+        return artifact_path
+
+    def export_compiled(self, path: Path | str) -> None:
+        """
+        Save the model in the compact compiled format (``.npz`` of packed arrays).
+
+        The file can be loaded with :meth:`load` without importing sklearn.
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
 
         with open(path, "wb") as f:
-            pickle.dump(state, f)
+            np.savez(
+                f,
+                feature_names=np.array(self.feature_names),
+                **self._compiled_arrays(),
+            )
+
+    def load(self, path: Path | str, mmap: bool = True) -> "AVMModel":
+        """
+        Load model from disk.
 
-    def load(self, path: Path | str) -> "AVMModel":
-        """Load model from disk."""
+        Accepts an artifact directory (arrays memory-mapped when ``mmap`` is
+        True), a compiled ``.npz`` file, or a legacy pickle file.
+        """
         path = Path(path)
 
+        if is_artifact(path):
+            artifact = read_artifact(path, mmap=mmap)
+            self._set_compiled_arrays(artifact.arrays)
+            self.feature_names = list(artifact.feature_names)
+            self.version = artifact.version
+            self.training_data_hash = artifact.training_data_hash
+            self.metrics = dict(artifact.metrics)
+            return self
+
+        if path.suffix == ".npz":
+            with np.load(path, allow_pickle=False) as npz:
+                arrays = dict(npz)
+            self._set_compiled_arrays(arrays)
+            self.feature_names = arrays["feature_names"].tolist()
+            return self
+
+        # Legacy pickle files written before the artifact format
         with open(path, "rb") as f:
             state = pickle.load(f)
 
         self.model = state["model"]
         self.scaler = state["scaler"]
+        self.quantile_models = state.get("quantile_models")
         self.feature_names = state["feature_names"]
         self.is_fitted = state["is_fitted"]
 
@@ -334,6 +764,8 @@ class EnsembleAVM:
         comp_estimate: float,
         comp_confidence: float,
         zone_stats: dict[str, Any],
+        ml_model: AVMModel | None = None,
+        ml_result: PredictionResult | None = None,
     ) -> dict[str, Any]:
         """
         Generate ensemble prediction.
@@ -343,6 +775,9 @@ class EnsembleAVM:
             comp_estimate: Estimate from comparable analysis
             comp_confidence: Confidence in comparable estimate
             zone_stats: Zone-level statistics
+            ml_model: Model to use instead of the ensemble's own (e.g. the
+                registry's current trained model)
+            ml_result: Precomputed ML prediction (e.g. from ``predict_batch``)
 
         Returns:
             Combined prediction with confidence
@@ -350,7 +785,8 @@ class EnsembleAVM:
         area_m2 = property_data.get("area_m2", 100)
 
         # ML model prediction
-        ml_result = self.ml_model.predict(property_data, zone_stats)
+        if ml_result is None:
+            ml_result = (ml_model or self.ml_model).predict(property_data, zone_stats)
 
         # Zone-based estimate
         zone_avg = zone_stats.get("avg_price_m2", 2000)
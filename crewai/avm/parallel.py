@@ -0,0 +1,255 @@
+"""Parallel Valuation - Process-pool executor for batch property valuation.
+
+Comparables scoring and ML inference are CPU-bound, so large batches are
+spread over worker processes. Nothing large travels through the task
+pipes: the candidate frame is saved once as ``.npy`` columns (on
+``/dev/shm`` when available) and memory-mapped by every worker, and the
+model is loaded by each worker from the registry's artifact directory,
+which is memory-mapped as well. A task carries only its chunk of subjects.
+"""
+
+import json
+import os
+import shutil
+import tempfile
+from collections import deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Future, ProcessPoolExecutor, wait
+from functools import lru_cache
+from itertools import islice
+from multiprocessing import get_context
+from pathlib import Path
+from typing import Any
+
+from config import get_settings
+
+from .frame import CandidateFrame
+from .registry import ModelRegistry, get_model_registry
+from .spatial import SpatialIndex
+from .valuation import PropertyValuator, ValuationResult
+
+# Zone statistics are saved next to the shared frame columns
+ZONE_STATS_FILE = "zone_stats.json"
+
+# Shared frames live in RAM-backed storage when the platform has it
+SHARED_DIR = "/dev/shm" if os.path.isdir("/dev/shm") else None
+
+
+class _WorkerState:
+    """Per-process cache of the shared frame, its index and the pinned valuator."""
+
+    frame_dir: str | None = None
+    frame: CandidateFrame | None = None
+    index: SpatialIndex | None = None
+    zone_stats_map: dict[str, dict[str, Any]] = {}
+    valuators: dict[tuple[Any, ...], PropertyValuator] = {}
+
+
+def _worker_valuator(
+    model_path: str | None,
+    use_ml_model: bool,
+    use_ensemble: bool,
+) -> PropertyValuator:
+    """Valuator serving the parent's model version, built once per worker."""
+    key = (model_path, use_ml_model, use_ensemble)
+    valuator = _WorkerState.valuators.get(key)
+    if valuator is None:
+        registry = ModelRegistry(None)
+        if model_path:
+            registry.pin(model_path)
+        valuator = PropertyValuator(
+            use_ml_model=use_ml_model,
+            use_ensemble=use_ensemble,
+            registry=registry,
+        )
+        _WorkerState.valuators[key] = valuator
+    return valuator
+
+
+def _attach_frame(frame_dir: str, valuator: PropertyValuator) -> None:
+    """Memory-map a shared frame and index it, unless this worker already has."""
+    if _WorkerState.frame_dir == frame_dir:
+        return
+
+    frame = CandidateFrame.load(frame_dir, mmap=True)
+    with open(Path(frame_dir) / ZONE_STATS_FILE, encoding="utf-8") as f:
+        zone_stats_map = json.load(f)
+
+    _WorkerState.frame_dir = frame_dir
+    _WorkerState.frame = frame
+    _WorkerState.index = valuator.comparables_finder.build_index(frame)
+    _WorkerState.zone_stats_map = zone_stats_map
+
+
+def _valuate_chunk(
+    frame_dir: str,
+    model_path: str | None,
+    use_ml_model: bool,
+    use_ensemble: bool,
+    subjects: list[dict[str, Any]],
+) -> list[ValuationResult]:
+    """Worker task: value a chunk of subjects against the shared frame."""
+    valuator = _worker_valuator(model_path, use_ml_model, use_ensemble)
+    _attach_frame(frame_dir, valuator)
+
+    return list(
+        valuator.valuate_many(
+            subjects,
+            _WorkerState.frame,
+            _WorkerState.zone_stats_map,
+            index=_WorkerState.index,
+            chunk_size=len(subjects),
+        )
+    )
+
+
+class ParallelValuator:
+    """
+    Values batches of properties on a pool of worker processes.
+
+    Every batch pins the model version the registry is serving when the
+    batch starts, so all subjects in a batch are valued by the same model
+    even if a hot-swap happens meanwhile. With one worker the batch runs
+    in-process through ``PropertyValuator.valuate_many``.
+    """
+
+    def __init__(
+        self,
+        workers: int | None = None,
+        chunk_size: int = 64,
+        use_ml_model: bool = True,
+        use_ensemble: bool = True,
+        registry: ModelRegistry | None = None,
+    ):
+        """
+        Initialize the executor; worker processes start on first use.
+
+        Args:
+            workers: Number of worker processes (None or 0 = one per CPU)
+            chunk_size: Subjects per worker task
+            use_ml_model: Whether to use ML model predictions
+            use_ensemble: Whether to use ensemble of methods
+            registry: Source of the model (defaults to the process-wide registry)
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.use_ml_model = use_ml_model
+        self.use_ensemble = use_ensemble
+        self.registry = registry if registry is not None else get_model_registry()
+
+        self._pool: ProcessPoolExecutor | None = None
+
+    def __enter__(self) -> "ParallelValuator":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            # Spawned workers do not inherit the server's threads or locks
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=get_context("spawn"),
+            )
+        return self._pool
+
+    def close(self) -> None:
+        """Shut down the worker processes."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+
+    def valuate_many(
+        self,
+        subjects: Iterable[dict[str, Any]],
+        candidate_properties: list[dict[str, Any]] | CandidateFrame,
+        zone_stats_map: dict[str, dict[str, Any]],
+        chunk_size: int | None = None,
+    ) -> Iterator[ValuationResult]:
+        """
+        Value many properties in parallel, yielding results in subject order.
+
+        At most two chunks per worker are in flight, so ``subjects`` can be
+        an arbitrarily long iterator.
+
+        Args:
+            subjects: Subject properties (same fields as ``PropertyValuator.valuate``)
+            candidate_properties: Candidates shared by all subjects
+            zone_stats_map: Zone statistics by zone_id (JSON-serializable)
+            chunk_size: Subjects per worker task (defaults to ``self.chunk_size``)
+
+        Yields:
+            ValuationResult for each subject
+        """
+        chunk_size = chunk_size or self.chunk_size
+
+        if self.workers <= 1:
+            valuator = PropertyValuator(
+                use_ml_model=self.use_ml_model,
+                use_ensemble=self.use_ensemble,
+                registry=self.registry,
+            )
+            yield from valuator.valuate_many(
+                subjects, candidate_properties, zone_stats_map, chunk_size=chunk_size
+            )
+            return
+
+        frame = (
+            candidate_properties
+            if isinstance(candidate_properties, CandidateFrame)
+            else CandidateFrame.from_records(candidate_properties)
+        )
+        model_path = self.registry.current_path
+        model_path = str(model_path) if model_path else None
+
+        share_root = tempfile.mkdtemp(prefix="pricewaze-frame-", dir=SHARED_DIR)
+        pending: deque[Future] = deque()
+        try:
+            frame_dir = str(frame.save(Path(share_root) / "frame"))
+            with open(Path(frame_dir) / ZONE_STATS_FILE, "w", encoding="utf-8") as f:
+                json.dump(zone_stats_map, f)
+
+            pool = self._get_pool()
+            subjects = iter(subjects)
+
+            def submit_next() -> bool:
+                chunk = list(islice(subjects, chunk_size))
+                if chunk:
+                    pending.append(
+                        pool.submit(
+                            _valuate_chunk,
+                            frame_dir,
+                            model_path,
+                            self.use_ml_model,
+                            self.use_ensemble,
+                            chunk,
+                        )
+                    )
+                return bool(chunk)
+
+            # Keep every worker busy while bounding memory held by pending results
+            while len(pending) < 2 * self.workers and submit_next():
+                pass
+
+            while pending:
+                results = pending.popleft().result()
+                submit_next()
+                yield from results
+
+        finally:
+            # The consumer may stop early (e.g. a client disconnect): drop queued
+            # chunks and let running ones finish before their frame is deleted
+            running = [future for future in pending if not future.cancel()]
+            wait(running)
+            shutil.rmtree(share_root, ignore_errors=True)
+
+
+@lru_cache
+def get_parallel_valuator() -> ParallelValuator:
+    """Get the process-wide parallel valuator configured from settings."""
+    settings = get_settings()
+    return ParallelValuator(
+        workers=settings.avm_parallel_workers,
+        chunk_size=settings.avm_parallel_chunk_size,
+    )
@@ -0,0 +1,205 @@
+"""Model Registry - Process-wide AVM model loading and hot-swap."""
+
+import threading
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+from config import get_settings
+
+from .artifact import is_artifact, read_manifest
+from .model import AVMModel
+
+# Optional pointer file in the registry root naming the artifact to serve.
+# Without it the registry serves the artifact with the highest version.
+CURRENT_POINTER_FILE = "CURRENT"
+
+
+@dataclass(frozen=True)
+class _ActiveModel:
+    """Immutable snapshot of the model being served and where it came from."""
+
+    model: AVMModel
+    version: str
+    path: Path
+    loaded_at: float
+
+
+class ModelRegistry:
+    """
+    Loads the current AVM model artifact once and shares it across valuators.
+
+    Artifacts live as version directories under ``root`` (see
+    ``avm.artifact``). ``refresh`` loads a newer artifact completely before
+    swapping a single reference, so in-flight predictions keep using the
+    model they started with and are never blocked by a reload.
+    """
+
+    def __init__(
+        self,
+        root: Path | str | None,
+        poll_interval_seconds: float = 30.0,
+    ):
+        """
+        Initialize the registry.
+
+        Args:
+            root: Directory containing artifact version directories
+                (None disables the registry; ``current`` returns None)
+            poll_interval_seconds: How often the watcher checks for new versions
+        """
+        self.root = Path(root) if root else None
+        self.poll_interval_seconds = poll_interval_seconds
+
+        self._active: _ActiveModel | None = None
+        self._reload_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._watcher: threading.Thread | None = None
+        self._swap_count = 0
+        self._last_checked: float | None = None
+        self._last_error: str | None = None
+
+    def current(self) -> AVMModel | None:
+        """Return the model currently being served (None if none is loaded)."""
+        active = self._active
+        return active.model if active else None
+
+    @property
+    def current_version(self) -> str | None:
+        """Version of the model currently being served."""
+        active = self._active
+        return active.version if active else None
+
+    @property
+    def current_path(self) -> Path | None:
+        """Artifact directory of the model currently being served."""
+        active = self._active
+        return active.path if active else None
+
+    def _select_artifact(self) -> Path | None:
+        """Pick the artifact directory that should be served."""
+        if self.root is None or not self.root.is_dir():
+            return None
+
+        pointer = self.root / CURRENT_POINTER_FILE
+        if pointer.is_file():
+            selected = self.root / pointer.read_text(encoding="utf-8").strip()
+            return selected if is_artifact(selected) else None
+
+        candidates = [
+            path
+            for path in self.root.iterdir()
+            if not path.name.startswith(".") and is_artifact(path)
+        ]
+        if not candidates:
+            return None
+
+        return max(candidates, key=lambda path: read_manifest(path)["version"])
+
+    def refresh(self) -> bool:
+        """
+        Load and swap in the selected artifact if it differs from the active one.
+
+        Returns:
+            True if a new model was swapped in
+        """
+        with self._reload_lock:
+            self._last_checked = time.time()
+            try:
+                selected = self._select_artifact()
+                if selected is None:
+                    return False
+
+                return self._swap_in(selected)
+
+            except Exception as e:
+                # Keep serving the previous model if the new artifact is unusable
+                self._last_error = str(e)
+                return False
+
+    def pin(self, path: Path | str) -> bool:
+        """
+        Serve a specific artifact, e.g. the version a parent process is serving.
+
+        Args:
+            path: Artifact directory
+
+        Returns:
+            True if a new model was swapped in
+        """
+        with self._reload_lock:
+            return self._swap_in(Path(path))
+
+    def _swap_in(self, path: Path) -> bool:
+        """Load an artifact and publish it unless it is already active."""
+        version = read_manifest(path)["version"]
+        active = self._active
+        if active is not None and active.version == version and active.path == path:
+            return False
+
+        # Load fully before publishing; readers keep the old snapshot meanwhile
+        model = AVMModel(model_path=path)
+        self._active = _ActiveModel(
+            model=model,
+            version=version,
+            path=path,
+            loaded_at=time.time(),
+        )
+        self._swap_count += 1
+        self._last_error = None
+        return True
+
+    def start_watching(self) -> None:
+        """Start a background thread that polls for new artifact versions."""
+        if self.root is None or (self._watcher and self._watcher.is_alive()):
+            return
+
+        self._stop_event.clear()
+        self._watcher = threading.Thread(
+            target=self._watch_loop,
+            name="avm-model-registry",
+            daemon=True,
+        )
+        self._watcher.start()
+
+    def stop_watching(self) -> None:
+        """Stop the background watcher thread."""
+        self._stop_event.set()
+        if self._watcher:
+            self._watcher.join(timeout=self.poll_interval_seconds)
+            self._watcher = None
+
+    def _watch_loop(self) -> None:
+        """Poll for new versions until stopped."""
+        while not self._stop_event.wait(self.poll_interval_seconds):
+            self.refresh()
+
+    def status(self) -> dict[str, Any]:
+        """Registry status for health checks."""
+        active = self._active
+        return {
+            "enabled": self.root is not None,
+            "version": active.version if active else None,
+            "path": str(active.path) if active else None,
+            "loaded_at": active.loaded_at if active else None,
+            "swap_count": self._swap_count,
+            "last_checked": self._last_checked,
+            "last_error": self._last_error,
+            "watching": bool(self._watcher and self._watcher.is_alive()),
+        }
+
+
+@lru_cache
+def get_model_registry() -> ModelRegistry:
+    """Get the process-wide model registry, loading and watching on first use."""
+    settings = get_settings()
+    registry = ModelRegistry(
+        root=settings.avm_model_dir or None,
+        poll_interval_seconds=settings.avm_model_poll_seconds,
+    )
+    registry.refresh()
+    if settings.avm_model_poll_seconds > 0:
+        registry.start_watching()
+    return registry
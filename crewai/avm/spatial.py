@@ -0,0 +1,323 @@
+"""Spatial Index - Grid-bucketed radius and k-nearest search over listings."""
+
+import math
+from collections.abc import Hashable, Iterable
+from typing import Any
+
+import numpy as np
+
+EARTH_RADIUS_KM = 6371
+KM_PER_DEGREE_LAT = 2 * math.pi * EARTH_RADIUS_KM / 360
+
+# Half the Earth's circumference: a radius this large covers the globe
+MAX_DISTANCE_KM = math.pi * EARTH_RADIUS_KM
+
+# Slack added to query radii so float differences between the scalar and
+# vectorized haversine never drop a point that sits exactly on the boundary
+RADIUS_EPSILON_KM = 1e-6
+
+# Removed rows are reclaimed once they outnumber live rows and this minimum
+_COMPACT_MIN_ROWS = 64
+
+
+def haversine_km(
+    lat: float,
+    lon: float,
+    lats: np.ndarray,
+    lons: np.ndarray,
+) -> np.ndarray:
+    """
+    Vectorized great circle distance from one point to many points.
+
+    Same formula as ``ComparablesFinder.haversine_distance``.
+
+    Args:
+        lat, lon: Origin latitude and longitude
+        lats, lons: Arrays of target latitudes and longitudes
+
+    Returns:
+        Distances in kilometers
+    """
+    lat1_rad = math.radians(lat)
+    lat2_rad = np.radians(lats)
+    delta_lat = lat2_rad - lat1_rad
+    delta_lon = np.radians(lons) - math.radians(lon)
+
+    a = (
+        np.sin(delta_lat / 2) ** 2
+        + math.cos(lat1_rad) * np.cos(lat2_rad) * np.sin(delta_lon / 2) ** 2
+    )
+    c = 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+
+    return EARTH_RADIUS_KM * c
+
+
+class SpatialIndex:
+    """
+    Incremental spatial index over points keyed by id.
+
+    Points are bucketed into a square lat/lon grid. A radius query only
+    visits the cells overlapping the query's bounding box and refines the
+    result with an exact haversine distance, so search cost grows with the
+    number of nearby points rather than the zone size. Points can be
+    inserted, moved and removed without rebuilding: a move updates the
+    point's row in place, and rows of removed points are compacted away
+    once they outnumber the live ones, so memory follows the live point
+    count over any event stream.
+    """
+
+    def __init__(self, cell_size_km: float = 1.0, initial_capacity: int = 256):
+        """
+        Initialize an empty index.
+
+        Args:
+            cell_size_km: Grid cell edge length (north-south) in kilometers
+            initial_capacity: Initial size of the coordinate arrays
+        """
+        self.cell_size_km = cell_size_km
+        self.cell_size_deg = cell_size_km / KM_PER_DEGREE_LAT
+
+        self.initial_capacity = initial_capacity
+        self._lats = np.empty(initial_capacity, dtype=np.float64)
+        self._lons = np.empty(initial_capacity, dtype=np.float64)
+        self._items: list[Any] = []
+        self._ids: list[Hashable | None] = []
+        self._row_by_id: dict[Hashable, int] = {}
+        self._cells: dict[tuple[int, int], set[int]] = {}
+        self._cell_of_row: list[tuple[int, int] | None] = []
+        self._removed = 0
+
+    @classmethod
+    def from_points(
+        cls,
+        points: Iterable[tuple[Hashable, float, float, Any]],
+        cell_size_km: float = 1.0,
+    ) -> "SpatialIndex":
+        """Build an index from ``(id, latitude, longitude, item)`` tuples."""
+        index = cls(cell_size_km=cell_size_km)
+        for item_id, lat, lon, item in points:
+            index.insert(item_id, lat, lon, item)
+        return index
+
+    def __len__(self) -> int:
+        return len(self._row_by_id)
+
+    def __contains__(self, item_id: Hashable) -> bool:
+        return item_id in self._row_by_id
+
+    def _cell(self, lat: float, lon: float) -> tuple[int, int]:
+        """Grid cell containing a point."""
+        return (
+            math.floor(lat / self.cell_size_deg),
+            math.floor(lon / self.cell_size_deg),
+        )
+
+    def _grow(self) -> None:
+        """Double the coordinate array capacity."""
+        capacity = max(2 * len(self._lats), 1)
+        self._lats = np.resize(self._lats, capacity)
+        self._lons = np.resize(self._lons, capacity)
+
+    def _unlink(self, row: int) -> None:
+        """Drop a row from its grid cell."""
+        cell = self._cell_of_row[row]
+        rows = self._cells[cell]
+        rows.discard(row)
+        if not rows:
+            del self._cells[cell]
+
+    def insert(self, item_id: Hashable, lat: float, lon: float, item: Any = None) -> int:
+        """
+        Insert a point, or move it in place if the id is already indexed.
+
+        A moved point keeps its place in the insertion order.
+
+        Args:
+            item_id: Unique point id
+            lat, lon: Point coordinates
+            item: Payload returned by queries (e.g. the candidate row)
+
+        Returns:
+            Row number of the point (until rows are compacted)
+        """
+        cell = self._cell(lat, lon)
+        row = self._row_by_id.get(item_id)
+
+        if row is None:
+            row = len(self._items)
+            if row >= len(self._lats):
+                self._grow()
+            self._items.append(item)
+            self._ids.append(item_id)
+            self._cell_of_row.append(cell)
+            self._row_by_id[item_id] = row
+        else:
+            self._items[row] = item
+            if self._cell_of_row[row] == cell:
+                cell = None  # Still in the same cell
+            else:
+                self._unlink(row)
+                self._cell_of_row[row] = cell
+
+        self._lats[row] = lat
+        self._lons[row] = lon
+        if cell is not None:
+            self._cells.setdefault(cell, set()).add(row)
+
+        return row
+
+    def remove(self, item_id: Hashable) -> bool:
+        """
+        Remove a point by id.
+
+        Returns:
+            True if the point was indexed
+        """
+        row = self._row_by_id.pop(item_id, None)
+        if row is None:
+            return False
+
+        self._unlink(row)
+        self._cell_of_row[row] = None
+        self._items[row] = None
+        self._ids[row] = None
+
+        self._removed += 1
+        if self._removed > max(len(self._row_by_id), _COMPACT_MIN_ROWS):
+            self._compact()
+        return True
+
+    def _compact(self) -> None:
+        """Reclaim the rows of removed points, keeping live points in insertion order."""
+        live = [row for row, cell in enumerate(self._cell_of_row) if cell is not None]
+        capacity = max(2 * len(live), self.initial_capacity, 1)
+
+        lats = np.empty(capacity, dtype=np.float64)
+        lons = np.empty(capacity, dtype=np.float64)
+        lats[: len(live)] = self._lats[live]
+        lons[: len(live)] = self._lons[live]
+        self._lats, self._lons = lats, lons
+
+        self._items = [self._items[row] for row in live]
+        self._ids = [self._ids[row] for row in live]
+        self._cell_of_row = [self._cell_of_row[row] for row in live]
+        self._row_by_id = {item_id: row for row, item_id in enumerate(self._ids)}
+        self._cells = {}
+        for row, cell in enumerate(self._cell_of_row):
+            self._cells.setdefault(cell, set()).add(row)
+        self._removed = 0
+
+    def get(self, item_id: Hashable) -> Any:
+        """Payload of an indexed point (None if absent)."""
+        row = self._row_by_id.get(item_id)
+        return self._items[row] if row is not None else None
+
+    def _lon_cell_ranges(self, lon: float, lon_span: float) -> list[tuple[int, int]]:
+        """Longitude cell ranges within ``lon_span`` degrees of ``lon``, split at ±180°."""
+        lon = (lon + 180) % 360 - 180
+        if lon_span >= 180:
+            intervals = [(-180.0, 180.0)]
+        elif lon - lon_span < -180:
+            intervals = [(-180.0, lon + lon_span), (lon - lon_span + 360, 180.0)]
+        elif lon + lon_span > 180:
+            intervals = [(lon - lon_span, 180.0), (-180.0, lon + lon_span - 360)]
+        else:
+            intervals = [(lon - lon_span, lon + lon_span)]
+        return [
+            (math.floor(lo / self.cell_size_deg), math.floor(hi / self.cell_size_deg))
+            for lo, hi in intervals
+        ]
+
+    def _rows_near(self, lat: float, lon: float, radius_km: float) -> np.ndarray:
+        """Rows in the grid cells overlapping a query circle's bounding box."""
+        lat_span = radius_km / KM_PER_DEGREE_LAT
+        max_abs_lat = min(abs(lat) + lat_span, 89.999)
+        lon_span = radius_km / (KM_PER_DEGREE_LAT * math.cos(math.radians(max_abs_lat)))
+
+        lat_lo = math.floor((lat - lat_span) / self.cell_size_deg)
+        lat_hi = math.floor((lat + lat_span) / self.cell_size_deg)
+        lon_ranges = self._lon_cell_ranges(lon, lon_span)
+
+        cells = self._cells
+        n_cells = (lat_hi - lat_lo + 1) * sum(hi - lo + 1 for lo, hi in lon_ranges)
+        if n_cells > len(cells):
+            # Query box covers more cells than exist; scan occupied cells instead
+            rows = [
+                row
+                for (i, j), cell_rows in cells.items()
+                if lat_lo <= i <= lat_hi and any(lo <= j <= hi for lo, hi in lon_ranges)
+                for row in cell_rows
+            ]
+        else:
+            rows = [
+                row
+                for i in range(lat_lo, lat_hi + 1)
+                for lo, hi in lon_ranges
+                for j in range(lo, hi + 1)
+                for row in cells.get((i, j), ())
+            ]
+
+        return np.sort(np.fromiter(rows, dtype=np.int64, count=len(rows)))
+
+    def query_radius(
+        self,
+        lat: float,
+        lon: float,
+        radius_km: float,
+    ) -> tuple[list[Any], np.ndarray]:
+        """
+        Find all points within a radius.
+
+        Args:
+            lat, lon: Query point
+            radius_km: Search radius in kilometers
+
+        Returns:
+            Tuple of (items, distances_km), in insertion order
+        """
+        rows = self._rows_near(lat, lon, radius_km)
+        distances = haversine_km(lat, lon, self._lats[rows], self._lons[rows])
+        within = distances <= radius_km + RADIUS_EPSILON_KM
+
+        rows = rows[within]
+        return [self._items[row] for row in rows.tolist()], distances[within]
+
+    def query_knn(
+        self,
+        lat: float,
+        lon: float,
+        k: int,
+        max_radius_km: float | None = None,
+    ) -> tuple[list[Any], np.ndarray]:
+        """
+        Find the k nearest points, optionally within a maximum radius.
+
+        Searches a doubling radius starting at one cell, so only the cells
+        around the query point are visited, up to a radius covering the
+        globe.
+
+        Args:
+            lat, lon: Query point
+            k: Number of neighbours
+            max_radius_km: Optional radius cap
+
+        Returns:
+            Tuple of (items, distances_km), nearest first
+        """
+        if k <= 0 or not self._row_by_id:
+            return [], np.empty(0)
+
+        limit = MAX_DISTANCE_KM if max_radius_km is None else min(max_radius_km, MAX_DISTANCE_KM)
+        radius = self.cell_size_km
+        while True:
+            capped = radius >= limit
+            if capped:
+                radius = limit
+
+            items, distances = self.query_radius(lat, lon, radius)
+            if len(items) >= k or capped or len(items) == len(self._row_by_id):
+                break
+            radius *= 2
+
+        order = np.argsort(distances, kind="stable")[:k]
+        return [items[i] for i in order.tolist()], distances[order]
@@ -0,0 +1,233 @@
+"""Streaming Valuation - Zone-by-zone revaluation with bounded memory.
+
+``iter_valuations`` pages a zone's listings from the data layer into a
+compact CandidateFrame, values its subjects chunk by chunk, and yields one
+flat ``ValuationRecord`` per subject. Full ValuationResults (with their
+comparables) are dropped as soon as their record is built, so memory is
+bounded by one zone's frame plus one chunk of results, however many zones
+or subjects are streamed. Records can be written straight to NDJSON or
+Parquet.
+"""
+
+import importlib.util
+import json
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import asdict, dataclass, fields
+from pathlib import Path
+from typing import IO, Any
+
+from .frame import CandidateFrame
+from .valuation import PropertyValuator, ValuationResult
+
+PYARROW_AVAILABLE = importlib.util.find_spec("pyarrow") is not None
+
+# Fetches one zone's property rows page by page
+PageFetcher = Callable[[str], Iterable[list[dict[str, Any]]]]
+
+
+@dataclass(frozen=True, slots=True)
+class ValuationRecord:
+    """Flat summary of a ValuationResult, without the comparables list."""
+
+    property_id: str
+    zone_id: str
+    estimated_value: float
+    estimated_price_per_m2: float
+    confidence_score: float
+    value_range_low: float
+    value_range_high: float
+    listed_price: float
+    fairness_score: float
+    fairness_label: str
+    price_deviation_percent: float
+    comparables_count: int
+    comp_based_value: float
+    model_type: str
+    model_version: str | None
+
+    @classmethod
+    def from_result(cls, result: ValuationResult) -> "ValuationRecord":
+        """Summarize a full valuation result."""
+        return cls(
+            property_id=result.property_id,
+            zone_id=result.zone_id,
+            estimated_value=result.estimated_value,
+            estimated_price_per_m2=result.estimated_price_per_m2,
+            confidence_score=result.confidence_score,
+            value_range_low=result.value_range_low,
+            value_range_high=result.value_range_high,
+            listed_price=result.listed_price,
+            fairness_score=result.fairness_score,
+            fairness_label=result.fairness_label,
+            price_deviation_percent=result.price_deviation_percent,
+            comparables_count=len(result.comparables),
+            comp_based_value=result.comp_based_value,
+            model_type=result.model_type,
+            model_version=result.model_version,
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to a JSON-serializable dictionary."""
+        return asdict(self)
+
+
+RECORD_FIELDS = [f.name for f in fields(ValuationRecord)]
+
+
+def _default_page_fetcher(page_size: int) -> PageFetcher:
+    """Page zone listings from Supabase."""
+    from tools.database_tools import iter_property_pages
+
+    return lambda zone_id: iter_property_pages({"zone_id": zone_id}, page_size=page_size)
+
+
+def _load_zone(
+    pages: Iterable[list[dict[str, Any]]],
+    candidate_status: str | None,
+) -> tuple[CandidateFrame, CandidateFrame]:
+    """Fold pages of rows into compact subject and candidate frames."""
+    subject_frames = []
+    candidate_frames = []
+    for rows in pages:
+        subject_frames.append(CandidateFrame.from_supabase_rows(rows))
+        candidate_frames.append(
+            CandidateFrame.from_supabase_rows(
+                [row for row in rows if candidate_status is None
+                 or row.get("status") == candidate_status]
+            )
+        )
+    return CandidateFrame.concat(subject_frames), CandidateFrame.concat(candidate_frames)
+
+
+def iter_valuations(
+    zone_ids: Iterable[str],
+    fetch_pages: PageFetcher | None = None,
+    valuator: PropertyValuator | Any | None = None,
+    zone_stats_map: dict[str, dict[str, Any]] | None = None,
+    page_size: int = 1000,
+    chunk_size: int = 256,
+    candidate_status: str | None = "active",
+) -> Iterator[ValuationRecord]:
+    """
+    Value every property in the given zones, one zone and chunk at a time.
+
+    Args:
+        zone_ids: Zones to value
+        fetch_pages: Returns a zone's rows page by page (defaults to
+            paging ``pricewaze_properties`` from Supabase)
+        valuator: Anything with ``valuate_many`` (e.g. a ParallelValuator);
+            defaults to a PropertyValuator that bypasses the valuation cache
+        zone_stats_map: Zone statistics by zone_id (defaults to statistics
+            computed from each zone's candidates)
+        page_size: Rows per page fetched
+        chunk_size: Subjects valued per batch
+        candidate_status: Listing status usable as comparables (None = all)
+
+    Yields:
+        ValuationRecord per property
+    """
+    fetch_pages = fetch_pages or _default_page_fetcher(page_size)
+    # A city-wide sweep would only churn the shared cache
+    valuator = valuator or PropertyValuator(use_cache=False)
+
+    for zone_id in zone_ids:
+        subjects, candidates = _load_zone(fetch_pages(zone_id), candidate_status)
+        if not len(subjects):
+            continue
+
+        stats = zone_stats_map if zone_stats_map is not None else candidates.zone_statistics()
+        results = valuator.valuate_many(
+            (subjects.record(row) for row in range(len(subjects))),
+            candidates,
+            stats,
+            chunk_size=chunk_size,
+        )
+        for result in results:
+            yield ValuationRecord.from_result(result)
+
+
+def write_ndjson(records: Iterable[ValuationRecord], target: Path | str | IO[str]) -> int:
+    """
+    Write records as newline-delimited JSON.
+
+    Args:
+        records: Records to write (consumed lazily)
+        target: File path or open text stream
+
+    Returns:
+        Number of records written
+    """
+    if isinstance(target, (str, Path)):
+        with open(target, "w", encoding="utf-8") as f:
+            return write_ndjson(records, f)
+
+    count = 0
+    for record in records:
+        target.write(json.dumps(record.to_dict(), default=str) + "\n")
+        count += 1
+    return count
+
+
+def write_parquet(
+    records: Iterable[ValuationRecord],
+    path: Path | str,
+    row_group_size: int = 10_000,
+) -> int:
+    """
+    Write records to a Parquet file, one row group at a time.
+
+    Args:
+        records: Records to write (consumed lazily)
+        path: Output file
+        row_group_size: Records buffered per row group
+
+    Returns:
+        Number of records written
+    """
+    if not PYARROW_AVAILABLE:
+        raise RuntimeError("pyarrow required for Parquet output")
+
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.schema(
+        [
+            ("property_id", pa.string()),
+            ("zone_id", pa.string()),
+            ("estimated_value", pa.float64()),
+            ("estimated_price_per_m2", pa.float64()),
+            ("confidence_score", pa.float64()),
+            ("value_range_low", pa.float64()),
+            ("value_range_high", pa.float64()),
+            ("listed_price", pa.float64()),
+            ("fairness_score", pa.float64()),
+            ("fairness_label", pa.string()),
+            ("price_deviation_percent", pa.float64()),
+            ("comparables_count", pa.int32()),
+            ("comp_based_value", pa.float64()),
+            ("model_type", pa.string()),
+            ("model_version", pa.string()),
+        ]
+    )
+
+    count = 0
+    columns: dict[str, list[Any]] = {name: [] for name in RECORD_FIELDS}
+
+    with pq.ParquetWriter(str(path), schema) as writer:
+
+        def flush() -> None:
+            writer.write_table(pa.table(columns, schema=schema))
+            for values in columns.values():
+                values.clear()
+
+        for record in records:
+            for name in RECORD_FIELDS:
+                columns[name].append(getattr(record, name))
+            count += 1
+            if len(columns["property_id"]) >= row_group_size:
+                flush()
+
+        if columns["property_id"] or count == 0:
+            flush()
+
+    return count
@@ -1,16 +1,27 @@
 """Property Valuation - Main AVM Interface."""
 
-from dataclasses import dataclass, field
+from collections.abc import Iterable, Iterator, Mapping
+from dataclasses import dataclass, field, fields
 from datetime import datetime
+from itertools import islice
 from typing import Any
 
+from .cache import ValuationCache, candidate_set_version, get_valuation_cache, valuation_key
 from .comparables import ComparableProperty, ComparablesFinder
-from .model import AVMModel, EnsembleAVM
+from .frame import CandidateFrame
+from .model import AVMModel, EnsembleAVM, PredictionResult, shared_feature_importances
+from .registry import ModelRegistry, get_model_registry
+from .spatial import SpatialIndex
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ValuationResult:
-    """Complete property valuation result."""
+    """
+    Complete property valuation result.
+
+    Immutable, so cached results can be handed to every caller; feature
+    importances are the read-only mapping shared by the serving model version.
+    """
 
     property_id: str
     valuation_date: str
@@ -31,7 +42,7 @@ class ValuationResult:
     price_deviation_percent: float
 
     # Comparables
-    comparables: list[ComparableProperty]
+    comparables: tuple[ComparableProperty, ...]
     comp_based_value: float
     comp_confidence: float
 
@@ -44,8 +55,38 @@ class ValuationResult:
 
     # Model details
     model_type: str
-    methodology_notes: list[str] = field(default_factory=list)
-    feature_importances: dict[str, float] = field(default_factory=dict)
+    methodology_notes: tuple[str, ...] = ()
+    feature_importances: Mapping[str, float] = field(
+        default_factory=lambda: shared_feature_importances({})
+    )
+    model_version: str | None = None  # Registry artifact version that served this result
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to a JSON-serializable dictionary."""
+        data = {name: getattr(self, name) for name in RESULT_FIELDS}
+        data["comparables"] = [comp.to_dict() for comp in self.comparables]
+        data["methodology_notes"] = list(self.methodology_notes)
+        data["feature_importances"] = dict(self.feature_importances)
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "ValuationResult":
+        """Rebuild a result from ``to_dict`` output."""
+        return cls(
+            **{
+                **data,
+                "comparables": tuple(
+                    ComparableProperty.from_dict(c) for c in data.get("comparables", [])
+                ),
+                "methodology_notes": tuple(data.get("methodology_notes", ())),
+                "feature_importances": shared_feature_importances(
+                    data.get("feature_importances", {})
+                ),
+            }
+        )
+
+
+RESULT_FIELDS = tuple(f.name for f in fields(ValuationResult))
 
 
 class PropertyValuator:
@@ -63,6 +104,9 @@ class PropertyValuator:
         self,
         use_ml_model: bool = True,
         use_ensemble: bool = True,
+        registry: ModelRegistry | None = None,
+        cache: ValuationCache | None = None,
+        use_cache: bool = True,
     ):
         """
         Initialize the property valuator.
@@ -70,6 +114,11 @@ class PropertyValuator:
         Args:
             use_ml_model: Whether to use ML model predictions
             use_ensemble: Whether to use ensemble of methods
+            registry: Source of the trained model (defaults to the
+                process-wide registry; falls back to zone statistics when
+                no trained model is available)
+            cache: Valuation cache (defaults to the process-wide cache)
+            use_cache: Whether to read and write the valuation cache
         """
         self.comparables_finder = ComparablesFinder(
             max_distance_km=2.0,
@@ -78,6 +127,8 @@ class PropertyValuator:
         )
         self.use_ml_model = use_ml_model
         self.use_ensemble = use_ensemble
+        self.registry = registry if registry is not None else get_model_registry()
+        self.cache = (cache if cache is not None else get_valuation_cache()) if use_cache else None
 
         if use_ensemble:
             self.ensemble = EnsembleAVM()
@@ -148,8 +199,9 @@ class PropertyValuator:
     def valuate(
         self,
         property_data: dict[str, Any],
-        candidate_properties: list[dict[str, Any]],
+        candidate_properties: list[dict[str, Any]] | CandidateFrame,
         zone_stats: dict[str, Any],
+        index: SpatialIndex | None = None,
     ) -> ValuationResult:
         """
         Perform complete property valuation.
@@ -159,21 +211,110 @@ class PropertyValuator:
                 - id, price, area_m2, bedrooms, bathrooms
                 - latitude, longitude
                 - property_type, condition
-            candidate_properties: List of properties in area for comparables
+            candidate_properties: List of properties in area for comparables,
+                or a CandidateFrame of them
             zone_stats: Zone statistics including:
                 - zone_id, zone_name
                 - avg_price_m2, median_price_m2
                 - property_count
+            index: Optional spatial index over the candidates (see
+                ``ComparablesFinder.build_index``), reused across subjects
+
+        Returns:
+            Complete ValuationResult
+        """
+        ml_model = self.served_model()
+
+        key = None
+        if self.cache is not None:
+            key = self._cache_key(
+                property_data, zone_stats, candidate_set_version(candidate_properties), ml_model
+            )
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+
+        result = self.valuate_with_model(
+            property_data,
+            candidate_properties,
+            zone_stats,
+            index=index,
+            ml_model=ml_model,
+        )
+        if key is not None:
+            self.cache.put(key, result)
+        return result
+
+    def _cache_key(
+        self,
+        property_data: dict[str, Any],
+        zone_stats: dict[str, Any],
+        candidate_version: str,
+        ml_model: AVMModel | None,
+    ) -> str:
+        """Cache key of a valuation by this valuator's method and model."""
+        if self.use_ensemble:
+            method = "ensemble"
+        elif self.use_ml_model:
+            method = "ml"
+        else:
+            method = "comparables"
+        model_version = ml_model.version if ml_model else None
+        return valuation_key(
+            property_data, zone_stats, candidate_version, f"{method}:{model_version}"
+        )
+
+    def served_model(self) -> AVMModel | None:
+        """
+        Snapshot the registry's model so a concurrent hot-swap cannot mix versions.
+
+        Returns:
+            Model to pin for a batch of valuations (None for comparables-only)
+        """
+        return self.registry.current() if (self.use_ensemble or self.use_ml_model) else None
+
+    def prediction_model(self, ml_model: AVMModel | None) -> AVMModel | None:
+        """Model that produces the ML estimate (None for comparables-only)."""
+        if self.use_ensemble:
+            return ml_model or self.ensemble.ml_model
+        if self.use_ml_model:
+            return ml_model or self.model
+        return None
+
+    def valuate_with_model(
+        self,
+        property_data: dict[str, Any],
+        candidate_properties: list[dict[str, Any]] | CandidateFrame,
+        zone_stats: dict[str, Any],
+        index: SpatialIndex | None,
+        ml_model: AVMModel | None,
+        ml_result: PredictionResult | None = None,
+    ) -> ValuationResult:
+        """
+        Value one subject with a pinned model, bypassing the valuation cache.
+
+        Used by batch and incremental pipelines that pin one model for many
+        subjects and predict their ML estimates in a single batch.
+
+        Args:
+            property_data: Subject property
+            candidate_properties: Candidate comparables, or a CandidateFrame of them
+            zone_stats: Zone statistics of the subject
+            index: Optional spatial index over the candidates
+            ml_model: Model from ``served_model``
+            ml_result: Precomputed ML estimate of the subject (from ``prediction_model``)
 
         Returns:
             Complete ValuationResult
         """
         methodology_notes = []
+        model_version = ml_model.version if ml_model else None
 
         # 1. Find comparables
         comparables = self.comparables_finder.find_comparables(
             subject=property_data,
             candidates=candidate_properties,
+            index=index,
         )
 
         # 2. Get comparable-based estimate
@@ -201,6 +342,8 @@ class PropertyValuator:
                 comp_estimate=comp_value,
                 comp_confidence=comp_confidence,
                 zone_stats=zone_stats,
+                ml_model=ml_model,
+                ml_result=ml_result,
             )
             estimated_value = ensemble_result["ensemble_value"]
             estimated_price_m2 = ensemble_result["ensemble_price_per_m2"]
@@ -212,7 +355,8 @@ class PropertyValuator:
             )
 
         elif self.use_ml_model:
-            ml_result = self.model.predict(property_data, zone_stats)
+            if ml_result is None:
+                ml_result = (ml_model or self.model).predict(property_data, zone_stats)
             estimated_value = ml_result.predicted_value
             estimated_price_m2 = ml_result.predicted_price_per_m2
             confidence = ml_result.confidence_score
@@ -225,7 +369,7 @@ class PropertyValuator:
             estimated_value = comp_value
             estimated_price_m2 = comp_price_m2
             confidence = comp_confidence
-            feature_importances = {}
+            feature_importances = shared_feature_importances({})
             model_type = "comparables"
             methodology_notes.append("Using comparable sales approach only")
 
@@ -262,7 +406,7 @@ class PropertyValuator:
             fairness_score=fairness_score,
             fairness_label=fairness_label,
             price_deviation_percent=deviation_percent,
-            comparables=comparables,
+            comparables=tuple(comparables),
             comp_based_value=comp_value,
             comp_confidence=comp_confidence,
             zone_id=zone_stats.get("zone_id", ""),
@@ -271,9 +415,89 @@ class PropertyValuator:
             zone_median_price_m2=zone_stats.get("median_price_m2", 0),
             zone_property_count=zone_stats.get("property_count", 0),
             model_type=model_type,
-            methodology_notes=methodology_notes,
+            methodology_notes=tuple(methodology_notes),
             feature_importances=feature_importances,
+            model_version=model_version,
+        )
+
+    def valuate_many(
+        self,
+        subjects: Iterable[dict[str, Any]],
+        candidate_properties: list[dict[str, Any]] | CandidateFrame,
+        zone_stats_map: dict[str, dict[str, Any]],
+        index: SpatialIndex | None = None,
+        chunk_size: int = 256,
+    ) -> Iterator[ValuationResult]:
+        """
+        Value many properties against one candidate set.
+
+        The candidates are converted to a CandidateFrame and spatially
+        indexed once, one model snapshot serves every subject, and the ML
+        estimates are computed one chunk of subjects at a time with a single
+        batch prediction (skipping subjects found in the valuation cache).
+        Results are yielded in subject order as they are produced, so
+        callers can stream them.
+
+        Args:
+            subjects: Subject properties (same fields as ``valuate``)
+            candidate_properties: Candidates shared by all subjects
+            zone_stats_map: Zone statistics by zone_id
+            index: Optional prebuilt spatial index over the candidates
+            chunk_size: Subjects per batch prediction
+
+        Yields:
+            ValuationResult for each subject
+        """
+        frame = (
+            candidate_properties
+            if isinstance(candidate_properties, CandidateFrame)
+            else CandidateFrame.from_records(candidate_properties)
         )
+        if index is None:
+            index = self.comparables_finder.build_index(frame)
+
+        ml_model = self.served_model()
+        prediction_model = self.prediction_model(ml_model)
+        candidate_version = frame.fingerprint() if self.cache is not None else None
+
+        subjects = iter(subjects)
+        while chunk := list(islice(subjects, chunk_size)):
+            zone_stats_list = [
+                zone_stats_map.get(subject.get("zone_id", ""), {}) for subject in chunk
+            ]
+
+            keys: list[str | None] = [None] * len(chunk)
+            cached: list[ValuationResult | None] = [None] * len(chunk)
+            if self.cache is not None:
+                keys = [
+                    self._cache_key(subject, zone_stats, candidate_version, ml_model)
+                    for subject, zone_stats in zip(chunk, zone_stats_list)
+                ]
+                cached = [self.cache.get(key) for key in keys]
+
+            # One batch prediction for the subjects that missed the cache
+            misses = [i for i, result in enumerate(cached) if result is None]
+            ml_results: dict[int, PredictionResult] = {}
+            if prediction_model is not None and misses:
+                predictions = prediction_model.predict_batch(
+                    [chunk[i] for i in misses], zone_stats_map, as_results=True
+                )
+                ml_results = dict(zip(misses, predictions))
+
+            for i, subject in enumerate(chunk):
+                result = cached[i]
+                if result is None:
+                    result = self.valuate_with_model(
+                        subject,
+                        frame,
+                        zone_stats_list[i],
+                        index=index,
+                        ml_model=ml_model,
+                        ml_result=ml_results.get(i),
+                    )
+                    if keys[i] is not None:
+                        self.cache.put(keys[i], result)
+                yield result
 
     def quick_estimate(
         self,
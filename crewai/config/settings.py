@@ -1,5 +1,6 @@
 """Configuration settings for PriceWaze CrewAI system."""
 
+import tempfile
 from functools import lru_cache
 from pathlib import Path
 
@@ -22,6 +23,31 @@ class Settings(BaseSettings):
     next_public_supabase_url: str = ""
     next_public_supabase_anon_key: str = ""
 
+    # Supabase HTTP Pool Configuration
+    supabase_pool_max_connections: int = 20
+    supabase_pool_max_keepalive: int = 10  # Idle connections kept open for reuse
+    supabase_pool_keepalive_seconds: float = 30.0
+    supabase_connect_timeout: float = 5.0
+    supabase_read_timeout: float = 30.0
+    supabase_http2: bool = False
+    market_stats_rpc: bool = True  # Aggregate market stats in Postgres (pricewaze_market_stats)
+
+    # Data Backend Configuration
+    data_backend: str = "supabase"  # "supabase" or "sqlite" (local, offline)
+    local_db_path: str = ""  # SQLite file of the sqlite backend (see seed_local_db.py)
+
+    # Tool Fetch Cache Configuration
+    fetch_cache_max_entries: int = 1024  # 0 disables the cache
+    fetch_cache_property_ttl_seconds: float = 60.0
+    fetch_cache_zone_ttl_seconds: float = 120.0
+
+    # LLM Response Cache Configuration
+    llm_cache_max_entries: int = 512  # Responses kept in memory per process; 0 disables the cache
+    llm_cache_ttl_seconds: float = 3600.0
+    llm_cache_path: str = ""  # SQLite file shared by all processes and kept across restarts; empty = memory only
+    llm_cache_max_disk_entries: int = 20000
+    llm_cache_bypass: bool = False  # Always call the model (fresh responses still refresh the cache)
+
     # DeepSeek AI Configuration
     deepseek_api_key: str = ""
     deepseek_base_url: str = "https://api.deepseek.com"
@@ -32,11 +58,48 @@ class Settings(BaseSettings):
     api_port: int = 8000
     api_debug: bool = False
 
+    # Execution Layer Configuration (per work class: concurrent runs, waiting runs)
+    exec_crew_workers: int = 4
+    exec_crew_queue: int = 16
+    exec_tool_workers: int = 16
+    exec_tool_queue: int = 128
+    exec_avm_workers: int = 2
+    exec_avm_queue: int = 4
+    exec_queue_timeout_seconds: float = 120.0  # Queued work not started by then gets 503
+    event_loop_lag_interval_seconds: float = 0.5
+
+    # Async Job Store Configuration
+    job_store_max_entries: int = 1000  # Finished jobs kept in memory per process
+    job_ttl_seconds: float = 86400.0  # Jobs are dropped this long after their last update
+    job_store_path: str = str(Path(tempfile.gettempdir()) / "pricewaze" / "jobs.db")  # Shared by all workers; empty = per-process memory
+
+    # Job Worker Configuration (see run_workers.py)
+    job_inline: bool = False  # Run async jobs on the API crew pool instead of job workers
+    job_workers: int = 2  # Jobs run concurrently per job worker, each in its own process
+    job_timeout_seconds: float = 900.0  # Longest run of one attempt
+    job_max_attempts: int = 2
+    job_retry_backoff_seconds: float = 15.0  # Doubles on every further retry
+    job_worker_lease_seconds: float = 60.0  # Jobs of a worker silent this long are retried
+    job_poll_interval_seconds: float = 0.5
+
     # CrewAI Configuration
     crew_verbose: bool = True
     crew_memory: bool = True
     crew_max_rpm: int = 10
 
+    # AVM Model Registry Configuration
+    avm_model_dir: str = ""  # Directory of versioned model artifacts; empty disables
+    avm_model_poll_seconds: float = 30.0  # 0 disables hot-reload watching
+
+    # AVM Parallel Valuation Configuration
+    avm_parallel_workers: int = 0  # Worker processes; 0 = one per CPU, 1 = in-process
+    avm_parallel_chunk_size: int = 64  # Subjects per worker task
+
+    # AVM Valuation Cache Configuration
+    avm_cache_max_entries: int = 4096  # In-process entries; 0 disables the cache
+    avm_cache_ttl_seconds: float = 900.0
+    avm_cache_path: str = ""  # SQLite file shared between processes; empty disables
+
     @property
     def effective_supabase_url(self) -> str:
         """Get Supabase URL from either direct or Next.js env var."""
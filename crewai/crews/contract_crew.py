@@ -3,10 +3,13 @@
 from typing import Any
 
 from crewai import Crew, Task, Process
-from langchain_openai import ChatOpenAI
 
 from agents import LegalAdvisorAgent, NegotiationAdvisorAgent
 from config import get_settings
+from tools.fetch_cache import track_fetches
+
+from .llm import create_llm
+from .llm_cache import track_llm_cache
 
 
 class ContractGenerationCrew:
@@ -18,12 +21,7 @@ class ContractGenerationCrew:
         self.settings = get_settings()
 
         # Initialize LLM with DeepSeek
-        self.llm = ChatOpenAI(
-            model=self.settings.deepseek_model,
-            api_key=self.settings.deepseek_api_key,
-            base_url=self.settings.deepseek_base_url,
-            temperature=0.2,  # Lower temperature for legal documents
-        )
+        self.llm = create_llm(temperature=0.2)  # Lower temperature for legal documents
 
         # Create agents
         self.legal_advisor = LegalAdvisorAgent.create(llm=self.llm, verbose=verbose)
@@ -174,7 +172,8 @@ class ContractGenerationCrew:
             max_rpm=self.settings.crew_max_rpm,
         )
 
-        result = crew.kickoff()
+        with track_fetches() as fetch_stats, track_llm_cache() as llm_stats:
+            result = crew.kickoff()
 
         # Extract contract from generation task
         contract_output = tasks[1].output.raw if tasks[1].output else ""
@@ -194,4 +193,6 @@ class ContractGenerationCrew:
                 }
                 for task in tasks
             ],
+            "fetch_cache": fetch_stats.to_dict(),
+            "llm_cache": llm_stats.to_dict(),
         }
@@ -1,9 +1,9 @@
 """Full Property Analysis Crew - Comprehensive end-to-end property analysis."""
 
+from collections.abc import Callable
 from typing import Any
 
 from crewai import Crew, Task, Process
-from langchain_openai import ChatOpenAI
 
 from agents import (
     MarketAnalystAgent,
@@ -13,6 +13,11 @@ from agents import (
     CoordinatorAgent,
 )
 from config import get_settings
+from tools.fetch_cache import track_fetches
+
+from .llm import create_llm
+from .llm_cache import track_llm_cache
+from .progress import TaskProgress, usage_metrics
 
 
 class FullPropertyAnalysisCrew:
@@ -24,12 +29,7 @@ class FullPropertyAnalysisCrew:
         self.settings = get_settings()
 
         # Initialize LLM with DeepSeek
-        self.llm = ChatOpenAI(
-            model=self.settings.deepseek_model,
-            api_key=self.settings.deepseek_api_key,
-            base_url=self.settings.deepseek_base_url,
-            temperature=0.3,
-        )
+        self.llm = create_llm(temperature=0.3)
 
         # Create all specialist agents
         self.market_analyst = MarketAnalystAgent.create(llm=self.llm, verbose=verbose)
@@ -215,6 +215,7 @@ class FullPropertyAnalysisCrew:
         generate_contract: bool = False,
         buyer_name: str | None = None,
         seller_name: str | None = None,
+        progress: Callable[[dict[str, Any]], None] | None = None,
     ) -> dict[str, Any]:
         """
         Run comprehensive property analysis.
@@ -225,6 +226,7 @@ class FullPropertyAnalysisCrew:
             generate_contract: Whether to generate contract framework
             buyer_name: Buyer name (required if generate_contract=True)
             seller_name: Seller name (required if generate_contract=True)
+            progress: Receives an event as each task completes (see ``TaskProgress``)
 
         Returns:
             Complete multi-agent analysis results
@@ -245,6 +247,7 @@ class FullPropertyAnalysisCrew:
             self.coordinator,
         ]
 
+        task_progress = TaskProgress(tasks, progress) if progress else None
         crew = Crew(
             agents=agents,
             tasks=tasks,
@@ -252,9 +255,13 @@ class FullPropertyAnalysisCrew:
             verbose=self.verbose,
             memory=self.settings.crew_memory,
             max_rpm=self.settings.crew_max_rpm,
+            task_callback=task_progress,
         )
+        if task_progress:
+            task_progress.bind(crew)
 
-        result = crew.kickoff()
+        with track_fetches() as fetch_stats, track_llm_cache() as llm_stats:
+            result = crew.kickoff()
 
         return {
             "property_id": property_id,
@@ -271,4 +278,7 @@ class FullPropertyAnalysisCrew:
                 for task in tasks
             ],
             "agents_used": [agent.role for agent in agents],
+            "fetch_cache": fetch_stats.to_dict(),
+            "llm_cache": llm_stats.to_dict(),
+            "token_usage": usage_metrics(crew),
         }
@@ -0,0 +1,95 @@
+"""Crew LLM - DeepSeek language model of the crews, with response caching.
+
+CrewAI turns any LangChain chat model it is given into its own ``LLM``
+and calls that, so the crews build the ``LLM`` directly. ``LLM(...)`` is a
+factory returning a provider-specific client, so the response cache
+(``crews.llm_cache``) wraps the ``call`` method of the client it returns
+rather than subclassing ``LLM``.
+"""
+
+from functools import wraps
+from typing import Any
+
+from crewai import LLM
+
+from config import get_settings
+
+from .llm_cache import USAGE_FIELDS, LLMCache, get_llm_cache, llm_cache_key
+
+
+def _token_usage(llm: Any) -> dict[str, int]:
+    """Tokens an LLM client has used so far (empty if it does not track them)."""
+    summary = getattr(llm, "get_token_usage_summary", None)
+    if summary is None:
+        return {}
+    usage = summary()
+    return usage.model_dump() if hasattr(usage, "model_dump") else dict(usage)
+
+
+def cache_responses(llm: Any, cache: LLMCache) -> Any:
+    """
+    Answer repeated calls of an LLM client from a response cache.
+
+    Calls that run functions themselves (``available_functions``) have
+    side effects and always reach the model. The tokens a stored response
+    cost are the client's usage during the call.
+
+    Args:
+        llm: CrewAI LLM client (whatever ``LLM(...)`` returned)
+        cache: Response cache
+
+    Returns:
+        The same client, its ``call`` now cached
+    """
+    call = llm.call
+
+    @wraps(call)
+    def cached_call(
+        messages: str | list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        callbacks: list[Any] | None = None,
+        available_functions: dict[str, Any] | None = None,
+        **kwargs: Any,
+    ) -> Any:
+        if available_functions:
+            return call(messages, tools, callbacks, available_functions, **kwargs)
+
+        # Stop sequences of this call (``stop_sequences`` includes per-call overrides)
+        stop = getattr(llm, "stop_sequences", getattr(llm, "stop", None))
+        key = llm_cache_key(llm.model, llm.temperature, messages, tools, stop=stop)
+        cached = cache.get(key)
+        if cached is not None:
+            return cached.response
+
+        before = _token_usage(llm)
+        response = call(messages, tools, callbacks, available_functions, **kwargs)
+        if isinstance(response, str) and response.strip():
+            after = _token_usage(llm)
+            usage = {name: after.get(name, 0) - before.get(name, 0) for name in USAGE_FIELDS}
+            cache.put(key, llm.model, response, usage)
+        return response
+
+    # An instance attribute, so it shadows the method of whichever client class this is
+    object.__setattr__(llm, "call", cached_call)
+    return llm
+
+
+def create_llm(temperature: float = 0.3) -> Any:
+    """
+    Create the DeepSeek model the crews' agents share.
+
+    Args:
+        temperature: Sampling temperature
+
+    Returns:
+        CrewAI LLM client whose responses are cached (unless disabled in settings)
+    """
+    settings = get_settings()
+    llm = LLM(
+        model=settings.deepseek_model,
+        api_key=settings.deepseek_api_key,
+        base_url=settings.deepseek_base_url,
+        temperature=temperature,
+    )
+    cache = get_llm_cache()
+    return cache_responses(llm, cache) if cache is not None else llm
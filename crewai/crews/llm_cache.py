@@ -0,0 +1,336 @@
+"""LLM Cache - Deterministic response cache for crew LLM calls.
+
+Analyzing the same property with the same inputs minutes apart sends the
+agents the same prompts, and each one pays full DeepSeek latency and cost.
+Responses are therefore cached under a hash of the model, the temperature
+and the normalized conversation. The conversation includes the tool
+results the agent has observed so far, so a changed listing or zone yields
+different tool output, a different key, and a fresh call; identical
+inputs replay the stored response, which also makes repeated runs
+deterministic.
+
+The in-process tier is an LRU with TTL. An optional SQLite file adds a
+disk tier, bounded in entries, shared by every process that opens it (API
+workers, job workers) and kept across restarts. With the bypass flag set
+every call goes to the model and refreshes the stored response.
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+from config import get_settings
+
+# Token counts stored with each response and credited as saved on hits
+USAGE_FIELDS = ("prompt_tokens", "completion_tokens", "total_tokens")
+
+# Disk entries beyond the limit are evicted every this many stores
+_TRIM_EVERY = 50
+
+
+def _normalize(content: Any) -> str:
+    """Message content with whitespace runs collapsed (structured content as JSON)."""
+    if not isinstance(content, str):
+        content = json.dumps(content, sort_keys=True, default=str)
+    return " ".join(content.split())
+
+
+def llm_cache_key(
+    model: str,
+    temperature: float | None,
+    messages: str | list[dict[str, Any]],
+    tools: list[dict[str, Any]] | None = None,
+    stop: list[str] | None = None,
+) -> str:
+    """
+    Content address of an LLM call.
+
+    Args:
+        model: Model name
+        temperature: Sampling temperature
+        messages: Prompt or chat messages, tool observations included
+        tools: Function-calling tool schemas offered to the model
+        stop: Stop sequences
+
+    Returns:
+        Hex digest key
+    """
+    if isinstance(messages, str):
+        messages = [{"role": "user", "content": messages}]
+    payload = {
+        "model": model,
+        "temperature": temperature,
+        "messages": [
+            [message.get("role", ""), _normalize(message.get("content", ""))]
+            for message in messages
+        ],
+        "tools": tools or [],
+        "stop": list(stop or []),
+    }
+    encoded = json.dumps(payload, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+@dataclass
+class LLMCacheStats:
+    """Counters of the LLM cache, process-wide or for one crew run."""
+
+    hits: int = 0
+    disk_hits: int = 0  # Hits served by the disk tier (included in hits)
+    misses: int = 0  # Calls that went to the model
+    bypassed: int = 0  # Calls sent to the model because of the bypass flag
+    saved_prompt_tokens: int = 0
+    saved_completion_tokens: int = 0
+    saved_tokens: int = 0
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to a JSON-serializable dictionary."""
+        calls = self.hits + self.misses + self.bypassed
+        return {
+            **asdict(self),
+            "hit_rate": round(self.hits / calls, 3) if calls else 0.0,
+        }
+
+
+# Statistics of the crew run in progress (see ``track_llm_cache``)
+_run_stats: ContextVar[LLMCacheStats | None] = ContextVar("llm_cache_run_stats", default=None)
+
+
+@contextmanager
+def track_llm_cache() -> Iterator[LLMCacheStats]:
+    """
+    Collect LLM cache statistics for the code run inside the block.
+
+    Yields:
+        LLMCacheStats updated as agents call the model within the block
+    """
+    stats = LLMCacheStats()
+    token = _run_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _run_stats.reset(token)
+
+
+@dataclass
+class CachedResponse:
+    """A stored model response and the tokens it cost."""
+
+    response: str
+    usage: dict[str, int]
+    expires_at: float
+
+
+class LLMCache:
+    """
+    Two-tier LLM response cache: in-process LRU with TTL, optional SQLite disk tier.
+
+    Thread-safe.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 512,
+        ttl_seconds: float = 3600.0,
+        sqlite_path: Path | str | None = None,
+        max_disk_entries: int = 20000,
+        bypass: bool = False,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum responses in the in-process tier
+            ttl_seconds: Time to live of a response in both tiers
+            sqlite_path: Optional SQLite file of the disk tier
+            max_disk_entries: Maximum responses in the disk tier
+            bypass: Never serve cached responses (still store fresh ones)
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.sqlite_path = Path(sqlite_path) if sqlite_path else None
+        self.max_disk_entries = max_disk_entries
+        self.bypass = bypass
+
+        self._entries: OrderedDict[str, CachedResponse] = OrderedDict()
+        self._lock = threading.Lock()
+        self._db: sqlite3.Connection | None = None
+        self._stored_since_trim = 0
+        self._stats = LLMCacheStats()
+        self._evictions = 0
+
+    def _connection(self) -> sqlite3.Connection | None:
+        """Open the disk tier lazily (after any fork). Call with the lock held."""
+        if self.sqlite_path is None:
+            return None
+        if self._db is None:
+            self.sqlite_path.parent.mkdir(parents=True, exist_ok=True)
+            db = sqlite3.connect(self.sqlite_path, timeout=5.0, check_same_thread=False)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            db.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS llm_cache (
+                    key TEXT PRIMARY KEY,
+                    model TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    expires_at REAL NOT NULL,
+                    response TEXT NOT NULL,
+                    usage TEXT NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_llm_cache_created_at
+                    ON llm_cache(created_at);
+                """
+            )
+            self._db = db
+        return self._db
+
+    def _count(self, name: str, amount: int = 1) -> None:
+        """Count an event process-wide and for the current run. Call with the lock held."""
+        for stats in (self._stats, _run_stats.get()):
+            if stats is not None:
+                setattr(stats, name, getattr(stats, name) + amount)
+
+    def _hit(self, entry: CachedResponse) -> None:
+        """Count a hit and the tokens it saved. Call with the lock held."""
+        self._count("hits")
+        self._count("saved_prompt_tokens", entry.usage.get("prompt_tokens", 0))
+        self._count("saved_completion_tokens", entry.usage.get("completion_tokens", 0))
+        self._count("saved_tokens", entry.usage.get("total_tokens", 0))
+
+    def _remember(self, key: str, entry: CachedResponse) -> None:
+        """Insert into the in-process LRU, evicting the oldest entries. Call with the lock held."""
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._evictions += 1
+
+    def get(self, key: str) -> CachedResponse | None:
+        """
+        Look up a response; counts a hit, a miss or a bypass.
+
+        Args:
+            key: Key from ``llm_cache_key``
+
+        Returns:
+            Cached response, or None if the model must be called
+        """
+        now = time.time()
+        with self._lock:
+            if self.bypass:
+                self._count("bypassed")
+                return None
+
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry.expires_at > now:
+                    self._entries.move_to_end(key)
+                    self._hit(entry)
+                    return entry
+                del self._entries[key]
+
+            db = self._connection()
+            if db is not None:
+                row = db.execute(
+                    "SELECT response, usage, expires_at FROM llm_cache "
+                    "WHERE key = ? AND expires_at > ?",
+                    (key, now),
+                ).fetchone()
+                if row is not None:
+                    entry = CachedResponse(
+                        response=row[0], usage=json.loads(row[1]), expires_at=row[2]
+                    )
+                    self._remember(key, entry)
+                    self._hit(entry)
+                    self._count("disk_hits")
+                    return entry
+
+            self._count("misses")
+            return None
+
+    def put(self, key: str, model: str, response: str, usage: dict[str, int] | None = None) -> None:
+        """
+        Store a model response in every tier.
+
+        Args:
+            key: Key from ``llm_cache_key``
+            model: Model that produced the response
+            response: Response text
+            usage: Tokens the call used (``USAGE_FIELDS``)
+        """
+        now = time.time()
+        usage = {name: int((usage or {}).get(name, 0)) for name in USAGE_FIELDS}
+        entry = CachedResponse(response=response, usage=usage, expires_at=now + self.ttl_seconds)
+        with self._lock:
+            self._remember(key, entry)
+
+            db = self._connection()
+            if db is not None:
+                with db:
+                    db.execute(
+                        "INSERT OR REPLACE INTO llm_cache VALUES (?, ?, ?, ?, ?, ?)",
+                        (key, model, now, entry.expires_at, response, json.dumps(usage)),
+                    )
+                self._stored_since_trim += 1
+                if self._stored_since_trim >= _TRIM_EVERY:
+                    self._trim(db, now)
+
+    def _trim(self, db: sqlite3.Connection, now: float) -> None:
+        """Drop expired and the oldest excess disk entries. Call with the lock held."""
+        self._stored_since_trim = 0
+        with db:
+            db.execute("DELETE FROM llm_cache WHERE expires_at <= ?", (now,))
+            cursor = db.execute(
+                "DELETE FROM llm_cache WHERE key IN ("
+                "SELECT key FROM llm_cache ORDER BY created_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_disk_entries,),
+            )
+        self._evictions += cursor.rowcount
+
+    def clear(self) -> None:
+        """Drop every response from both tiers."""
+        with self._lock:
+            self._entries.clear()
+            db = self._connection()
+            if db is not None:
+                with db:
+                    db.execute("DELETE FROM llm_cache")
+
+    def stats(self) -> dict[str, Any]:
+        """Process-wide counters and tier sizes for health checks."""
+        with self._lock:
+            return {
+                **self._stats.to_dict(),
+                "evictions": self._evictions,
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "bypass": self.bypass,
+                "disk_tier": str(self.sqlite_path) if self.sqlite_path else None,
+            }
+
+
+@lru_cache
+def get_llm_cache() -> LLMCache | None:
+    """Get the process-wide LLM response cache (None when disabled in settings)."""
+    settings = get_settings()
+    if settings.llm_cache_max_entries <= 0:
+        return None
+    return LLMCache(
+        max_entries=settings.llm_cache_max_entries,
+        ttl_seconds=settings.llm_cache_ttl_seconds,
+        sqlite_path=settings.llm_cache_path or None,
+        max_disk_entries=settings.llm_cache_max_disk_entries,
+        bypass=settings.llm_cache_bypass,
+    )
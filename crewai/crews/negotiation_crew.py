@@ -3,10 +3,13 @@
 from typing import Any
 
 from crewai import Crew, Task, Process
-from langchain_openai import ChatOpenAI
 
 from agents import PricingAnalystAgent, NegotiationAdvisorAgent
 from config import get_settings
+from tools.fetch_cache import track_fetches
+
+from .llm import create_llm
+from .llm_cache import track_llm_cache
 
 
 class NegotiationAdvisoryCrew:
@@ -18,12 +21,7 @@ class NegotiationAdvisoryCrew:
         self.settings = get_settings()
 
         # Initialize LLM with DeepSeek
-        self.llm = ChatOpenAI(
-            model=self.settings.deepseek_model,
-            api_key=self.settings.deepseek_api_key,
-            base_url=self.settings.deepseek_base_url,
-            temperature=0.3,
-        )
+        self.llm = create_llm(temperature=0.3)
 
         # Create agents
         self.pricing_analyst = PricingAnalystAgent.create(llm=self.llm, verbose=verbose)
@@ -165,7 +163,8 @@ class NegotiationAdvisoryCrew:
             max_rpm=self.settings.crew_max_rpm,
         )
 
-        result = crew.kickoff()
+        with track_fetches() as fetch_stats, track_llm_cache() as llm_stats:
+            result = crew.kickoff()
 
         return {
             "property_id": property_id,
@@ -179,6 +178,8 @@ class NegotiationAdvisoryCrew:
                 }
                 for task in tasks
             ],
+            "fetch_cache": fetch_stats.to_dict(),
+            "llm_cache": llm_stats.to_dict(),
         }
 
     def run_seller_advice(
@@ -209,7 +210,8 @@ class NegotiationAdvisoryCrew:
             max_rpm=self.settings.crew_max_rpm,
         )
 
-        result = crew.kickoff()
+        with track_fetches() as fetch_stats, track_llm_cache() as llm_stats:
+            result = crew.kickoff()
 
         return {
             "property_id": property_id,
@@ -223,4 +225,6 @@ class NegotiationAdvisoryCrew:
                 }
                 for task in tasks
             ],
+            "fetch_cache": fetch_stats.to_dict(),
+            "llm_cache": llm_stats.to_dict(),
         }
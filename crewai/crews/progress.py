@@ -0,0 +1,75 @@
+"""Task Progress - Per-task progress events of a running crew.
+
+A full analysis runs for minutes; clients that only see the final result
+wait for all of it. ``TaskProgress`` is passed to a crew as its
+``task_callback`` and reports every finished task as it completes: the
+task output, elapsed time, and the tokens the task used (the difference of
+the crew's usage metrics since the previous task).
+"""
+
+import time
+from collections.abc import Callable
+from typing import Any
+
+from crewai import Crew, Task
+
+
+def usage_metrics(crew: Crew) -> dict[str, int]:
+    """Token usage of a crew's agents so far (prompt, completion, total, requests)."""
+    metrics = crew.calculate_usage_metrics()
+    return {
+        name: value
+        for name, value in metrics.model_dump().items()
+        if isinstance(value, int)
+    }
+
+
+class TaskProgress:
+    """Crew ``task_callback`` that emits one progress event per finished task."""
+
+    def __init__(self, tasks: list[Task], emit: Callable[[dict[str, Any]], None]):
+        """
+        Initialize the tracker; the clock starts now.
+
+        Args:
+            tasks: The crew's tasks, in execution order
+            emit: Receives each event (e.g. ``JobStore.add_event`` of the job)
+        """
+        self.tasks = tasks
+        self.emit = emit
+        self.crew: Crew | None = None
+        self._started_at = time.monotonic()
+        self._last_at = self._started_at
+        self._last_usage: dict[str, int] = {}
+        self._completed = 0
+
+    def bind(self, crew: Crew) -> None:
+        """Attach the crew whose token usage is reported."""
+        self.crew = crew
+
+    def __call__(self, output: Any) -> None:
+        """Report a finished task (``TaskOutput``)."""
+        now = time.monotonic()
+        usage = usage_metrics(self.crew) if self.crew is not None else {}
+        task = self.tasks[self._completed] if self._completed < len(self.tasks) else None
+        self._completed += 1
+
+        self.emit(
+            {
+                "type": "task",
+                "task_index": self._completed,
+                "task_count": len(self.tasks),
+                "specialist": getattr(output, "agent", None)
+                or (task.agent.role if task is not None and task.agent else "Unknown"),
+                "task": (task.description[:100] + "...") if task is not None else None,
+                "output": getattr(output, "raw", None) or str(output),
+                "elapsed_seconds": round(now - self._started_at, 2),
+                "task_seconds": round(now - self._last_at, 2),
+                "token_usage": {
+                    name: value - self._last_usage.get(name, 0) for name, value in usage.items()
+                },
+                "total_token_usage": usage,
+            }
+        )
+        self._last_at = now
+        self._last_usage = usage
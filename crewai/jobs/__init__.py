@@ -0,0 +1,26 @@
+"""Jobs Module - Async analysis jobs: shared job store, queue and job workers."""
+
+from .handlers import JOB_HANDLERS, execute_job
+from .store import (
+    JOB_STATES,
+    PRIORITIES,
+    InvalidTransitionError,
+    Job,
+    JobEvent,
+    JobStore,
+    get_job_store,
+)
+from .worker import JobWorker
+
+__all__ = [
+    "JOB_HANDLERS",
+    "JOB_STATES",
+    "PRIORITIES",
+    "InvalidTransitionError",
+    "Job",
+    "JobEvent",
+    "JobStore",
+    "JobWorker",
+    "execute_job",
+    "get_job_store",
+]
@@ -0,0 +1,57 @@
+"""Job Handlers - The work behind each async job type.
+
+Handlers take the JSON parameters a job was created with and a progress
+callback, which appends events to the job while it runs, and return the
+JSON-serializable result. They run in job worker processes, or on the API
+crew pool when jobs run inline.
+"""
+
+from collections.abc import Callable
+from typing import Any
+
+Progress = Callable[[dict[str, Any]], None]
+
+
+def run_pricing_analysis(params: dict[str, Any], progress: Progress) -> dict[str, Any]:
+    """Pricing Analysis Crew run (``/pricing/analyze/async``)."""
+    from crews import PricingAnalysisCrew
+
+    crew = PricingAnalysisCrew(verbose=True)
+    return crew.run(property_id=params["property_id"], zone_id=params.get("zone_id"))
+
+
+def run_full_analysis(params: dict[str, Any], progress: Progress) -> dict[str, Any]:
+    """Full Property Analysis Crew run (``/analysis/full/async``), reporting each task."""
+    from crews import FullPropertyAnalysisCrew
+
+    crew = FullPropertyAnalysisCrew(verbose=True)
+    return crew.run(
+        property_id=params["property_id"],
+        buyer_budget=params.get("buyer_budget"),
+        generate_contract=params.get("generate_contract", False),
+        buyer_name=params.get("buyer_name"),
+        seller_name=params.get("seller_name"),
+        progress=progress,
+    )
+
+
+# Job type -> handler
+JOB_HANDLERS: dict[str, Callable[[dict[str, Any], Progress], Any]] = {
+    "pricing_analysis": run_pricing_analysis,
+    "full_analysis": run_full_analysis,
+}
+
+
+def execute_job(kind: str, params: dict[str, Any], progress: Progress | None = None) -> Any:
+    """
+    Run the handler of a job type.
+
+    Args:
+        kind: Job type
+        params: Job parameters
+        progress: Receives progress events (default: dropped)
+
+    Raises:
+        KeyError: If the job type has no handler
+    """
+    return JOB_HANDLERS[kind](params, progress or (lambda event: None))
@@ -0,0 +1,776 @@
+"""Job Store - Bounded, durable state of async analysis jobs.
+
+Async endpoints return a job id and the client polls for the result. With
+several uvicorn workers the poll can land on any of them, and results kept
+in a module-level dict grow without bound under sustained traffic. Jobs
+are therefore written to a SQLite file shared by every process on the
+host; each process keeps a bounded LRU of finished jobs, which never
+change again, so repeated polls of a result skip the database. Every job
+expires after a TTL from its last state change, and every state change is
+recorded with its timestamp.
+
+The same file is the local job queue the job workers (``jobs.worker``)
+pull from: queued jobs are claimed by priority, failed attempts are
+requeued with exponential backoff, and running jobs carry a heartbeat so
+the jobs of a worker that died are recovered. Handlers append progress
+events (e.g. each finished crew task) that clients stream while the job
+runs.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass, field, replace
+from datetime import UTC, datetime
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+from config import get_settings
+
+JOB_STATES = ("queued", "running", "completed", "failed", "cancelled")
+TERMINAL_STATES = frozenset({"completed", "failed", "cancelled"})
+
+# Claim order: lower values first
+PRIORITIES = {"interactive": 0, "batch": 10}
+
+# Allowed state changes (running -> queued is a retry); terminal states have none
+_TRANSITIONS = {
+    "queued": frozenset({"running", "failed", "cancelled"}),
+    "running": frozenset({"queued", "completed", "failed", "cancelled"}),
+}
+
+# Bumped on schema changes; jobs are transient, so an old file is recreated
+_SCHEMA_VERSION = 4
+
+# Expired rows are purged from the durable tier every this many new jobs
+_PURGE_EVERY = 100
+
+_COLUMNS = (
+    "id, kind, status, params, created_at, updated_at, expires_at, "
+    "started_at, finished_at, transitions, result, error, "
+    "priority, attempts, max_attempts, timeout_seconds, available_at, worker, heartbeat_at"
+)
+
+
+class InvalidTransitionError(ValueError):
+    """The job is not in a state it can move to the requested one from."""
+
+
+def _iso(timestamp: float | None) -> str | None:
+    if timestamp is None:
+        return None
+    return datetime.fromtimestamp(timestamp, tz=UTC).isoformat()
+
+
+@dataclass(frozen=True)
+class Job:
+    """Snapshot of an async job. State changes produce a new snapshot."""
+
+    id: str
+    kind: str
+    status: str
+    params: dict[str, Any]
+    created_at: float
+    updated_at: float
+    expires_at: float
+    started_at: float | None = None
+    finished_at: float | None = None
+    transitions: list[tuple[str, float]] = field(default_factory=list)
+    result: Any = None
+    error: str | None = None
+    priority: int = PRIORITIES["interactive"]
+    attempts: int = 0
+    max_attempts: int = 1
+    timeout_seconds: float | None = None
+    available_at: float = 0.0  # Not claimed before this time (retry backoff)
+    worker: str | None = None  # Job worker running or last running the job
+    heartbeat_at: float | None = None
+
+    @property
+    def terminal(self) -> bool:
+        """Whether the job reached a final state."""
+        return self.status in TERMINAL_STATES
+
+    def to_dict(self) -> dict[str, Any]:
+        """API representation with ISO timestamps."""
+        return {
+            "job_id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "params": self.params,
+            "created_at": _iso(self.created_at),
+            "started_at": _iso(self.started_at),
+            "finished_at": _iso(self.finished_at),
+            "transitions": [
+                {"status": status, "at": _iso(at)} for status, at in self.transitions
+            ],
+            "priority": self.priority,
+            "attempts": self.attempts,
+            "max_attempts": self.max_attempts,
+            "result": self.result,
+            "error": self.error,
+        }
+
+    @classmethod
+    def from_row(cls, row: tuple) -> "Job":
+        """Build a job from a row selected with ``_COLUMNS``."""
+        return cls(
+            id=row[0],
+            kind=row[1],
+            status=row[2],
+            params=json.loads(row[3]),
+            created_at=row[4],
+            updated_at=row[5],
+            expires_at=row[6],
+            started_at=row[7],
+            finished_at=row[8],
+            transitions=[tuple(t) for t in json.loads(row[9])],
+            result=json.loads(row[10]) if row[10] is not None else None,
+            error=row[11],
+            priority=row[12],
+            attempts=row[13],
+            max_attempts=row[14],
+            timeout_seconds=row[15],
+            available_at=row[16],
+            worker=row[17],
+            heartbeat_at=row[18],
+        )
+
+    def values(self) -> tuple:
+        """Row values in ``_COLUMNS`` order."""
+        return (
+            self.id,
+            self.kind,
+            self.status,
+            json.dumps(self.params, default=str),
+            self.created_at,
+            self.updated_at,
+            self.expires_at,
+            self.started_at,
+            self.finished_at,
+            json.dumps(self.transitions),
+            json.dumps(self.result, default=str) if self.result is not None else None,
+            self.error,
+            self.priority,
+            self.attempts,
+            self.max_attempts,
+            self.timeout_seconds,
+            self.available_at,
+            self.worker,
+            self.heartbeat_at,
+        )
+
+
+@dataclass(frozen=True)
+class JobEvent:
+    """A progress event of a job attempt, e.g. a finished crew task."""
+
+    seq: int
+    at: float
+    attempt: int
+    data: dict[str, Any]
+
+    def to_dict(self) -> dict[str, Any]:
+        """API representation with an ISO timestamp."""
+        return {**self.data, "seq": self.seq, "at": _iso(self.at), "attempt": self.attempt}
+
+
+class JobStore:
+    """
+    Two-tier job store: in-process LRU of finished jobs, durable SQLite file.
+
+    Without a SQLite path every job lives in the LRU, which is only correct
+    with a single worker process. Thread-safe.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1000,
+        ttl_seconds: float = 86400.0,
+        sqlite_path: Path | str | None = None,
+        retry_backoff_seconds: float = 15.0,
+        worker_lease_seconds: float = 60.0,
+    ):
+        """
+        Initialize the store.
+
+        Args:
+            max_entries: Maximum jobs in the in-process tier
+            ttl_seconds: Time a job is kept after its last state change
+            sqlite_path: Optional SQLite file shared between processes
+            retry_backoff_seconds: Delay before the first retry; doubles on every further one
+            worker_lease_seconds: Heartbeat age after which a job worker counts as dead
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.sqlite_path = Path(sqlite_path) if sqlite_path else None
+        self.retry_backoff_seconds = retry_backoff_seconds
+        self.worker_lease_seconds = worker_lease_seconds
+
+        self._jobs: OrderedDict[str, Job] = OrderedDict()
+        self._events: dict[str, list[JobEvent]] = {}  # Without a durable tier only
+        self._lock = threading.Lock()
+        self._db: sqlite3.Connection | None = None
+        self._created_since_purge = 0
+        self._counters = {
+            "created": 0,
+            "transitions": 0,
+            "evictions": 0,
+            "expirations": 0,
+        }
+
+    def _connection(self) -> sqlite3.Connection | None:
+        """Open the durable tier lazily (after any fork). Call with the lock held."""
+        if self.sqlite_path is None:
+            return None
+        if self._db is None:
+            self.sqlite_path.parent.mkdir(parents=True, exist_ok=True)
+            db = sqlite3.connect(self.sqlite_path, timeout=5.0, check_same_thread=False)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            db.execute("BEGIN IMMEDIATE")
+            if db.execute("PRAGMA user_version").fetchone()[0] != _SCHEMA_VERSION:
+                db.execute("DROP TABLE IF EXISTS jobs")
+                db.execute("DROP TABLE IF EXISTS job_workers")
+                db.execute("DROP TABLE IF EXISTS job_events")
+                db.execute(
+                    """
+                    CREATE TABLE jobs (
+                        id TEXT PRIMARY KEY,
+                        kind TEXT NOT NULL,
+                        status TEXT NOT NULL,
+                        params TEXT NOT NULL,
+                        created_at REAL NOT NULL,
+                        updated_at REAL NOT NULL,
+                        expires_at REAL NOT NULL,
+                        started_at REAL,
+                        finished_at REAL,
+                        transitions TEXT NOT NULL,
+                        result TEXT,
+                        error TEXT,
+                        priority INTEGER NOT NULL,
+                        attempts INTEGER NOT NULL,
+                        max_attempts INTEGER NOT NULL,
+                        timeout_seconds REAL,
+                        available_at REAL NOT NULL,
+                        worker TEXT,
+                        heartbeat_at REAL
+                    )
+                    """
+                )
+                db.execute("CREATE INDEX idx_jobs_expires_at ON jobs(expires_at)")
+                db.execute("CREATE INDEX idx_jobs_queue ON jobs(status, priority, created_at)")
+                db.execute(
+                    """
+                    CREATE TABLE job_workers (
+                        id TEXT PRIMARY KEY,
+                        slots INTEGER NOT NULL,
+                        running INTEGER NOT NULL,
+                        kinds TEXT NOT NULL,
+                        started_at REAL NOT NULL,
+                        heartbeat_at REAL NOT NULL
+                    )
+                    """
+                )
+                db.execute(
+                    """
+                    CREATE TABLE job_events (
+                        job_id TEXT NOT NULL,
+                        seq INTEGER NOT NULL,
+                        at REAL NOT NULL,
+                        attempt INTEGER NOT NULL,
+                        data TEXT NOT NULL,
+                        PRIMARY KEY (job_id, seq)
+                    )
+                    """
+                )
+                db.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+            db.commit()
+            self._db = db
+        return self._db
+
+    def _remember(self, job: Job, db: sqlite3.Connection | None) -> None:
+        """
+        Keep a job in the in-process LRU. Call with the lock held.
+
+        With a durable tier only finished jobs are kept: another process may
+        change an unfinished one at any time.
+        """
+        if db is not None and not job.terminal:
+            self._jobs.pop(job.id, None)
+            return
+        self._jobs[job.id] = job
+        self._jobs.move_to_end(job.id)
+        while len(self._jobs) > self.max_entries:
+            evicted, _ = self._jobs.popitem(last=False)
+            self._events.pop(evicted, None)
+            self._counters["evictions"] += 1
+
+    def _load(self, job_id: str, now: float) -> Job | None:
+        """Current snapshot of a job from either tier. Call with the lock held."""
+        db = self._connection()
+        job = self._jobs.get(job_id)
+        if job is not None:
+            if job.expires_at <= now:
+                del self._jobs[job_id]
+                self._events.pop(job_id, None)
+                self._counters["expirations"] += 1
+            elif job.terminal or db is None:
+                self._jobs.move_to_end(job_id)
+                return job
+        if db is None:
+            return None
+
+        row = db.execute(
+            f"SELECT {_COLUMNS} FROM jobs WHERE id = ? AND expires_at > ?", (job_id, now)
+        ).fetchone()
+        if row is None:
+            return None
+        job = Job.from_row(row)
+        self._remember(job, db)
+        return job
+
+    def create(
+        self,
+        kind: str,
+        params: dict[str, Any] | None = None,
+        priority: int = PRIORITIES["interactive"],
+        max_attempts: int = 1,
+        timeout_seconds: float | None = None,
+    ) -> Job:
+        """
+        Record a new job in the ``queued`` state.
+
+        Args:
+            kind: Job type, e.g. ``"pricing_analysis"``
+            params: JSON-serializable request parameters
+            priority: Claim order (see ``PRIORITIES``)
+            max_attempts: Runs before a failing job stays failed
+            timeout_seconds: Longest run of one attempt (enforced by job workers)
+
+        Returns:
+            The new job
+        """
+        now = time.time()
+        job = Job(
+            id=str(uuid.uuid4()),
+            kind=kind,
+            status="queued",
+            params=dict(params or {}),
+            created_at=now,
+            updated_at=now,
+            expires_at=now + self.ttl_seconds,
+            transitions=[("queued", now)],
+            priority=priority,
+            max_attempts=max(1, max_attempts),
+            timeout_seconds=timeout_seconds,
+            available_at=now,
+        )
+        with self._lock:
+            db = self._connection()
+            if db is not None:
+                with db:
+                    db.execute(
+                        f"INSERT INTO jobs ({_COLUMNS}) VALUES ({', '.join('?' * 19)})",
+                        job.values(),
+                    )
+            self._remember(job, db)
+            self._counters["created"] += 1
+            self._created_since_purge += 1
+            if self._created_since_purge >= _PURGE_EVERY:
+                self._purge_expired(now)
+        return job
+
+    def get(self, job_id: str) -> Job | None:
+        """
+        Look up a job, whichever process created or updated it.
+
+        Returns:
+            Current snapshot, or None if unknown or expired
+        """
+        with self._lock:
+            return self._load(job_id, time.time())
+
+    def transition(
+        self,
+        job_id: str,
+        status: str,
+        result: Any = None,
+        error: str | None = None,
+        worker: str | None = None,
+        delay_seconds: float = 0.0,
+    ) -> Job:
+        """
+        Move a job to a new state.
+
+        The change applies only if the job is still in the state it was read
+        in, so two processes cannot both start or finish the same job.
+
+        Args:
+            job_id: Job to update
+            status: New state (one of ``JOB_STATES``)
+            result: JSON-serializable result (``completed``)
+            error: Error message (``failed``, ``cancelled`` or a retry)
+            worker: Job worker starting the job (``running``)
+            delay_seconds: Time before a requeued job can be claimed again (``queued``)
+
+        Returns:
+            The updated job
+
+        Raises:
+            KeyError: If the job is unknown or expired
+            InvalidTransitionError: If the job cannot move to ``status`` from its current state
+        """
+        now = time.time()
+        with self._lock:
+            job = self._load(job_id, now)
+            if job is None:
+                raise KeyError(job_id)
+            if status not in _TRANSITIONS.get(job.status, ()):
+                raise InvalidTransitionError(f"Job {job_id} cannot go from {job.status} to {status}")
+
+            starting = status == "running"
+            updated = replace(
+                job,
+                status=status,
+                updated_at=now,
+                expires_at=now + self.ttl_seconds,
+                started_at=now if starting else job.started_at,
+                finished_at=now if status in TERMINAL_STATES else job.finished_at,
+                transitions=[*job.transitions, (status, now)],
+                result=result if result is not None else job.result,
+                error=error if error is not None else job.error,
+                attempts=job.attempts + 1 if starting else job.attempts,
+                available_at=now + delay_seconds if status == "queued" else job.available_at,
+                worker=worker if starting else job.worker,
+                heartbeat_at=now if starting else job.heartbeat_at,
+            )
+
+            db = self._connection()
+            if db is not None:
+                with db:
+                    cursor = db.execute(
+                        f"UPDATE jobs SET ({_COLUMNS}) = ({', '.join('?' * 19)}) "
+                        "WHERE id = ? AND status = ?",
+                        (*updated.values(), job_id, job.status),
+                    )
+                if cursor.rowcount == 0:
+                    raise InvalidTransitionError(f"Job {job_id} changed state concurrently")
+
+            self._remember(updated, db)
+            self._counters["transitions"] += 1
+            return updated
+
+    def fail(self, job_id: str, error: str) -> Job:
+        """
+        Record a failed attempt of a running job.
+
+        The job is requeued with exponential backoff while attempts remain,
+        and fails for good otherwise.
+
+        Returns:
+            The updated job
+
+        Raises:
+            KeyError: If the job is unknown or expired
+            InvalidTransitionError: If the job is not running (e.g. it was cancelled)
+        """
+        job = self.get(job_id)
+        if job is None:
+            raise KeyError(job_id)
+        if job.status == "running" and job.attempts < job.max_attempts:
+            delay = self.retry_backoff_seconds * 2 ** (job.attempts - 1)
+            return self.transition(job_id, "queued", error=error, delay_seconds=delay)
+        return self.transition(job_id, "failed", error=error)
+
+    def cancel(self, job_id: str) -> Job:
+        """
+        Cancel a queued or running job; a job worker running it stops the run.
+
+        Raises:
+            KeyError: If the job is unknown or expired
+            InvalidTransitionError: If the job already finished
+        """
+        return self.transition(job_id, "cancelled", error="Cancelled")
+
+    def run(self, job_id: str, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Job | None:
+        """
+        Execute a job's work in this process and record its outcome.
+
+        Args:
+            job_id: Queued job
+            fn: Work returning the job result
+            *args: Positional arguments of ``fn``
+            **kwargs: Keyword arguments of ``fn``
+
+        Returns:
+            The updated job, or None if it was cancelled, expired or started
+            elsewhere before or while it ran
+        """
+        try:
+            self.transition(job_id, "running")
+            try:
+                result = fn(*args, **kwargs)
+            except Exception as e:
+                return self.fail(job_id, str(e))
+            return self.transition(job_id, "completed", result=result)
+        except (KeyError, InvalidTransitionError):
+            return None
+
+    def add_event(self, job_id: str, data: dict[str, Any]) -> None:
+        """
+        Append a progress event to the current attempt of a job.
+
+        Args:
+            job_id: Job the event belongs to (ignored if unknown or expired)
+            data: JSON-serializable event
+        """
+        now = time.time()
+        with self._lock:
+            db = self._connection()
+            if db is None:
+                job = self._load(job_id, now)
+                if job is not None:
+                    events = self._events.setdefault(job_id, [])
+                    events.append(JobEvent(len(events) + 1, now, job.attempts, data))
+                return
+            with db:
+                db.execute(
+                    "INSERT INTO job_events (job_id, seq, at, attempt, data) "
+                    "SELECT id, COALESCE((SELECT MAX(seq) FROM job_events WHERE job_id = ?), 0) + 1, "
+                    "?, attempts, ? FROM jobs WHERE id = ?",
+                    (job_id, now, json.dumps(data, default=str), job_id),
+                )
+
+    def events(self, job_id: str, after: int = 0) -> list[JobEvent]:
+        """
+        Progress events of a job, oldest first.
+
+        Args:
+            job_id: Job to read
+            after: Sequence number of the last event already seen
+
+        Returns:
+            Events with a higher sequence number
+        """
+        with self._lock:
+            db = self._connection()
+            if db is None:
+                return [event for event in self._events.get(job_id, ()) if event.seq > after]
+            rows = db.execute(
+                "SELECT seq, at, attempt, data FROM job_events "
+                "WHERE job_id = ? AND seq > ? ORDER BY seq",
+                (job_id, after),
+            ).fetchall()
+        return [JobEvent(seq, at, attempt, json.loads(data)) for seq, at, attempt, data in rows]
+
+    def _queue_connection(self) -> sqlite3.Connection:
+        """Durable tier, which the job queue requires. Call with the lock held."""
+        db = self._connection()
+        if db is None:
+            raise RuntimeError("job_store_path required for the job queue")
+        return db
+
+    def claim(self, worker: str, kinds: list[str] | None = None) -> Job | None:
+        """
+        Start the next queued job: highest priority first, then oldest.
+
+        Args:
+            worker: Id of the claiming job worker
+            kinds: Job types the worker runs (default: all)
+
+        Returns:
+            The job, now running, or None if none is ready
+        """
+        now = time.time()
+        query = (
+            "SELECT id FROM jobs WHERE status = 'queued' AND available_at <= ? AND expires_at > ?"
+        )
+        params: list[Any] = [now, now]
+        if kinds:
+            query += f" AND kind IN ({', '.join('?' * len(kinds))})"
+            params.extend(kinds)
+        query += " ORDER BY priority, created_at LIMIT 8"
+
+        with self._lock:
+            candidates = [row[0] for row in self._queue_connection().execute(query, params)]
+        # Another worker may win any of them; take the first still queued
+        for job_id in candidates:
+            try:
+                return self.transition(job_id, "running", worker=worker)
+            except (KeyError, InvalidTransitionError):
+                continue
+        return None
+
+    def heartbeat(
+        self, worker: str, slots: int, running: list[str], kinds: list[str] | None = None
+    ) -> None:
+        """
+        Record that a job worker and the jobs it runs are alive.
+
+        Args:
+            worker: Job worker id
+            slots: Jobs the worker runs concurrently
+            running: Ids of its running jobs
+            kinds: Job types the worker claims (default: all)
+        """
+        now = time.time()
+        with self._lock:
+            db = self._queue_connection()
+            with db:
+                db.execute(
+                    "INSERT INTO job_workers VALUES (?, ?, ?, ?, ?, ?) "
+                    "ON CONFLICT (id) DO UPDATE SET slots = excluded.slots, "
+                    "running = excluded.running, kinds = excluded.kinds, "
+                    "heartbeat_at = excluded.heartbeat_at",
+                    (worker, slots, len(running), json.dumps(kinds or []), now, now),
+                )
+                db.executemany(
+                    "UPDATE jobs SET heartbeat_at = ? WHERE id = ? AND worker = ? AND status = 'running'",
+                    [(now, job_id, worker) for job_id in running],
+                )
+
+    def retire_worker(self, worker: str) -> None:
+        """Remove a job worker that shut down from the live worker list."""
+        with self._lock:
+            db = self._queue_connection()
+            with db:
+                db.execute("DELETE FROM job_workers WHERE id = ?", (worker,))
+
+    def _live_workers(self, db: sqlite3.Connection) -> list[dict[str, Any]]:
+        """Job workers that heartbeated within the lease. Call with the lock held."""
+        return [
+            {"id": worker, "slots": slots, "running": running, "kinds": json.loads(kinds)}
+            for worker, slots, running, kinds in db.execute(
+                "SELECT id, slots, running, kinds FROM job_workers WHERE heartbeat_at > ?",
+                (time.time() - self.worker_lease_seconds,),
+            )
+        ]
+
+    def has_worker(self, kind: str) -> bool:
+        """
+        Whether a live job worker would claim jobs of a type.
+
+        Args:
+            kind: Job type
+
+        Returns:
+            False also without a durable tier, which no worker can share
+        """
+        with self._lock:
+            db = self._connection()
+            if db is None:
+                return False
+            return any(
+                not worker["kinds"] or kind in worker["kinds"]
+                for worker in self._live_workers(db)
+            )
+
+    def stale(self) -> list[str]:
+        """
+        Running jobs whose worker stopped sending heartbeats (e.g. it was killed).
+
+        Returns:
+            Ids of the jobs, to be failed (and retried) by a live worker
+        """
+        with self._lock:
+            rows = self._queue_connection().execute(
+                "SELECT id FROM jobs WHERE status = 'running' AND worker IS NOT NULL "
+                "AND heartbeat_at < ?",
+                (time.time() - self.worker_lease_seconds,),
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def delete(self, job_id: str) -> bool:
+        """
+        Forget a job, e.g. one whose work could not be scheduled.
+
+        Returns:
+            Whether the job existed
+        """
+        with self._lock:
+            removed = self._jobs.pop(job_id, None) is not None
+            self._events.pop(job_id, None)
+            db = self._connection()
+            if db is not None:
+                with db:
+                    cursor = db.execute("DELETE FROM jobs WHERE id = ?", (job_id,))
+                    db.execute("DELETE FROM job_events WHERE job_id = ?", (job_id,))
+                removed = removed or cursor.rowcount > 0
+            return removed
+
+    def _purge_expired(self, now: float) -> int:
+        """Drop expired jobs from both tiers. Call with the lock held."""
+        self._created_since_purge = 0
+        expired = [job_id for job_id, job in self._jobs.items() if job.expires_at <= now]
+        for job_id in expired:
+            del self._jobs[job_id]
+            self._events.pop(job_id, None)
+        removed = len(expired)
+
+        db = self._connection()
+        if db is not None:
+            with db:
+                cursor = db.execute("DELETE FROM jobs WHERE expires_at <= ?", (now,))
+                db.execute(
+                    "DELETE FROM job_events WHERE job_id NOT IN (SELECT id FROM jobs)"
+                )
+            removed = max(removed, cursor.rowcount)
+
+        self._counters["expirations"] += removed
+        return removed
+
+    def purge_expired(self) -> int:
+        """
+        Drop expired jobs now (also done periodically on ``create``).
+
+        Returns:
+            Number of jobs removed
+        """
+        with self._lock:
+            return self._purge_expired(time.time())
+
+    def stats(self) -> dict[str, Any]:
+        """Counters, tier sizes, live jobs by state and live job workers, for health checks."""
+        with self._lock:
+            db = self._connection()
+            workers = None
+            if db is not None:
+                now = time.time()
+                rows = db.execute(
+                    "SELECT status, COUNT(*) FROM jobs WHERE expires_at > ? GROUP BY status",
+                    (now,),
+                ).fetchall()
+                workers = self._live_workers(db)
+            else:
+                rows = [
+                    (status, sum(1 for job in self._jobs.values() if job.status == status))
+                    for status in JOB_STATES
+                ]
+            return {
+                **self._counters,
+                "by_status": {status: count for status, count in rows if count},
+                "size": len(self._jobs),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "durable_tier": str(self.sqlite_path) if self.sqlite_path else None,
+                "workers": workers,
+            }
+
+
+@lru_cache
+def get_job_store() -> JobStore:
+    """Get the process-wide job store configured from settings."""
+    settings = get_settings()
+    return JobStore(
+        max_entries=settings.job_store_max_entries,
+        ttl_seconds=settings.job_ttl_seconds,
+        sqlite_path=settings.job_store_path or None,
+        retry_backoff_seconds=settings.job_retry_backoff_seconds,
+        worker_lease_seconds=settings.job_worker_lease_seconds,
+    )
@@ -0,0 +1,240 @@
+"""Job Worker - Process pool that runs async jobs from the local job queue.
+
+Crew runs take minutes of LLM calls and tool I/O; run inside an API worker
+they compete with request handling. A job worker is a separate process
+(``run_workers.py``) that claims queued jobs from the job store and runs
+each in its own child process, at most ``slots`` at a time. Because every
+run is a process, a run that exceeds its timeout or whose job was
+cancelled is terminated rather than left to finish. Failed runs are
+requeued with backoff by the store until their attempts are used up, and
+the jobs of a worker that stops heartbeating are recovered by the others.
+"""
+
+import os
+import socket
+import threading
+import time
+import uuid
+from collections.abc import Callable
+from dataclasses import dataclass
+from functools import partial
+from multiprocessing import get_context
+from multiprocessing.process import BaseProcess
+from typing import Any
+
+from .handlers import JOB_HANDLERS, Progress
+from .store import InvalidTransitionError, Job, JobStore
+
+# Seconds a terminated run gets to exit before it is killed
+_TERMINATE_GRACE_SECONDS = 5.0
+
+
+@dataclass
+class _Run:
+    """A job attempt running in a child process."""
+
+    job: Job
+    process: BaseProcess
+    started_at: float
+
+
+def _execute(
+    store_config: dict[str, Any],
+    handler: Callable[[dict[str, Any], Progress], Any],
+    job_id: str,
+    params: dict[str, Any],
+) -> None:
+    """Child process body: run the handler and record the outcome."""
+    store = JobStore(**store_config)
+    try:
+        try:
+            result = handler(params, partial(store.add_event, job_id))
+        except Exception as e:
+            store.fail(job_id, str(e))
+        else:
+            store.transition(job_id, "completed", result=result)
+    except (KeyError, InvalidTransitionError):
+        # Cancelled, timed out or expired while running
+        pass
+
+
+class JobWorker:
+    """
+    Supervisor of job runs in child processes.
+
+    Call ``run`` to serve until stopped, or ``step`` for a single pass.
+    """
+
+    def __init__(
+        self,
+        store: JobStore,
+        slots: int = 2,
+        poll_interval_seconds: float = 0.5,
+        handlers: dict[str, Callable[[dict[str, Any], Progress], Any]] | None = None,
+        kinds: list[str] | None = None,
+        log: Callable[[str], None] | None = None,
+    ):
+        """
+        Initialize the worker.
+
+        Args:
+            store: Job store with a durable tier (the queue)
+            slots: Jobs run concurrently
+            poll_interval_seconds: Time between supervision passes
+            handlers: Job type -> handler (default: ``JOB_HANDLERS``); must be
+                importable module-level functions, as runs are spawned
+            kinds: Job types to claim (default: every type with a handler)
+            log: Receives one line per job event
+        """
+        if store.sqlite_path is None:
+            raise RuntimeError("job_store_path required for job workers")
+        self.store = store
+        self.slots = slots
+        self.poll_interval_seconds = poll_interval_seconds
+        self.handlers = handlers if handlers is not None else JOB_HANDLERS
+        self.kinds = kinds or list(self.handlers)
+        self.id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+
+        self._log = log or (lambda line: None)
+        self._context = get_context("spawn")
+        self._runs: dict[str, _Run] = {}
+        self._counters = {
+            "started": 0,
+            "completed": 0,
+            "failed": 0,
+            "retried": 0,
+            "timed_out": 0,
+            "cancelled": 0,
+            "recovered": 0,
+        }
+
+    def _store_config(self) -> dict[str, Any]:
+        return {
+            "max_entries": 1,
+            "ttl_seconds": self.store.ttl_seconds,
+            "sqlite_path": str(self.store.sqlite_path),
+            "retry_backoff_seconds": self.store.retry_backoff_seconds,
+            "worker_lease_seconds": self.store.worker_lease_seconds,
+        }
+
+    def _start(self, job: Job) -> None:
+        process = self._context.Process(
+            target=_execute,
+            args=(self._store_config(), self.handlers[job.kind], job.id, job.params),
+            name=f"pricewaze-job-{job.id[:8]}",
+            daemon=True,
+        )
+        process.start()
+        self._runs[job.id] = _Run(job=job, process=process, started_at=time.monotonic())
+        self._counters["started"] += 1
+        self._log(f"started {job.kind} {job.id} (attempt {job.attempts}/{job.max_attempts})")
+
+    def _terminate(self, run: _Run) -> None:
+        run.process.terminate()
+        run.process.join(_TERMINATE_GRACE_SECONDS)
+        if run.process.is_alive():
+            run.process.kill()
+            run.process.join()
+
+    def _fail(self, job_id: str, error: str) -> None:
+        """Record a failed attempt, unless the job changed state meanwhile."""
+        try:
+            job = self.store.fail(job_id, error)
+        except (KeyError, InvalidTransitionError):
+            return
+        self._count(job)
+        self._log(f"{job.status} {job.kind} {job_id}: {error}")
+
+    def _count(self, job: Job | None) -> None:
+        """Count how an attempt ended."""
+        if job is None:
+            return
+        if job.status == "queued":
+            self._counters["retried"] += 1
+        elif job.status in ("completed", "failed", "cancelled"):
+            self._counters[job.status] += 1
+
+    def _supervise(self) -> None:
+        """Reap finished runs and stop timed-out or cancelled ones."""
+        for job_id, run in list(self._runs.items()):
+            current = self.store.get(job_id)
+            ours = (
+                current is not None
+                and current.status == "running"
+                and current.worker == self.id
+                and current.attempts == run.job.attempts
+            )
+
+            if not run.process.is_alive():
+                run.process.join()
+                del self._runs[job_id]
+                if ours:
+                    # Exited without recording an outcome (crash, OOM kill)
+                    self._fail(job_id, f"Job process exited with code {run.process.exitcode}")
+                else:
+                    self._count(current)
+                    if current is not None:
+                        self._log(f"{current.status} {current.kind} {job_id}")
+                continue
+
+            if not ours and (current is None or current.status not in ("completed", "failed")):
+                # Cancelled, expired or taken over by another worker
+                self._terminate(run)
+                del self._runs[job_id]
+                self._count(current)
+                self._log(f"stopped {run.job.kind} {job_id}")
+                continue
+
+            timeout = run.job.timeout_seconds
+            if ours and timeout and time.monotonic() - run.started_at > timeout:
+                self._terminate(run)
+                del self._runs[job_id]
+                self._counters["timed_out"] += 1
+                self._fail(job_id, f"Timed out after {timeout:g}s")
+
+    def step(self) -> None:
+        """One supervision pass: reap, heartbeat, recover dead workers' jobs, claim."""
+        self._supervise()
+        self.store.heartbeat(self.id, self.slots, list(self._runs), self.kinds)
+
+        for job_id in self.store.stale():
+            self._counters["recovered"] += 1
+            self._fail(job_id, "Job worker stopped responding")
+
+        while len(self._runs) < self.slots:
+            job = self.store.claim(self.id, self.kinds)
+            if job is None:
+                break
+            self._start(job)
+
+    def run(self, stop: threading.Event | None = None) -> None:
+        """
+        Serve jobs until ``stop`` is set.
+
+        Args:
+            stop: Event that ends the loop (e.g. set from a signal handler)
+        """
+        stop = stop or threading.Event()
+        try:
+            while not stop.is_set():
+                self.step()
+                stop.wait(self.poll_interval_seconds)
+        finally:
+            self.shutdown()
+
+    def shutdown(self) -> None:
+        """Stop running jobs (they are retried while attempts remain) and leave the pool."""
+        for job_id, run in list(self._runs.items()):
+            self._terminate(run)
+            del self._runs[job_id]
+            self._fail(job_id, "Job worker shut down")
+        self.store.retire_worker(self.id)
+
+    def stats(self) -> dict[str, Any]:
+        """Running jobs and counters."""
+        return {
+            "id": self.id,
+            "slots": self.slots,
+            "running": len(self._runs),
+            **self._counters,
+        }
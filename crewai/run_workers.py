@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+PriceWaze Job Workers - Run async analysis jobs outside the API process.
+
+Usage:
+    python run_workers.py                      # JOB_WORKERS concurrent jobs
+    python run_workers.py --slots 4            # 4 concurrent jobs
+    python run_workers.py --kinds full_analysis
+
+Start any number of these next to the API (run.py); they share the job
+store file (JOB_STORE_PATH) with it.
+"""
+
+import argparse
+import signal
+import sys
+import threading
+from datetime import datetime
+from pathlib import Path
+
+# Add crewai directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from config import get_settings
+from jobs import JOB_HANDLERS, JobWorker, get_job_store
+
+
+def main():
+    settings = get_settings()
+
+    parser = argparse.ArgumentParser(description="Run PriceWaze async job workers")
+    parser.add_argument(
+        "--slots",
+        type=int,
+        default=settings.job_workers,
+        help=f"Jobs run concurrently, each in its own process (default: {settings.job_workers})",
+    )
+    parser.add_argument(
+        "--kinds",
+        nargs="+",
+        choices=sorted(JOB_HANDLERS),
+        help="Job types to run (default: all)",
+    )
+    parser.add_argument("--quiet", action="store_true", help="Do not log job events")
+
+    args = parser.parse_args()
+
+    if settings.job_inline:
+        print("⚠️  JOB_INLINE is set: the API runs async jobs itself and enqueues none")
+
+    def log(line: str) -> None:
+        print(f"[{datetime.now().strftime('%H:%M:%S')}] {line}", flush=True)
+
+    try:
+        worker = JobWorker(
+            get_job_store(),
+            slots=args.slots,
+            poll_interval_seconds=settings.job_poll_interval_seconds,
+            kinds=args.kinds,
+            log=None if args.quiet else log,
+        )
+    except RuntimeError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+    signal.signal(signal.SIGINT, lambda *_: stop.set())
+
+    print("=" * 60)
+    print("🏠 PriceWaze CrewAI - Job Workers")
+    print("=" * 60)
+    print(f"🆔 Worker: {worker.id}")
+    print(f"📦 Job store: {settings.job_store_path}")
+    print(f"⚙️  Slots: {worker.slots}  Jobs: {', '.join(worker.kinds)}")
+    print(f"⏱️  Timeout: {settings.job_timeout_seconds:.0f}s  Attempts: {settings.job_max_attempts}")
+    print("=" * 60)
+
+    worker.run(stop)
+
+    stats = worker.stats()
+    print(
+        f"✅ Stopped after {stats['started']} runs: {stats['completed']} completed, "
+        f"{stats['failed']} failed, {stats['retried']} retried, {stats['cancelled']} cancelled"
+    )
+
+
+if __name__ == "__main__":
+    main()
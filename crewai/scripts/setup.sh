@@ -45,5 +45,8 @@ echo "  cd crewai"
 echo "  source venv/bin/activate"
 echo "  python run.py"
 echo ""
+echo "To run async analysis jobs outside the API (recommended in production):"
+echo "  python run_workers.py"
+echo ""
 echo "API documentation will be available at:"
 echo "  http://localhost:8000/docs"
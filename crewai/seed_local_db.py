@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+PriceWaze Local Database - Create an offline SQLite stand-in for Supabase.
+
+Usage:
+    python seed_local_db.py local.db                       # 10k listings
+    python seed_local_db.py local.db --properties 1000000  # Load-test scale
+    DATA_BACKEND=sqlite LOCAL_DB_PATH=local.db python run.py
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Add crewai directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from tools.sqlite_backend import MIGRATIONS_DIR, create_local_database
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Create a SQLite database with the Supabase schema and synthetic data",
+    )
+    parser.add_argument("path", help="Database file to create")
+    parser.add_argument("--properties", type=int, default=10_000, help="Listings (default: 10000)")
+    parser.add_argument("--zones", type=int, default=16, help="Zones (default: 16)")
+    parser.add_argument("--profiles", type=int, default=200, help="User profiles (default: 200)")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed (default: 0)")
+    parser.add_argument(
+        "--migrations",
+        default=str(MIGRATIONS_DIR),
+        help="Supabase migrations directory the schema is derived from",
+    )
+    parser.add_argument("--force", action="store_true", help="Replace an existing file")
+
+    args = parser.parse_args()
+
+    path = Path(args.path)
+    if path.exists():
+        if not args.force:
+            print(f"❌ {path} already exists (use --force to replace it)")
+            sys.exit(1)
+        path.unlink()
+
+    started = time.perf_counter()
+    counts = create_local_database(
+        path,
+        properties=args.properties,
+        zones=args.zones,
+        profiles=args.profiles,
+        seed=args.seed,
+        migrations_dir=args.migrations,
+    )
+
+    print(f"✅ Created {path} in {time.perf_counter() - started:.1f}s")
+    for table, count in counts.items():
+        print(f"   {table}: {count:,} rows")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,27 @@
 """Tests for FastAPI endpoints."""
 
+import asyncio
+import json
+import threading
+import time
+
 import pytest
+from fastapi import HTTPException
 from fastapi.testclient import TestClient
 
 import sys
 from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+import api.execution as execution
+from api.execution import (
+    EventLoopMonitor,
+    ExecutionLayer,
+    WorkPool,
+    get_job,
+    start_job,
+    stream_job,
+)
 from api.main import app
 
 
@@ -46,6 +61,11 @@ class TestPricingEndpoints:
         response = client.get("/api/v1/pricing/quick/")
         assert response.status_code in [404, 405]  # Not found or method not allowed
 
+    def test_batch_valuation_requires_ids_or_zone(self):
+        """Test that batch valuation requires property_ids or zone_id."""
+        response = client.post("/api/v1/pricing/valuate/batch", json={})
+        assert response.status_code == 400
+
 
 class TestNegotiationEndpoints:
     """Tests for negotiation advisory endpoints."""
@@ -143,3 +163,262 @@ class TestAnalysisEndpoints:
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
+
+
+class TestExecutionLayer:
+    """Tests for the bounded work pools and event loop monitor."""
+
+    def test_saturated_pool_rejects_with_429(self):
+        """Test that work beyond running + queued slots is rejected at once."""
+        pool = WorkPool("crew", max_workers=1, max_queue=1, queue_timeout_seconds=10)
+        release = threading.Event()
+
+        async def main():
+            running = asyncio.ensure_future(pool.run(release.wait))
+            queued = asyncio.ensure_future(pool.run(lambda: "queued"))
+            await asyncio.sleep(0.05)
+            with pytest.raises(HTTPException) as rejected:
+                await pool.run(lambda: "rejected")
+            release.set()
+            return rejected.value, await running, await queued
+
+        rejected, running, queued = asyncio.run(main())
+
+        assert rejected.status_code == 429
+        assert int(rejected.headers["Retry-After"]) >= 1
+        assert (running, queued) == (True, "queued")
+        stats = pool.stats()
+        assert stats["rejected"] == 1
+        assert stats["completed"] == 2
+        assert stats["running"] == stats["queued"] == 0
+        pool.shutdown()
+
+    def test_queue_timeout_rejects_with_503(self):
+        """Test that work waiting longer than the queue timeout is dropped at the timeout."""
+        pool = WorkPool("tool", max_workers=1, max_queue=4, queue_timeout_seconds=0.05)
+
+        async def main():
+            blocker = asyncio.ensure_future(pool.run(time.sleep, 1.0))
+            await asyncio.sleep(0.01)
+            started = time.monotonic()
+            with pytest.raises(HTTPException) as rejected:
+                await pool.run(pytest.fail)
+            waited = time.monotonic() - started
+            queued = pool.stats()["queued"]
+            await blocker
+            return rejected.value, waited, queued
+
+        rejected, waited, queued = asyncio.run(main())
+        assert rejected.status_code == 503
+        assert waited < 0.5  # Not when the blocking call finishes
+        assert queued == 0
+        assert pool.stats()["timed_out"] == 1
+        pool.shutdown()
+
+    def test_iterate_holds_one_slot(self):
+        """Test that a streamed iterator occupies a slot until exhausted."""
+        pool = WorkPool("avm", max_workers=1, max_queue=0, queue_timeout_seconds=10)
+
+        async def main():
+            stream = pool.iterate(iter([1, 2, 3]))
+            with pytest.raises(HTTPException):
+                pool.iterate(iter([]))
+            return [item async for item in stream]
+
+        assert asyncio.run(main()) == [1, 2, 3]
+        assert pool.stats()["running"] == 0
+        pool.shutdown()
+
+    def test_stopped_iterator_closes_on_pool(self):
+        """Test that a stream the client left is closed off the loop before its slot frees."""
+        pool = WorkPool("avm", max_workers=2, max_queue=0, queue_timeout_seconds=10)
+        closed_on = []
+
+        def results():
+            try:
+                yield 1
+                time.sleep(0.05)
+                yield 2
+            finally:
+                time.sleep(0.1)  # e.g. waiting for chunks, removing the shared frame
+                closed_on.append(threading.current_thread().name)
+
+        async def main():
+            running = []
+            # Stopped after the first item
+            stream = pool.iterate(results())
+            await anext(stream)
+            closing = asyncio.ensure_future(stream.aclose())
+            await asyncio.sleep(0.02)
+            running.append(pool.stats()["running"])
+            await closing
+
+            # Cancelled while an item is produced
+            stream = pool.iterate(results())
+            await anext(stream)
+            waiting = asyncio.ensure_future(anext(stream))
+            await asyncio.sleep(0.01)
+            waiting.cancel()
+            await asyncio.sleep(0.1)
+            running.append(pool.stats()["running"])
+
+            # Dropped
+            stream = pool.iterate(results())
+            await anext(stream)
+            del stream
+            await asyncio.sleep(0.2)
+            return running
+
+        assert asyncio.run(main()) == [1, 1]
+        assert len(closed_on) == 3
+        assert all(name.startswith("pricewaze-avm") for name in closed_on)
+        assert pool.stats()["running"] == 0
+        pool.shutdown()
+
+    def test_event_loop_lag(self):
+        """Test that blocking the loop shows up as lag."""
+        monitor = EventLoopMonitor(interval_seconds=0.01)
+
+        async def main():
+            monitor.start()
+            await asyncio.sleep(0.02)
+            time.sleep(0.1)  # Blocks the loop
+            await asyncio.sleep(0.03)
+            monitor.stop()
+
+        asyncio.run(main())
+
+        stats = monitor.stats()
+        assert stats["samples"] > 0
+        assert stats["max_lag_ms"] >= 50
+
+
+@pytest.fixture
+def job_store(monkeypatch):
+    """An in-process job store behind the API, polled every 10 ms."""
+    from jobs import JobStore
+
+    store = JobStore()
+    monkeypatch.setattr(execution, "get_job_store", lambda: store)
+    settings = execution.get_settings().model_copy(update={"job_poll_interval_seconds": 0.01})
+    monkeypatch.setattr(execution, "get_settings", lambda: settings)
+    return store
+
+
+def parse_ndjson(frames: list[str]) -> list[tuple[str, int | None]]:
+    """Event names and ids of NDJSON frames."""
+    return [(line["event"], line["id"]) for line in map(json.loads, frames)]
+
+
+class TestInlineJobs:
+    """Tests for async jobs run on the crew pool of the API process."""
+
+    def test_job_dropped_by_queue_timeout_fails(self, job_store, monkeypatch):
+        """Test that an inline job that never got a crew worker fails rather than staying queued."""
+        settings = execution.get_settings().model_copy(update={"job_inline": True})
+        monkeypatch.setattr(execution, "get_settings", lambda: settings)
+        layer = ExecutionLayer(
+            pools={
+                "crew": WorkPool("crew", max_workers=1, max_queue=4, queue_timeout_seconds=0.05),
+                "tool": WorkPool("tool", max_workers=2, max_queue=4, queue_timeout_seconds=10),
+            },
+            monitor=EventLoopMonitor(),
+        )
+        monkeypatch.setattr(execution, "get_execution_layer", lambda: layer)
+        monkeypatch.setattr(execution, "execute_job", lambda *args: time.sleep(0.2) or {})
+
+        async def main():
+            first = await start_job("full_analysis", {})
+            second = await start_job("full_analysis", {})
+            await asyncio.sleep(0.4)
+            return await get_job("full_analysis", first.id), await get_job("full_analysis", second.id)
+
+        first, second = asyncio.run(main())
+
+        assert first.status == "completed"
+        assert second.status == "failed"
+        assert second.error == "Dropped before start: queue timeout"
+        layer.shutdown()
+
+
+class TestJobStreaming:
+    """Tests for progress streams of async jobs."""
+
+    def test_frames_follow_the_job(self, job_store):
+        """Test that tasks stream as recorded and the final state follows the last task."""
+        job = job_store.create("full_analysis", {"property_id": "p1"})
+        job_store.transition(job.id, "running")
+        for index in (1, 2):
+            job_store.add_event(job.id, {"type": "task", "task_index": index})
+
+        async def main():
+            frames = []
+            async for frame in stream_job(job.id, ndjson=True):
+                frames.append(frame)
+                if len(frames) == 3:
+                    job_store.add_event(job.id, {"type": "task", "task_index": 3})
+                    job_store.transition(job.id, "completed", result={"summary": "fair"})
+            return frames
+
+        frames = asyncio.run(main())
+
+        assert parse_ndjson(frames) == [
+            ("status", None),
+            ("task", 1),
+            ("task", 2),
+            ("task", 3),
+            ("status", None),
+            ("job", None),
+        ]
+        assert json.loads(frames[0])["data"]["status"] == "running"
+        assert json.loads(frames[3])["data"]["task_index"] == 3
+        assert json.loads(frames[-1])["data"]["result"] == {"summary": "fair"}
+
+    def test_resume_after_last_event_id(self, job_store):
+        """Test that a reconnecting SSE client only gets the tasks it has not seen."""
+        job = job_store.create("full_analysis")
+        job_store.transition(job.id, "running")
+        for index in (1, 2, 3):
+            job_store.add_event(job.id, {"type": "task", "task_index": index})
+        job_store.transition(job.id, "failed", error="crew failed")
+
+        async def main():
+            return [frame async for frame in stream_job(job.id, after=2)]
+
+        frames = asyncio.run(main())
+
+        assert frames[0].startswith("id: 3\nevent: task\ndata: ")
+        assert frames[1].startswith("event: status\n")
+        assert frames[2].startswith("event: job\n")
+        assert json.loads(frames[2].split("data: ", 1)[1])["error"] == "crew failed"
+
+    def test_unknown_job(self, job_store):
+        """Test that a stream of an unknown or expired job ends with an error."""
+
+        async def main():
+            return [frame async for frame in stream_job("missing", ndjson=True)]
+
+        assert parse_ndjson(asyncio.run(main())) == [("error", None)]
+
+    def test_stream_route(self, job_store):
+        """Test the stream endpoint with NDJSON encoding and Last-Event-ID."""
+        job = job_store.create("full_analysis")
+        job_store.transition(job.id, "running")
+        for index in (1, 2):
+            job_store.add_event(job.id, {"type": "task", "task_index": index})
+        job_store.transition(job.id, "completed", result={})
+
+        response = client.get(
+            f"/api/v1/analysis/full/stream/{job.id}",
+            params={"format": "ndjson"},
+            headers={"Last-Event-ID": "1"},
+        )
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        assert parse_ndjson(response.text.splitlines()) == [
+            ("task", 2),
+            ("status", None),
+            ("job", None),
+        ]
+        assert client.get("/api/v1/analysis/full/stream/missing").status_code == 404
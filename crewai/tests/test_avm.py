@@ -0,0 +1,920 @@
+"""Tests for the AVM (Automated Valuation Model) module."""
+
+import dataclasses
+import json
+import pickle
+import subprocess
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from avm.artifact import read_manifest
+from avm.cache import ValuationCache
+from avm.comparables import ComparablesFinder
+from avm.frame import CandidateFrame
+from avm.incremental import IncrementalRevaluator, ListingEvent
+from avm.kernels import feature_similarity, price_adjustments, top_k
+from avm.model import AVMModel, BatchPredictionResult, PredictionResult
+from avm.parallel import ParallelValuator
+from avm.registry import CURRENT_POINTER_FILE, ModelRegistry
+from avm.spatial import SpatialIndex
+from avm.streaming import ValuationRecord, iter_valuations, write_ndjson, write_parquet
+from avm.valuation import PropertyValuator, ValuationResult
+
+
+def make_properties(count: int, seed: int = 7) -> tuple[list[dict], list[float]]:
+    """Generate a synthetic training set with a learnable price signal."""
+    rng = np.random.default_rng(seed)
+    types = ["apartment", "house", "penthouse", "studio"]
+    properties = []
+    prices = []
+    for i in range(count):
+        area = float(rng.uniform(40, 300))
+        bedrooms = int(rng.integers(1, 6))
+        prop = {
+            "id": f"prop-{i}",
+            "zone_id": f"zone-{i % 3}",
+            "area_m2": area,
+            "bedrooms": bedrooms,
+            "bathrooms": int(rng.integers(1, 4)),
+            "age_years": int(rng.integers(0, 40)),
+            "property_type": types[i % len(types)],
+            "condition": int(rng.integers(1, 6)),
+            "latitude": 18.47 + float(rng.normal(0, 0.02)),
+            "longitude": -69.93 + float(rng.normal(0, 0.02)),
+        }
+        price = area * 1900 + bedrooms * 8000 + float(rng.normal(0, 5000))
+        prop["price"] = round(price, 2)
+        prop["price_per_m2"] = round(price / area, 2)
+        properties.append(prop)
+        prices.append(price)
+    return properties, prices
+
+
+ZONE_STATS = {
+    "zone-0": {"avg_price_m2": 2100, "median_price_m2": 1950},
+    "zone-1": {"avg_price_m2": 1800, "median_price_m2": 1700},
+    "zone-2": {"avg_price_m2": 2500, "median_price_m2": 2300},
+}
+
+
+class TestAVMModelBatch:
+    """Tests for batched AVM prediction."""
+
+    def test_feature_matrix_matches_single_extraction(self):
+        """Test that the vectorized feature matrix matches per-row extraction."""
+        model = AVMModel()
+        properties, _ = make_properties(10)
+
+        matrix = model.extract_feature_matrix(properties, ZONE_STATS)
+
+        assert matrix.shape == (10, len(AVMModel.FEATURE_NAMES))
+        for row, prop in zip(matrix, properties):
+            single = model.extract_features(prop, ZONE_STATS[prop["zone_id"]])
+            np.testing.assert_allclose(row, single.flatten())
+
+    def test_fallback_batch_matches_predict(self):
+        """Test that the unfitted fallback path agrees between batch and single."""
+        model = AVMModel()
+        properties, _ = make_properties(5)
+
+        results = model.predict_batch(properties, ZONE_STATS, as_results=True)
+
+        assert all(isinstance(r, PredictionResult) for r in results)
+        for result, prop in zip(results, properties):
+            assert result == model.predict(prop, ZONE_STATS[prop["zone_id"]])
+
+    def test_fitted_batch_matches_predict(self):
+        """Test that the fitted model gives the same answers in batch and single."""
+        pytest.importorskip("sklearn")
+        properties, prices = make_properties(200)
+        model = AVMModel().fit(properties, prices, ZONE_STATS)
+
+        batch = model.predict_batch(properties[:20], ZONE_STATS)
+
+        assert isinstance(batch, BatchPredictionResult)
+        assert len(batch) == 20
+        for i, prop in enumerate(properties[:20]):
+            single = model.predict(prop, ZONE_STATS[prop["zone_id"]])
+            assert batch.predicted_values[i] == pytest.approx(single.predicted_value)
+            assert batch.confidence_scores[i] == pytest.approx(single.confidence_score)
+
+    def test_quantile_interval_brackets_prediction(self):
+        """Test that quantile heads give one ordered interval per property."""
+        pytest.importorskip("sklearn")
+        properties, prices = make_properties(300)
+        model = AVMModel().fit(properties, prices, ZONE_STATS)
+
+        batch = model.predict_batch(properties[:50], ZONE_STATS)
+
+        assert model.quantile_models is not None
+        assert np.all(batch.confidence_interval_low <= batch.predicted_values)
+        assert np.all(batch.predicted_values <= batch.confidence_interval_high)
+        assert np.all((batch.confidence_scores >= 0) & (batch.confidence_scores <= 1))
+
+    def test_empty_batch(self):
+        """Test that an empty batch returns empty arrays."""
+        model = AVMModel()
+
+        batch = model.predict_batch([], ZONE_STATS)
+
+        assert len(batch) == 0
+        assert batch.to_results() == []
+
+
+@pytest.fixture(scope="module")
+def fitted_model():
+    """A model fitted once on synthetic data, with its training properties."""
+    pytest.importorskip("sklearn")
+    properties, prices = make_properties(300)
+    return AVMModel().fit(properties, prices, ZONE_STATS), properties
+
+
+class TestCompiledAVM:
+    """Tests for the pure-NumPy compiled evaluator."""
+
+    def test_compiled_matches_sklearn(self, fitted_model):
+        """Test that compiled predictions match sklearn within float tolerance."""
+        model, properties = fitted_model
+        features = model.extract_feature_matrix(properties, ZONE_STATS)
+        scaled = model.scaler.transform(features)
+
+        compiled = model.compile()
+
+        np.testing.assert_allclose(compiled.scaler.transform(features), scaled)
+        np.testing.assert_allclose(
+            compiled.model.predict(scaled), model.model.predict(scaled), rtol=1e-9
+        )
+        for head, compiled_head in zip(model.quantile_models, compiled.quantile_models):
+            np.testing.assert_allclose(
+                compiled_head.predict(scaled), head.predict(scaled), rtol=1e-9
+            )
+
+    def test_export_and_load_round_trip(self, fitted_model, tmp_path):
+        """Test that the .npz export loads back to the same predictions."""
+        model, properties = fitted_model
+        path = tmp_path / "avm.npz"
+
+        model.export_compiled(path)
+        loaded = AVMModel(model_path=path)
+
+        expected = model.predict_batch(properties[:25], ZONE_STATS)
+        actual = loaded.predict_batch(properties[:25], ZONE_STATS)
+        np.testing.assert_allclose(actual.predicted_values, expected.predicted_values)
+        np.testing.assert_allclose(
+            actual.confidence_interval_high, expected.confidence_interval_high
+        )
+        assert actual.feature_importances == expected.feature_importances
+
+    def test_artifact_round_trip_is_memory_mapped(self, fitted_model, tmp_path):
+        """Test that saved artifacts record provenance and load memory-mapped."""
+        model, properties = fitted_model
+        path = tmp_path / "avm-v1"
+
+        model.save(path, version="v1", metrics={"holdout_mape": 0.12})
+        loaded = AVMModel(model_path=path)
+
+        manifest = read_manifest(path)
+        assert manifest["version"] == "v1"
+        assert manifest["feature_names"] == AVMModel.FEATURE_NAMES
+        assert manifest["training_data_hash"] == model.training_data_hash
+        assert manifest["metrics"]["holdout_mape"] == 0.12
+        assert "train_r2" in manifest["metrics"]
+
+        assert loaded.version == "v1"
+        assert isinstance(loaded.model.threshold, np.memmap)
+        expected = model.predict_batch(properties[:25], ZONE_STATS)
+        actual = loaded.predict_batch(properties[:25], ZONE_STATS)
+        np.testing.assert_allclose(actual.predicted_values, expected.predicted_values)
+
+    def test_artifact_refuses_overwrite(self, fitted_model, tmp_path):
+        """Test that an existing artifact version is never overwritten in place."""
+        model, _ = fitted_model
+        path = tmp_path / "avm-v1"
+        model.save(path, version="v1")
+
+        with pytest.raises(FileExistsError):
+            model.save(path, version="v1")
+
+    def test_load_compiled_does_not_import_sklearn(self, fitted_model, tmp_path):
+        """Test that loading and predicting with the compiled format skips sklearn."""
+        model, properties = fitted_model
+        path = tmp_path / "avm.npz"
+        model.export_compiled(path)
+
+        script = (
+            "import sys\n"
+            "from avm.model import AVMModel\n"
+            f"m = AVMModel(model_path={str(path)!r})\n"
+            f"m.predict({properties[0]!r})\n"
+            "assert 'sklearn' not in sys.modules\n"
+        )
+        subprocess.run(
+            [sys.executable, "-c", script],
+            check=True,
+            cwd=Path(__file__).parent.parent,
+        )
+
+    def test_valuation_does_not_import_sklearn(self, fitted_model, tmp_path):
+        """Test that a full ensemble valuation with a registry model skips sklearn."""
+        model, properties = fitted_model
+        model.save(tmp_path / "avm-v1", version="v1")
+
+        script = (
+            "import sys\n"
+            "from avm.registry import ModelRegistry\n"
+            "from avm.valuation import PropertyValuator\n"
+            f"registry = ModelRegistry({str(tmp_path)!r}, poll_interval_seconds=0)\n"
+            "registry.refresh()\n"
+            "valuator = PropertyValuator(use_ensemble=True, registry=registry, use_cache=False)\n"
+            f"properties = {properties[:20]!r}\n"
+            f"valuator.valuate(properties[0], properties, {ZONE_STATS[properties[0]['zone_id']]!r})\n"
+            "assert registry.current_version == 'v1'\n"
+            "assert 'sklearn' not in sys.modules\n"
+        )
+        subprocess.run(
+            [sys.executable, "-c", script],
+            check=True,
+            cwd=Path(__file__).parent.parent,
+        )
+
+
+class TestModelRegistry:
+    """Tests for the process-wide model registry."""
+
+    def test_serves_latest_version_and_hot_swaps(self, fitted_model, tmp_path):
+        """Test that refresh picks up a newer artifact and swaps it in."""
+        model, _ = fitted_model
+        model.save(tmp_path / "avm-v1", version="20260101T000000")
+        registry = ModelRegistry(tmp_path, poll_interval_seconds=0)
+
+        assert registry.refresh() is True
+        first = registry.current()
+        assert registry.current_version == "20260101T000000"
+        assert registry.refresh() is False
+
+        model.save(tmp_path / "avm-v2", version="20260201T000000")
+        assert registry.refresh() is True
+        assert registry.current_version == "20260201T000000"
+        # Holders of the previous snapshot keep a usable model
+        assert first.version == "20260101T000000"
+        assert first.predict({"area_m2": 120}).predicted_value > 0
+
+    def test_current_pointer_pins_version(self, fitted_model, tmp_path):
+        """Test that the CURRENT pointer file overrides latest-version selection."""
+        model, _ = fitted_model
+        model.save(tmp_path / "avm-v1", version="v1")
+        model.save(tmp_path / "avm-v2", version="v2")
+        (tmp_path / CURRENT_POINTER_FILE).write_text("avm-v1\n")
+
+        registry = ModelRegistry(tmp_path, poll_interval_seconds=0)
+        registry.refresh()
+
+        assert registry.current_version == "v1"
+
+    def test_valuation_reports_serving_version(self, fitted_model, tmp_path):
+        """Test that ValuationResult records the model version that served it."""
+        model, properties = fitted_model
+        model.save(tmp_path / "avm-v1", version="v1")
+        registry = ModelRegistry(tmp_path, poll_interval_seconds=0)
+        registry.refresh()
+
+        valuator = PropertyValuator(registry=registry)
+        result = valuator.valuate(properties[0], properties[1:], ZONE_STATS["zone-0"])
+
+        assert result.model_version == "v1"
+
+    def test_disabled_registry_falls_back(self):
+        """Test that valuation still works without any trained model."""
+        registry = ModelRegistry(None)
+
+        valuator = PropertyValuator(registry=registry)
+        result = valuator.valuate({"id": "p1", "area_m2": 100, "price": 200000}, [], {})
+
+        assert registry.current() is None
+        assert result.model_version is None
+        assert result.estimated_value > 0
+
+
+class TestBatchValuation:
+    """Tests for valuing many subjects against a shared candidate set."""
+
+    @pytest.mark.parametrize(
+        "use_ensemble,use_ml_model", [(True, True), (False, True), (False, False)]
+    )
+    def test_valuate_many_matches_single_valuations(
+        self, fitted_model, tmp_path, use_ensemble, use_ml_model
+    ):
+        """Test that batch results equal one valuate call per subject."""
+        model, properties = fitted_model
+        model.save(tmp_path / "avm-v1", version="v1")
+        registry = ModelRegistry(tmp_path, poll_interval_seconds=0)
+        registry.refresh()
+        valuator = PropertyValuator(
+            use_ml_model=use_ml_model, use_ensemble=use_ensemble, registry=registry
+        )
+        subjects = properties[:12]
+
+        results = list(valuator.valuate_many(subjects, properties, ZONE_STATS, chunk_size=5))
+
+        assert [r.property_id for r in results] == [s["id"] for s in subjects]
+        for subject, result in zip(subjects, results):
+            expected = valuator.valuate(subject, properties, ZONE_STATS[subject["zone_id"]])
+            assert result.estimated_value == pytest.approx(expected.estimated_value)
+            assert result.comparables == expected.comparables
+            assert result.model_version == expected.model_version
+
+    def test_parallel_valuator_matches_serial(self, fitted_model, tmp_path):
+        """Test that worker processes produce the serial results in subject order."""
+        model, properties = fitted_model
+        model.save(tmp_path / "models" / "avm-v1", version="v1")
+        registry = ModelRegistry(tmp_path / "models", poll_interval_seconds=0)
+        registry.refresh()
+        subjects = properties[:20]
+
+        expected = list(
+            PropertyValuator(registry=registry).valuate_many(subjects, properties, ZONE_STATS)
+        )
+        with ParallelValuator(workers=2, chunk_size=3, registry=registry) as parallel:
+            results = list(parallel.valuate_many(subjects, properties, ZONE_STATS))
+
+        assert [r.property_id for r in results] == [s["id"] for s in subjects]
+        for result, serial in zip(results, expected):
+            assert result.estimated_value == pytest.approx(serial.estimated_value)
+            assert result.comparables == serial.comparables
+            assert result.model_version == "v1"
+
+    def test_early_stop_drops_queued_chunks(self, fitted_model, tmp_path, monkeypatch):
+        """Test that closing the stream early settles every chunk before removing their frame."""
+        model, properties = fitted_model
+        monkeypatch.setattr("avm.parallel.SHARED_DIR", str(tmp_path))
+        registry = ModelRegistry(tmp_path / "models", poll_interval_seconds=0)
+        submitted = []
+
+        with ParallelValuator(workers=2, chunk_size=1, registry=registry) as parallel:
+            pool = parallel._get_pool()
+            submit = pool.submit
+            monkeypatch.setattr(
+                pool, "submit", lambda *args: submitted.append(submit(*args)) or submitted[-1]
+            )
+            results = parallel.valuate_many(properties[:40], properties, ZONE_STATS)
+            next(results)
+            results.close()
+
+            # Queued chunks were cancelled and running ones finished before the frame went away
+            assert all(future.done() for future in submitted)
+            assert not any(path.name.startswith("pricewaze-frame-") for path in tmp_path.iterdir())
+
+    def test_frame_save_load_round_trip(self, tmp_path):
+        """Test that a saved frame memory-maps back with the same contents."""
+        properties, _ = make_properties(40)
+        frame = CandidateFrame.from_records(properties)
+
+        loaded = CandidateFrame.load(frame.save(tmp_path / "frame"))
+
+        assert isinstance(loaded.area_m2, np.memmap)
+        assert loaded.row("prop-7") == 7
+        assert [loaded.record(i) for i in range(40)] == [frame.record(i) for i in range(40)]
+
+    def test_zone_statistics_from_frame(self):
+        """Test that per-zone statistics are computed from the frame columns."""
+        properties, _ = make_properties(30)
+        frame = CandidateFrame.from_records(properties)
+
+        stats = frame.zone_statistics()
+
+        zone_prices = [p["price_per_m2"] for p in properties if p["zone_id"] == "zone-1"]
+        assert stats["zone-1"]["property_count"] == len(zone_prices)
+        assert stats["zone-1"]["median_price_m2"] == pytest.approx(np.median(zone_prices), abs=0.01)
+
+    def test_result_serializes_to_json(self):
+        """Test that ValuationResult.to_dict is JSON-serializable."""
+        valuator = PropertyValuator(registry=ModelRegistry(None))
+        result = valuator.valuate({"id": "p1", "area_m2": 100, "price": 200000}, [], {})
+
+        assert json.loads(json.dumps(result.to_dict()))["property_id"] == "p1"
+
+
+class TestValuationCache:
+    """Tests for the content-addressed valuation cache."""
+
+    SUBJECT = {"id": "p1", "zone_id": "zone-0", "area_m2": 100, "price": 200000}
+
+    def make_valuator(self, cache):
+        return PropertyValuator(registry=ModelRegistry(None), cache=cache)
+
+    def test_repeat_valuation_hits_cache(self):
+        """Test that an identical valuation is served from the cache."""
+        cache = ValuationCache()
+        valuator = self.make_valuator(cache)
+
+        first = valuator.valuate(self.SUBJECT, [], ZONE_STATS["zone-0"])
+        second = valuator.valuate(self.SUBJECT, [], ZONE_STATS["zone-0"])
+
+        assert second is first
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+
+    def test_changed_inputs_miss(self):
+        """Test that a new price, zone stats or candidate set changes the key."""
+        cache = ValuationCache()
+        valuator = self.make_valuator(cache)
+        properties, _ = make_properties(10)
+
+        valuator.valuate(self.SUBJECT, [], ZONE_STATS["zone-0"])
+        valuator.valuate({**self.SUBJECT, "price": 210000}, [], ZONE_STATS["zone-0"])
+        valuator.valuate(self.SUBJECT, [], ZONE_STATS["zone-1"])
+        valuator.valuate(self.SUBJECT, properties, ZONE_STATS["zone-0"])
+
+        assert cache.stats()["misses"] == 4
+
+    def test_lru_and_ttl_eviction(self):
+        """Test that the oldest entries are evicted and expired entries dropped."""
+        cache = ValuationCache(max_entries=2)
+        valuator = self.make_valuator(cache)
+        for price in (1, 2, 3):
+            valuator.valuate({**self.SUBJECT, "price": price}, [], {})
+        assert cache.stats()["evictions"] == 1
+
+        expiring = ValuationCache(ttl_seconds=0)
+        valuator = self.make_valuator(expiring)
+        valuator.valuate(self.SUBJECT, [], {})
+        valuator.valuate(self.SUBJECT, [], {})
+        assert expiring.stats()["hits"] == 0
+
+    def test_shared_tier_and_invalidation(self, tmp_path):
+        """Test that processes share entries and invalidations through SQLite."""
+        path = tmp_path / "cache.sqlite"
+        writer, reader = ValuationCache(sqlite_path=path), ValuationCache(sqlite_path=path)
+        zone_stats = {**ZONE_STATS["zone-0"], "zone_id": "zone-0"}
+
+        first = self.make_valuator(writer).valuate(self.SUBJECT, [], zone_stats)
+        shared = self.make_valuator(reader).valuate(self.SUBJECT, [], zone_stats)
+        assert shared == first
+        assert reader.stats()["disk_hits"] == 1
+
+        assert writer.invalidate_zone("zone-0") == 1
+        self.make_valuator(reader).valuate(self.SUBJECT, [], zone_stats)
+        assert reader.stats()["misses"] == 1
+
+    def test_valuate_many_uses_cache(self, fitted_model):
+        """Test that batch valuation serves repeated subjects from the cache."""
+        _, properties = fitted_model
+        cache = ValuationCache()
+        valuator = self.make_valuator(cache)
+
+        first = list(valuator.valuate_many(properties[:5], properties, ZONE_STATS))
+        second = list(valuator.valuate_many(properties[:5], properties, ZONE_STATS))
+
+        assert all(a is b for a, b in zip(first, second))
+        assert cache.stats()["hits"] == 5
+
+
+class TestValuationResultRecords:
+    """Tests for the compact, immutable valuation records."""
+
+    def valuate(self, model, count=20):
+        properties, _ = make_properties(count)
+        valuator = PropertyValuator(
+            use_ensemble=False, registry=ModelRegistry(None), use_cache=False
+        )
+        if model is not None:
+            valuator.model = model
+        return properties, list(valuator.valuate_many(properties, properties, ZONE_STATS))
+
+    def test_results_are_frozen_and_slotted(self):
+        """Test that results and comparables cannot be mutated and carry no __dict__."""
+        _, results = self.valuate(None)
+        result = results[0]
+
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            result.estimated_value = 0
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            result.comparables[0].adjustments.area = 0
+        assert not hasattr(result, "__dict__")
+        assert not hasattr(result.comparables[0], "__dict__")
+
+    def test_json_shape_unchanged(self):
+        """Test that to_dict emits plain lists and dicts, with only applied adjustments."""
+        properties, results = self.valuate(None)
+        finder = ComparablesFinder()
+        data = json.loads(json.dumps(results[0].to_dict()))
+
+        assert isinstance(data["methodology_notes"], list)
+        assert isinstance(data["feature_importances"], dict)
+        for comp in data["comparables"]:
+            candidate = next(p for p in properties if p["id"] == comp["property_id"])
+            expected, _ = finder.calculate_adjustments(
+                properties[0], candidate, candidate["price_per_m2"]
+            )
+            assert comp["adjustments"] == pytest.approx(expected)
+
+        assert ValuationResult.from_dict(data) == results[0]
+
+    def test_feature_importances_shared(self, fitted_model):
+        """Test that every result of a model version holds the same importances object."""
+        model, _ = fitted_model
+        _, results = self.valuate(model)
+
+        importances = {id(result.feature_importances) for result in results}
+        assert len(importances) == 1
+        assert pickle.loads(pickle.dumps(results[0])).feature_importances is (
+            results[0].feature_importances
+        )
+
+
+class TestIncrementalRevaluation:
+    """Tests for event-driven incremental revaluation."""
+
+    def fresh_results(self, valuator, candidates):
+        return {
+            c["id"]: valuator.valuate(c, candidates, ZONE_STATS[c["zone_id"]])
+            for c in candidates
+        }
+
+    def test_events_touch_few_subjects_and_match_full_revaluation(self):
+        """Test that incremental results equal a full revaluation after each event."""
+        properties, _ = make_properties(200)
+        for i, prop in enumerate(properties):
+            # Spread listings over ~30km so an event only reaches its neighbourhood
+            prop["latitude"] = 18.40 + (i % 20) * 0.015
+            prop["longitude"] = -70.00 + (i // 20) * 0.015
+        valuator = PropertyValuator(registry=ModelRegistry(None), use_cache=False)
+        pipeline = IncrementalRevaluator(valuator, properties, ZONE_STATS)
+        pipeline.value_all()
+
+        candidates = {p["id"]: p for p in properties}
+        events = [
+            ListingEvent("update", {"id": "prop-5", "price": 90000, "price_per_m2": 900.0}),
+            ListingEvent("delete", {"id": "prop-77"}),
+            ListingEvent("insert", {**properties[120], "id": "new-1", "area_m2": 95.0}),
+        ]
+        for event in events:
+            report = pipeline.apply(event)
+            if event.kind == "delete":
+                candidates.pop(event.property_id)
+            else:
+                candidates[event.property_id] = {
+                    **candidates.get(event.property_id, {}), **event.listing
+                }
+
+            assert 0 < report.touched < len(candidates) / 2
+            expected = self.fresh_results(valuator, list(candidates.values()))
+            assert set(pipeline.results) == set(expected)
+            for subject_id, result in expected.items():
+                assert pipeline.results[subject_id].comparables == result.comparables
+                assert pipeline.results[subject_id].estimated_value == pytest.approx(
+                    result.estimated_value
+                )
+
+    def test_webhook_payload(self):
+        """Test that Supabase webhook payloads map to listing events."""
+        event = ListingEvent.from_webhook(
+            {"type": "DELETE", "record": None, "old_record": {"id": "p1"}}
+        )
+
+        assert event.kind == "delete"
+        assert event.property_id == "p1"
+        with pytest.raises(ValueError):
+            ListingEvent.from_webhook({"type": "TRUNCATE"})
+
+
+class TestStreamingValuation:
+    """Tests for zone-by-zone streaming valuation."""
+
+    def make_pages(self, page_size=7):
+        properties, _ = make_properties(40)
+        rows = [{**p, "status": "active" if i % 4 else "sold"} for i, p in enumerate(properties)]
+
+        def fetch_pages(zone_id):
+            zone_rows = [row for row in rows if row["zone_id"] == zone_id]
+            for start in range(0, len(zone_rows), page_size):
+                yield zone_rows[start:start + page_size]
+
+        return rows, fetch_pages
+
+    def test_records_match_batch_valuation(self):
+        """Test that streamed records summarize the same valuations as valuate_many."""
+        rows, fetch_pages = self.make_pages()
+        valuator = PropertyValuator(registry=ModelRegistry(None), use_cache=False)
+
+        records = list(
+            iter_valuations(["zone-0", "zone-1"], fetch_pages=fetch_pages, valuator=valuator)
+        )
+
+        zone_rows = [r for r in rows if r["zone_id"] in ("zone-0", "zone-1")]
+        assert sorted(r.property_id for r in records) == sorted(r["id"] for r in zone_rows)
+        for zone_id in ("zone-0", "zone-1"):
+            in_zone = [r for r in zone_rows if r["zone_id"] == zone_id]
+            candidates = CandidateFrame.from_supabase_rows(
+                [r for r in in_zone if r["status"] == "active"]
+            )
+            subjects = CandidateFrame.from_supabase_rows(in_zone)
+            expected = valuator.valuate_many(
+                [subjects.record(i) for i in range(len(subjects))],
+                candidates,
+                candidates.zone_statistics(),
+            )
+            streamed = [r for r in records if r.zone_id == zone_id]
+            for record, result in zip(streamed, expected):
+                assert record == ValuationRecord.from_result(result)
+
+    def test_frame_concat_merges_vocabularies(self):
+        """Test that concatenated page frames equal one frame over all rows."""
+        properties, _ = make_properties(30)
+        pages = [properties[:10], properties[10:25], properties[25:]]
+
+        frame = CandidateFrame.concat([CandidateFrame.from_records(p) for p in pages])
+        whole = CandidateFrame.from_records(properties)
+
+        assert [frame.record(i) for i in range(30)] == [whole.record(i) for i in range(30)]
+
+    def test_writers(self, tmp_path):
+        """Test that records round-trip through NDJSON and Parquet files."""
+        _, fetch_pages = self.make_pages()
+        valuator = PropertyValuator(registry=ModelRegistry(None), use_cache=False)
+        records = list(iter_valuations(["zone-2"], fetch_pages=fetch_pages, valuator=valuator))
+
+        assert write_ndjson(iter(records), tmp_path / "out.ndjson") == len(records)
+        lines = (tmp_path / "out.ndjson").read_text().splitlines()
+        assert json.loads(lines[0]) == records[0].to_dict()
+
+        pq = pytest.importorskip("pyarrow.parquet")
+        assert write_parquet(iter(records), tmp_path / "out.parquet", row_group_size=4) == len(records)
+        table = pq.read_table(tmp_path / "out.parquet")
+        assert table.column("property_id").to_pylist() == [r.property_id for r in records]
+
+
+class TestComparablesRadius:
+    """Tests for the adaptive radius search in find_comparables."""
+
+    def test_sparse_zone_expands_to_smallest_sufficient_radius(self):
+        """Test that the radius grows to the first 1km step with enough comps."""
+        finder = ComparablesFinder(max_distance_km=2.0, min_comparables=3)
+        subject = {"id": "s", "latitude": 18.47, "longitude": -69.93}
+        # ~3.3km north of the subject: first reached at the 4km step
+        candidates = [
+            {"id": f"c{i}", "latitude": 18.50, "longitude": -69.93, "price_per_m2": 2000}
+            for i in range(3)
+        ]
+
+        comparables = finder.find_comparables(subject, candidates)
+
+        distance = finder.haversine_distance(18.47, -69.93, 18.50, -69.93)
+        expected_overall = 0.4 * (1 - distance / 4.0) + 0.6 * 0.5
+        assert len(comparables) == 3
+        assert all(c.overall_similarity == round(expected_overall, 3) for c in comparables)
+
+    def test_no_expansion_keeps_initial_radius(self):
+        """Test that expand_radius=False never widens the search."""
+        finder = ComparablesFinder(max_distance_km=2.0, min_comparables=3)
+        subject = {"id": "s", "latitude": 18.47, "longitude": -69.93}
+        candidates = [{"id": "far", "latitude": 18.50, "longitude": -69.93}]
+
+        assert finder.find_comparables(subject, candidates, expand_radius=False) == []
+
+
+class TestComparablesKernels:
+    """Tests for the vectorized comparables kernels against the scalar reference."""
+
+    def test_kernels_match_scalar_reference(self):
+        """Test that similarity and adjustment kernels match the scalar methods."""
+        properties, _ = make_properties(60)
+        properties[3].pop("bedrooms")
+        properties[4].pop("property_type")
+        finder = ComparablesFinder()
+        frame = CandidateFrame.from_records(properties)
+        subject = {**properties[0], "age": 12}
+
+        similarity = feature_similarity(subject, frame, finder.weights)
+        adjustments = price_adjustments(subject, frame, finder.ADJUSTMENT_FACTORS)
+
+        for i, cand in enumerate(properties):
+            expected_adj, expected_price = finder.calculate_adjustments(
+                subject, cand, cand["price_per_m2"]
+            )
+            assert similarity[i] == pytest.approx(
+                finder.calculate_feature_similarity(subject, cand)
+            )
+            assert adjustments.as_dict(i) == pytest.approx(expected_adj)
+            assert adjustments.adjusted_price_per_m2[i] == pytest.approx(expected_price)
+
+    def test_top_k_is_stable_on_ties(self):
+        """Test that top-k ordering matches a stable descending sort."""
+        scores = np.array([0.5, 0.9, 0.5, 0.7, 0.9, 0.5])
+
+        assert top_k(scores, 4).tolist() == [1, 4, 3, 0]
+        assert top_k(scores, 10).tolist() == [1, 4, 3, 0, 2, 5]
+
+    def test_frame_search_matches_record_search(self):
+        """Test that find_comparables gives the same result for frames and dicts."""
+        properties, _ = make_properties(300)
+        finder = ComparablesFinder(max_distance_km=1.0, min_comparables=5)
+        frame = CandidateFrame.from_records(properties)
+        index = finder.build_index(frame)
+
+        for subject in properties[:10]:
+            expected = finder.find_comparables(subject, properties)
+            assert finder.find_comparables(subject, frame) == expected
+            assert finder.find_comparables(subject, frame, index=index) == expected
+
+
+class TestCandidateFrame:
+    """Tests for the columnar candidate frame."""
+
+    def test_from_supabase_rows(self):
+        """Test that database rows are parsed, interned and indexed by id."""
+        rows = [
+            {"id": "a", "zone_id": "z1", "property_type": "apartment", "price": "150000.00",
+             "area_m2": "100.50", "bedrooms": 2, "bathrooms": 1, "year_built": 2016,
+             "latitude": 18.47, "longitude": -69.93},
+            {"id": "b", "zone_id": "z2", "property_type": "house", "price": 300000,
+             "area_m2": 200, "bedrooms": None, "latitude": 18.48, "longitude": -69.94},
+            {"id": "c", "zone_id": "z1", "property_type": "apartment", "price": 90000,
+             "area_m2": 60},
+        ]
+
+        frame = CandidateFrame.from_supabase_rows(rows, as_of_year=2026)
+
+        assert len(frame) == 3
+        assert frame.row("b") == 1
+        assert frame.type_codes == {"apartment": 0, "house": 1}
+        assert frame.zone_codes == {"z1": 0, "z2": 1}
+        assert frame.zone.tolist() == [0, 1, 0]
+        assert frame.area_m2[0] == 100.5
+        assert frame.age_years[0] == 10
+        assert np.isnan(frame.bedrooms[1])
+        assert frame.record(1) == {
+            "id": "b", "latitude": 18.48, "longitude": -69.94, "price": 300000.0,
+            "area_m2": 200.0, "property_type": "house", "zone_id": "z2",
+        }
+
+    def test_from_scraper_listings(self):
+        """Test that scraper listings are filtered, mapped and priced per m2."""
+        listings = [
+            {"id": "x1", "currency": "USD", "transactionType": "venta", "priceNumeric": 120000,
+             "areaM2": 80, "bedrooms": 2, "bathrooms": 2, "parking": 1,
+             "propertyType": "apartamento", "zone": "piantini"},
+            {"id": "x2", "currency": "DOP", "transactionType": "venta", "priceNumeric": 9000000,
+             "areaM2": 90, "propertyType": "casa", "zone": "naco"},
+            {"id": "x3", "currency": "USD", "transactionType": "alquiler", "priceNumeric": 1500,
+             "areaM2": 70, "propertyType": "apartamento", "zone": "piantini"},
+            {"id": "x4", "currency": "USD", "transactionType": "venta", "priceNumeric": 50000,
+             "propertyType": "inmueble", "zone": None},
+        ]
+
+        frame = CandidateFrame.from_scraper_listings(listings)
+
+        assert frame.ids == ["x1", "x4"]
+        assert frame.price_per_m2[0] == 1500
+        assert np.isnan(frame.price_per_m2[1])
+        assert frame.record(0)["property_type"] == "apartment"
+        assert "property_type" not in frame.record(1)
+        assert frame.zone.tolist() == [0, -1]
+        assert np.isnan(frame.latitude).all()
+
+    def test_frame_is_smaller_than_records(self):
+        """Test that the frame columns take far less memory than row dicts."""
+        properties, _ = make_properties(1000)
+        frame = CandidateFrame.from_records(properties)
+        dict_bytes = sum(
+            sys.getsizeof(p) + sum(sys.getsizeof(v) for v in p.values()) for p in properties
+        )
+
+        assert frame.nbytes() * 4 < dict_bytes
+
+    def test_model_predicts_from_frame(self, fitted_model):
+        """Test that batch prediction on a frame matches the dict path."""
+        model, _ = fitted_model
+        properties, _ = make_properties(50, seed=3)
+        frame = CandidateFrame.from_records(properties)
+
+        expected = model.predict_batch(properties, ZONE_STATS)
+        batch = model.predict_batch(frame, ZONE_STATS)
+
+        np.testing.assert_allclose(batch.predicted_values, expected.predicted_values)
+        np.testing.assert_allclose(
+            model.extract_feature_matrix(frame, ZONE_STATS),
+            model.extract_feature_matrix(properties, ZONE_STATS),
+        )
+
+
+class TestSpatialIndex:
+    """Tests for the grid spatial index used by comparables search."""
+
+    def test_radius_query_matches_brute_force(self):
+        """Test that radius queries return exactly the points within the radius."""
+        properties, _ = make_properties(400)
+        index = ComparablesFinder.build_index(properties)
+        finder = ComparablesFinder()
+        lat, lon = 18.47, -69.93
+
+        items, distances = index.query_radius(lat, lon, 2.0)
+
+        expected = [
+            p["id"]
+            for p in properties
+            if finder.haversine_distance(lat, lon, p["latitude"], p["longitude"]) <= 2.0
+        ]
+        assert [item["id"] for item in items] == expected
+        assert np.all(distances <= 2.0 + 1e-6)
+
+    def test_knn_matches_brute_force(self):
+        """Test that k-nearest search returns the k closest points in order."""
+        properties, _ = make_properties(400)
+        index = ComparablesFinder.build_index(properties)
+        finder = ComparablesFinder()
+        lat, lon = 18.48, -69.92
+
+        items, distances = index.query_knn(lat, lon, k=7)
+
+        by_distance = sorted(
+            properties,
+            key=lambda p: finder.haversine_distance(lat, lon, p["latitude"], p["longitude"]),
+        )
+        assert [item["id"] for item in items] == [p["id"] for p in by_distance[:7]]
+        assert np.all(np.diff(distances) >= 0)
+
+    def test_incremental_insert_move_and_remove(self):
+        """Test that points can be added, moved and removed without a rebuild."""
+        index = SpatialIndex(cell_size_km=0.5)
+        index.insert("a", 18.47, -69.93, {"id": "a"})
+        index.insert("b", 18.60, -69.93, {"id": "b"})
+
+        assert [i["id"] for i in index.query_radius(18.47, -69.93, 1.0)[0]] == ["a"]
+
+        index.insert("b", 18.471, -69.931, {"id": "b"})
+        assert len(index) == 2
+        assert {i["id"] for i in index.query_radius(18.47, -69.93, 1.0)[0]} == {"a", "b"}
+
+        assert index.remove("a") is True
+        assert index.remove("a") is False
+        assert [i["id"] for i in index.query_radius(18.47, -69.93, 1.0)[0]] == ["b"]
+
+    def test_rows_stay_bounded_under_churn(self):
+        """Test that moves reuse rows and removed rows are reclaimed."""
+        properties, _ = make_properties(100)
+        index = ComparablesFinder.build_index(properties)
+        for step in range(1000):
+            shift = 0.001 * ((step + 1) % 7)
+            for p in properties:
+                index.insert(p["id"], p["latitude"] + shift, p["longitude"], p)
+        for p in properties:
+            index.insert(p["id"], p["latitude"], p["longitude"], p)
+        assert len(index._ids) == 100
+
+        for step in range(10):
+            for p in properties[50:]:
+                index.remove(p["id"])
+            for p in properties[50:]:
+                index.insert(p["id"], p["latitude"], p["longitude"], p)
+        assert len(index) == 100
+        assert len(index._ids) <= 200
+
+        finder = ComparablesFinder()
+        lat, lon = 18.47, -69.93
+        expected = {
+            p["id"]
+            for p in properties
+            if finder.haversine_distance(lat, lon, p["latitude"], p["longitude"]) <= 2.0
+        }
+        assert {item["id"] for item in index.query_radius(lat, lon, 2.0)[0]} == expected
+
+    def test_queries_wrap_around_the_antimeridian(self):
+        """Test that searches near ±180° longitude find points on the other side."""
+        index = SpatialIndex(cell_size_km=1.0)
+        index.insert("east", 0.0, 179.99, {"id": "east"})
+        index.insert("west", 0.0, -179.99, {"id": "west"})
+        index.insert("far", 0.0, 170.0, {"id": "far"})
+
+        items, distances = index.query_radius(0.0, 179.99, 5.0)
+        assert [item["id"] for item in items] == ["east", "west"]
+        assert distances[1] == pytest.approx(2.2, abs=0.05)
+        assert [item["id"] for item in index.query_radius(0.0, -179.995, 2.0)[0]] == [
+            "east",
+            "west",
+        ]
+
+        items, _ = index.query_knn(0.0, 179.99, k=2)
+        assert [item["id"] for item in items] == ["east", "west"]
+
+        # More neighbours than points: the search stops once it covers the globe
+        items, _ = index.query_knn(0.0, 179.99, k=5)
+        assert [item["id"] for item in items] == ["east", "west", "far"]
+
+    def test_find_comparables_with_index_matches_scan(self):
+        """Test that index-backed comparables search gives the same result."""
+        properties, _ = make_properties(300)
+        finder = ComparablesFinder(max_distance_km=1.0, min_comparables=5)
+        index = finder.build_index(properties)
+
+        for subject in properties[:10]:
+            assert finder.find_comparables(subject, [], index=index) == (
+                finder.find_comparables(subject, properties)
+            )
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,184 @@
+"""Tests for crew support: task progress events and the LLM response cache."""
+
+import time
+from types import SimpleNamespace
+
+from crewai import LLM
+
+import crews.llm
+from config import get_settings
+from crews.llm import create_llm
+from crews.llm_cache import LLMCache, llm_cache_key, track_llm_cache
+from crews.progress import TaskProgress
+
+USAGE = {"prompt_tokens": 900, "completion_tokens": 100, "total_tokens": 1000}
+
+
+class FakeCrew:
+    """Crew whose usage metrics are set by the test."""
+
+    def __init__(self):
+        self.usage = {}
+
+    def calculate_usage_metrics(self):
+        return SimpleNamespace(model_dump=lambda: dict(self.usage, model="deepseek-chat"))
+
+
+class TestTaskProgress:
+    """Tests for per-task progress events."""
+
+    def test_events_report_task_token_deltas(self):
+        """Test that each event carries the tokens of its own task and the running total."""
+        tasks = [
+            SimpleNamespace(
+                description=f"Task {index} " + "x" * 200, agent=SimpleNamespace(role=role)
+            )
+            for index, role in ((1, "Market Analyst"), (2, "Pricing Analyst"))
+        ]
+        events = []
+        progress = TaskProgress(tasks, events.append)
+        crew = FakeCrew()
+        progress.bind(crew)
+
+        crew.usage = {"total_tokens": 1000, "prompt_tokens": 800, "successful_requests": 2}
+        progress(SimpleNamespace(agent="Market Analyst", raw="Zone report"))
+        crew.usage = {"total_tokens": 1600, "prompt_tokens": 1300, "successful_requests": 3}
+        progress(SimpleNamespace(agent=None, raw="Valuation"))
+
+        first, second = events
+        assert (first["task_index"], first["task_count"]) == (1, 2)
+        assert first["output"] == "Zone report"
+        assert first["task"].startswith("Task 1 ") and first["task"].endswith("...")
+        assert first["token_usage"] == {
+            "total_tokens": 1000,
+            "prompt_tokens": 800,
+            "successful_requests": 2,
+        }
+        assert second["specialist"] == "Pricing Analyst"
+        assert second["token_usage"] == {
+            "total_tokens": 600,
+            "prompt_tokens": 500,
+            "successful_requests": 1,
+        }
+        assert second["total_token_usage"] == crew.usage
+        assert second["elapsed_seconds"] >= second["task_seconds"] >= 0
+
+
+class TestLLMCache:
+    """Tests for the LLM response cache."""
+
+    def test_key_covers_model_temperature_prompt_and_tools(self):
+        """Test that only whitespace differences map to the same key."""
+        messages = [
+            {"role": "system", "content": "You are a pricing analyst."},
+            {"role": "user", "content": "Value property p1.\nObservation: {\"price\": 100}"},
+        ]
+        key = llm_cache_key("deepseek-chat", 0.3, messages)
+
+        reformatted = [
+            {"role": "system", "content": "  You are a pricing   analyst. "},
+            {"role": "user", "content": "Value property p1. Observation: {\"price\": 100}\n"},
+        ]
+        assert llm_cache_key("deepseek-chat", 0.3, reformatted) == key
+
+        changed_tool_result = [
+            messages[0],
+            {"role": "user", "content": "Value property p1.\nObservation: {\"price\": 120}"},
+        ]
+        assert llm_cache_key("deepseek-chat", 0.3, changed_tool_result) != key
+        assert llm_cache_key("deepseek-chat", 0.2, messages) != key
+        assert llm_cache_key("deepseek-reasoner", 0.3, messages) != key
+        assert llm_cache_key("deepseek-chat", 0.3, messages, [{"name": "fetch"}]) != key
+        assert llm_cache_key("deepseek-chat", 0.3, messages, stop=["\nObservation:"]) != key
+        assert llm_cache_key("deepseek-chat", 0.3, "Hi") == llm_cache_key(
+            "deepseek-chat", 0.3, [{"role": "user", "content": "Hi"}]
+        )
+
+    def test_lru_and_ttl(self):
+        """Test that the in-process tier evicts the least recently used and expired responses."""
+        cache = LLMCache(max_entries=2, ttl_seconds=60)
+        for key in ("a", "b"):
+            cache.put(key, "deepseek-chat", f"response {key}")
+        assert cache.get("a").response == "response a"
+        cache.put("c", "deepseek-chat", "response c")
+
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+        assert cache.stats()["evictions"] == 1
+
+        expiring = LLMCache(ttl_seconds=0.05)
+        expiring.put("a", "deepseek-chat", "response a")
+        time.sleep(0.06)
+        assert expiring.get("a") is None
+
+    def test_disk_tier_is_shared_and_bounded(self, tmp_path, monkeypatch):
+        """Test that another process finds stored responses and the file stays within its limit."""
+        monkeypatch.setattr("crews.llm_cache._TRIM_EVERY", 1)
+        path = tmp_path / "llm.db"
+        api, worker = LLMCache(sqlite_path=path), LLMCache(sqlite_path=path, max_disk_entries=3)
+
+        api.put("a", "deepseek-chat", "response a", USAGE)
+        hit = worker.get("a")
+        assert hit.response == "response a"
+        assert hit.usage == USAGE
+        assert worker.stats()["disk_hits"] == 1
+
+        for key in ("b", "c", "d"):
+            worker.put(key, "deepseek-chat", f"response {key}")
+            time.sleep(0.01)
+        assert LLMCache(sqlite_path=path).get("a") is None
+        assert LLMCache(sqlite_path=path).get("d").response == "response d"
+
+    def test_bypass(self):
+        """Test that the bypass flag never serves cached responses."""
+        cache = LLMCache(bypass=True)
+        cache.put("a", "deepseek-chat", "response a")
+
+        assert cache.get("a") is None
+        stats = cache.stats()
+        assert stats["bypassed"] == 1
+        assert stats["hits"] == 0
+
+    def test_run_statistics(self):
+        """Test that hits, hit rate and saved tokens are reported per tracked run."""
+        cache = LLMCache()
+        cache.put("a", "deepseek-chat", "response a", USAGE)
+
+        with track_llm_cache() as stats:
+            cache.get("a")
+            cache.get("a")
+            cache.get("b")
+
+        assert stats.hits == 2
+        assert stats.misses == 1
+        assert stats.saved_tokens == 2000
+        assert stats.to_dict()["saved_prompt_tokens"] == 1800
+        assert stats.to_dict()["hit_rate"] == 0.667
+        assert cache.stats()["hits"] == 2
+
+    def test_crew_llm_serves_repeated_calls_from_cache(self, monkeypatch):
+        """Test that the LLM the crews build answers an identical second call from the cache."""
+        settings = get_settings()
+        # LLM(...) picks a provider client class; stub that class's request to the model
+        provider = type(
+            LLM(model=settings.deepseek_model, api_key="test", base_url=settings.deepseek_base_url)
+        )
+        requests = []
+
+        def call(self, messages, tools=None, callbacks=None, available_functions=None, **kwargs):
+            requests.append(messages)
+            return "Final Answer: fairly priced"
+
+        monkeypatch.setattr(provider, "call", call)
+        monkeypatch.setattr(crews.llm, "get_llm_cache", LLMCache)
+        llm = create_llm(temperature=0.3)
+        messages = [{"role": "user", "content": "Value property p1."}]
+
+        with track_llm_cache() as stats:
+            first = llm.call(messages)
+            second = llm.call([{"role": "user", "content": " Value property  p1. "}])
+            llm.call(messages, available_functions={"fetch_property": print})
+
+        assert first == second == "Final Answer: fairly priced"
+        assert len(requests) == 2  # The function-calling request is never cached
+        assert (stats.hits, stats.misses) == (1, 1)
@@ -0,0 +1,251 @@
+"""Tests for async jobs: job store, queue and job workers."""
+
+import time
+
+import pytest
+
+from jobs import PRIORITIES, InvalidTransitionError, JobStore, JobWorker
+
+
+def echo_job(params: dict, progress) -> dict:
+    """Job handler returning its parameters (module level, so runs can be spawned)."""
+    progress({"type": "task", "task_index": 1})
+    return params
+
+
+def sleep_job(params: dict, progress) -> None:
+    """Job handler that outlives short timeouts."""
+    time.sleep(params["seconds"])
+
+
+def failing_job(params: dict, progress) -> None:
+    """Job handler that always fails."""
+    raise ValueError("crew failed")
+
+
+def wait_for(store: JobStore, job_id: str, worker: JobWorker, statuses: set, timeout: float = 30.0):
+    """Step the worker until the job reaches one of the states."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        worker.step()
+        job = store.get(job_id)
+        if job.status in statuses:
+            return job
+        time.sleep(0.05)
+    raise AssertionError(f"job still {store.get(job_id).status}")
+
+
+class TestJobStore:
+    """Tests for the two-tier job store."""
+
+    def test_transitions_are_recorded(self):
+        """Test that a job moves through its states with timestamps."""
+        store = JobStore()
+        job = store.create("pricing_analysis", {"property_id": "p1"})
+        assert job.status == "queued"
+
+        finished = store.run(job.id, lambda: {"result": "ok"})
+
+        assert finished.status == "completed"
+        assert finished.result == {"result": "ok"}
+        assert [status for status, _ in finished.transitions] == ["queued", "running", "completed"]
+        assert finished.created_at <= finished.started_at <= finished.finished_at
+        assert store.get(job.id).to_dict()["finished_at"] is not None
+
+    def test_failure_and_invalid_transition(self):
+        """Test that errors fail the job and finished jobs cannot change."""
+        store = JobStore()
+        job = store.create("full_analysis")
+
+        def explode():
+            raise ValueError("no comparables")
+
+        failed = store.run(job.id, explode)
+        assert failed.status == "failed"
+        assert failed.error == "no comparables"
+
+        with pytest.raises(InvalidTransitionError):
+            store.transition(job.id, "running")
+        with pytest.raises(KeyError):
+            store.transition("missing", "running")
+
+    def test_cancelled_job_does_not_run(self):
+        """Test that work of a job cancelled while queued never starts."""
+        store = JobStore()
+        job = store.create("full_analysis")
+        store.transition(job.id, "cancelled")
+
+        assert store.run(job.id, pytest.fail) is None
+        assert store.get(job.id).status == "cancelled"
+
+    def test_memory_stays_bounded(self):
+        """Test LRU eviction and TTL expiry of the in-process tier."""
+        store = JobStore(max_entries=10)
+        for _ in range(100):
+            store.create("pricing_analysis")
+        assert store.stats()["size"] == 10
+        assert store.stats()["evictions"] == 90
+
+        expiring = JobStore(ttl_seconds=0)
+        job = expiring.create("pricing_analysis")
+        assert expiring.get(job.id) is None
+
+    def test_durable_tier_is_shared(self, tmp_path):
+        """Test that any process sees jobs and state changes made by another."""
+        path = tmp_path / "jobs.db"
+        web, worker = JobStore(sqlite_path=path), JobStore(sqlite_path=path)
+
+        job = web.create("full_analysis", {"property_id": "p1"})
+        assert worker.get(job.id).params == {"property_id": "p1"}
+
+        worker.transition(job.id, "running")
+        assert web.get(job.id).status == "running"
+
+        worker.transition(job.id, "completed", result={"summary": "fair"})
+        assert web.get(job.id).result == {"summary": "fair"}
+        assert web.stats()["by_status"] == {"completed": 1}
+
+    def test_concurrent_start_is_rejected(self, tmp_path):
+        """Test that two processes cannot both start the same job."""
+        path = tmp_path / "jobs.db"
+        first, second = JobStore(sqlite_path=path), JobStore(sqlite_path=path)
+        job = first.create("full_analysis")
+
+        first.transition(job.id, "running")
+        with pytest.raises(InvalidTransitionError):
+            second.transition(job.id, "running")
+
+    @pytest.mark.parametrize("durable", [False, True])
+    def test_progress_events(self, tmp_path, durable):
+        """Test that progress events are numbered per job, read incrementally and dropped with it."""
+        if durable:
+            path = tmp_path / "jobs.db"
+            web, worker = JobStore(sqlite_path=path), JobStore(sqlite_path=path)
+        else:
+            web = worker = JobStore()
+        job = web.create("full_analysis")
+        worker.transition(job.id, "running")
+
+        for index in (1, 2, 3):
+            worker.add_event(job.id, {"type": "task", "task_index": index})
+        worker.add_event("missing", {"type": "task"})
+
+        events = web.events(job.id, after=1)
+        assert [event.seq for event in events] == [2, 3]
+        assert events[0].to_dict()["task_index"] == 2
+        assert events[0].attempt == 1
+
+        web.delete(job.id)
+        assert worker.events(job.id) == []
+
+    def test_expired_jobs_are_purged(self, tmp_path):
+        """Test that expired jobs are dropped from the durable tier."""
+        store = JobStore(ttl_seconds=0.05, sqlite_path=tmp_path / "jobs.db")
+        for _ in range(3):
+            store.create("pricing_analysis")
+        time.sleep(0.1)
+
+        assert store.purge_expired() == 3
+        assert store.stats()["by_status"] == {}
+
+
+class TestJobQueue:
+    """Tests for claiming, retries and job workers."""
+
+    def test_claims_by_priority_then_age(self, tmp_path):
+        """Test that interactive jobs are claimed before older batch jobs."""
+        store = JobStore(sqlite_path=tmp_path / "jobs.db")
+        batch = store.create("full_analysis", priority=PRIORITIES["batch"])
+        first = store.create("full_analysis")
+        second = store.create("full_analysis")
+
+        claimed = [store.claim("w1").id for _ in range(3)]
+
+        assert claimed == [first.id, second.id, batch.id]
+        assert store.claim("w1") is None
+
+    def test_failed_attempts_retry_with_backoff(self, tmp_path):
+        """Test that a failed attempt is requeued after a growing delay until attempts run out."""
+        store = JobStore(sqlite_path=tmp_path / "jobs.db", retry_backoff_seconds=0.1)
+        job = store.create("full_analysis", max_attempts=3)
+
+        store.claim("w1")
+        retried = store.fail(job.id, "rate limited")
+        assert retried.status == "queued"
+        assert retried.available_at - retried.updated_at == pytest.approx(0.1)
+        assert store.claim("w1") is None
+
+        time.sleep(0.15)
+        store.claim("w1")
+        assert store.fail(job.id, "rate limited").available_at - time.time() > 0.1
+
+        time.sleep(0.25)
+        store.claim("w1")
+        failed = store.fail(job.id, "rate limited")
+        assert failed.status == "failed"
+        assert failed.attempts == 3
+
+    def test_worker_runs_jobs_in_processes(self, tmp_path):
+        """Test that a job worker completes jobs and records handler failures."""
+        store = JobStore(sqlite_path=tmp_path / "jobs.db")
+        worker = JobWorker(store, slots=2, handlers={"echo": echo_job, "fail": failing_job})
+        done = store.create("echo", {"property_id": "p1"})
+        failed = store.create("fail")
+
+        assert wait_for(store, done.id, worker, {"completed"}).result == {"property_id": "p1"}
+        job = wait_for(store, failed.id, worker, {"failed"})
+        assert job.error == "crew failed"
+        assert [status for status, _ in job.transitions] == ["queued", "running", "failed"]
+        assert [event.data["task_index"] for event in store.events(done.id)] == [1]
+
+        worker.shutdown()
+        assert store.stats()["workers"] == []
+
+    def test_worker_enforces_timeout_and_cancellation(self, tmp_path):
+        """Test that timed-out and cancelled runs are terminated."""
+        store = JobStore(sqlite_path=tmp_path / "jobs.db")
+        worker = JobWorker(store, slots=2, handlers={"sleep": sleep_job})
+        slow = store.create("sleep", {"seconds": 60}, timeout_seconds=0.5)
+        cancelled = store.create("sleep", {"seconds": 60})
+
+        wait_for(store, cancelled.id, worker, {"running"})
+        store.cancel(cancelled.id)
+        timed_out = wait_for(store, slow.id, worker, {"failed"})
+
+        assert timed_out.error == "Timed out after 0.5s"
+        assert worker.stats()["timed_out"] == 1
+        assert worker.stats()["cancelled"] == 1
+        assert worker.stats()["running"] == 0
+
+    def test_live_workers_by_job_type(self, tmp_path):
+        """Test that only workers heartbeating within the lease serve a job type."""
+        store = JobStore(sqlite_path=tmp_path / "jobs.db", worker_lease_seconds=0.1)
+        assert not JobStore().has_worker("full_analysis")
+        assert not store.has_worker("full_analysis")
+
+        store.heartbeat("w1", 2, [], ["pricing_analysis"])
+        assert store.has_worker("pricing_analysis")
+        assert not store.has_worker("full_analysis")
+        assert store.stats()["workers"][0]["kinds"] == ["pricing_analysis"]
+
+        store.heartbeat("w2", 2, [])
+        assert store.has_worker("full_analysis")
+        store.retire_worker("w2")
+        assert not store.has_worker("full_analysis")
+
+        time.sleep(0.15)
+        assert not store.has_worker("pricing_analysis")
+
+    def test_jobs_of_a_dead_worker_are_recovered(self, tmp_path):
+        """Test that a running job without heartbeats is retried by a live worker."""
+        store = JobStore(sqlite_path=tmp_path / "jobs.db", worker_lease_seconds=0.1)
+        job = store.create("echo", max_attempts=2)
+        store.claim("dead-worker")
+        time.sleep(0.2)
+
+        worker = JobWorker(store, handlers={"echo": echo_job})
+        recovered = wait_for(store, job.id, worker, {"completed"})
+
+        assert recovered.attempts == 2
+        assert worker.stats()["recovered"] == 1
+        worker.shutdown()
@@ -1,5 +1,10 @@
 """Tests for CrewAI tools."""
 
+import asyncio
+import threading
+import time
+
+import httpx
 import pytest
 from tools.analysis_tools import (
     CalculatePriceStatsTool,
@@ -10,6 +15,16 @@ from tools.contract_tools import (
     GenerateContractTemplateTool,
     ValidateContractTermsTool,
 )
+from supabase import create_client
+from supabase.lib.client_options import SyncClientOptions
+
+import tools.avm_tool as avm_tool
+import tools.data_backend as data_backend
+import tools.database_tools as database_tools
+from tools.avm_tool import AVMValuationTool
+from tools.database_tools import ConnectionMetrics, iter_property_pages, market_stats_from_rows
+from tools.fetch_cache import FetchCache, track_fetches
+from tools.sqlite_backend import SQLiteBackend, create_local_database, local_schema
 
 
 class TestCalculatePriceStatsTool:
@@ -247,5 +262,363 @@ class TestGenerateContractTemplateTool:
         assert "NON-BINDING" in result["contract"]["disclaimer"]
 
 
+class TestConnectionMetrics:
+    """Tests for the pooled Supabase connection metrics."""
+
+    def make_request(self, metrics):
+        request = httpx.Request("GET", "https://example.supabase.co/rest/v1/x")
+        metrics.on_request(request)
+        return request.extensions["trace"]
+
+    def test_reused_connections(self):
+        """Test that requests without a new TCP connection count as reused."""
+        metrics = ConnectionMetrics()
+
+        trace = self.make_request(metrics)
+        trace("connection.connect_tcp.complete", {})
+        trace("connection.start_tls.complete", {})
+        for _ in range(3):
+            self.make_request(metrics)("http11.send_request_headers.started", {})
+
+        snapshot = metrics.snapshot()
+        assert snapshot["requests"] == 4
+        assert snapshot["connections_opened"] == 1
+        assert snapshot["tls_handshakes"] == 1
+        assert snapshot["connections_reused"] == 3
+        assert snapshot["reuse_ratio"] == 0.75
+
+    def test_empty_snapshot(self):
+        """Test that a fresh snapshot reports no reuse."""
+        snapshot = ConnectionMetrics().snapshot()
+
+        assert snapshot["requests"] == 0
+        assert snapshot["reuse_ratio"] == 0.0
+
+
+class TestMarketStatsAggregation:
+    """Tests for the Python fallback of the market stats RPC."""
+
+    ROWS = [
+        {"price": 100000, "price_per_m2": 1000, "property_type": "apartment", "status": "active"},
+        {"price": 200000, "price_per_m2": 2000, "property_type": "house", "status": "active"},
+        {"price": 0, "price_per_m2": None, "property_type": "house", "status": "active"},
+        {"price": 300000, "price_per_m2": 3000, "property_type": "apartment", "status": "active"},
+        {"price": 150000, "price_per_m2": 1500, "property_type": "apartment", "status": "sold"},
+    ]
+
+    def test_counts_and_distribution(self):
+        """Test listing counts and type distribution of active listings."""
+        stats = market_stats_from_rows(self.ROWS)
+
+        assert stats["total_listings"] == 4
+        assert stats["total_sold"] == 1
+        assert stats["property_type_distribution"] == {"apartment": 2, "house": 2}
+
+    def test_percentiles_interpolate_like_postgres(self):
+        """Test that percentiles ignore zero prices and interpolate linearly."""
+        stats = market_stats_from_rows(self.ROWS)
+
+        assert stats["min_price"] == 100000
+        assert stats["max_price"] == 300000
+        assert stats["median_price"] == 200000
+        assert stats["price_p25"] == 150000
+        assert stats["price_p90"] == pytest.approx(280000)
+        assert stats["median_price_per_m2"] == 2000
+
+    def test_empty_rows(self):
+        """Test that an empty zone reports zeros."""
+        stats = market_stats_from_rows([])
+
+        assert stats["total_listings"] == 0
+        assert stats["avg_price"] == 0
+        assert stats["median_price"] == 0
+
+
+class TestKeysetPagination:
+    """Tests for the keyset-paginated property reader."""
+
+    ROWS = [
+        {"id": f"{i:04d}", "zone_id": "z1", "price": i, "created_at": created_at}
+        for i, created_at in enumerate(
+            ["2026-01-01T00:00:00+00:00"] * 5 + ["2026-01-02T00:00:00+00:00"] * 4 + [None] * 3
+        )
+    ]
+
+    def serve(self, request: httpx.Request) -> httpx.Response:
+        """Minimal PostgREST: the filters and ordering the reader emits."""
+        params = dict(request.url.params)
+        rows = [r for r in self.ROWS if r["zone_id"] == params["zone_id"].removeprefix("eq.")]
+        if params.get("created_at") == "is.null":
+            rows = [r for r in rows if r["created_at"] is None]
+        elif params.get("created_at") == "not.is.null":
+            rows = [r for r in rows if r["created_at"] is not None]
+        if "id" in params:
+            rows = [r for r in rows if r["id"] > params["id"].removeprefix("gt.")]
+        if "or" in params:
+            created_at = params["or"].split('"')[1]
+            last_id = params["or"].rsplit("id.gt.", 1)[1].rstrip(")")
+            rows = [
+                r for r in rows
+                if (r["created_at"], r["id"]) > (created_at, last_id)
+            ]
+        order = [key.split(".")[0] for key in params["order"].split(",")]
+        rows.sort(key=lambda r: [r[key] for key in order])
+        columns = params["select"].split(",")
+        page = rows[: int(params["limit"])]
+        return httpx.Response(200, json=[{c: r[c] for c in columns} for r in page])
+
+    def test_pages_cover_every_row_once(self, monkeypatch):
+        """Test that pages resume after the cursor, including undated rows."""
+        client = create_client(
+            "https://example.supabase.co",
+            "test-key",
+            options=SyncClientOptions(httpx_client=httpx.Client(transport=httpx.MockTransport(self.serve))),
+        )
+        monkeypatch.setattr(database_tools, "get_supabase_client", lambda: client)
+
+        pages = list(iter_property_pages({"zone_id": "z1"}, columns="price", page_size=4))
+
+        assert [len(page) for page in pages] == [3, 4, 4, 1]
+        ids = [row["id"] for page in pages for row in page]
+        assert sorted(ids) == [r["id"] for r in self.ROWS]
+        assert set(pages[0][0]) == {"price", "id", "created_at"}
+
+
+class TestFetchCache:
+    """Tests for the read-through fetch cache."""
+
+    def test_hit_after_miss_and_expiry(self):
+        """Test that repeats are served until the TTL expires."""
+        cache = FetchCache(ttl_seconds={"pricewaze_properties": 0.05})
+        calls = []
+
+        def fetch():
+            calls.append(1)
+            return {"id": "p1", "price": 100}
+
+        first = cache.get_or_fetch("pricewaze_properties", "p1", fetch)
+        first["price"] = 0  # Callers get copies
+        assert cache.get_or_fetch("pricewaze_properties", "p1", fetch)["price"] == 100
+        assert len(calls) == 1
+
+        time.sleep(0.06)
+        cache.get_or_fetch("pricewaze_properties", "p1", fetch)
+        assert len(calls) == 2
+        assert cache.stats()["hits"] == 1
+
+    def test_concurrent_fetches_are_coalesced(self):
+        """Test that identical in-flight fetches hit the database once."""
+        cache = FetchCache(ttl_seconds={})
+        calls = []
+        release = threading.Event()
+
+        def fetch():
+            calls.append(1)
+            release.wait(1)
+            return ["p1", "p2"]
+
+        results = []
+        threads = [
+            threading.Thread(
+                target=lambda: results.append(cache.get_or_fetch("zone", "z1", fetch))
+            )
+            for _ in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        time.sleep(0.05)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        assert len(calls) == 1
+        assert results == [["p1", "p2"]] * 5
+        stats = cache.stats()
+        assert stats["misses"] == 1
+        assert stats["coalesced"] == 4
+
+    def test_invalidation_by_property_and_zone(self):
+        """Test that entries are dropped by the ids they were tagged with."""
+        cache = FetchCache(ttl_seconds={})
+        cache.get_or_fetch("pricewaze_properties", "p1", lambda: {"id": "p1"},
+                           tags=lambda value: [("property", "p1")])
+        cache.get_or_fetch("pricewaze_zone_properties", "z1", lambda: [{"id": "p1"}],
+                           tags=lambda value: [("zone", "z1"), ("property", "p1")])
+        cache.get_or_fetch("pricewaze_zone_properties", "z2", lambda: [{"id": "p2"}],
+                           tags=lambda value: [("zone", "z2"), ("property", "p2")])
+
+        assert cache.invalidate_property("p1") == 2
+        assert cache.invalidate_zone("z2") == 1
+        assert cache.stats()["size"] == 0
+
+    def test_invalidation_during_fetch_is_not_overwritten(self):
+        """Test that a fetch started before an invalidation is not cached."""
+        cache = FetchCache(ttl_seconds={})
+
+        def fetch():
+            cache.invalidate_property("p1")
+            return {"id": "p1", "price": 100}
+
+        cache.get_or_fetch("pricewaze_properties", "p1", fetch,
+                           tags=lambda value: [("property", "p1")])
+        assert cache.stats()["size"] == 0
+
+    def test_run_statistics(self):
+        """Test that statistics are collected per tracked run."""
+        cache = FetchCache(ttl_seconds={})
+        cache.get_or_fetch("pricewaze_properties", "p1", lambda: {"id": "p1"})
+
+        with track_fetches() as stats:
+            cache.get_or_fetch("pricewaze_properties", "p1", lambda: {"id": "p1"})
+            cache.get_or_fetch("pricewaze_properties", "p2", lambda: {"id": "p2"})
+
+        assert stats.to_dict()["hits"] == 1
+        assert stats.to_dict()["misses"] == 1
+        assert stats.saved_round_trips == 1
+        assert cache.stats()["misses"] == 2
+
+    def test_async_fetches_are_coalesced(self):
+        """Test single-flight for the async tools."""
+        cache = FetchCache(ttl_seconds={})
+        calls = []
+
+        async def fetch():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return {"id": "p1"}
+
+        async def main():
+            return await asyncio.gather(
+                *(cache.aget_or_fetch("pricewaze_properties", "p1", fetch) for _ in range(3))
+            )
+
+        assert asyncio.run(main()) == [{"id": "p1"}] * 3
+        assert len(calls) == 1
+
+    def test_cancelled_leader_does_not_cancel_waiters(self):
+        """Test that a waiter runs the fetch itself when the caller running it is cancelled."""
+        cache = FetchCache(ttl_seconds={})
+        calls = []
+
+        async def fetch():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return {"id": "p1"}
+
+        async def main():
+            leader = asyncio.ensure_future(cache.aget_or_fetch("pricewaze_properties", "p1", fetch))
+            await asyncio.sleep(0.01)
+            waiter = asyncio.ensure_future(cache.aget_or_fetch("pricewaze_properties", "p1", fetch))
+            await asyncio.sleep(0.01)
+            leader.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await leader
+            return await waiter
+
+        assert asyncio.run(main()) == {"id": "p1"}
+        assert len(calls) == 2
+
+
+@pytest.fixture(scope="module")
+def local_backend(tmp_path_factory):
+    """A small synthetic SQLite database."""
+    path = tmp_path_factory.mktemp("local") / "pricewaze.db"
+    create_local_database(path, properties=600, zones=4, profiles=20, seed=3)
+    return SQLiteBackend(path)
+
+
+class TestSQLiteBackend:
+    """Tests for the local offline data backend."""
+
+    def test_schema_follows_migrations(self):
+        """Test that later migrations and PostGIS columns are accounted for."""
+        properties = local_schema()["pricewaze_properties"]
+
+        assert "source_type" in properties.columns
+        assert not properties.columns["area_m2"].not_null
+        assert "location" not in properties.columns
+        assert properties.columns["price_per_m2"].generated
+        assert "idx_properties_zone_created_at_id" in properties.indexes
+
+    def test_pages_in_keyset_order(self, local_backend):
+        """Test that pages cover every row once, undated rows first."""
+        pages = list(local_backend.iter_property_pages({}, "price", 64))
+        rows = [row for page in pages for row in page]
+        keys = [(r["created_at"] is not None, r["created_at"] or "", r["id"]) for r in rows]
+
+        assert len(rows) == 600
+        assert len({r["id"] for r in rows}) == 600
+        assert keys == sorted(keys)
+        assert rows[0]["created_at"] is None
+
+    def test_market_stats_match_python_aggregation(self, local_backend):
+        """Test that SQL aggregates equal the RPC fallback computed from rows."""
+        zone_id = next(local_backend.iter_property_pages({}, "zone_id", 1))[0]["zone_id"]
+        rows = [
+            row
+            for page in local_backend.iter_property_pages(
+                {"zone_id": zone_id}, "price, price_per_m2, property_type, status", 100
+            )
+            for row in page
+        ]
+
+        stats = local_backend.market_stats(zone_id, None)
+        expected = market_stats_from_rows(rows)
+
+        assert stats.keys() == expected.keys()
+        for key, value in expected.items():
+            assert stats[key] == (value if isinstance(value, dict) else pytest.approx(value))
+
+    def test_fetch_property_embeds_owner_and_zone(self, local_backend):
+        """Test PostgREST-style embedding and JSON column decoding."""
+        row = next(local_backend.iter_property_pages({"status": "active"}, "owner_id", 50))[-1]
+        prop = local_backend.fetch_property(row["id"])
+
+        assert prop["zone"]["id"] == prop["zone_id"]
+        assert prop["owner"] is None or prop["owner"]["id"] == prop["owner_id"]
+        assert isinstance(prop["features"], list)
+        assert local_backend.fetch_property("missing") is None
+
+
+class TestAVMValuationTool:
+    """Tests for the zone comparables of the AVM valuation tool."""
+
+    def test_unconfigured_backend_values_without_comparables(self, monkeypatch):
+        """Test that a zone without a configured data backend falls back to zone statistics."""
+        settings = data_backend.get_settings().model_copy(
+            update={"data_backend": "supabase", "supabase_url": "", "next_public_supabase_url": ""}
+        )
+        monkeypatch.setattr(data_backend, "get_settings", lambda: settings)
+
+        report = AVMValuationTool()._run(
+            property_id="p1",
+            price=180000,
+            area_m2=90,
+            latitude=18.47,
+            longitude=-69.93,
+            zone_id="zone-1",
+        )
+
+        assert report.startswith("AVM VALUATION RESULT for Property p1")
+
+    def test_zone_read_is_cached(self, local_backend, monkeypatch):
+        """Test that repeated valuations in a zone read its listings once."""
+        zone_id = next(local_backend.iter_property_pages({"status": "active"}, "zone_id", 1))[0][
+            "zone_id"
+        ]
+        cache = FetchCache(ttl_seconds={})
+        monkeypatch.setattr(avm_tool, "data_backend_configured", lambda: True)
+        monkeypatch.setattr(avm_tool, "get_fetch_cache", lambda: cache)
+        monkeypatch.setattr(database_tools, "get_data_backend", lambda: local_backend)
+
+        with track_fetches() as stats:
+            first = avm_tool._zone_candidates(zone_id)
+            second = avm_tool._zone_candidates(zone_id)
+
+        assert len(first) == len(second) > 0
+        assert (stats.misses, stats.hits) == (1, 1)
+        assert cache.invalidate_zone(zone_id) == 1
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -1,10 +1,62 @@
 """AVM Tool for CrewAI - Automated Valuation Model Integration."""
 
+import logging
+import sqlite3
 
+import httpx
 from crewai_tools import BaseTool
+from postgrest.exceptions import APIError
 from pydantic import BaseModel, Field
 
-from avm import PropertyValuator
+from avm import CandidateFrame, PropertyValuator
+
+from .data_backend import data_backend_configured
+from .fetch_cache import Tag, get_fetch_cache
+
+logger = logging.getLogger(__name__)
+
+# Failures of a reachable, configured data backend (Supabase or local SQLite)
+_DATA_ERRORS = (httpx.HTTPError, APIError, sqlite3.Error)
+
+
+def _zone_candidates(zone_id: str) -> CandidateFrame | list:
+    """
+    A zone's active listings as a compact candidate frame, via the fetch cache.
+
+    Without a zone, without a configured data backend, or when the
+    database read fails, valuation relies on zone statistics and the ML
+    model alone; the reason is logged.
+    """
+    if not zone_id:
+        return []
+    if not data_backend_configured():
+        logger.warning("No data backend configured, valuing zone %s without comparables", zone_id)
+        return []
+
+    from .database_tools import iter_property_pages
+
+    def fetch() -> CandidateFrame:
+        return CandidateFrame.concat(
+            [
+                CandidateFrame.from_supabase_rows(rows)
+                for rows in iter_property_pages({"zone_id": zone_id, "status": "active"})
+            ]
+        )
+
+    def tags(frame: CandidateFrame) -> list[Tag]:
+        return [("zone", zone_id)] + [
+            ("property", str(item_id)) for item_id in frame.ids if item_id is not None
+        ]
+
+    try:
+        cache = get_fetch_cache()
+        if cache is None:
+            return fetch()
+        # Repeated valuations in a zone (one per agent call) share one read
+        return cache.get_or_fetch("pricewaze_zone_properties", f"candidates|{zone_id}", fetch, tags)
+    except _DATA_ERRORS as e:
+        logger.warning("Comparables of zone %s unavailable, valuing without them: %r", zone_id, e)
+        return []
 
 
 class AVMValuationInput(BaseModel):
@@ -83,11 +135,9 @@ class AVMValuationTool(BaseTool):
             "property_count": zone_property_count,
         }
 
-        # Note: In production, candidate_properties would come from database
-        # For now, use empty list (relies on zone stats and ML model)
         result = valuator.valuate(
             property_data=property_data,
-            candidate_properties=[],  # Would be fetched from Supabase
+            candidate_properties=_zone_candidates(zone_id),
             zone_stats=zone_stats,
         )
 
@@ -0,0 +1,171 @@
+"""Data Backend - Pluggable data access for the database tools.
+
+Tools, batch valuation and streaming revaluation read listings through a
+``DataBackend``: ``SupabaseBackend`` queries the live project over
+PostgREST, ``SQLiteBackend`` reads a local file seeded from the migrations
+schema and synthetic data, for benchmarks and load tests without network.
+Both return the same rows, in the same keyset order, for the same calls.
+"""
+
+import asyncio
+from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator, Iterator
+from functools import lru_cache
+from typing import Any
+
+from config import get_settings
+
+# Backends selectable with the ``data_backend`` setting
+DATA_BACKENDS = ("supabase", "sqlite")
+
+
+class DataBackend(ABC):
+    """
+    Fetch, stream and aggregate interface over the PriceWaze tables.
+
+    Async methods default to running the sync method in a worker thread;
+    backends with a native async client override them.
+    """
+
+    name: str = ""
+
+    @abstractmethod
+    def fetch_property(self, property_id: str) -> dict[str, Any] | None:
+        """
+        Fetch one property with its ``owner`` and ``zone`` embedded.
+
+        Returns:
+            Property row, or None if it does not exist
+        """
+
+    @abstractmethod
+    def fetch_zone_properties(
+        self,
+        zone_id: str | None,
+        zone_name: str | None,
+        status: str,
+        limit: int,
+        columns: str,
+    ) -> list[dict[str, Any]]:
+        """
+        Fetch listings of a zone, given by id or by (partial) name.
+
+        Args:
+            zone_id: Zone UUID (takes precedence over ``zone_name``)
+            zone_name: Case-insensitive substring of the zone name
+            status: Listing status filter (empty = any)
+            limit: Maximum rows returned
+            columns: Comma-separated columns to select
+
+        Returns:
+            Property rows
+        """
+
+    @abstractmethod
+    def fetch_offers(self, property_id: str, include_expired: bool) -> list[dict[str, Any]]:
+        """
+        Fetch a property's offers, newest first, with ``buyer`` and ``seller`` embedded.
+
+        Returns:
+            Offer rows
+        """
+
+    @abstractmethod
+    def fetch_zone_names(self, zone_ids: list[str]) -> dict[str, str]:
+        """
+        Look up zone names.
+
+        Returns:
+            Zone name by zone id
+        """
+
+    @abstractmethod
+    def iter_property_pages(
+        self,
+        filters: dict[str, Any],
+        columns: str,
+        page_size: int,
+    ) -> Iterator[list[dict[str, Any]]]:
+        """
+        Stream ``pricewaze_properties`` in keyset order, one page at a time.
+
+        Rows without ``created_at`` come first, ordered by id, then the rest
+        ordered by ``(created_at, id)``.
+
+        Args:
+            filters: Column filters; a list value filters with ``in``, None is ignored
+            columns: Columns to select (``id`` and ``created_at`` are always included)
+            page_size: Rows per page
+
+        Yields:
+            Lists of up to ``page_size`` property rows
+        """
+
+    @abstractmethod
+    def market_stats(self, zone_id: str | None, property_type: str | None) -> dict[str, Any]:
+        """
+        Aggregate listing statistics of a zone and/or property type.
+
+        Returns:
+            The keys of the ``pricewaze_market_stats`` database function
+        """
+
+    async def afetch_property(self, property_id: str) -> dict[str, Any] | None:
+        """Async counterpart of ``fetch_property``."""
+        return await asyncio.to_thread(self.fetch_property, property_id)
+
+    async def afetch_zone_properties(
+        self,
+        zone_id: str | None,
+        zone_name: str | None,
+        status: str,
+        limit: int,
+        columns: str,
+    ) -> list[dict[str, Any]]:
+        """Async counterpart of ``fetch_zone_properties``."""
+        return await asyncio.to_thread(
+            self.fetch_zone_properties, zone_id, zone_name, status, limit, columns
+        )
+
+    async def aiter_property_pages(
+        self,
+        filters: dict[str, Any],
+        columns: str,
+        page_size: int,
+    ) -> AsyncIterator[list[dict[str, Any]]]:
+        """Async counterpart of ``iter_property_pages``, fetching each page in a thread."""
+        pages = self.iter_property_pages(filters, columns, page_size)
+        while (rows := await asyncio.to_thread(next, pages, None)) is not None:
+            yield rows
+
+
+def data_backend_configured() -> bool:
+    """Whether the backend selected in settings has what it needs to connect."""
+    settings = get_settings()
+    if settings.data_backend == "supabase":
+        return bool(settings.effective_supabase_url and settings.effective_supabase_key)
+    if settings.data_backend == "sqlite":
+        return bool(settings.local_db_path)
+    return False
+
+
+@lru_cache
+def get_data_backend() -> DataBackend:
+    """Get the process-wide data backend selected in settings."""
+    settings = get_settings()
+
+    if settings.data_backend == "supabase":
+        from .database_tools import SupabaseBackend
+
+        return SupabaseBackend()
+
+    if settings.data_backend == "sqlite":
+        from .sqlite_backend import SQLiteBackend
+
+        if not settings.local_db_path:
+            raise RuntimeError("local_db_path required for the sqlite data backend")
+        return SQLiteBackend(settings.local_db_path)
+
+    raise RuntimeError(
+        f"Unknown data_backend {settings.data_backend!r} (expected one of {DATA_BACKENDS})"
+    )
@@ -1,23 +1,210 @@
-"""Database tools for CrewAI agents to interact with Supabase."""
+"""Database tools for CrewAI agents to interact with Supabase (or a local backend)."""
 
+import asyncio
+import threading
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterable, Iterator
+from functools import lru_cache
 from typing import Any
 
+import httpx
 from crewai.tools import BaseTool
+from postgrest.exceptions import APIError
 from pydantic import BaseModel, Field
-from supabase import create_client, Client
+from supabase import AsyncClient, Client, acreate_client, create_client
+from supabase.lib.client_options import AsyncClientOptions, SyncClientOptions
 
 from config import get_settings
 
+from .data_backend import DataBackend, get_data_backend
+from .fetch_cache import Tag, get_fetch_cache
 
+
+class ConnectionMetrics:
+    """
+    Request and connection counters of the pooled Supabase HTTP transport.
+
+    Connections are counted from httpcore trace events, so the gap between
+    requests and connections opened is the number of requests served on a
+    kept-alive connection.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._counters = {
+            "requests": 0,
+            "connections_opened": 0,
+            "tls_handshakes": 0,
+            "errors": 0,
+        }
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._counters[name] += 1
+
+    def _on_trace(self, event: str) -> None:
+        if event == "connection.connect_tcp.complete":
+            self._count("connections_opened")
+        elif event == "connection.start_tls.complete":
+            self._count("tls_handshakes")
+        elif event.endswith(".failed"):
+            self._count("errors")
+
+    def on_request(self, request: httpx.Request) -> None:
+        """Sync request hook: count the request and trace its connection."""
+        self._count("requests")
+        request.extensions["trace"] = lambda event, info: self._on_trace(event)
+
+    async def aon_request(self, request: httpx.Request) -> None:
+        """Async request hook: count the request and trace its connection."""
+        self._count("requests")
+
+        async def trace(event: str, info: dict[str, Any]) -> None:
+            self._on_trace(event)
+
+        request.extensions["trace"] = trace
+
+    def snapshot(self) -> dict[str, Any]:
+        """Current counters and connection reuse ratio."""
+        with self._lock:
+            counters = dict(self._counters)
+        requests = counters["requests"]
+        reused = max(0, requests - counters["connections_opened"])
+        return {
+            **counters,
+            "connections_reused": reused,
+            "reuse_ratio": round(reused / requests, 3) if requests else 0.0,
+        }
+
+
+@lru_cache
+def get_connection_metrics() -> ConnectionMetrics:
+    """Get the process-wide Supabase connection metrics."""
+    return ConnectionMetrics()
+
+
+def _http_client_options() -> dict[str, Any]:
+    """Pool limits and timeouts shared by the sync and async HTTP clients."""
+    settings = get_settings()
+    return {
+        "limits": httpx.Limits(
+            max_connections=settings.supabase_pool_max_connections,
+            max_keepalive_connections=settings.supabase_pool_max_keepalive,
+            keepalive_expiry=settings.supabase_pool_keepalive_seconds,
+        ),
+        "timeout": httpx.Timeout(
+            settings.supabase_read_timeout,
+            connect=settings.supabase_connect_timeout,
+        ),
+        "http2": settings.supabase_http2,
+        "follow_redirects": True,
+    }
+
+
+@lru_cache
 def get_supabase_client() -> Client:
-    """Get Supabase client instance."""
+    """
+    Get the process-wide Supabase client.
+
+    All tools share one client and its keep-alive connection pool, so a
+    crew run pays for the TLS handshake and auth setup once rather than on
+    every tool call.
+    """
     settings = get_settings()
+    http_client = httpx.Client(
+        **_http_client_options(),
+        event_hooks={"request": [get_connection_metrics().on_request]},
+    )
     return create_client(
         settings.effective_supabase_url,
         settings.effective_supabase_key,
+        options=SyncClientOptions(httpx_client=http_client),
     )
 
 
+_async_client: AsyncClient | None = None
+_async_client_lock = asyncio.Lock()
+
+
+async def get_async_supabase_client() -> AsyncClient:
+    """
+    Get the process-wide async Supabase client, for use from API routes.
+
+    Shares the pool settings and connection metrics of ``get_supabase_client``.
+    """
+    global _async_client
+    if _async_client is None:
+        async with _async_client_lock:
+            if _async_client is None:
+                settings = get_settings()
+                http_client = httpx.AsyncClient(
+                    **_http_client_options(),
+                    event_hooks={"request": [get_connection_metrics().aon_request]},
+                )
+                _async_client = await acreate_client(
+                    settings.effective_supabase_url,
+                    settings.effective_supabase_key,
+                    options=AsyncClientOptions(httpx_client=http_client),
+                )
+    return _async_client
+
+
+async def aclose_supabase_clients() -> None:
+    """Close the pooled connections of both clients (application shutdown)."""
+    global _async_client
+    if _async_client is not None:
+        await _async_client.options.httpx_client.aclose()
+        _async_client = None
+    if get_supabase_client.cache_info().currsize:
+        get_supabase_client().options.httpx_client.close()
+        get_supabase_client.cache_clear()
+
+
+def _read_through(
+    table: str,
+    key: str,
+    fetch: Callable[[], dict[str, Any]],
+    tags: Callable[[dict[str, Any]], Iterable[Tag]],
+) -> dict[str, Any]:
+    """Serve a tool fetch through the fetch cache, when enabled."""
+    cache = get_fetch_cache()
+    if cache is None:
+        return fetch()
+    return cache.get_or_fetch(table, key, fetch, tags)
+
+
+async def _aread_through(
+    table: str,
+    key: str,
+    fetch: Callable[[], Awaitable[dict[str, Any]]],
+    tags: Callable[[dict[str, Any]], Iterable[Tag]],
+) -> dict[str, Any]:
+    """Async counterpart of ``_read_through``."""
+    cache = get_fetch_cache()
+    if cache is None:
+        return await fetch()
+    return await cache.aget_or_fetch(table, key, fetch, tags)
+
+
+def _property_tags(response: dict[str, Any]) -> list[Tag]:
+    """A fetched property depends on its own row."""
+    prop = response.get("property") or {}
+    return [("property", str(prop["id"]))] if prop.get("id") else []
+
+
+def _zone_properties_tags(zone_id: str | None) -> Callable[[dict[str, Any]], list[Tag]]:
+    """A zone listing depends on its zones and on every listed property."""
+
+    def tags(response: dict[str, Any]) -> list[Tag]:
+        rows = response.get("properties", [])
+        zone_ids = {str(zone_id)} if zone_id else set()
+        zone_ids.update(str(row["zone_id"]) for row in rows if row.get("zone_id"))
+        return [("zone", z) for z in zone_ids] + [
+            ("property", str(row["id"])) for row in rows if row.get("id")
+        ]
+
+    return tags
+
+
 class FetchPropertyInput(BaseModel):
     """Input schema for fetching a property."""
 
@@ -34,22 +221,37 @@ class FetchPropertyTool(BaseTool):
     )
     args_schema: type[BaseModel] = FetchPropertyInput
 
-    def _run(self, property_id: str) -> dict[str, Any]:
-        """Fetch property data from Supabase."""
-        client = get_supabase_client()
-
-        result = client.table("pricewaze_properties").select(
-            "*, owner:pricewaze_profiles!owner_id(id, full_name, email), "
-            "zone:pricewaze_zones!zone_id(id, name, city, avg_price_m2)"
-        ).eq("id", property_id).single().execute()
-
-        if result.data:
+    @staticmethod
+    def _response(data: dict[str, Any] | None) -> dict[str, Any]:
+        if data:
             return {
                 "success": True,
-                "property": result.data,
+                "property": data,
             }
         return {"success": False, "error": "Property not found"}
 
+    def _run(self, property_id: str) -> dict[str, Any]:
+        """Fetch property data from the data backend."""
+
+        def fetch() -> dict[str, Any]:
+            return self._response(get_data_backend().fetch_property(property_id))
+
+        return _read_through("pricewaze_properties", property_id, fetch, _property_tags)
+
+    async def _arun(self, property_id: str) -> dict[str, Any]:
+        """Fetch property data without blocking the event loop."""
+
+        async def fetch() -> dict[str, Any]:
+            return self._response(await get_data_backend().afetch_property(property_id))
+
+        return await _aread_through("pricewaze_properties", property_id, fetch, _property_tags)
+
+
+ZONE_PROPERTY_COLUMNS = (
+    "id, title, price, area_m2, price_per_m2, property_type, status, "
+    "bedrooms, bathrooms, created_at, zone_id"
+)
+
 
 class FetchZonePropertiesInput(BaseModel):
     """Input schema for fetching zone properties."""
@@ -70,6 +272,14 @@ class FetchZonePropertiesTool(BaseTool):
     )
     args_schema: type[BaseModel] = FetchZonePropertiesInput
 
+    @staticmethod
+    def _response(data: list[dict[str, Any]] | None) -> dict[str, Any]:
+        return {
+            "success": True,
+            "properties": data or [],
+            "count": len(data or []),
+        }
+
     def _run(
         self,
         zone_id: str | None = None,
@@ -77,39 +287,44 @@ class FetchZonePropertiesTool(BaseTool):
         status: str = "active",
         limit: int = 50,
     ) -> dict[str, Any]:
-        """Fetch zone properties from Supabase."""
-        client = get_supabase_client()
-
-        query = client.table("pricewaze_properties").select(
-            "id, title, price, area_m2, price_per_m2, property_type, status, "
-            "bedrooms, bathrooms, created_at, zone_id"
-        )
+        """Fetch zone properties from the data backend."""
 
-        if zone_id:
-            query = query.eq("zone_id", zone_id)
+        def fetch() -> dict[str, Any]:
+            return self._response(
+                get_data_backend().fetch_zone_properties(
+                    zone_id, zone_name, status, limit, ZONE_PROPERTY_COLUMNS
+                )
+            )
 
-        if status:
-            query = query.eq("status", status)
+        return _read_through(
+            "pricewaze_zone_properties",
+            f"{zone_id}|{zone_name}|{status}|{limit}",
+            fetch,
+            _zone_properties_tags(zone_id),
+        )
 
-        result = query.limit(limit).execute()
+    async def _arun(
+        self,
+        zone_id: str | None = None,
+        zone_name: str | None = None,
+        status: str = "active",
+        limit: int = 50,
+    ) -> dict[str, Any]:
+        """Fetch zone properties without blocking the event loop."""
 
-        # If filtering by zone_name, fetch zone first
-        if zone_name and not zone_id:
-            zone_result = client.table("pricewaze_zones").select("id").ilike(
-                "name", f"%{zone_name}%"
-            ).execute()
-            if zone_result.data:
-                zone_ids = [z["id"] for z in zone_result.data]
-                result = client.table("pricewaze_properties").select(
-                    "id, title, price, area_m2, price_per_m2, property_type, status, "
-                    "bedrooms, bathrooms, created_at, zone_id"
-                ).in_("zone_id", zone_ids).eq("status", status).limit(limit).execute()
+        async def fetch() -> dict[str, Any]:
+            return self._response(
+                await get_data_backend().afetch_zone_properties(
+                    zone_id, zone_name, status, limit, ZONE_PROPERTY_COLUMNS
+                )
+            )
 
-        return {
-            "success": True,
-            "properties": result.data or [],
-            "count": len(result.data or []),
-        }
+        return await _aread_through(
+            "pricewaze_zone_properties",
+            f"{zone_id}|{zone_name}|{status}|{limit}",
+            fetch,
+            _zone_properties_tags(zone_id),
+        )
 
 
 class FetchOfferHistoryInput(BaseModel):
@@ -134,27 +349,87 @@ class FetchOfferHistoryTool(BaseTool):
         property_id: str,
         include_expired: bool = False,
     ) -> dict[str, Any]:
-        """Fetch offer history from Supabase."""
-        client = get_supabase_client()
-
-        query = client.table("pricewaze_offers").select(
-            "id, amount, message, status, created_at, expires_at, parent_offer_id, "
-            "buyer:pricewaze_profiles!buyer_id(id, full_name), "
-            "seller:pricewaze_profiles!seller_id(id, full_name)"
-        ).eq("property_id", property_id).order("created_at", desc=True)
-
-        if not include_expired:
-            query = query.neq("status", "expired")
-
-        result = query.execute()
+        """Fetch offer history from the data backend."""
+        offers = get_data_backend().fetch_offers(property_id, include_expired)
 
         return {
             "success": True,
-            "offers": result.data or [],
-            "total_offers": len(result.data or []),
+            "offers": offers,
+            "total_offers": len(offers),
         }
 
 
+MARKET_STATS_RPC = "pricewaze_market_stats"
+
+
+def _percentile(sorted_values: list[float], fraction: float) -> float:
+    """Linearly interpolated percentile, matching Postgres ``percentile_cont``."""
+    if not sorted_values:
+        return 0
+    position = fraction * (len(sorted_values) - 1)
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (
+        position - lower
+    )
+
+
+def market_stats_from_rows(properties: Iterable[dict[str, Any]]) -> dict[str, Any]:
+    """
+    Aggregate market statistics from property rows.
+
+    Python counterpart of the ``pricewaze_market_stats`` database function,
+    used when the function is unavailable. Rows are consumed in one pass
+    and only the active prices are kept, so a streamed zone never has to
+    fit in memory.
+
+    Args:
+        properties: Rows with price, price_per_m2, property_type and status
+
+    Returns:
+        Statistics dict with the same keys as the database function
+    """
+    total_listings = 0
+    total_sold = 0
+    active_prices: list[float] = []
+    active_price_per_m2: list[float] = []
+    type_distribution: dict[str, int] = {}
+
+    for p in properties:
+        if p["status"] == "sold":
+            total_sold += 1
+        if p["status"] != "active":
+            continue
+        total_listings += 1
+        if p["price"]:
+            active_prices.append(float(p["price"]))
+        if p["price_per_m2"]:
+            active_price_per_m2.append(float(p["price_per_m2"]))
+        ptype = p["property_type"]
+        type_distribution[ptype] = type_distribution.get(ptype, 0) + 1
+
+    active_prices.sort()
+    active_price_per_m2.sort()
+
+    return {
+        "total_listings": total_listings,
+        "total_sold": total_sold,
+        "avg_price": sum(active_prices) / len(active_prices) if active_prices else 0,
+        "min_price": active_prices[0] if active_prices else 0,
+        "max_price": active_prices[-1] if active_prices else 0,
+        "median_price": _percentile(active_prices, 0.5),
+        "price_p25": _percentile(active_prices, 0.25),
+        "price_p75": _percentile(active_prices, 0.75),
+        "price_p90": _percentile(active_prices, 0.9),
+        "avg_price_per_m2": (
+            sum(active_price_per_m2) / len(active_price_per_m2)
+            if active_price_per_m2 else 0
+        ),
+        "median_price_per_m2": _percentile(active_price_per_m2, 0.5),
+        "property_type_distribution": type_distribution,
+    }
+
+
 class FetchMarketStatsInput(BaseModel):
     """Input schema for fetching market statistics."""
 
@@ -179,51 +454,12 @@ class FetchMarketStatsTool(BaseTool):
         property_type: str | None = None,
         days_back: int = 90,
     ) -> dict[str, Any]:
-        """Fetch market statistics from Supabase."""
-        client = get_supabase_client()
-
-        # Get active listings
-        query = client.table("pricewaze_properties").select(
-            "price, area_m2, price_per_m2, property_type, status, created_at"
-        )
-
-        if zone_id:
-            query = query.eq("zone_id", zone_id)
-        if property_type:
-            query = query.eq("property_type", property_type)
-
-        result = query.execute()
-        properties = result.data or []
-
-        # Calculate statistics
-        active = [p for p in properties if p["status"] == "active"]
-        sold = [p for p in properties if p["status"] == "sold"]
-
-        active_prices = [p["price"] for p in active if p["price"]]
-        active_price_per_m2 = [p["price_per_m2"] for p in active if p["price_per_m2"]]
-
-        stats = {
-            "total_listings": len(active),
-            "total_sold": len(sold),
-            "avg_price": sum(active_prices) / len(active_prices) if active_prices else 0,
-            "min_price": min(active_prices) if active_prices else 0,
-            "max_price": max(active_prices) if active_prices else 0,
-            "avg_price_per_m2": (
-                sum(active_price_per_m2) / len(active_price_per_m2)
-                if active_price_per_m2 else 0
-            ),
-            "property_type_distribution": {},
+        """Fetch market statistics from the data backend."""
+        return {
+            "success": True,
+            "stats": get_data_backend().market_stats(zone_id, property_type),
         }
 
-        # Property type distribution
-        for p in active:
-            ptype = p["property_type"]
-            stats["property_type_distribution"][ptype] = (
-                stats["property_type_distribution"].get(ptype, 0) + 1
-            )
-
-        return {"success": True, "stats": stats}
-
 
 class SaveAnalysisResultInput(BaseModel):
     """Input schema for saving analysis results."""
@@ -257,3 +493,340 @@ class SaveAnalysisResultTool(BaseTool):
             "message": f"Analysis of type '{analysis_type}' saved for property {property_id}",
             "timestamp": "now",
         }
+
+
+# Columns needed to value a property and to use it as a comparable
+VALUATION_COLUMNS = (
+    "id, zone_id, property_type, status, price, area_m2, price_per_m2, "
+    "bedrooms, bathrooms, parking_spaces, year_built, latitude, longitude"
+)
+
+
+# Ids per ``in`` filter when fetching properties by id
+ID_FILTER_BATCH = 200
+
+
+def fetch_valuation_batch(
+    property_ids: list[str] | None = None,
+    zone_id: str | None = None,
+    candidate_status: str = "active",
+) -> dict[str, Any]:
+    """
+    Fetch everything a batch valuation needs in a few queries.
+
+    Subjects are the given properties, or every property in ``zone_id``.
+    Candidates are the listings in all subject zones, fetched once and
+    shared by every subject. Rows are read with keyset pagination, so
+    zones are complete rather than cut at PostgREST's row limit.
+
+    Args:
+        property_ids: Properties to value
+        zone_id: Zone whose properties to value (used when no ids are given)
+        candidate_status: Status of listings used as comparables
+
+    Returns:
+        Dict with ``subjects`` and ``candidates`` rows and ``zone_names`` by zone id
+    """
+    backend = get_data_backend()
+
+    if property_ids:
+        # Bounded id lists keep each request URL short
+        subjects = [
+            row
+            for start in range(0, len(property_ids), ID_FILTER_BATCH)
+            for row in iter_properties(
+                {"id": property_ids[start:start + ID_FILTER_BATCH]}
+            )
+        ]
+    else:
+        subjects = list(iter_properties({"zone_id": zone_id}))
+
+    zone_ids = sorted({s["zone_id"] for s in subjects if s.get("zone_id")})
+    if not zone_ids:
+        return {"subjects": subjects, "candidates": [], "zone_names": {}}
+
+    candidates = list(iter_properties({"zone_id": zone_ids, "status": candidate_status}))
+
+    return {
+        "subjects": subjects,
+        "candidates": candidates,
+        "zone_names": backend.fetch_zone_names(zone_ids),
+    }
+
+
+# Keyset pagination passes: rows without created_at first (keyed on id
+# alone), then the rest on (created_at, id)
+_KEYSET_PASSES = ("undated", "dated")
+
+
+def _keyset_columns(columns: str) -> str:
+    """Column projection including the keyset cursor columns."""
+    names = [name.strip() for name in columns.split(",")]
+    if "*" not in names:
+        names += [key for key in ("id", "created_at") if key not in names]
+    return ", ".join(names)
+
+
+def _keyset_page_query(
+    client: Client | AsyncClient,
+    columns: str,
+    filters: dict[str, Any],
+    page_size: int,
+    phase: str,
+    cursor: dict[str, Any] | None,
+) -> Any:
+    """One page of ``pricewaze_properties`` after ``cursor`` in keyset order."""
+    query = client.table("pricewaze_properties").select(columns)
+
+    for column, value in filters.items():
+        if value is None:
+            continue
+        if isinstance(value, (list, tuple, set)):
+            query = query.in_(column, list(value))
+        else:
+            query = query.eq(column, value)
+
+    if phase == "undated":
+        query = query.is_("created_at", "null")
+        if cursor is not None:
+            query = query.gt("id", cursor["id"])
+        return query.order("id").limit(page_size)
+
+    query = query.not_.is_("created_at", "null")
+    if cursor is not None:
+        created_at, row_id = cursor["created_at"], cursor["id"]
+        query = query.or_(
+            f'created_at.gt."{created_at}",'
+            f'and(created_at.eq."{created_at}",id.gt.{row_id})'
+        )
+    return query.order("created_at").order("id").limit(page_size)
+
+
+def iter_property_pages(
+    filters: dict[str, Any] | None = None,
+    columns: str = VALUATION_COLUMNS,
+    page_size: int = 1000,
+) -> Iterator[list[dict[str, Any]]]:
+    """
+    Stream ``pricewaze_properties`` one page at a time with keyset pagination.
+
+    Pages are ordered by ``(created_at, id)`` and each request resumes after
+    the last row of the previous page, so every request is an index range
+    scan, rows are neither skipped nor repeated when rows are inserted
+    meanwhile, and only one page is held in memory.
+
+    Args:
+        filters: Column filters; a list value filters with ``in``, None is ignored
+        columns: Columns to select (``id`` and ``created_at`` are always included)
+        page_size: Rows per request
+
+    Yields:
+        Lists of up to ``page_size`` property rows
+    """
+    yield from get_data_backend().iter_property_pages(filters or {}, columns, page_size)
+
+
+def iter_properties(
+    filters: dict[str, Any] | None = None,
+    columns: str = VALUATION_COLUMNS,
+    page_size: int = 1000,
+) -> Iterator[dict[str, Any]]:
+    """Stream ``pricewaze_properties`` row by row (see ``iter_property_pages``)."""
+    for rows in iter_property_pages(filters, columns, page_size):
+        yield from rows
+
+
+async def aiter_property_pages(
+    filters: dict[str, Any] | None = None,
+    columns: str = VALUATION_COLUMNS,
+    page_size: int = 1000,
+) -> AsyncIterator[list[dict[str, Any]]]:
+    """Async counterpart of ``iter_property_pages``."""
+    async for rows in get_data_backend().aiter_property_pages(filters or {}, columns, page_size):
+        yield rows
+
+
+async def aiter_properties(
+    filters: dict[str, Any] | None = None,
+    columns: str = VALUATION_COLUMNS,
+    page_size: int = 1000,
+) -> AsyncIterator[dict[str, Any]]:
+    """Async counterpart of ``iter_properties``."""
+    async for rows in aiter_property_pages(filters, columns, page_size):
+        for row in rows:
+            yield row
+
+
+class SupabaseBackend(DataBackend):
+    """Data backend over the live Supabase project (PostgREST)."""
+
+    name = "supabase"
+
+    @staticmethod
+    def _property_query(client: Client | AsyncClient, property_id: str) -> Any:
+        return client.table("pricewaze_properties").select(
+            "*, owner:pricewaze_profiles!owner_id(id, full_name, email), "
+            "zone:pricewaze_zones!zone_id(id, name, city, avg_price_m2)"
+        ).eq("id", property_id).maybe_single()
+
+    def fetch_property(self, property_id: str) -> dict[str, Any] | None:
+        result = self._property_query(get_supabase_client(), property_id).execute()
+        return result.data if result else None
+
+    async def afetch_property(self, property_id: str) -> dict[str, Any] | None:
+        client = await get_async_supabase_client()
+        result = await self._property_query(client, property_id).execute()
+        return result.data if result else None
+
+    @staticmethod
+    def _zone_properties_query(
+        client: Client | AsyncClient,
+        zone_ids: str | list[str] | None,
+        status: str,
+        limit: int,
+        columns: str,
+    ) -> Any:
+        query = client.table("pricewaze_properties").select(columns)
+
+        if isinstance(zone_ids, list):
+            query = query.in_("zone_id", zone_ids)
+        elif zone_ids:
+            query = query.eq("zone_id", zone_ids)
+
+        if status:
+            query = query.eq("status", status)
+
+        return query.limit(limit)
+
+    @staticmethod
+    def _zone_name_query(client: Client | AsyncClient, zone_name: str) -> Any:
+        return client.table("pricewaze_zones").select("id").ilike("name", f"%{zone_name}%")
+
+    def fetch_zone_properties(
+        self,
+        zone_id: str | None,
+        zone_name: str | None,
+        status: str,
+        limit: int,
+        columns: str,
+    ) -> list[dict[str, Any]]:
+        client = get_supabase_client()
+
+        # If filtering by zone_name, resolve the matching zones first
+        if zone_name and not zone_id:
+            zone_result = self._zone_name_query(client, zone_name).execute()
+            if zone_result.data:
+                zone_ids = [z["id"] for z in zone_result.data]
+                query = self._zone_properties_query(client, zone_ids, status, limit, columns)
+                return query.execute().data or []
+
+        query = self._zone_properties_query(client, zone_id, status, limit, columns)
+        return query.execute().data or []
+
+    async def afetch_zone_properties(
+        self,
+        zone_id: str | None,
+        zone_name: str | None,
+        status: str,
+        limit: int,
+        columns: str,
+    ) -> list[dict[str, Any]]:
+        client = await get_async_supabase_client()
+
+        if zone_name and not zone_id:
+            zone_result = await self._zone_name_query(client, zone_name).execute()
+            if zone_result.data:
+                zone_ids = [z["id"] for z in zone_result.data]
+                query = self._zone_properties_query(client, zone_ids, status, limit, columns)
+                return (await query.execute()).data or []
+
+        query = self._zone_properties_query(client, zone_id, status, limit, columns)
+        return (await query.execute()).data or []
+
+    def fetch_offers(self, property_id: str, include_expired: bool) -> list[dict[str, Any]]:
+        query = get_supabase_client().table("pricewaze_offers").select(
+            "id, amount, message, status, created_at, expires_at, parent_offer_id, "
+            "buyer:pricewaze_profiles!buyer_id(id, full_name), "
+            "seller:pricewaze_profiles!seller_id(id, full_name)"
+        ).eq("property_id", property_id).order("created_at", desc=True)
+
+        if not include_expired:
+            query = query.neq("status", "expired")
+
+        return query.execute().data or []
+
+    def fetch_zone_names(self, zone_ids: list[str]) -> dict[str, str]:
+        zones = get_supabase_client().table("pricewaze_zones").select("id, name").in_(
+            "id", zone_ids
+        ).execute()
+        return {z["id"]: z["name"] for z in zones.data or []}
+
+    def iter_property_pages(
+        self,
+        filters: dict[str, Any],
+        columns: str,
+        page_size: int,
+    ) -> Iterator[list[dict[str, Any]]]:
+        client = get_supabase_client()
+        columns = _keyset_columns(columns)
+
+        for phase in _KEYSET_PASSES:
+            cursor = None
+            while True:
+                rows = _keyset_page_query(
+                    client, columns, filters, page_size, phase, cursor
+                ).execute().data or []
+
+                if rows:
+                    yield rows
+                    cursor = rows[-1]
+                if len(rows) < page_size:
+                    break
+
+    async def aiter_property_pages(
+        self,
+        filters: dict[str, Any],
+        columns: str,
+        page_size: int,
+    ) -> AsyncIterator[list[dict[str, Any]]]:
+        client = await get_async_supabase_client()
+        columns = _keyset_columns(columns)
+
+        for phase in _KEYSET_PASSES:
+            cursor = None
+            while True:
+                result = await _keyset_page_query(
+                    client, columns, filters, page_size, phase, cursor
+                ).execute()
+                rows = result.data or []
+
+                if rows:
+                    yield rows
+                    cursor = rows[-1]
+                if len(rows) < page_size:
+                    break
+
+    def market_stats(self, zone_id: str | None, property_type: str | None) -> dict[str, Any]:
+        # Aggregate in the database: one JSON object instead of every row
+        if get_settings().market_stats_rpc:
+            try:
+                result = get_supabase_client().rpc(
+                    MARKET_STATS_RPC,
+                    {"p_zone_id": zone_id, "p_property_type": property_type},
+                ).execute()
+                if isinstance(result.data, dict):
+                    return result.data
+            except APIError:
+                pass  # Function not migrated yet: aggregate the rows here
+
+        # Stream every listing in scope, one page at a time
+        rows = (
+            row
+            for rows in self.iter_property_pages(
+                {"zone_id": zone_id, "property_type": property_type},
+                "price, price_per_m2, property_type, status",
+                1000,
+            )
+            for row in rows
+        )
+        return market_stats_from_rows(rows)
@@ -0,0 +1,324 @@
+"""Fetch Cache - Read-through cache for the database tools.
+
+During one crew run several agents fetch the same property and zone
+listings. The cache serves repeats for a per-table TTL, and concurrent
+identical fetches are coalesced into a single database round-trip
+(single-flight), for both the sync tools and their async variants.
+
+Entries are tagged with the property and zone ids they contain, so a
+listing change can drop every entry that mentions it. Statistics are kept
+process-wide and, inside ``track_fetches``, for the current crew run.
+"""
+
+import asyncio
+import copy
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Iterable, Iterator
+from concurrent.futures import Future
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
+from functools import lru_cache
+from typing import Any
+
+from config import get_settings
+
+# (scope, id) pairs an entry depends on, e.g. ("property", "<uuid>")
+Tag = tuple[str, str]
+
+
+@dataclass
+class FetchStats:
+    """Counters of a fetch cache, process-wide or for one crew run."""
+
+    hits: int = 0
+    misses: int = 0  # Fetches that went to the database
+    coalesced: int = 0  # Fetches that waited on an identical in-flight fetch
+    invalidations: int = 0
+
+    @property
+    def saved_round_trips(self) -> int:
+        """Database round-trips avoided by hits and coalescing."""
+        return self.hits + self.coalesced
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to a JSON-serializable dictionary."""
+        requests = self.hits + self.misses + self.coalesced
+        return {
+            **asdict(self),
+            "saved_round_trips": self.saved_round_trips,
+            "hit_rate": round(self.saved_round_trips / requests, 3) if requests else 0.0,
+        }
+
+
+# Statistics of the crew run in progress (see ``track_fetches``)
+_run_stats: ContextVar[FetchStats | None] = ContextVar("fetch_cache_run_stats", default=None)
+
+
+@contextmanager
+def track_fetches() -> Iterator[FetchStats]:
+    """
+    Collect fetch cache statistics for the code run inside the block.
+
+    Yields:
+        FetchStats updated as tools fetch within the block
+    """
+    stats = FetchStats()
+    token = _run_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _run_stats.reset(token)
+
+
+@dataclass
+class _Entry:
+    """A cached fetch result."""
+
+    value: Any
+    expires_at: float
+    tags: frozenset[Tag] = field(default_factory=frozenset)
+
+
+class FetchCache:
+    """
+    Read-through TTL cache with single-flight coalescing.
+
+    Thread-safe. Values are copied on the way out, so callers can modify
+    what they receive without affecting other readers.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: dict[str, float],
+        default_ttl_seconds: float = 60.0,
+        max_entries: int = 1024,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            ttl_seconds: Time to live by table
+            default_ttl_seconds: Time to live of tables without their own TTL
+            max_entries: Maximum cached fetches (least recently used are evicted)
+        """
+        self.ttl_seconds = ttl_seconds
+        self.default_ttl_seconds = default_ttl_seconds
+        self.max_entries = max_entries
+
+        self._entries: OrderedDict[tuple[str, str], _Entry] = OrderedDict()
+        self._inflight: dict[tuple[str, str], Future] = {}
+        self._ainflight: dict[tuple[str, str], asyncio.Future] = {}
+        self._lock = threading.Lock()
+        # Bumped by every invalidation; fetches started before it are not stored
+        self._epoch = 0
+        self._stats = FetchStats()
+
+    def _count(self, name: str, amount: int = 1) -> None:
+        """Count an event process-wide and for the current run. Call with the lock held."""
+        setattr(self._stats, name, getattr(self._stats, name) + amount)
+        run_stats = _run_stats.get()
+        if run_stats is not None:
+            setattr(run_stats, name, getattr(run_stats, name) + amount)
+
+    def _lookup(self, key: tuple[str, str]) -> _Entry | None:
+        """Live entry for a key. Call with the lock held."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def _store(
+        self,
+        key: tuple[str, str],
+        value: Any,
+        tags: Iterable[Tag],
+        epoch: int,
+    ) -> None:
+        """Cache a fetched value unless an invalidation happened meanwhile."""
+        with self._lock:
+            if epoch != self._epoch:
+                return
+            ttl = self.ttl_seconds.get(key[0], self.default_ttl_seconds)
+            self._entries[key] = _Entry(
+                value=value,
+                expires_at=time.monotonic() + ttl,
+                tags=frozenset(tags),
+            )
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_or_fetch(
+        self,
+        table: str,
+        key: str,
+        fetch: Callable[[], Any],
+        tags: Callable[[Any], Iterable[Tag]] = lambda value: (),
+    ) -> Any:
+        """
+        Return a cached fetch, or run it once for all concurrent callers.
+
+        Args:
+            table: Table fetched (selects the TTL)
+            key: Identity of the fetch within the table (its parameters)
+            fetch: Performs the database read
+            tags: Property/zone ids the fetched value depends on
+
+        Returns:
+            The fetched value (a copy)
+        """
+        cache_key = (table, key)
+        with self._lock:
+            entry = self._lookup(cache_key)
+            if entry is not None:
+                self._count("hits")
+                return copy.deepcopy(entry.value)
+
+            flight = self._inflight.get(cache_key)
+            leader = flight is None
+            if leader:
+                flight = self._inflight[cache_key] = Future()
+                self._count("misses")
+            else:
+                self._count("coalesced")
+            epoch = self._epoch
+
+        if not leader:
+            return copy.deepcopy(flight.result())
+
+        try:
+            value = fetch()
+        except BaseException as e:
+            flight.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(cache_key, None)
+
+        self._store(cache_key, value, tags(value), epoch)
+        flight.set_result(value)
+        return copy.deepcopy(value)
+
+    async def aget_or_fetch(
+        self,
+        table: str,
+        key: str,
+        fetch: Callable[[], Awaitable[Any]],
+        tags: Callable[[Any], Iterable[Tag]] = lambda value: (),
+    ) -> Any:
+        """
+        Async counterpart of ``get_or_fetch``, coalescing within the event loop.
+
+        If the caller running the fetch is cancelled (e.g. its client went
+        away), the callers waiting on it are not: one of them runs the
+        fetch again for the rest.
+        """
+        cache_key = (table, key)
+        while True:
+            with self._lock:
+                entry = self._lookup(cache_key)
+                if entry is not None:
+                    self._count("hits")
+                    return copy.deepcopy(entry.value)
+
+                flight = self._ainflight.get(cache_key)
+                leader = flight is None
+                if leader:
+                    flight = self._ainflight[cache_key] = (
+                        asyncio.get_running_loop().create_future()
+                    )
+                    self._count("misses")
+                else:
+                    self._count("coalesced")
+                epoch = self._epoch
+
+            if leader:
+                break
+            # Unlike awaiting the flight, waiting neither cancels it nor raises its cancellation
+            await asyncio.wait({flight})
+            if not flight.cancelled():
+                return copy.deepcopy(flight.result())
+
+        try:
+            value = await fetch()
+        except asyncio.CancelledError:
+            flight.cancel()  # Waiters retry rather than inherit the cancellation
+            raise
+        except BaseException as e:
+            flight.set_exception(e)
+            # Only waiters see the exception; do not warn if there are none
+            flight.exception()
+            raise
+        finally:
+            with self._lock:
+                self._ainflight.pop(cache_key, None)
+
+        self._store(cache_key, value, tags(value), epoch)
+        flight.set_result(value)
+        return copy.deepcopy(value)
+
+    def _invalidate(self, tag: Tag) -> int:
+        """Drop every entry that depends on a property or zone."""
+        with self._lock:
+            self._epoch += 1
+            keys = [key for key, entry in self._entries.items() if tag in entry.tags]
+            for key in keys:
+                del self._entries[key]
+            self._count("invalidations", len(keys))
+            return len(keys)
+
+    def invalidate_property(self, property_id: str) -> int:
+        """
+        Drop cached fetches that include a property, e.g. after its listing changed.
+
+        Returns:
+            Number of entries removed
+        """
+        return self._invalidate(("property", str(property_id)))
+
+    def invalidate_zone(self, zone_id: str) -> int:
+        """
+        Drop cached fetches of a zone's listings.
+
+        Returns:
+            Number of entries removed
+        """
+        return self._invalidate(("zone", str(zone_id)))
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        with self._lock:
+            self._epoch += 1
+            self._entries.clear()
+
+    def stats(self) -> dict[str, Any]:
+        """Process-wide counters and size for health checks."""
+        with self._lock:
+            return {
+                **self._stats.to_dict(),
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": dict(self.ttl_seconds),
+            }
+
+
+@lru_cache
+def get_fetch_cache() -> FetchCache | None:
+    """Get the process-wide fetch cache (None when disabled in settings)."""
+    settings = get_settings()
+    if settings.fetch_cache_max_entries <= 0:
+        return None
+    return FetchCache(
+        ttl_seconds={
+            "pricewaze_properties": settings.fetch_cache_property_ttl_seconds,
+            "pricewaze_zone_properties": settings.fetch_cache_zone_ttl_seconds,
+        },
+        max_entries=settings.fetch_cache_max_entries,
+    )
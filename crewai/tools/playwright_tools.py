@@ -579,8 +579,7 @@ class VerifyDatabaseActionTool(BaseTool):
 
     def _run(self, input_str: str) -> str:
         try:
-            from config import get_settings
-            from supabase import create_client
+            from .database_tools import get_supabase_client
 
             params = json.loads(input_str)
             table = params.get("table")
@@ -590,11 +589,7 @@ class VerifyDatabaseActionTool(BaseTool):
             if not table:
                 return json.dumps({"error": "Table name required"})
 
-            settings = get_settings()
-            supabase = create_client(
-                settings.effective_supabase_url,
-                settings.effective_supabase_key
-            )
+            supabase = get_supabase_client()
 
             # Build query
             q = supabase.table(table).select("*")
@@ -645,7 +640,8 @@ class CheckDatabaseConnectionTool(BaseTool):
     def _run(self, input_str: str) -> str:
         try:
             from config import get_settings
-            from supabase import create_client
+
+            from .database_tools import get_supabase_client
 
             params = json.loads(input_str) if isinstance(input_str, str) else {}
             tables_to_check = params.get("tables", [
@@ -657,10 +653,7 @@ class CheckDatabaseConnectionTool(BaseTool):
             ])
 
             settings = get_settings()
-            supabase = create_client(
-                settings.effective_supabase_url,
-                settings.effective_supabase_key
-            )
+            supabase = get_supabase_client()
 
             table_status = {}
             for table in tables_to_check:
@@ -0,0 +1,757 @@
+"""SQLite Backend - Local, offline stand-in for the Supabase data backend.
+
+The schema is derived from ``supabase/migrations``: table columns, later
+``ALTER TABLE`` changes and plain b-tree indexes are replayed in migration
+order and translated to SQLite (UUIDs and timestamps as text, arrays and
+JSONB as JSON text, PostGIS columns dropped). ``create_local_database``
+fills that schema with ``SyntheticData`` rows; ``SQLiteBackend`` serves
+the ``DataBackend`` interface from the file, so benchmarks and load tests
+exercise the same code paths as production at realistic row counts.
+"""
+
+import json
+import re
+import sqlite3
+import threading
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from .data_backend import DataBackend
+from .synthetic_data import SyntheticData
+
+MIGRATIONS_DIR = Path(__file__).resolve().parents[2] / "supabase" / "migrations"
+
+# Tables the data backend reads
+LOCAL_TABLES = (
+    "pricewaze_profiles",
+    "pricewaze_zones",
+    "pricewaze_properties",
+    "pricewaze_offers",
+)
+
+# Declared SQLite types; JSONTEXT keeps TEXT affinity and marks JSON columns
+SQLITE_TYPES = {
+    "text": "TEXT",
+    "integer": "INTEGER",
+    "real": "REAL",
+    "boolean": "BOOLEAN",
+    "json": "JSONTEXT",
+}
+KIND_BY_SQLITE_TYPE = {sqlite_type: kind for kind, sqlite_type in SQLITE_TYPES.items()}
+
+_POSTGRES_KINDS = {
+    "integer": "integer", "int": "integer", "int2": "integer", "int4": "integer",
+    "int8": "integer", "smallint": "integer", "bigint": "integer",
+    "serial": "integer", "bigserial": "integer",
+    "decimal": "real", "numeric": "real", "real": "real", "float": "real",
+    "float4": "real", "float8": "real", "double": "real",
+    "boolean": "boolean", "bool": "boolean",
+    "json": "json", "jsonb": "json",
+}
+_SPATIAL_TYPES = {"geometry", "geography"}
+_TABLE_CONSTRAINTS = {"constraint", "primary", "unique", "check", "foreign", "exclude"}
+# Generated column expressions SQLite can evaluate as written
+_PORTABLE_EXPRESSION = re.compile(r"[\w\s()+\-*/,.]+")
+
+
+def _sql_statements(sql: str) -> Iterator[str]:
+    """Split a migration into statements, dropping comments and dollar-quoted bodies."""
+    statement: list[str] = []
+    i = 0
+    while i < len(sql):
+        char = sql[i]
+        if sql.startswith("--", i):
+            i = sql.find("\n", i)
+            i = len(sql) if i < 0 else i
+            continue
+        if sql.startswith("/*", i):
+            end = sql.find("*/", i + 2)
+            i = len(sql) if end < 0 else end + 2
+            continue
+        if char == "$":
+            tag = re.match(r"\$\w*\$", sql[i:])
+            if tag:
+                end = sql.find(tag.group(), i + len(tag.group()))
+                i = len(sql) if end < 0 else end + len(tag.group())
+                continue
+        if char == "'":
+            end = i + 1
+            while end < len(sql):
+                if sql[end] == "'" and sql.startswith("''", end):
+                    end += 2
+                elif sql[end] == "'":
+                    break
+                else:
+                    end += 1
+            statement.append(sql[i:end + 1])
+            i = end + 1
+            continue
+        if char == ";":
+            text = "".join(statement).strip()
+            if text:
+                yield text
+            statement = []
+        else:
+            statement.append(char)
+        i += 1
+
+    text = "".join(statement).strip()
+    if text:
+        yield text
+
+
+def _split_top_level(text: str) -> list[str]:
+    """Split on commas outside parentheses and quotes."""
+    parts, depth, start, quoted = [], 0, 0, False
+    for i, char in enumerate(text):
+        if char == "'":
+            quoted = not quoted
+        elif quoted:
+            continue
+        elif char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        elif char == "," and depth == 0:
+            parts.append(text[start:i].strip())
+            start = i + 1
+    parts.append(text[start:].strip())
+    return [part for part in parts if part]
+
+
+def _parenthesized(text: str, start: int) -> str:
+    """Contents of the parenthesized group opening at ``text[start]``."""
+    depth = 0
+    for i in range(start, len(text)):
+        if text[i] == "(":
+            depth += 1
+        elif text[i] == ")":
+            depth -= 1
+            if depth == 0:
+                return text[start + 1:i]
+    return text[start + 1:]
+
+
+def _identifier(name: str) -> str:
+    """Unquoted, schema-less, lower-case identifier."""
+    return name.strip().strip('"').split(".")[-1].strip('"').lower()
+
+
+@dataclass
+class LocalColumn:
+    """A column of the local schema."""
+
+    name: str
+    kind: str  # Key of SQLITE_TYPES
+    not_null: bool = False
+    primary_key: bool = False
+    default: str | None = None  # SQLite literal
+    generated: str | None = None  # Stored expression
+
+    def ddl(self) -> str:
+        """Column definition for CREATE TABLE."""
+        parts = [self.name, SQLITE_TYPES[self.kind]]
+        if self.primary_key:
+            parts.append("PRIMARY KEY")
+        if self.not_null:
+            parts.append("NOT NULL")
+        if self.generated:
+            parts.append(f"GENERATED ALWAYS AS ({self.generated}) STORED")
+        elif self.default is not None:
+            parts.append(f"DEFAULT {self.default}")
+        return " ".join(parts)
+
+
+@dataclass
+class LocalTable:
+    """A table of the local schema with its indexes."""
+
+    name: str
+    columns: dict[str, LocalColumn] = field(default_factory=dict)
+    indexes: dict[str, tuple[bool, list[str]]] = field(default_factory=dict)  # name -> (unique, columns)
+
+    def ddl(self) -> str:
+        """CREATE TABLE statement."""
+        columns = ",\n  ".join(column.ddl() for column in self.columns.values())
+        return f"CREATE TABLE {self.name} (\n  {columns}\n)"
+
+    def index_ddl(self) -> list[str]:
+        """CREATE INDEX statements."""
+        return [
+            f"CREATE {'UNIQUE ' if unique else ''}INDEX {name} ON {self.name}({', '.join(columns)})"
+            for name, (unique, columns) in self.indexes.items()
+        ]
+
+
+def _default_literal(expression: str, kind: str, is_array: bool) -> str | None:
+    """SQLite literal for a Postgres default, or None if it is not a constant."""
+    value = re.sub(r"::[\w\s\[\]]+$", "", expression.strip()).strip()
+    if re.fullmatch(r"-?\d+(\.\d+)?", value):
+        return value
+    if value.lower() in ("true", "false"):
+        return "1" if value.lower() == "true" else "0"
+    if value.startswith("'") and value.endswith("'"):
+        if is_array:
+            return "'[]'" if value == "'{}'" else None
+        return value
+    return None
+
+
+def _column(definition: str) -> LocalColumn | None:
+    """Translate a Postgres column definition (None for constraints and spatial columns)."""
+    match = re.match(r'("[^"]+"|\w+)\s+(.*)', definition, re.DOTALL)
+    if not match or match.group(1).lower() in _TABLE_CONSTRAINTS:
+        return None
+    name, rest = _identifier(match.group(1)), match.group(2)
+
+    type_match = re.match(
+        r"(\w+(?:\s+(?:precision|varying|with(?:out)?\s+time\s+zone))?)\s*(\([^)]*\))?\s*(\[\])?",
+        rest,
+        re.IGNORECASE,
+    )
+    base_type = type_match.group(1).split()[0].lower()
+    if base_type in _SPATIAL_TYPES:
+        return None
+    is_array = bool(type_match.group(3))
+    kind = "json" if is_array else _POSTGRES_KINDS.get(base_type, "text")
+    constraints = rest[type_match.end():]
+    upper = constraints.upper()
+
+    column = LocalColumn(
+        name=name,
+        kind=kind,
+        not_null="NOT NULL" in upper,
+        primary_key="PRIMARY KEY" in upper,
+    )
+
+    generated = re.search(r"GENERATED\s+ALWAYS\s+AS\s*\(", constraints, re.IGNORECASE)
+    if generated:
+        expression = _parenthesized(constraints, generated.end() - 1).strip()
+        if not _PORTABLE_EXPRESSION.fullmatch(expression):
+            return None
+        # DECIMAL(p, s) columns store rounded values
+        scale = re.fullmatch(r"\(\s*\d+\s*,\s*(\d+)\s*\)", type_match.group(2) or "")
+        column.generated = f"ROUND({expression}, {scale.group(1)})" if scale else expression
+        return column
+
+    default = re.search(
+        r"\bDEFAULT\s+('(?:[^']|'')*'(?:::[\w\[\]]+)?|\([^)]*\)|[\w.:\-]+(?:\([^)]*\))?)",
+        constraints,
+        re.IGNORECASE,
+    )
+    if default:
+        column.default = _default_literal(default.group(1), kind, is_array)
+    return column
+
+
+def _apply_statement(tables: dict[str, LocalTable], statement: str) -> None:
+    """Replay one migration statement on the local schema."""
+    create = re.match(
+        r"CREATE\s+TABLE\s+(?:IF\s+NOT\s+EXISTS\s+)?([\w.\"]+)\s*\(",
+        statement,
+        re.IGNORECASE,
+    )
+    if create:
+        name = _identifier(create.group(1))
+        if name in LOCAL_TABLES and name not in tables:
+            table = LocalTable(name)
+            for definition in _split_top_level(_parenthesized(statement, create.end() - 1)):
+                column = _column(definition)
+                if column:
+                    table.columns[column.name] = column
+            tables[name] = table
+        return
+
+    alter = re.match(
+        r"ALTER\s+TABLE\s+(?:IF\s+EXISTS\s+)?(?:ONLY\s+)?([\w.\"]+)\s+(.*)",
+        statement,
+        re.IGNORECASE | re.DOTALL,
+    )
+    if alter:
+        table = tables.get(_identifier(alter.group(1)))
+        if table is None:
+            return
+        for action in _split_top_level(alter.group(2)):
+            add = re.match(r"ADD\s+COLUMN\s+(?:IF\s+NOT\s+EXISTS\s+)?(.*)", action, re.I | re.S)
+            drop = re.match(r"DROP\s+COLUMN\s+(?:IF\s+EXISTS\s+)?([\w\"]+)", action, re.I)
+            nullability = re.match(
+                r"ALTER\s+COLUMN\s+([\w\"]+)\s+(SET|DROP)\s+NOT\s+NULL", action, re.I
+            )
+            if add:
+                column = _column(add.group(1))
+                if column and column.name not in table.columns:
+                    table.columns[column.name] = column
+            elif drop:
+                table.columns.pop(_identifier(drop.group(1)), None)
+            elif nullability:
+                column = table.columns.get(_identifier(nullability.group(1)))
+                if column:
+                    column.not_null = nullability.group(2).upper() == "SET"
+        return
+
+    index = re.match(
+        r"CREATE\s+(UNIQUE\s+)?INDEX\s+(?:CONCURRENTLY\s+)?(?:IF\s+NOT\s+EXISTS\s+)?(\w+)\s+"
+        r"ON\s+(?:ONLY\s+)?([\w.\"]+)\s*(?:USING\s+(\w+)\s*)?\((.*)\)\s*$",
+        statement,
+        re.IGNORECASE | re.DOTALL,
+    )
+    if index:
+        unique, name, table_name, method, columns = index.groups()
+        table = tables.get(_identifier(table_name))
+        if table is None or (method and method.lower() != "btree"):
+            return
+        keys = _split_top_level(columns)
+        # Only plain column keys; partial and expression indexes stay in Postgres
+        if all(
+            re.fullmatch(r"\w+(\s+(ASC|DESC))?", key, re.I)
+            and key.split()[0].lower() in table.columns
+            for key in keys
+        ):
+            table.indexes[name.lower()] = (bool(unique), keys)
+        return
+
+    drop_index = re.match(
+        r"DROP\s+INDEX\s+(?:CONCURRENTLY\s+)?(?:IF\s+EXISTS\s+)?([\w.\"]+)", statement, re.I
+    )
+    if drop_index:
+        name = _identifier(drop_index.group(1))
+        for table in tables.values():
+            table.indexes.pop(name, None)
+
+
+def local_schema(migrations_dir: Path | str = MIGRATIONS_DIR) -> dict[str, LocalTable]:
+    """
+    Derive the local schema of ``LOCAL_TABLES`` from the Supabase migrations.
+
+    Args:
+        migrations_dir: Directory of ``.sql`` migrations, applied in name order
+
+    Returns:
+        Tables by name
+    """
+    tables: dict[str, LocalTable] = {}
+    for path in sorted(Path(migrations_dir).glob("*.sql")):
+        for statement in _sql_statements(path.read_text(encoding="utf-8")):
+            _apply_statement(tables, statement)
+
+    missing = set(LOCAL_TABLES) - set(tables)
+    if missing:
+        raise RuntimeError(f"Tables not found in {migrations_dir}: {sorted(missing)}")
+    return tables
+
+
+def _insert_batches(
+    db: sqlite3.Connection,
+    table: LocalTable,
+    rows: Iterable[dict[str, Any]],
+    batch_size: int,
+) -> int:
+    """
+    Insert rows in batches, encoding JSON columns.
+
+    Columns are those of the first row; the rest take their defaults.
+
+    Returns:
+        Number of rows inserted
+    """
+    rows = iter(rows)
+    first = next(rows, None)
+    if first is None:
+        return 0
+
+    columns = [c for c in table.columns.values() if not c.generated and c.name in first]
+    statement = (
+        f"INSERT INTO {table.name} ({', '.join(c.name for c in columns)}) "
+        f"VALUES ({', '.join('?' for _ in columns)})"
+    )
+    json_columns = {c.name for c in columns if c.kind == "json"}
+
+    def encode(row: dict[str, Any]) -> tuple[Any, ...]:
+        return tuple(
+            json.dumps(row[c.name])
+            if c.name in json_columns and row.get(c.name) is not None
+            else row.get(c.name)
+            for c in columns
+        )
+
+    count = 0
+    batch = [encode(first)]
+    for row in rows:
+        batch.append(encode(row))
+        if len(batch) >= batch_size:
+            db.executemany(statement, batch)
+            count += len(batch)
+            batch.clear()
+    if batch:
+        db.executemany(statement, batch)
+        count += len(batch)
+    return count
+
+
+def create_local_database(
+    path: Path | str,
+    properties: int = 10_000,
+    zones: int = 16,
+    profiles: int = 200,
+    seed: int = 0,
+    migrations_dir: Path | str = MIGRATIONS_DIR,
+    batch_size: int = 5000,
+) -> dict[str, int]:
+    """
+    Create a SQLite database with the migrations schema and synthetic rows.
+
+    Args:
+        path: Database file to create (must not exist)
+        properties: Number of listings
+        zones: Number of zones
+        profiles: Number of user profiles
+        seed: Random seed of the synthetic data
+        migrations_dir: Supabase migrations the schema is derived from
+        batch_size: Rows per insert batch
+
+    Returns:
+        Row count by table
+    """
+    path = Path(path)
+    if path.exists():
+        raise FileExistsError(f"{path} already exists")
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    tables = local_schema(migrations_dir)
+    data = SyntheticData(zones=zones, profiles=profiles, seed=seed)
+
+    db = sqlite3.connect(path)
+    try:
+        # Bulk load without a journal; indexes are built once at the end
+        db.execute("PRAGMA journal_mode=OFF")
+        db.execute("PRAGMA synchronous=OFF")
+        for table in tables.values():
+            db.execute(table.ddl())
+
+        counts = {
+            "pricewaze_zones": _insert_batches(
+                db, tables["pricewaze_zones"], (z.row for z in data.zones), batch_size
+            ),
+            "pricewaze_profiles": _insert_batches(
+                db, tables["pricewaze_profiles"], data.profiles, batch_size
+            ),
+            "pricewaze_offers": 0,
+        }
+
+        offers: list[dict[str, Any]] = []
+
+        def listings() -> Iterator[dict[str, Any]]:
+            for listing, listing_offers in data.iter_listings(properties):
+                offers.extend(listing_offers)
+                yield listing
+                if len(offers) >= batch_size:
+                    counts["pricewaze_offers"] += _insert_batches(
+                        db, tables["pricewaze_offers"], offers, batch_size
+                    )
+                    offers.clear()
+
+        counts["pricewaze_properties"] = _insert_batches(
+            db, tables["pricewaze_properties"], listings(), batch_size
+        )
+        counts["pricewaze_offers"] += _insert_batches(
+            db, tables["pricewaze_offers"], offers, batch_size
+        )
+
+        db.execute(
+            "UPDATE pricewaze_zones SET total_listings = (SELECT COUNT(*) "
+            "FROM pricewaze_properties p WHERE p.zone_id = pricewaze_zones.id "
+            "AND p.status = 'active')"
+        )
+        for table in tables.values():
+            for statement in table.index_ddl():
+                db.execute(statement)
+        db.commit()
+        db.execute("ANALYZE")
+        db.execute("PRAGMA journal_mode=DELETE")
+    finally:
+        db.close()
+
+    return counts
+
+
+class SQLiteBackend(DataBackend):
+    """
+    Data backend over a local SQLite file (see ``create_local_database``).
+
+    Read-only; each thread gets its own connection.
+    """
+
+    name = "sqlite"
+
+    def __init__(self, path: Path | str):
+        """
+        Open the database lazily.
+
+        Args:
+            path: SQLite file created by ``create_local_database``
+        """
+        self.path = Path(path)
+        if not self.path.exists():
+            raise RuntimeError(
+                f"Local database {self.path} not found (create it with seed_local_db.py)"
+            )
+        self._local = threading.local()
+        self._kinds: dict[str, dict[str, str]] | None = None
+
+    def _connection(self) -> sqlite3.Connection:
+        db = getattr(self._local, "db", None)
+        if db is None:
+            db = sqlite3.connect(
+                f"{self.path.resolve().as_uri()}?mode=ro", uri=True, check_same_thread=False
+            )
+            db.row_factory = sqlite3.Row
+            self._local.db = db
+        return db
+
+    def _column_kinds(self, table: str) -> dict[str, str]:
+        """Column kind by name, from the declared types (generated columns included)."""
+        if self._kinds is None:
+            db = self._connection()
+            self._kinds = {
+                name: {
+                    row["name"]: KIND_BY_SQLITE_TYPE.get(row["type"], "text")
+                    for row in db.execute(f"PRAGMA table_xinfo({name})")
+                    if row["hidden"] != 1
+                }
+                for name in LOCAL_TABLES
+            }
+        return self._kinds[table]
+
+    def _columns(self, table: str, columns: str) -> list[str]:
+        """Validated column list of a PostgREST-style projection."""
+        kinds = self._column_kinds(table)
+        names = [name.strip() for name in columns.split(",")]
+        if "*" in names:
+            return list(kinds)
+        unknown = [name for name in names if name not in kinds]
+        if unknown:
+            raise ValueError(f"Unknown columns of {table}: {unknown}")
+        return names
+
+    def _select(
+        self,
+        table: str,
+        columns: list[str],
+        where: str = "",
+        params: Iterable[Any] = (),
+        suffix: str = "",
+    ) -> list[dict[str, Any]]:
+        """Run a SELECT and decode JSON and boolean columns."""
+        kinds = self._column_kinds(table)
+        sql = f"SELECT {', '.join(columns)} FROM {table}"
+        if where:
+            sql += f" WHERE {where}"
+        if suffix:
+            sql += f" {suffix}"
+
+        rows = []
+        for row in self._connection().execute(sql, tuple(params)):
+            record = dict(row)
+            for name in columns:
+                value = record[name]
+                if value is None:
+                    continue
+                if kinds[name] == "json":
+                    record[name] = json.loads(value)
+                elif kinds[name] == "boolean":
+                    record[name] = bool(value)
+            rows.append(record)
+        return rows
+
+    def _embed(self, table: str, columns: str, row_id: str | None) -> dict[str, Any] | None:
+        """A to-one embedded row, like PostgREST's ``alias:table!fk(...)``."""
+        if row_id is None:
+            return None
+        rows = self._select(table, self._columns(table, columns), "id = ?", (row_id,))
+        return rows[0] if rows else None
+
+    @staticmethod
+    def _filters(filters: dict[str, Any], columns: Iterable[str]) -> tuple[list[str], list[Any]]:
+        """WHERE clauses for column filters (list values filter with IN)."""
+        known = set(columns)
+        clauses, params = [], []
+        for column, value in filters.items():
+            if value is None:
+                continue
+            if column not in known:
+                raise ValueError(f"Unknown filter column: {column}")
+            if isinstance(value, (list, tuple, set)):
+                values = list(value)
+                clauses.append(f"{column} IN ({', '.join('?' for _ in values)})")
+                params.extend(values)
+            else:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        return clauses, params
+
+    def fetch_property(self, property_id: str) -> dict[str, Any] | None:
+        rows = self._select(
+            "pricewaze_properties",
+            self._columns("pricewaze_properties", "*"),
+            "id = ?",
+            (property_id,),
+        )
+        if not rows:
+            return None
+        prop = rows[0]
+        prop["owner"] = self._embed("pricewaze_profiles", "id, full_name, email", prop["owner_id"])
+        prop["zone"] = self._embed("pricewaze_zones", "id, name, city, avg_price_m2", prop["zone_id"])
+        return prop
+
+    def fetch_zone_properties(
+        self,
+        zone_id: str | None,
+        zone_name: str | None,
+        status: str,
+        limit: int,
+        columns: str,
+    ) -> list[dict[str, Any]]:
+        zone_ids: str | list[str] | None = zone_id
+        if zone_name and not zone_id:
+            # ILIKE: LIKE is case-insensitive for ASCII in SQLite
+            zones = self._select("pricewaze_zones", ["id"], "name LIKE ?", (f"%{zone_name}%",))
+            if zones:
+                zone_ids = [z["id"] for z in zones]
+
+        clauses, params = self._filters(
+            {"zone_id": zone_ids, "status": status or None},
+            self._column_kinds("pricewaze_properties"),
+        )
+        return self._select(
+            "pricewaze_properties",
+            self._columns("pricewaze_properties", columns),
+            " AND ".join(clauses),
+            [*params, limit],
+            "LIMIT ?",
+        )
+
+    def fetch_offers(self, property_id: str, include_expired: bool) -> list[dict[str, Any]]:
+        where = "property_id = ?" + ("" if include_expired else " AND status <> 'expired'")
+        offers = self._select(
+            "pricewaze_offers",
+            self._columns(
+                "pricewaze_offers",
+                "id, amount, message, status, created_at, expires_at, parent_offer_id, "
+                "buyer_id, seller_id",
+            ),
+            where,
+            (property_id,),
+            "ORDER BY created_at DESC",
+        )
+        for offer in offers:
+            offer["buyer"] = self._embed("pricewaze_profiles", "id, full_name", offer.pop("buyer_id"))
+            offer["seller"] = self._embed("pricewaze_profiles", "id, full_name", offer.pop("seller_id"))
+        return offers
+
+    def fetch_zone_names(self, zone_ids: list[str]) -> dict[str, str]:
+        clauses, params = self._filters({"id": zone_ids}, ("id",))
+        zones = self._select("pricewaze_zones", ["id", "name"], " AND ".join(clauses), params)
+        return {z["id"]: z["name"] for z in zones}
+
+    def iter_property_pages(
+        self,
+        filters: dict[str, Any],
+        columns: str,
+        page_size: int,
+    ) -> Iterator[list[dict[str, Any]]]:
+        table = "pricewaze_properties"
+        names = self._columns(table, columns)
+        names += [key for key in ("id", "created_at") if key not in names]
+        clauses, params = self._filters(filters, self._column_kinds(table))
+
+        # Same passes and order as the Supabase keyset reader
+        passes = (
+            ("created_at IS NULL", "id > ?", ("id",), "ORDER BY id"),
+            ("created_at IS NOT NULL", "(created_at, id) > (?, ?)", ("created_at", "id"),
+             "ORDER BY created_at, id"),
+        )
+        for phase, after, cursor_keys, order in passes:
+            cursor: dict[str, Any] | None = None
+            while True:
+                where = [*clauses, phase]
+                page_params = list(params)
+                if cursor is not None:
+                    where.append(after)
+                    page_params += [cursor[key] for key in cursor_keys]
+                rows = self._select(
+                    table, names, " AND ".join(where), [*page_params, page_size],
+                    f"{order} LIMIT ?",
+                )
+
+                if rows:
+                    yield rows
+                    cursor = rows[-1]
+                if len(rows) < page_size:
+                    break
+
+    def market_stats(self, zone_id: str | None, property_type: str | None) -> dict[str, Any]:
+        clauses, params = self._filters(
+            {"zone_id": zone_id, "property_type": property_type},
+            ("zone_id", "property_type"),
+        )
+        scope = " AND ".join(clauses) or "1"
+        db = self._connection()
+
+        totals = db.execute(
+            "SELECT "
+            "COUNT(*) FILTER (WHERE status = 'active'), "
+            "COUNT(*) FILTER (WHERE status = 'sold'), "
+            "AVG(price) FILTER (WHERE status = 'active' AND price <> 0), "
+            "MIN(price) FILTER (WHERE status = 'active' AND price <> 0), "
+            "MAX(price) FILTER (WHERE status = 'active' AND price <> 0), "
+            "COUNT(price) FILTER (WHERE status = 'active' AND price <> 0), "
+            "AVG(price_per_m2) FILTER (WHERE status = 'active' AND price_per_m2 <> 0), "
+            "COUNT(price_per_m2) FILTER (WHERE status = 'active' AND price_per_m2 <> 0) "
+            f"FROM pricewaze_properties WHERE {scope}",
+            params,
+        ).fetchone()
+        listings, sold, avg_price, min_price, max_price, priced, avg_ppm2, priced_m2 = totals
+
+        def percentile(column: str, count: int, fraction: float) -> float:
+            """Postgres ``percentile_cont`` from the two ordered values around the position."""
+            if not count:
+                return 0
+            position = fraction * (count - 1)
+            lower = int(position)
+            values = [
+                row[0]
+                for row in db.execute(
+                    f"SELECT {column} FROM pricewaze_properties WHERE {scope} "
+                    f"AND status = 'active' AND {column} <> 0 "
+                    f"ORDER BY {column} LIMIT 2 OFFSET ?",
+                    [*params, lower],
+                )
+            ]
+            upper = values[1] if len(values) > 1 else values[0]
+            return values[0] + (upper - values[0]) * (position - lower)
+
+        distribution = {
+            row[0]: row[1]
+            for row in db.execute(
+                "SELECT property_type, COUNT(*) FROM pricewaze_properties "
+                f"WHERE {scope} AND status = 'active' GROUP BY property_type",
+                params,
+            )
+        }
+
+        return {
+            "total_listings": listings,
+            "total_sold": sold,
+            "avg_price": avg_price or 0,
+            "min_price": min_price or 0,
+            "max_price": max_price or 0,
+            "median_price": percentile("price", priced, 0.5),
+            "price_p25": percentile("price", priced, 0.25),
+            "price_p75": percentile("price", priced, 0.75),
+            "price_p90": percentile("price", priced, 0.9),
+            "avg_price_per_m2": avg_ppm2 or 0,
+            "median_price_per_m2": percentile("price_per_m2", priced_m2, 0.5),
+            "property_type_distribution": distribution,
+        }
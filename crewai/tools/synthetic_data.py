@@ -0,0 +1,223 @@
+"""Synthetic Data - Reproducible PriceWaze rows for local benchmarks.
+
+Generates zones, profiles, listings and offers with the columns of the
+Supabase schema and plausible Dominican Republic prices: each zone has a
+base price per m2, listings vary around it by type, size and age, and
+offers negotiate around the asking price. The same seed always yields the
+same rows, so benchmark runs are comparable.
+"""
+
+import random
+import uuid
+from collections.abc import Iterator
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+# (name, city, latitude, longitude, base price per m2 in USD)
+ZONE_SEEDS = (
+    ("Piantini", "Santo Domingo", 18.4650, -69.9400, 2500),
+    ("Naco", "Santo Domingo", 18.4600, -69.9350, 1800),
+    ("Serrallés", "Santo Domingo", 18.4640, -69.9480, 2100),
+    ("Evaristo Morales", "Santo Domingo", 18.4700, -69.9430, 1900),
+    ("Bella Vista", "Santo Domingo", 18.4520, -69.9460, 1700),
+    ("La Esperilla", "Santo Domingo", 18.4610, -69.9270, 1600),
+    ("Los Cacicazgos", "Santo Domingo", 18.4480, -69.9560, 2300),
+    ("Mirador Sur", "Santo Domingo", 18.4430, -69.9620, 1500),
+    ("Gazcue", "Santo Domingo", 18.4680, -69.9030, 1300),
+    ("Zona Colonial", "Santo Domingo", 18.4740, -69.8840, 1600),
+    ("Los Prados", "Santo Domingo", 18.4810, -69.9410, 1200),
+    ("Arroyo Hondo", "Santo Domingo", 18.4960, -69.9520, 1400),
+    ("Punta Cana", "Punta Cana", 18.5600, -68.3720, 2600),
+    ("Bávaro", "Punta Cana", 18.6820, -68.4530, 2000),
+    ("Los Jardines", "Santiago", 19.4600, -70.6900, 1100),
+    ("Cerros de Gurabo", "Santiago", 19.4750, -70.6650, 1250),
+)
+
+# Price multiplier and area range (m2) by property type
+PROPERTY_TYPES = {
+    "apartment": (1.0, (45, 260)),
+    "house": (0.85, (90, 600)),
+    "land": (0.25, (200, 3000)),
+    "commercial": (1.15, (40, 900)),
+    "office": (1.1, (30, 500)),
+}
+PROPERTY_TYPE_WEIGHTS = (0.55, 0.2, 0.08, 0.1, 0.07)
+
+LISTING_STATUSES = ("active", "pending", "sold", "inactive")
+LISTING_STATUS_WEIGHTS = (0.7, 0.08, 0.17, 0.05)
+
+OFFER_STATUSES = ("pending", "accepted", "rejected", "countered", "withdrawn", "expired")
+OFFER_STATUS_WEIGHTS = (0.3, 0.1, 0.2, 0.2, 0.05, 0.15)
+
+FIRST_NAMES = ("María", "Juan", "Ana", "Carlos", "Laura", "Pedro", "Elena", "Roberto", "Rosa", "Luis")
+LAST_NAMES = ("García", "Pérez", "Rodríguez", "Méndez", "Santos", "Jiménez", "Vega", "Cruz", "Núñez", "Reyes")
+
+# Listing dates span two years before this instant (fixed for reproducibility)
+EPOCH = datetime(2026, 1, 1, tzinfo=UTC)
+
+
+def _uuid(rng: random.Random) -> str:
+    return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+
+def _timestamp(moment: datetime) -> str:
+    """ISO timestamp in the format PostgREST returns for TIMESTAMPTZ."""
+    return moment.isoformat()
+
+
+@dataclass(frozen=True, slots=True)
+class SyntheticZone:
+    """A generated zone with the parameters its listings are drawn from."""
+
+    row: dict[str, Any]
+    latitude: float
+    longitude: float
+    price_per_m2: float
+
+
+class SyntheticData:
+    """
+    Generator of schema-shaped rows from a seed.
+
+    Zones and profiles are small and kept in memory; listings and their
+    offers are generated lazily so any row count streams into a database.
+    """
+
+    def __init__(self, zones: int = 16, profiles: int = 200, seed: int = 0):
+        """
+        Generate the zones and profiles.
+
+        Args:
+            zones: Number of zones (names repeat with a suffix past the built-in list)
+            profiles: Number of user profiles owning listings and making offers
+            seed: Random seed
+        """
+        self.seed = seed
+        rng = random.Random(f"{seed}:reference")
+        self.zones = [self._zone(rng, i) for i in range(zones)]
+        self.profiles = [self._profile(rng, i) for i in range(profiles)]
+
+    def _zone(self, rng: random.Random, i: int) -> SyntheticZone:
+        name, city, latitude, longitude, price_per_m2 = ZONE_SEEDS[i % len(ZONE_SEEDS)]
+        if i >= len(ZONE_SEEDS):
+            name = f"{name} {i // len(ZONE_SEEDS) + 1}"
+            latitude += rng.uniform(-0.05, 0.05)
+            longitude += rng.uniform(-0.05, 0.05)
+            price_per_m2 *= rng.uniform(0.8, 1.2)
+        created_at = _timestamp(EPOCH - timedelta(days=900))
+        return SyntheticZone(
+            row={
+                "id": _uuid(rng),
+                "name": name,
+                "city": city,
+                "avg_price_m2": round(price_per_m2, 2),
+                "total_listings": 0,
+                "created_at": created_at,
+                "updated_at": created_at,
+            },
+            latitude=latitude,
+            longitude=longitude,
+            price_per_m2=price_per_m2,
+        )
+
+    def _profile(self, rng: random.Random, i: int) -> dict[str, Any]:
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        created_at = _timestamp(EPOCH - timedelta(days=rng.uniform(30, 900)))
+        return {
+            "id": _uuid(rng),
+            "email": f"user{i}@example.com",
+            "full_name": f"{first} {last}",
+            "phone": f"+1-809-555-{i % 10000:04d}",
+            "role": rng.choices(("buyer", "seller", "agent"), (0.6, 0.3, 0.1))[0],
+            "verified": rng.random() < 0.5,
+            "created_at": created_at,
+            "updated_at": created_at,
+        }
+
+    def _listing(self, rng: random.Random, i: int) -> dict[str, Any]:
+        zone = rng.choice(self.zones)
+        property_type = rng.choices(tuple(PROPERTY_TYPES), PROPERTY_TYPE_WEIGHTS)[0]
+        type_factor, (min_area, max_area) = PROPERTY_TYPES[property_type]
+
+        area = round(rng.uniform(min_area, max_area) * rng.uniform(0.9, 1.1), 2)
+        year_built = None if property_type == "land" else rng.randint(1970, 2025)
+        age_factor = 1.0 if year_built is None else 1.0 - (2025 - year_built) * 0.004
+        price_per_m2 = zone.price_per_m2 * type_factor * age_factor * rng.lognormvariate(0, 0.15)
+
+        has_rooms = property_type in ("apartment", "house")
+        bedrooms = max(1, min(6, round(area / 55))) if has_rooms else None
+        bathrooms = max(1, (bedrooms or 0) - rng.randint(0, 1)) if has_rooms else None
+
+        # A few listings predate created_at tracking (e.g. imported rows)
+        created = None if rng.random() < 0.02 else EPOCH - timedelta(days=rng.uniform(0, 730))
+        created_at = _timestamp(created) if created else None
+
+        return {
+            "id": _uuid(rng),
+            "owner_id": rng.choice(self.profiles)["id"] if rng.random() < 0.9 else None,
+            "zone_id": zone.row["id"],
+            "title": f"{property_type.capitalize()} en {zone.row['name']}",
+            "description": None,
+            "property_type": property_type,
+            "price": round(area * price_per_m2, -2),
+            "area_m2": area,
+            "bedrooms": bedrooms,
+            "bathrooms": bathrooms,
+            "parking_spaces": rng.randint(0, 3) if property_type != "land" else None,
+            "year_built": year_built,
+            "address": f"Calle {i % 97 + 1} #{rng.randint(1, 300)}, {zone.row['name']}",
+            "latitude": round(zone.latitude + rng.gauss(0, 0.004), 8),
+            "longitude": round(zone.longitude + rng.gauss(0, 0.004), 8),
+            "images": [],
+            "features": rng.sample(("pool", "gym", "security", "elevator", "balcony"), rng.randint(0, 3)),
+            "status": rng.choices(LISTING_STATUSES, LISTING_STATUS_WEIGHTS)[0],
+            "views_count": rng.randint(0, 500),
+            "created_at": created_at,
+            "updated_at": created_at,
+            "source_type": "seed",
+        }
+
+    def _offers(self, rng: random.Random, listing: dict[str, Any]) -> list[dict[str, Any]]:
+        if listing["owner_id"] is None or rng.random() < 0.6:
+            return []
+        listed = EPOCH - timedelta(days=rng.uniform(0, 730))
+        offers = []
+        parent_id = None
+        amount = listing["price"] * rng.uniform(0.8, 0.95)
+        for _ in range(rng.randint(1, 4)):
+            created = listed + timedelta(hours=rng.uniform(1, 24 * 30))
+            offers.append(
+                {
+                    "id": _uuid(rng),
+                    "property_id": listing["id"],
+                    "buyer_id": rng.choice(self.profiles)["id"],
+                    "seller_id": listing["owner_id"],
+                    "amount": round(amount, -2),
+                    "message": None,
+                    "status": rng.choices(OFFER_STATUSES, OFFER_STATUS_WEIGHTS)[0],
+                    "parent_offer_id": parent_id,
+                    "expires_at": _timestamp(created + timedelta(hours=72)),
+                    "created_at": _timestamp(created),
+                    "updated_at": _timestamp(created),
+                }
+            )
+            parent_id = offers[-1]["id"]
+            listed = created
+            amount = min(listing["price"], amount * rng.uniform(1.01, 1.06))
+        return offers
+
+    def iter_listings(self, count: int) -> Iterator[tuple[dict[str, Any], list[dict[str, Any]]]]:
+        """
+        Generate listings with their offer chains.
+
+        Args:
+            count: Number of listings
+
+        Yields:
+            (property row, offer rows) per listing
+        """
+        rng = random.Random(f"{self.seed}:listings")
+        for i in range(count):
+            listing = self._listing(rng, i)
+            yield listing, self._offers(rng, listing)
@@ -98,6 +98,7 @@ export interface PricingAnalysisResponse {
   analysis_type: string;
   result: string;
   tasks_output: TaskOutput[];
+  llm_cache?: LLMCacheStats;
 }
 
 export interface NegotiationAdviceResponse {
@@ -107,6 +108,7 @@ export interface NegotiationAdviceResponse {
   offer_amount?: number;
   result: string;
   tasks_output: TaskOutput[];
+  llm_cache?: LLMCacheStats;
 }
 
 export interface ContractResponse {
@@ -118,6 +120,7 @@ export interface ContractResponse {
   contract_draft: string;
   full_analysis: string;
   tasks_output: TaskOutput[];
+  llm_cache?: LLMCacheStats;
 }
 
 export interface FullAnalysisResponse {
@@ -128,21 +131,68 @@ export interface FullAnalysisResponse {
   executive_summary: string;
   specialist_reports: SpecialistReport[];
   agents_used: string[];
+  token_usage?: TokenUsage;
+  llm_cache?: LLMCacheStats;
 }
 
 export interface AsyncJobResponse {
   job_id: string;
   status: string;
   check_url: string;
+  stream_url?: string;
   estimated_time?: string;
 }
 
+export interface TokenUsage {
+  total_tokens: number;
+  prompt_tokens: number;
+  completion_tokens: number;
+  successful_requests: number;
+  [key: string]: number;
+}
+
+// LLM response cache activity of one crew run
+export interface LLMCacheStats {
+  hits: number;
+  disk_hits: number;
+  misses: number;
+  bypassed: number;
+  saved_prompt_tokens: number;
+  saved_completion_tokens: number;
+  saved_tokens: number;
+  hit_rate: number;
+}
+
+// `task` event of a job progress stream: one finished crew task
+export interface TaskProgressEvent {
+  type: 'task';
+  seq: number;
+  at: string;
+  attempt: number;
+  task_index: number;
+  task_count: number;
+  specialist: string;
+  task: string | null;
+  output: string;
+  elapsed_seconds: number;
+  task_seconds: number;
+  token_usage: TokenUsage;
+  total_token_usage: TokenUsage;
+}
+
+export type JobPriority = 'interactive' | 'batch';
+
 export interface JobResult<T> {
-  status: 'processing' | 'completed' | 'failed';
-  result?: T;
-  error?: string;
-  started_at?: string;
-  completed_at?: string;
+  job_id: string;
+  kind: string;
+  status: 'queued' | 'running' | 'completed' | 'failed' | 'cancelled';
+  params: Record<string, unknown>;
+  result: T | null;
+  error: string | null;
+  created_at: string;
+  started_at: string | null;
+  finished_at: string | null;
+  transitions: Array<{ status: string; at: string }>;
 }
 
 export interface NegotiationPowerResult {
@@ -358,9 +408,10 @@ class CrewAIClient {
   }
 
   async analyzePricingAsync(
-    request: PricingAnalysisRequest
+    request: PricingAnalysisRequest,
+    priority: JobPriority = 'interactive'
   ): Promise<AsyncJobResponse> {
-    return this.request('/api/v1/pricing/analyze/async', {
+    return this.request(`/api/v1/pricing/analyze/async?priority=${priority}`, {
       method: 'POST',
       body: JSON.stringify(request),
     });
@@ -372,6 +423,14 @@ class CrewAIClient {
     return this.request(`/api/v1/pricing/analyze/result/${jobId}`);
   }
 
+  async cancelPricingAnalysis(
+    jobId: string
+  ): Promise<JobResult<PricingAnalysisResponse>> {
+    return this.request(`/api/v1/pricing/analyze/result/${jobId}`, {
+      method: 'DELETE',
+    });
+  }
+
   async quickPricing(propertyId: string): Promise<QuickPricingResult> {
     return this.request(`/api/v1/pricing/quick/${propertyId}`);
   }
@@ -464,9 +523,10 @@ class CrewAIClient {
   }
 
   async runFullAnalysisAsync(
-    request: FullAnalysisRequest
+    request: FullAnalysisRequest,
+    priority: JobPriority = 'interactive'
   ): Promise<AsyncJobResponse> {
-    return this.request('/api/v1/analysis/full/async', {
+    return this.request(`/api/v1/analysis/full/async?priority=${priority}`, {
       method: 'POST',
       body: JSON.stringify(request),
     });
@@ -478,6 +538,19 @@ class CrewAIClient {
     return this.request(`/api/v1/analysis/full/result/${jobId}`);
   }
 
+  // Server-Sent Events: `status`, `task` (TaskProgressEvent), then `job` (JobResult)
+  streamFullAnalysis(jobId: string): EventSource {
+    return new EventSource(`${this.baseUrl}/api/v1/analysis/full/stream/${jobId}`);
+  }
+
+  async cancelFullAnalysis(
+    jobId: string
+  ): Promise<JobResult<FullAnalysisResponse>> {
+    return this.request(`/api/v1/analysis/full/result/${jobId}`, {
+      method: 'DELETE',
+    });
+  }
+
   async getCapabilities(): Promise<object> {
     return this.request('/api/v1/analysis/capabilities');
   }
@@ -504,8 +577,8 @@ class CrewAIClient {
         return result.result;
       }
 
-      if (result.status === 'failed') {
-        throw new Error(result.error || 'Analysis failed');
+      if (result.status === 'failed' || result.status === 'cancelled') {
+        throw new Error(result.error || `Analysis ${result.status}`);
       }
 
       // Wait before next poll
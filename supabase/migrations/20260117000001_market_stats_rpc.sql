@@ -0,0 +1,66 @@
+-- ============================================================================
+-- MARKET STATS AGGREGATION RPC
+-- ============================================================================
+-- Aggregates listing statistics in the database so FetchMarketStatsTool
+-- receives one JSON object instead of every property row in the zone.
+-- Returns the same keys the tool computes in Python, plus medians and
+-- percentiles (percentile_cont, i.e. linear interpolation).
+-- ============================================================================
+
+CREATE OR REPLACE FUNCTION pricewaze_market_stats(
+  p_zone_id UUID DEFAULT NULL,
+  p_property_type TEXT DEFAULT NULL
+)
+RETURNS JSONB AS $$
+  WITH scoped AS (
+    SELECT price, price_per_m2, property_type, status
+    FROM pricewaze_properties
+    WHERE (p_zone_id IS NULL OR zone_id = p_zone_id)
+      AND (p_property_type IS NULL OR property_type::TEXT = p_property_type)
+  ),
+  active AS (
+    SELECT * FROM scoped WHERE status = 'active'
+  ),
+  -- Zero or missing prices are ignored, as in the Python aggregation
+  prices AS (
+    SELECT
+      avg(price) FILTER (WHERE price <> 0) AS avg_price,
+      min(price) FILTER (WHERE price <> 0) AS min_price,
+      max(price) FILTER (WHERE price <> 0) AS max_price,
+      percentile_cont(ARRAY[0.25, 0.5, 0.75, 0.9])
+        WITHIN GROUP (ORDER BY price) FILTER (WHERE price <> 0) AS price_percentiles,
+      avg(price_per_m2) FILTER (WHERE price_per_m2 <> 0) AS avg_price_per_m2,
+      percentile_cont(0.5)
+        WITHIN GROUP (ORDER BY price_per_m2) FILTER (WHERE price_per_m2 <> 0)
+        AS median_price_per_m2
+    FROM active
+  ),
+  type_distribution AS (
+    SELECT jsonb_object_agg(property_type, listings) AS distribution
+    FROM (
+      SELECT property_type::TEXT AS property_type, count(*) AS listings
+      FROM active
+      GROUP BY property_type
+    ) counts
+  )
+  SELECT jsonb_build_object(
+    'total_listings', (SELECT count(*) FROM active),
+    'total_sold', (SELECT count(*) FROM scoped WHERE status = 'sold'),
+    'avg_price', COALESCE(p.avg_price, 0),
+    'min_price', COALESCE(p.min_price, 0),
+    'max_price', COALESCE(p.max_price, 0),
+    'median_price', COALESCE(p.price_percentiles[2], 0),
+    'price_p25', COALESCE(p.price_percentiles[1], 0),
+    'price_p75', COALESCE(p.price_percentiles[3], 0),
+    'price_p90', COALESCE(p.price_percentiles[4], 0),
+    'avg_price_per_m2', COALESCE(p.avg_price_per_m2, 0),
+    'median_price_per_m2', COALESCE(p.median_price_per_m2, 0),
+    'property_type_distribution', COALESCE(t.distribution, '{}'::JSONB)
+  )
+  FROM prices p, type_distribution t;
+$$ LANGUAGE sql STABLE;
+
+COMMENT ON FUNCTION pricewaze_market_stats(UUID, TEXT) IS
+  'Listing aggregates (counts, price avg/min/max/median/percentiles, price per m2, type distribution) for a zone and/or property type';
+
+GRANT EXECUTE ON FUNCTION pricewaze_market_stats(UUID, TEXT) TO authenticated, service_role;
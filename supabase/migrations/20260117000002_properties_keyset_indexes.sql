@@ -0,0 +1,14 @@
+-- ============================================================================
+-- KEYSET PAGINATION INDEXES FOR PROPERTIES
+-- ============================================================================
+-- The CrewAI data layer streams pricewaze_properties in (created_at, id)
+-- order, resuming each page after the last row of the previous one. These
+-- indexes turn every page into a range scan, for whole-table reads and for
+-- the per-zone reads used by market stats and batch valuation.
+-- ============================================================================
+
+CREATE INDEX IF NOT EXISTS idx_properties_created_at_id
+  ON pricewaze_properties(created_at, id);
+
+CREATE INDEX IF NOT EXISTS idx_properties_zone_created_at_id
+  ON pricewaze_properties(zone_id, created_at, id);